@@ -5,10 +5,46 @@ from app.algorithms.zscore_detector import ZScoreDetector
 from app.algorithms.iqr_detector import IQRDetector
 from app.algorithms.trend_analyzer import TrendAnalyzer
 from app.algorithms.seasonal_decomposition import SeasonalDecomposer
+from app.algorithms.online_detector import (
+    OnlineAnomalyDetector,
+    OnlineMetricState,
+    RunningStats,
+    QuantileSketch
+)
+from app.algorithms.batch_detector import BatchAnomalyDetector, SeriesBatch
+from app.algorithms.change_point import ChangePointDetector, ChangePointState
+from app.algorithms.derived_metrics import (
+    DerivedFormula,
+    DerivedMetricGraph,
+    get_derived_metric_graph
+)
+from app.algorithms.near_duplicates import Fingerprint, MinHasher, NearDuplicateIndex
+from app.algorithms.bloom_filter import BloomFilter
+from app.algorithms.rank_fusion import reciprocal_rank_fusion
+from app.algorithms.hnsw import HNSWIndex
+from app.algorithms.flat_index import FlatIndex
 
 __all__ = [
     "ZScoreDetector",
     "IQRDetector",
     "TrendAnalyzer",
     "SeasonalDecomposer",
+    "OnlineAnomalyDetector",
+    "OnlineMetricState",
+    "RunningStats",
+    "QuantileSketch",
+    "BatchAnomalyDetector",
+    "SeriesBatch",
+    "ChangePointDetector",
+    "ChangePointState",
+    "DerivedFormula",
+    "DerivedMetricGraph",
+    "get_derived_metric_graph",
+    "Fingerprint",
+    "MinHasher",
+    "NearDuplicateIndex",
+    "BloomFilter",
+    "reciprocal_rank_fusion",
+    "HNSWIndex",
+    "FlatIndex",
 ]
@@ -0,0 +1,454 @@
+"""
+Batch (Vectorized) Anomaly Detection
+Multi-series detection over a padded, masked 2-D matrix
+"""
+import logging
+from dataclasses import dataclass
+from typing import List, Dict, Any, Optional, Tuple
+from datetime import datetime
+import numpy as np
+
+from app.models.anomaly import AnomalyType, DetectionMethod, TrendDirection
+from app.algorithms.zscore_detector import ZScoreDetector
+from app.algorithms.iqr_detector import IQRDetector
+from app.algorithms.trend_analyzer import TrendAnalyzer
+from app.algorithms.seasonal_decomposition import SeasonalDecomposer
+
+
+logger = logging.getLogger(__name__)
+
+
+PERIOD_DAYS = {"WoW": 7, "MoM": 30, "QoQ": 90, "YoY": 365}
+
+
+@dataclass
+class SeriesBatch:
+    """
+    Many time series packed into one left-aligned matrix
+
+    Row i holds series i in its first lengths[i] columns; the remaining
+    columns are padding (zero-filled and excluded by mask).
+    """
+    values: np.ndarray    # (series, max_length) float
+    mask: np.ndarray      # (series, max_length) bool, True where observed
+    offsets: np.ndarray   # (series, max_length) days since each series' first timestamp
+    lengths: np.ndarray   # (series,) int
+
+    @classmethod
+    def from_series(
+        cls,
+        values: List[List[float]],
+        timestamps: Optional[List[List[datetime]]] = None
+    ) -> "SeriesBatch":
+        """
+        Pack a list of series into a padded matrix
+
+        Args:
+            values: One list of values per series, in chronological order
+            timestamps: Optional matching timestamps (defaults to one point per day)
+
+        Returns:
+            SeriesBatch
+        """
+        lengths = np.array([len(v) for v in values], dtype=int)
+        width = int(lengths.max()) if len(lengths) else 0
+        mask = np.arange(width) < lengths[:, None]
+
+        matrix = np.zeros((len(values), width), dtype=float)
+        if lengths.sum():
+            matrix[mask] = np.concatenate([np.asarray(v, dtype=float) for v in values if len(v)])
+
+        if timestamps is None:
+            offsets = np.where(mask, np.arange(width, dtype=float), 0.0)
+        else:
+            offsets = np.zeros_like(matrix)
+            if lengths.sum():
+                offsets[mask] = [
+                    (t - series[0]).total_seconds() / 86400
+                    for series in timestamps for t in series
+                ]
+
+        return cls(values=matrix, mask=mask, offsets=offsets, lengths=lengths)
+
+    @property
+    def size(self) -> int:
+        """Number of series"""
+        return len(self.lengths)
+
+    def last(self, matrix: np.ndarray) -> np.ndarray:
+        """Last observed entry of each row (0 for empty rows)"""
+        idx = np.maximum(self.lengths - 1, 0)
+        return np.take_along_axis(matrix, idx[:, None], axis=1)[:, 0] if matrix.shape[1] else np.zeros(self.size)
+
+
+class BatchAnomalyDetector:
+    """
+    Vectorized anomaly detection and trend analysis across many series
+
+    Runs z-score, IQR, linear trend / period-over-period change and seasonal
+    decomposition for every row of a SeriesBatch in single NumPy passes.
+    Thresholds, minimum sample sizes and severity scales come from the
+    per-series detectors so results match running them one metric at a time.
+    """
+
+    def __init__(
+        self,
+        zscore_detector: Optional[ZScoreDetector] = None,
+        iqr_detector: Optional[IQRDetector] = None,
+        trend_analyzer: Optional[TrendAnalyzer] = None,
+        seasonal_decomposer: Optional[SeasonalDecomposer] = None,
+        seasonal_threshold: float = 2.0
+    ):
+        """
+        Initialize batch detector
+
+        Args:
+            zscore_detector: Z-score configuration (default: ZScoreDetector())
+            iqr_detector: IQR configuration (default: IQRDetector())
+            trend_analyzer: Trend configuration (default: TrendAnalyzer())
+            seasonal_decomposer: Decomposition configuration (default: SeasonalDecomposer())
+            seasonal_threshold: Residual z-score threshold for seasonal anomalies
+        """
+        self.zscore_detector = zscore_detector or ZScoreDetector()
+        self.iqr_detector = iqr_detector or IQRDetector()
+        self.trend_analyzer = trend_analyzer or TrendAnalyzer()
+        self.seasonal_decomposer = seasonal_decomposer or SeasonalDecomposer()
+        self.seasonal_threshold = seasonal_threshold
+        self.logger = logging.getLogger(__name__)
+
+    # ==================== ROW STATISTICS ====================
+
+    def _mean_std(self, values: np.ndarray, mask: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """Masked population mean and standard deviation per row"""
+        counts = np.maximum(mask.sum(axis=1), 1)
+        masked = np.where(mask, values, 0.0)
+        mean = masked.sum(axis=1) / counts
+        centered = np.where(mask, values - mean[:, None], 0.0)
+        std = np.sqrt((centered ** 2).sum(axis=1) / counts)
+        return mean, std
+
+    def quantiles(self, batch: SeriesBatch, qs: List[float]) -> np.ndarray:
+        """
+        Per-row quantiles with linear interpolation (matches np.percentile)
+
+        Args:
+            batch: Packed series
+            qs: Quantiles in [0, 1]
+
+        Returns:
+            Array of shape (series, len(qs)); NaN for empty rows
+        """
+        ordered = np.sort(np.where(batch.mask, batch.values, np.inf), axis=1)
+        n = np.maximum(batch.lengths, 1)[:, None]
+        positions = np.asarray(qs, dtype=float)[None, :] * (n - 1)
+        lower = np.floor(positions).astype(int)
+        upper = np.minimum(lower + 1, n - 1)
+        fraction = positions - lower
+
+        if ordered.shape[1] == 0:
+            return np.full((batch.size, len(qs)), np.nan)
+
+        low_values = np.take_along_axis(ordered, lower, axis=1)
+        high_values = np.take_along_axis(ordered, upper, axis=1)
+        result = low_values + (high_values - low_values) * fraction
+        result[batch.lengths == 0] = np.nan
+        return result
+
+    def statistics(self, batch: SeriesBatch) -> List[Dict[str, float]]:
+        """
+        Per-series summary statistics (same keys as ZScoreDetector.get_statistics)
+
+        Args:
+            batch: Packed series
+
+        Returns:
+            One statistics dict per series (empty for empty series)
+        """
+        mean, std = self._mean_std(batch.values, batch.mask)
+        median = self.quantiles(batch, [0.5])[:, 0]
+        minimum = np.where(batch.mask, batch.values, np.inf).min(axis=1, initial=np.inf)
+        maximum = np.where(batch.mask, batch.values, -np.inf).max(axis=1, initial=-np.inf)
+
+        return [
+            {
+                "mean": float(mean[i]),
+                "median": float(median[i]),
+                "std": float(std[i]),
+                "min": float(minimum[i]),
+                "max": float(maximum[i]),
+                "count": int(batch.lengths[i]),
+                "variance": float(std[i] ** 2)
+            } if batch.lengths[i] else {}
+            for i in range(batch.size)
+        ]
+
+    # ==================== ANOMALY DETECTION ====================
+
+    def zscore_scores(self, batch: SeriesBatch) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Absolute z-scores for every point
+
+        Returns:
+            Tuple of (z_scores, row_means); z_scores is 0 where undefined
+        """
+        mean, std = self._mean_std(batch.values, batch.mask)
+        safe_std = np.where(std > 0, std, 1.0)
+        z_scores = np.abs(batch.values - mean[:, None]) / safe_std[:, None]
+        valid = batch.mask & (std > 0)[:, None] & (batch.lengths >= self.zscore_detector.min_samples)[:, None]
+        return np.where(valid, z_scores, 0.0), mean
+
+    def iqr_bounds(self, batch: SeriesBatch) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """
+        IQR outlier bounds per row
+
+        Returns:
+            Tuple of (lower_bound, upper_bound, iqr)
+        """
+        quartiles = self.quantiles(batch, [0.25, 0.75])
+        q1, q3 = quartiles[:, 0], quartiles[:, 1]
+        iqr = q3 - q1
+        multiplier = self.iqr_detector.multiplier
+        return q1 - multiplier * iqr, q3 + multiplier * iqr, iqr
+
+    def decompose(self, batch: SeriesBatch) -> Dict[str, np.ndarray]:
+        """
+        Additive decomposition of every row (see SeasonalDecomposer.decompose_matrix)
+
+        Returns:
+            Dictionary of (series, max_length) arrays: trend, seasonal, residual
+        """
+        components = self.seasonal_decomposer.decompose_matrix(batch.values, batch.lengths)
+        return {key: components[key] for key in ("trend", "seasonal", "residual")}
+
+    def seasonal_scores(self, batch: SeriesBatch) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Residual z-scores from seasonal decomposition
+
+        Returns:
+            Tuple of (residual_z_scores, residuals); scores are 0 where undefined
+        """
+        residual = self.decompose(batch)["residual"]
+        mean, std = self._mean_std(residual, batch.mask)
+        safe_std = np.where(std > 0, std, 1.0)
+        scores = np.abs(residual - mean[:, None]) / safe_std[:, None]
+        valid = (
+            batch.mask
+            & (std > 0)[:, None]
+            & (batch.lengths >= self.seasonal_decomposer.min_samples)[:, None]
+        )
+        return np.where(valid, scores, 0.0), residual
+
+    def detect(
+        self,
+        batch: SeriesBatch,
+        methods: Optional[List[DetectionMethod]] = None
+    ) -> List[List[Dict[str, Any]]]:
+        """
+        Detect anomalies in every series
+
+        At most one detection is reported per point, with the same method
+        precedence as AnomalyDetectionService.detect_anomalies
+        (ZSCORE, then IQR, then SEASONAL_DECOMPOSITION).
+
+        Args:
+            batch: Packed series
+            methods: Detection methods to use (default: ZSCORE and IQR)
+
+        Returns:
+            One list per series of detections ordered by index. Each detection
+            has index, method, score, anomaly_type, severity, expected_value and
+            confidence.
+        """
+        if methods is None:
+            methods = [DetectionMethod.ZSCORE, DetectionMethod.IQR]
+
+        results: List[List[Dict[str, Any]]] = [[] for _ in range(batch.size)]
+        if batch.size == 0 or batch.values.shape[1] == 0:
+            return results
+
+        taken = np.zeros_like(batch.mask)
+        sample_factor = np.minimum(batch.lengths / 100.0, 1.0)
+
+        try:
+            if DetectionMethod.ZSCORE in methods:
+                z_scores, mean = self.zscore_scores(batch)
+                flagged = z_scores > self.zscore_detector.threshold
+                for row, col in zip(*np.nonzero(flagged)):
+                    z_score = float(z_scores[row, col])
+                    results[row].append({
+                        "index": int(col),
+                        "method": DetectionMethod.ZSCORE,
+                        "score": z_score,
+                        "anomaly_type": (
+                            AnomalyType.SPIKE if batch.values[row, col] > mean[row] else AnomalyType.DROP
+                        ),
+                        "severity": self.zscore_detector._calculate_severity(z_score),
+                        "expected_value": float(mean[row]),
+                        "confidence": min(sample_factor[row] * 0.3 + min(z_score / 5.0, 1.0) * 0.7, 1.0)
+                    })
+                taken |= flagged
+
+            if DetectionMethod.IQR in methods:
+                lower, upper, iqr = self.iqr_bounds(batch)
+                outside = (batch.values < lower[:, None]) | (batch.values > upper[:, None])
+                eligible = (batch.lengths >= self.iqr_detector.min_samples)[:, None]
+                flagged = batch.mask & eligible & outside & ~taken
+                for row, col in zip(*np.nonzero(flagged)):
+                    value = batch.values[row, col]
+                    if value < lower[row]:
+                        deviation = abs(value - lower[row]) / iqr[row] if iqr[row] > 0 else 0.0
+                        anomaly_type = AnomalyType.DROP
+                    else:
+                        deviation = abs(value - upper[row]) / iqr[row] if iqr[row] > 0 else 0.0
+                        anomaly_type = AnomalyType.SPIKE
+                    results[row].append({
+                        "index": int(col),
+                        "method": DetectionMethod.IQR,
+                        "score": float(deviation),
+                        "anomaly_type": anomaly_type,
+                        "severity": self.iqr_detector._calculate_severity(deviation),
+                        "expected_value": float((lower[row] + upper[row]) / 2),
+                        "confidence": min(sample_factor[row] * 0.3 + min(deviation / 3.0, 1.0) * 0.7, 1.0)
+                    })
+                taken |= flagged
+
+            if DetectionMethod.SEASONAL_DECOMPOSITION in methods:
+                residual_z, residual = self.seasonal_scores(batch)
+                flagged = (residual_z > self.seasonal_threshold) & ~taken
+                for row, col in zip(*np.nonzero(flagged)):
+                    results[row].append({
+                        "index": int(col),
+                        "method": DetectionMethod.SEASONAL_DECOMPOSITION,
+                        "score": float(residual[row, col]),
+                        "anomaly_type": AnomalyType.SEASONAL_DEVIATION,
+                        "severity": self.zscore_detector._calculate_severity(float(residual_z[row, col])),
+                        "expected_value": float(batch.values[row, col] - residual[row, col]),
+                        "confidence": 0.8
+                    })
+
+            for detections in results:
+                detections.sort(key=lambda d: d["index"])
+
+        except Exception as e:
+            self.logger.error(f"Error in batch anomaly detection: {str(e)}")
+
+        return results
+
+    # ==================== TREND ANALYSIS ====================
+
+    def linear_trend(self, batch: SeriesBatch) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Least-squares slope and R-squared for every row
+
+        Returns:
+            Tuple of (slope, r_squared)
+        """
+        counts = np.maximum(batch.lengths, 1)
+        x = np.where(batch.mask, batch.offsets, 0.0)
+        y = np.where(batch.mask, batch.values, 0.0)
+
+        x_mean = x.sum(axis=1) / counts
+        y_mean = y.sum(axis=1) / counts
+        dx = np.where(batch.mask, x - x_mean[:, None], 0.0)
+        dy = np.where(batch.mask, y - y_mean[:, None], 0.0)
+
+        sxx = (dx ** 2).sum(axis=1)
+        sxy = (dx * dy).sum(axis=1)
+        syy = (dy ** 2).sum(axis=1)
+
+        slope = np.divide(sxy, sxx, out=np.zeros_like(sxy), where=sxx > 0)
+        ss_res = np.where(batch.mask, (dy - slope[:, None] * dx) ** 2, 0.0).sum(axis=1)
+        r_squared = np.where(syy > 0, 1 - ss_res / np.where(syy > 0, syy, 1.0), 0.0)
+        return slope, r_squared
+
+    def period_change(self, batch: SeriesBatch, period: str) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Period-over-period percentage change (same method as TrendAnalyzer)
+
+        Compares the mean of values inside the trailing period window with
+        the mean of older values, falling back to first-vs-last.
+
+        Returns:
+            Tuple of (percentage_change, window_start_index)
+        """
+        days = PERIOD_DAYS.get(period, 7)
+        cutoff = batch.last(batch.offsets) - days
+        recent = batch.mask & (batch.offsets >= cutoff[:, None])
+        old = batch.mask & ~recent
+
+        recent_count = recent.sum(axis=1)
+        old_count = old.sum(axis=1)
+        recent_mean = np.where(recent, batch.values, 0.0).sum(axis=1) / np.maximum(recent_count, 1)
+        old_mean = np.where(old, batch.values, 0.0).sum(axis=1) / np.maximum(old_count, 1)
+
+        split = (recent_count > 0) & (old_count > 0)
+        old_value = np.where(split, old_mean, batch.values[:, 0] if batch.values.shape[1] else 0.0)
+        new_value = np.where(split, recent_mean, batch.last(batch.values))
+
+        defined = (split | (batch.lengths >= 2)) & (old_value != 0)
+        safe_old = np.where(old_value != 0, np.abs(old_value), 1.0)
+        change = np.where(defined, (new_value - old_value) / safe_old * 100, 0.0)
+
+        return change, np.argmax(recent, axis=1)
+
+    def analyze_trends(
+        self,
+        batch: SeriesBatch,
+        periods: Optional[List[str]] = None
+    ) -> List[List[Dict[str, Any]]]:
+        """
+        Analyze trends for every series
+
+        Args:
+            batch: Packed series
+            periods: Periods to analyze (default: WoW, MoM)
+
+        Returns:
+            One list per series of significant trends. Each trend has period,
+            days, direction, percentage_change, absolute_change,
+            confidence_score, start_index and is_significant.
+        """
+        if periods is None:
+            periods = ["WoW", "MoM"]
+
+        results: List[List[Dict[str, Any]]] = [[] for _ in range(batch.size)]
+        if batch.size == 0 or batch.values.shape[1] == 0:
+            return results
+
+        try:
+            _, r_squared = self.linear_trend(batch)
+            eligible = batch.lengths >= self.trend_analyzer.min_samples
+            absolute = batch.last(batch.values) - batch.values[:, 0]
+            sample_confidence = np.minimum(batch.lengths / 30.0, 1.0)
+
+            for period in periods:
+                change, start_index = self.period_change(batch, period)
+                significant = eligible & (np.abs(change) >= self.trend_analyzer.significance_threshold)
+                confidence = np.clip(
+                    r_squared * 0.4 + sample_confidence * 0.3 + np.minimum(np.abs(change) / 50.0, 1.0) * 0.3,
+                    0.0,
+                    1.0
+                )
+
+                for row in np.nonzero(significant)[0]:
+                    pct = float(change[row])
+                    if abs(pct) < 2.0:
+                        direction = TrendDirection.STABLE
+                    else:
+                        direction = TrendDirection.UP if pct > 0 else TrendDirection.DOWN
+
+                    results[row].append({
+                        "period": period,
+                        "days": PERIOD_DAYS.get(period, 7),
+                        "direction": direction,
+                        "percentage_change": pct,
+                        "absolute_change": float(absolute[row]),
+                        "confidence_score": float(confidence[row]),
+                        "start_index": int(start_index[row]),
+                        "is_significant": True
+                    })
+
+        except Exception as e:
+            self.logger.error(f"Error in batch trend analysis: {str(e)}")
+
+        return results
@@ -0,0 +1,79 @@
+"""
+Bloom Filter
+Compact set membership with no false negatives and a tunable false positive rate
+"""
+import hashlib
+import math
+from typing import Iterable
+
+
+class BloomFilter:
+    """
+    Bloom filter over strings
+
+    Sized for an expected number of items and false positive rate; each
+    item sets k bits chosen by double hashing one 128-bit BLAKE2b digest.
+    "x in filter" is False only for items never added. Past capacity the
+    false positive rate climbs, which saturated reports so callers can
+    rebuild a larger filter.
+    """
+
+    def __init__(self, capacity: int, error_rate: float = 0.01):
+        """
+        Initialize filter
+
+        Args:
+            capacity: Expected number of items
+            error_rate: Target false positive rate at capacity
+        """
+        if not 0 < error_rate < 1:
+            raise ValueError("error_rate must be between 0 and 1")
+
+        self.capacity = max(1, capacity)
+        self.error_rate = error_rate
+        self.num_bits = max(8, math.ceil(-self.capacity * math.log(error_rate) / math.log(2) ** 2))
+        self.num_hashes = max(1, round(self.num_bits / self.capacity * math.log(2)))
+        self._bits = bytearray((self.num_bits + 7) // 8)
+        self._count = 0
+
+    @classmethod
+    def from_items(cls, items: Iterable[str], capacity: int, error_rate: float = 0.01) -> "BloomFilter":
+        """
+        Build a filter holding the given items
+
+        Args:
+            items: Items to add
+            capacity: Expected number of items (including later additions)
+            error_rate: Target false positive rate at capacity
+
+        Returns:
+            BloomFilter
+        """
+        bloom = cls(capacity, error_rate)
+        for item in items:
+            bloom.add(item)
+        return bloom
+
+    def _positions(self, item: str):
+        digest = hashlib.blake2b(item.encode("utf-8"), digest_size=16).digest()
+        first = int.from_bytes(digest[:8], "little")
+        step = int.from_bytes(digest[8:], "little") | 1
+        return ((first + i * step) % self.num_bits for i in range(self.num_hashes))
+
+    def add(self, item: str) -> None:
+        """Add an item"""
+        for position in self._positions(item):
+            self._bits[position >> 3] |= 1 << (position & 7)
+        self._count += 1
+
+    def __contains__(self, item: str) -> bool:
+        return all(self._bits[position >> 3] & (1 << (position & 7)) for position in self._positions(item))
+
+    def __len__(self) -> int:
+        """Number of add() calls"""
+        return self._count
+
+    @property
+    def saturated(self) -> bool:
+        """Whether more items were added than the filter was sized for"""
+        return self._count > self.capacity
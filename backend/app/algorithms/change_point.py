@@ -0,0 +1,466 @@
+"""
+Change-Point Detection
+Linear-time trend reversal and level-shift detection for KPI series
+"""
+import logging
+import math
+from dataclasses import dataclass, field
+from typing import List, Dict, Any, Optional
+from datetime import datetime
+import numpy as np
+
+
+logger = logging.getLogger(__name__)
+
+
+CHANGE_POINT_METHODS = ("slope", "cusum", "pelt")
+
+
+@dataclass
+class ChangePointState:
+    """Per-metric state for streaming change-point detection (JSON serializable)"""
+    observations: int = 0
+    origin: Optional[datetime] = None
+
+    # Trailing 2 * window_size + 1 points for slope reversal
+    buffer_values: List[float] = field(default_factory=list)
+    buffer_offsets: List[float] = field(default_factory=list)
+    buffer_timestamps: List[Optional[str]] = field(default_factory=list)
+
+    # CUSUM reference (running sums of the current segment) and statistics
+    reference_count: int = 0
+    reference_sum: float = 0.0
+    reference_sum_sq: float = 0.0
+    cusum_pos: float = 0.0
+    cusum_neg: float = 0.0
+    pos_start: int = 0
+    neg_start: int = 0
+
+    @property
+    def reference_mean(self) -> float:
+        return self.reference_sum / self.reference_count if self.reference_count else 0.0
+
+    @property
+    def reference_std(self) -> float:
+        if not self.reference_count:
+            return 0.0
+        variance = self.reference_sum_sq / self.reference_count - self.reference_mean ** 2
+        return math.sqrt(max(variance, 0.0))
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "observations": self.observations,
+            "origin": self.origin.isoformat() if self.origin else None,
+            "buffer_values": list(self.buffer_values),
+            "buffer_offsets": list(self.buffer_offsets),
+            "buffer_timestamps": list(self.buffer_timestamps),
+            "reference_count": self.reference_count,
+            "reference_sum": self.reference_sum,
+            "reference_sum_sq": self.reference_sum_sq,
+            "cusum_pos": self.cusum_pos,
+            "cusum_neg": self.cusum_neg,
+            "pos_start": self.pos_start,
+            "neg_start": self.neg_start
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "ChangePointState":
+        origin = data.get("origin")
+        return cls(
+            observations=int(data.get("observations", 0)),
+            origin=datetime.fromisoformat(origin) if origin else None,
+            buffer_values=[float(v) for v in data.get("buffer_values", [])],
+            buffer_offsets=[float(v) for v in data.get("buffer_offsets", [])],
+            buffer_timestamps=list(data.get("buffer_timestamps", [])),
+            reference_count=int(data.get("reference_count", 0)),
+            reference_sum=float(data.get("reference_sum", 0.0)),
+            reference_sum_sq=float(data.get("reference_sum_sq", 0.0)),
+            cusum_pos=float(data.get("cusum_pos", 0.0)),
+            cusum_neg=float(data.get("cusum_neg", 0.0)),
+            pos_start=int(data.get("pos_start", 0)),
+            neg_start=int(data.get("neg_start", 0))
+        )
+
+
+class ChangePointDetector:
+    """
+    Change-point detection in linear time
+
+    Methods:
+        slope: Sign reversals between the regression slopes of the windows
+               before and after each point. Window sums come from prefix
+               sums of x, y, xy and x², so every slope is O(1).
+        cusum: Two-sided CUSUM on values standardized against the running
+               mean/std of the current segment (after window_size warm-up
+               points); restarts after an alarm.
+        pelt:  Optimal mean-shift segmentation (Killick et al. PELT) with a
+               Gaussian cost from prefix sums and a BIC-style penalty.
+
+    The streaming methods (new_state/fit/update) produce the same slope
+    and CUSUM change points as detect() while keeping O(window_size) state.
+    """
+
+    def __init__(
+        self,
+        window_size: int = 14,
+        method: str = "slope",
+        threshold: float = 8.0,
+        drift: float = 0.5,
+        penalty: Optional[float] = None
+    ):
+        """
+        Initialize change-point detector
+
+        Args:
+            window_size: Window for slope comparison, CUSUM warm-up and PELT
+                         minimum segment length
+            method: Detection method ("slope", "cusum" or "pelt")
+            threshold: CUSUM alarm threshold in standard deviations
+            drift: CUSUM allowance per point in standard deviations
+            penalty: PELT penalty per change point (default: 2·σ²·ln n)
+        """
+        if method not in CHANGE_POINT_METHODS:
+            raise ValueError(f"Unknown change-point method: {method}")
+
+        self.window_size = window_size
+        self.method = method
+        self.threshold = threshold
+        self.drift = drift
+        self.penalty = penalty
+        self.logger = logging.getLogger(__name__)
+
+    # ==================== BATCH DETECTION ====================
+
+    def detect(
+        self,
+        values: List[float],
+        timestamps: Optional[List[datetime]] = None
+    ) -> List[Dict[str, Any]]:
+        """
+        Detect change points in a whole series
+
+        Args:
+            values: List of metric values
+            timestamps: Optional list of timestamps (default: one point per day)
+
+        Returns:
+            List of change points ordered by index. Every change point has
+            index, timestamp, value and change_type.
+        """
+        changes = []
+
+        try:
+            if self.method == "slope":
+                changes = self._detect_slope_reversals(values, timestamps)
+            elif self.method == "cusum":
+                state = self.new_state()
+                for i, value in enumerate(values):
+                    change = self.update(state, value, timestamps[i] if timestamps else None)
+                    if change:
+                        changes.append(change)
+            else:
+                changes = self._detect_pelt(values, timestamps)
+
+        except Exception as e:
+            self.logger.error(f"Error detecting change points: {str(e)}")
+
+        return changes
+
+    def _offsets(self, values: List[float], timestamps: Optional[List[datetime]]) -> np.ndarray:
+        """X coordinates in days since the first point"""
+        if not timestamps:
+            return np.arange(len(values), dtype=float)
+        t0 = timestamps[0]
+        return np.array([(t - t0).total_seconds() / 86400 for t in timestamps])
+
+    def _detect_slope_reversals(
+        self,
+        values: List[float],
+        timestamps: Optional[List[datetime]]
+    ) -> List[Dict[str, Any]]:
+        """Slope sign changes between adjacent windows, from prefix sums"""
+        w = self.window_size
+        n = len(values)
+        if n < w * 2:
+            return []
+
+        y = np.asarray(values, dtype=float)
+        x = self._offsets(values, timestamps)
+
+        def prefix(a):
+            return np.concatenate([[0.0], np.cumsum(a)])
+
+        px, py, pxy, pxx = prefix(x), prefix(y), prefix(x * y), prefix(x * x)
+
+        def window_slopes(starts):
+            ends = starts + w
+            sx, sy = px[ends] - px[starts], py[ends] - py[starts]
+            sxy, sxx = pxy[ends] - pxy[starts], pxx[ends] - pxx[starts]
+            denominator = w * sxx - sx * sx
+            numerator = w * sxy - sx * sy
+            return np.divide(
+                numerator, denominator,
+                out=np.zeros_like(numerator),
+                where=np.abs(denominator) > 1e-12
+            )
+
+        points = np.arange(w, n - w)
+        previous = window_slopes(points - w)
+        following = window_slopes(points)
+
+        return [
+            {
+                "index": int(i),
+                "timestamp": timestamps[i] if timestamps else None,
+                "value": values[i],
+                "previous_slope": float(previous[k]),
+                "next_slope": float(following[k]),
+                "change_type": "reversal"
+            }
+            for k, i in enumerate(points)
+            if previous[k] * following[k] < 0
+        ]
+
+    def _detect_pelt(
+        self,
+        values: List[float],
+        timestamps: Optional[List[datetime]]
+    ) -> List[Dict[str, Any]]:
+        """Penalized optimal segmentation for shifts in mean"""
+        y = np.asarray(values, dtype=float)
+        n = len(y)
+        min_size = max(self.window_size, 2)
+        if n < 2 * min_size:
+            return []
+
+        s1 = np.concatenate([[0.0], np.cumsum(y)])
+        s2 = np.concatenate([[0.0], np.cumsum(y * y)])
+
+        def cost(starts, end):
+            length = end - starts
+            total = s1[end] - s1[starts]
+            return (s2[end] - s2[starts]) - total * total / length
+
+        penalty = self.penalty
+        if penalty is None:
+            # Noise level from first differences is robust to the shifts themselves
+            sigma = np.median(np.abs(np.diff(y))) / 0.6745 / math.sqrt(2)
+            if sigma == 0:
+                sigma = np.std(y)
+            if sigma == 0:
+                return []
+            penalty = 2 * sigma * sigma * math.log(n)
+
+        best = np.full(n + 1, np.inf)
+        best[0] = -penalty
+        last = np.zeros(n + 1, dtype=int)
+        candidates = np.array([0])
+
+        for end in range(min_size, n + 1):
+            if end - min_size >= min_size:
+                candidates = np.append(candidates, end - min_size)
+
+            totals = best[candidates] + cost(candidates, end)
+            choice = int(np.argmin(totals))
+            best[end] = totals[choice] + penalty
+            last[end] = candidates[choice]
+
+            # Prune candidates that can never be optimal again
+            candidates = candidates[totals <= best[end]]
+
+        boundaries = []
+        end = n
+        while end > 0:
+            end = int(last[end])
+            if end > 0:
+                boundaries.append(end)
+        boundaries.reverse()
+
+        segments = [0] + boundaries + [n]
+        changes = []
+        for k, index in enumerate(boundaries):
+            previous_mean = (s1[index] - s1[segments[k]]) / (index - segments[k])
+            next_mean = (s1[segments[k + 2]] - s1[index]) / (segments[k + 2] - index)
+            changes.append({
+                "index": index,
+                "timestamp": timestamps[index] if timestamps else None,
+                "value": values[index],
+                "previous_mean": float(previous_mean),
+                "next_mean": float(next_mean),
+                "change_type": "level_shift",
+                "direction": "up" if next_mean > previous_mean else "down"
+            })
+
+        return changes
+
+    # ==================== STREAMING DETECTION ====================
+
+    def new_state(self) -> ChangePointState:
+        """Create empty streaming state"""
+        return ChangePointState()
+
+    def fit(
+        self,
+        state: ChangePointState,
+        values: List[float],
+        timestamps: Optional[List[datetime]] = None
+    ) -> ChangePointState:
+        """
+        Fold historical values into state, discarding their change points
+
+        Args:
+            state: State to update in place
+            values: Historical values in chronological order
+            timestamps: Optional matching timestamps
+
+        Returns:
+            The updated state
+        """
+        for i, value in enumerate(values):
+            self.update(state, value, timestamps[i] if timestamps else None)
+        return state
+
+    def update(
+        self,
+        state: ChangePointState,
+        value: float,
+        timestamp: Optional[datetime] = None
+    ) -> Optional[Dict[str, Any]]:
+        """
+        Add a point and report a change point if one is now confirmed
+
+        In slope mode the reported point lies window_size points in the
+        past (the centre of the trailing window). PELT needs the whole
+        series and has no streaming form; CUSUM is used instead.
+
+        Args:
+            state: Per-metric state (updated in place)
+            value: New metric value
+            timestamp: Optional timestamp of the value
+
+        Returns:
+            Change point dict, or None
+        """
+        value = float(value)
+        index = state.observations
+        state.observations += 1
+
+        try:
+            if self.method == "slope":
+                return self._update_slope(state, value, index, timestamp)
+            return self._update_cusum(state, value, index, timestamp)
+        except Exception as e:
+            self.logger.error(f"Error in streaming change-point detection: {str(e)}")
+            return None
+
+    def _update_slope(
+        self,
+        state: ChangePointState,
+        value: float,
+        index: int,
+        timestamp: Optional[datetime]
+    ) -> Optional[Dict[str, Any]]:
+        """Slope reversal around the point window_size positions back"""
+        w = self.window_size
+
+        if timestamp is not None:
+            if state.origin is None:
+                state.origin = timestamp
+            offset = (timestamp - state.origin).total_seconds() / 86400
+        else:
+            offset = float(index)
+
+        # Keep 2w + 1 points: two full windows plus the newest point, which
+        # (as in batch mode) never belongs to a compared window
+        state.buffer_values.append(value)
+        state.buffer_offsets.append(offset)
+        state.buffer_timestamps.append(timestamp.isoformat() if timestamp else None)
+        if len(state.buffer_values) > 2 * w + 1:
+            del state.buffer_values[0], state.buffer_offsets[0], state.buffer_timestamps[0]
+
+        if len(state.buffer_values) < 2 * w + 1:
+            return None
+
+        x = np.asarray(state.buffer_offsets)
+        y = np.asarray(state.buffer_values)
+        previous = self._slope(x[:w], y[:w])
+        following = self._slope(x[w:2 * w], y[w:2 * w])
+
+        if previous * following >= 0:
+            return None
+
+        centre_timestamp = state.buffer_timestamps[w]
+        return {
+            "index": index - w,
+            "timestamp": datetime.fromisoformat(centre_timestamp) if centre_timestamp else None,
+            "value": state.buffer_values[w],
+            "previous_slope": previous,
+            "next_slope": following,
+            "change_type": "reversal"
+        }
+
+    def _slope(self, x: np.ndarray, y: np.ndarray) -> float:
+        """Least-squares slope of one window"""
+        n = len(x)
+        sx, sy = x.sum(), y.sum()
+        denominator = n * (x * x).sum() - sx * sx
+        if abs(denominator) <= 1e-12:
+            return 0.0
+        return float((n * (x * y).sum() - sx * sy) / denominator)
+
+    def _update_cusum(
+        self,
+        state: ChangePointState,
+        value: float,
+        index: int,
+        timestamp: Optional[datetime]
+    ) -> Optional[Dict[str, Any]]:
+        """Two-sided CUSUM against the running statistics of the current segment"""
+        if state.reference_count < self.window_size:
+            self._absorb_reference(state, value)
+            return None
+
+        std = state.reference_std
+        if std == 0:
+            self._absorb_reference(state, value)
+            return None
+
+        z = (value - state.reference_mean) / std
+        if state.cusum_pos == 0:
+            state.pos_start = index
+        if state.cusum_neg == 0:
+            state.neg_start = index
+        state.cusum_pos = max(0.0, state.cusum_pos + z - self.drift)
+        state.cusum_neg = max(0.0, state.cusum_neg - z - self.drift)
+
+        if state.cusum_pos <= self.threshold and state.cusum_neg <= self.threshold:
+            # In-control points keep refining the segment reference
+            self._absorb_reference(state, value)
+            return None
+
+        upward = state.cusum_pos > self.threshold
+        change = {
+            "index": index,
+            "timestamp": timestamp,
+            "value": value,
+            "start_index": state.pos_start if upward else state.neg_start,
+            "previous_mean": float(state.reference_mean),
+            "deviation": float(z),
+            "change_type": "level_shift",
+            "direction": "up" if upward else "down"
+        }
+
+        # Restart: the following points become the new segment reference
+        state.reference_count = 0
+        state.reference_sum = 0.0
+        state.reference_sum_sq = 0.0
+        state.cusum_pos = 0.0
+        state.cusum_neg = 0.0
+
+        return change
+
+    def _absorb_reference(self, state: ChangePointState, value: float) -> None:
+        """Add a value to the current segment's reference statistics"""
+        state.reference_count += 1
+        state.reference_sum += value
+        state.reference_sum_sq += value * value
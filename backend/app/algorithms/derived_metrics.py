@@ -0,0 +1,450 @@
+"""
+Derived Metrics
+Declarative KPI formulas compiled into a dependency DAG and evaluated with numpy
+"""
+import ast
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from functools import lru_cache
+from typing import Any, Callable, Dict, Iterable, List, Optional, Sequence, Set, Tuple
+import numpy as np
+
+
+# Functions that reach back over a window of days: fn(series, days)
+WINDOW_FUNCTIONS = ("lag", "delta", "pct_change", "rolling_sum", "rolling_mean")
+
+# Element-wise functions over one or two arguments
+ELEMENTWISE_FUNCTIONS = ("abs", "min", "max")
+
+Evaluator = Callable[[Dict[str, np.ndarray]], np.ndarray]
+
+
+def _divide(numerator: np.ndarray, denominator: np.ndarray) -> np.ndarray:
+    """Division where zero denominators yield NaN instead of inf"""
+    with np.errstate(divide="ignore", invalid="ignore"):
+        result = np.true_divide(numerator, denominator)
+    return np.where(np.isfinite(result), result, np.nan)
+
+
+def _lag(values: np.ndarray, days: int) -> np.ndarray:
+    result = np.full(values.shape, np.nan)
+    if days < len(values):
+        result[days:] = values[:len(values) - days]
+    return result
+
+
+def _rolling_sum(values: np.ndarray, days: int) -> np.ndarray:
+    """Trailing sum over `days` points; NaN until the window is full or if it holds a gap"""
+    result = np.full(values.shape, np.nan)
+    if days > len(values):
+        return result
+
+    gaps = np.isnan(values)
+    sums = np.concatenate(([0.0], np.cumsum(np.where(gaps, 0.0, values))))
+    gap_counts = np.concatenate(([0], np.cumsum(gaps)))
+
+    window_sums = sums[days:] - sums[:-days]
+    window_gaps = gap_counts[days:] - gap_counts[:-days]
+    result[days - 1:] = np.where(window_gaps == 0, window_sums, np.nan)
+    return result
+
+
+def _window_function(name: str, values: np.ndarray, days: int) -> np.ndarray:
+    if name == "lag":
+        return _lag(values, days)
+    if name == "delta":
+        return values - _lag(values, days)
+    if name == "pct_change":
+        previous = _lag(values, days)
+        return _divide(values - previous, previous) * 100
+    if name == "rolling_sum":
+        return _rolling_sum(values, days)
+    return _rolling_sum(values, days) / days
+
+
+_BINARY_OPERATORS = {
+    ast.Add: np.add,
+    ast.Sub: np.subtract,
+    ast.Mult: np.multiply,
+    ast.Div: _divide,
+    ast.Pow: np.power,
+}
+
+
+@dataclass
+class DerivedFormula:
+    """A compiled formula for one derived metric"""
+    name: str
+    expression: str
+    inputs: Tuple[str, ...]  # Metric names referenced, in order of appearance
+    window: int  # Days of history the expression reaches back
+    evaluate: Evaluator = field(repr=False, compare=False)
+
+
+def compile_formula(name: str, expression: str) -> DerivedFormula:
+    """
+    Compile a formula expression into a vectorized evaluator
+
+    Expressions use metric names, numeric constants, + - * / ** and the
+    functions in WINDOW_FUNCTIONS (e.g. pct_change(mrr, 30)) and
+    ELEMENTWISE_FUNCTIONS. Window lengths are days of daily-aligned history.
+
+    Args:
+        name: Derived metric name
+        expression: Formula expression
+
+    Returns:
+        DerivedFormula
+
+    Raises:
+        ValueError: If the expression is invalid or references no metrics
+    """
+    try:
+        tree = ast.parse(expression, mode="eval")
+    except SyntaxError as e:
+        raise ValueError(f"Invalid formula for {name}: {expression!r} ({e.msg})")
+
+    inputs: List[str] = []
+
+    def build(node: ast.AST) -> Tuple[Evaluator, int]:
+        if isinstance(node, ast.Constant) and isinstance(node.value, (int, float)) \
+                and not isinstance(node.value, bool):
+            constant = float(node.value)
+            return (lambda env: np.float64(constant)), 0
+
+        if isinstance(node, ast.Name):
+            metric = node.id
+            if metric not in inputs:
+                inputs.append(metric)
+            return (lambda env: env[metric]), 0
+
+        if isinstance(node, ast.BinOp) and type(node.op) in _BINARY_OPERATORS:
+            operator = _BINARY_OPERATORS[type(node.op)]
+            left, left_window = build(node.left)
+            right, right_window = build(node.right)
+            return (lambda env: operator(left(env), right(env))), max(left_window, right_window)
+
+        if isinstance(node, ast.UnaryOp) and isinstance(node.op, (ast.USub, ast.UAdd)):
+            operand, window = build(node.operand)
+            if isinstance(node.op, ast.USub):
+                return (lambda env: -operand(env)), window
+            return operand, window
+
+        if isinstance(node, ast.Call) and isinstance(node.func, ast.Name) and not node.keywords:
+            function = node.func.id
+
+            if function in WINDOW_FUNCTIONS:
+                if len(node.args) != 2:
+                    raise ValueError(f"{function}() takes a series and a window in formula for {name}")
+                days_node = node.args[1]
+                if not (isinstance(days_node, ast.Constant) and isinstance(days_node.value, int)
+                        and not isinstance(days_node.value, bool) and days_node.value > 0):
+                    raise ValueError(f"{function}() window must be a positive integer in formula for {name}")
+
+                days = days_node.value
+                series, window = build(node.args[0])
+                reach = days if function in ("lag", "delta", "pct_change") else days - 1
+                return (lambda env: _window_function(function, series(env), days)), window + reach
+
+            if function in ELEMENTWISE_FUNCTIONS:
+                expected = 1 if function == "abs" else 2
+                if len(node.args) != expected:
+                    raise ValueError(f"{function}() takes {expected} argument(s) in formula for {name}")
+                built = [build(arg) for arg in node.args]
+                window = max(w for _, w in built)
+                if function == "abs":
+                    operand = built[0][0]
+                    return (lambda env: np.abs(operand(env))), window
+                left, right = built[0][0], built[1][0]
+                numpy_function = np.fmin if function == "min" else np.fmax
+                return (lambda env: numpy_function(left(env), right(env))), window
+
+            raise ValueError(f"Unknown function {function}() in formula for {name}")
+
+        raise ValueError(f"Unsupported syntax in formula for {name}: {expression!r}")
+
+    evaluate, window = build(tree.body)
+    if not inputs:
+        raise ValueError(f"Formula for {name} references no metrics: {expression!r}")
+
+    return DerivedFormula(
+        name=name,
+        expression=expression,
+        inputs=tuple(inputs),
+        window=window,
+        evaluate=evaluate
+    )
+
+
+def to_day(timestamp: Any) -> np.datetime64:
+    """Calendar day (UTC) of a datetime or ISO timestamp string"""
+    if isinstance(timestamp, str):
+        timestamp = datetime.fromisoformat(timestamp.replace("Z", "+00:00"))
+    if isinstance(timestamp, datetime) and timestamp.tzinfo is not None:
+        timestamp = timestamp.astimezone(timezone.utc).replace(tzinfo=None)
+    return np.datetime64(timestamp, "D")
+
+
+def align_daily(
+    histories: Dict[str, Sequence[Tuple[Any, float]]],
+    start: Optional[Any] = None,
+    end: Optional[Any] = None
+) -> Tuple[np.ndarray, Dict[str, np.ndarray]]:
+    """
+    Align irregular series onto a shared daily index
+
+    Each series contributes its last value per day and is carried forward
+    until its next observation (including from before `start`), so window
+    lengths in formulas are calendar days regardless of sync frequency.
+
+    Args:
+        histories: Map of metric name to (timestamp, value) pairs
+        start: First day of the index (default: earliest observation)
+        end: Last day of the index (default: latest observation)
+
+    Returns:
+        Tuple of (days as datetime64[D], map of name to aligned values)
+    """
+    observed: Dict[str, Tuple[np.ndarray, np.ndarray]] = {}
+    for name, points in histories.items():
+        if not len(points):
+            continue
+        days = np.array([to_day(ts) for ts, _ in points], dtype="datetime64[D]")
+        values = np.array([value for _, value in points], dtype=float)
+
+        order = np.argsort(days, kind="stable")
+        days, values = days[order], values[order]
+        last_of_day = np.append(days[1:] != days[:-1], True)
+        observed[name] = (days[last_of_day], values[last_of_day])
+
+    if start is None or end is None:
+        if not observed:
+            return np.array([], dtype="datetime64[D]"), {name: np.array([]) for name in histories}
+        start = start if start is not None else min(days[0] for days, _ in observed.values())
+        end = end if end is not None else max(days[-1] for days, _ in observed.values())
+
+    index = np.arange(to_day(start), to_day(end) + np.timedelta64(1, "D"), dtype="datetime64[D]")
+    aligned = {}
+    for name in histories:
+        if name not in observed:
+            aligned[name] = np.full(len(index), np.nan)
+            continue
+        days, values = observed[name]
+        positions = np.searchsorted(days, index, side="right") - 1
+        aligned[name] = np.where(positions >= 0, values[np.maximum(positions, 0)], np.nan)
+
+    return index, aligned
+
+
+class DerivedMetricGraph:
+    """
+    Derived metric formulas compiled into a dependency DAG
+
+    Formulas may reference base metrics or other derived metrics. Nodes are
+    evaluated in topological order; incremental evaluation recomputes only
+    the nodes downstream of the metrics that changed, while backfills
+    evaluate every node as one vectorized pass over the full history.
+    """
+
+    def __init__(self, formulas: Dict[str, str]):
+        """
+        Compile formulas into a graph
+
+        Args:
+            formulas: Map of derived metric name to formula expression
+
+        Raises:
+            ValueError: If a formula is invalid or the formulas form a cycle
+        """
+        self.formulas: Dict[str, DerivedFormula] = {
+            name: compile_formula(name, expression) for name, expression in formulas.items()
+        }
+
+        self.dependents: Dict[str, Set[str]] = {}
+        for formula in self.formulas.values():
+            for metric in formula.inputs:
+                self.dependents.setdefault(metric, set()).add(formula.name)
+
+        self.order = self._topological_order()
+
+        # Base metrics read by the graph, in evaluation order
+        self.inputs: List[str] = []
+        for name in self.order:
+            for metric in self.formulas[name].inputs:
+                if metric not in self.formulas and metric not in self.inputs:
+                    self.inputs.append(metric)
+
+        # Days of base history each node needs, including its derived inputs
+        self.lookback: Dict[str, int] = {}
+        for name in self.order:
+            formula = self.formulas[name]
+            upstream = [self.lookback[m] for m in formula.inputs if m in self.formulas]
+            self.lookback[name] = formula.window + max(upstream, default=0)
+
+    def _topological_order(self) -> List[str]:
+        """Kahn's algorithm over derived-to-derived edges"""
+        pending = {
+            name: {m for m in formula.inputs if m in self.formulas}
+            for name, formula in self.formulas.items()
+        }
+        order = []
+        ready = [name for name, deps in pending.items() if not deps]
+        while ready:
+            name = ready.pop(0)
+            order.append(name)
+            for dependent in sorted(self.dependents.get(name, ())):
+                deps = pending[dependent]
+                deps.discard(name)
+                if not deps and dependent not in order and dependent not in ready:
+                    ready.append(dependent)
+
+        if len(order) < len(self.formulas):
+            cyclic = sorted(set(self.formulas) - set(order))
+            raise ValueError(f"Derived metric formulas contain a cycle: {', '.join(cyclic)}")
+        return order
+
+    def affected(self, changed: Iterable[str]) -> List[str]:
+        """
+        Derived metrics downstream of changed metrics
+
+        Args:
+            changed: Names of metrics whose values changed
+
+        Returns:
+            Affected derived metric names in evaluation order
+        """
+        affected: Set[str] = set()
+        frontier = list(changed)
+        while frontier:
+            for dependent in self.dependents.get(frontier.pop(), ()):
+                if dependent not in affected:
+                    affected.add(dependent)
+                    frontier.append(dependent)
+        return [name for name in self.order if name in affected]
+
+    def _closure(self, names: Iterable[str]) -> Set[str]:
+        """Derived metrics needed to evaluate names (names plus derived ancestors)"""
+        closure: Set[str] = set()
+        frontier = [name for name in names if name in self.formulas]
+        while frontier:
+            name = frontier.pop()
+            if name in closure:
+                continue
+            closure.add(name)
+            frontier.extend(m for m in self.formulas[name].inputs if m in self.formulas)
+        return closure
+
+    def required_inputs(self, names: Iterable[str]) -> List[str]:
+        """Base metrics needed to evaluate the given derived metrics"""
+        closure = self._closure(names)
+        needed = {m for name in closure for m in self.formulas[name].inputs}
+        return [metric for metric in self.inputs if metric in needed]
+
+    def evaluate(
+        self,
+        series: Dict[str, np.ndarray],
+        names: Optional[Iterable[str]] = None
+    ) -> Dict[str, np.ndarray]:
+        """
+        Evaluate derived metrics over aligned input arrays
+
+        Args:
+            series: Map of base metric name to values on a shared index
+            names: Derived metrics to return (default: all)
+
+        Returns:
+            Map of derived metric name to values (NaN where undefined)
+        """
+        names = list(self.order if names is None else names)
+        if not series:
+            return {}
+
+        length = len(next(iter(series.values())))
+        env = dict(series)
+        for metric in self.inputs:
+            env.setdefault(metric, np.full(length, np.nan))
+
+        closure = self._closure(names)
+        for name in self.order:
+            if name in closure:
+                values = self.formulas[name].evaluate(env)
+                env[name] = np.broadcast_to(np.asarray(values, dtype=float), (length,))
+
+        return {name: env[name] for name in names if name in self.formulas}
+
+    def evaluate_history(
+        self,
+        histories: Dict[str, Sequence[Tuple[Any, float]]],
+        names: Optional[Iterable[str]] = None,
+        start: Optional[Any] = None,
+        end: Optional[Any] = None
+    ) -> Tuple[np.ndarray, Dict[str, np.ndarray]]:
+        """
+        Evaluate derived metrics for every day of the input history
+
+        Args:
+            histories: Map of base metric name to (timestamp, value) pairs
+            names: Derived metrics to return (default: all)
+            start: First day to evaluate (default: earliest observation)
+            end: Last day to evaluate (default: latest observation)
+
+        Returns:
+            Tuple of (days, map of derived metric name to daily values)
+        """
+        names = list(self.order if names is None else names)
+        inputs = {metric: histories.get(metric, []) for metric in self.required_inputs(names)}
+        days, aligned = align_daily(inputs, start, end)
+        return days, self.evaluate(aligned, names)
+
+    def evaluate_latest(
+        self,
+        histories: Dict[str, Sequence[Tuple[Any, float]]],
+        changed: Iterable[str],
+        at: Any
+    ) -> Dict[str, float]:
+        """
+        Recompute only the derived metrics affected by changed inputs
+
+        Evaluates over the trailing window the affected nodes need, ending
+        on the day of `at`.
+
+        Args:
+            histories: Map of base metric name to (timestamp, value) pairs,
+                including the changed values
+            changed: Names of metrics whose values changed
+            at: Timestamp of the change
+
+        Returns:
+            Map of affected derived metric name to its value (undefined values omitted)
+        """
+        targets = self.affected(changed)
+        if not targets:
+            return {}
+
+        end = to_day(at)
+        start = end - np.timedelta64(max(self.lookback[name] for name in targets), "D")
+        _, values = self.evaluate_history(histories, targets, start, end)
+
+        return {
+            name: float(values[name][-1])
+            for name in targets
+            if np.isfinite(values[name][-1])
+        }
+
+
+@lru_cache(maxsize=256)
+def _compile_graph(formulas: Tuple[Tuple[str, str], ...]) -> DerivedMetricGraph:
+    return DerivedMetricGraph(dict(formulas))
+
+
+def get_derived_metric_graph(formulas: Dict[str, str]) -> DerivedMetricGraph:
+    """
+    Compiled graph for a set of formulas, reused across calls
+
+    Args:
+        formulas: Map of derived metric name to formula expression
+
+    Returns:
+        DerivedMetricGraph
+    """
+    return _compile_graph(tuple(sorted(formulas.items())))
@@ -0,0 +1,174 @@
+"""
+Flat Index
+Exact cosine nearest neighbour search over one NumPy matrix
+"""
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+
+class FlatIndex:
+    """
+    Brute-force cosine index with the same interface as HNSWIndex
+
+    Vectors are normalized and stored as rows of one matrix, so a search
+    is a single matrix-vector product and building from n rows is one
+    vectorized pass instead of n graph inserts. For the few thousand rows
+    of a cached workspace this is both faster to build and exact.
+
+    Removing a key moves the last row into its slot, so the matrix never
+    holds removed entries and compact() has nothing to do.
+    """
+
+    def __init__(self, dimension: int, dtype: str = "float32", capacity: int = 1024):
+        """
+        Initialize an empty index
+
+        Args:
+            dimension: Vector length
+            dtype: Storage type, float32 or float16
+            capacity: Initial number of rows
+        """
+        if dtype not in ("float32", "float16"):
+            raise ValueError("dtype must be float32 or float16")
+
+        self.dimension = dimension
+        self.dtype = dtype
+        self._vectors = np.zeros((capacity, dimension), dtype=dtype)
+        self._keys: List[str] = []
+        self._slots: Dict[str, int] = {}
+
+    def __len__(self) -> int:
+        return len(self._keys)
+
+    def __contains__(self, key: str) -> bool:
+        return key in self._slots
+
+    @property
+    def deleted_count(self) -> int:
+        """Removed entries still stored (always 0)"""
+        return 0
+
+    def add(self, key: str, vector: Sequence[float]) -> None:
+        """
+        Insert or replace a vector
+
+        Args:
+            key: Item key
+            vector: Vector of length dimension
+        """
+        self.add_many([key], [vector])
+
+    def add_many(self, keys: Sequence[str], vectors: Iterable[Sequence[float]]) -> None:
+        """
+        Insert or replace many vectors in one pass
+
+        Args:
+            keys: Item keys
+            vectors: Vectors of length dimension, one per key
+        """
+        keys = list(keys)
+        if not keys:
+            return
+        matrix = self._normalize(vectors)
+        if len(matrix) != len(keys):
+            raise ValueError(f"Got {len(keys)} keys for {len(matrix)} vectors")
+
+        # Later duplicates of a key win, as with repeated add()
+        rows = {key: row for row, key in enumerate(keys)}
+        new_keys = [key for key in rows if key not in self._slots]
+        if len(self._keys) + len(new_keys) > len(self._vectors):
+            self._grow(max(2 * len(self._vectors), len(self._keys) + len(new_keys)))
+
+        for key in new_keys:
+            self._slots[key] = len(self._keys)
+            self._keys.append(key)
+        slots = [self._slots[key] for key in rows]
+        self._vectors[slots] = matrix[list(rows.values())]
+
+    def remove(self, key: str) -> bool:
+        """
+        Remove a key
+
+        Args:
+            key: Item key
+
+        Returns:
+            True if the key was present
+        """
+        slot = self._slots.pop(key, None)
+        if slot is None:
+            return False
+
+        last = len(self._keys) - 1
+        if slot != last:
+            moved = self._keys[last]
+            self._vectors[slot] = self._vectors[last]
+            self._keys[slot] = moved
+            self._slots[moved] = slot
+        self._keys.pop()
+        return True
+
+    def changed(self, keys: Sequence[str], vectors: Iterable[Sequence[float]]) -> List[bool]:
+        """
+        Which of the given vectors are new or differ from the stored ones
+
+        Args:
+            keys: Item keys
+            vectors: Vectors, one per key
+
+        Returns:
+            One flag per key
+        """
+        keys = list(keys)
+        if not keys:
+            return []
+        matrix = self._normalize(vectors).astype(self.dtype)
+        slots = np.array([self._slots.get(key, -1) for key in keys])
+        flags = slots < 0
+        known = ~flags
+        if known.any():
+            flags[known] = (self._vectors[slots[known]] != matrix[known]).any(axis=1)
+        return flags.tolist()
+
+    def search(self, vector: Sequence[float], k: int = 10, ef: Optional[int] = None) -> List[Tuple[str, float]]:
+        """
+        Find the nearest keys by cosine similarity
+
+        Args:
+            vector: Query vector
+            k: Number of results
+            ef: Ignored; accepted for HNSWIndex compatibility
+
+        Returns:
+            (key, similarity) pairs, most similar first
+        """
+        count = len(self._keys)
+        if not count or k <= 0:
+            return []
+
+        query = self._normalize([vector])[0]
+        similarities = self._vectors[:count].astype(np.float32, copy=False) @ query
+        if k < count:
+            top = np.argpartition(-similarities, k - 1)[:k]
+        else:
+            top = np.arange(count)
+        top = top[np.argsort(-similarities[top])]
+        return [(self._keys[slot], float(similarities[slot])) for slot in top]
+
+    def compact(self) -> "FlatIndex":
+        """Nothing to rebuild; returns the index itself"""
+        return self
+
+    def _normalize(self, vectors: Iterable[Sequence[float]]) -> np.ndarray:
+        """Unit-length float32 copies of row vectors"""
+        matrix = np.asarray(vectors if isinstance(vectors, np.ndarray) else list(vectors), dtype=np.float32)
+        if matrix.ndim != 2 or matrix.shape[1] != self.dimension:
+            raise ValueError(f"Expected vectors of dimension {self.dimension}, got {matrix.shape}")
+        norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+        return matrix / np.where(norms > 0, norms, 1.0)
+
+    def _grow(self, capacity: int) -> None:
+        grown = np.zeros((capacity, self.dimension), dtype=self.dtype)
+        grown[:len(self._keys)] = self._vectors[:len(self._keys)]
+        self._vectors = grown
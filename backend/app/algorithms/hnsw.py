@@ -0,0 +1,371 @@
+"""
+HNSW Index
+Hierarchical navigable small world graph for approximate nearest neighbour search
+"""
+import heapq
+import json
+import math
+import os
+import random
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+
+class HNSWIndex:
+    """
+    Approximate cosine nearest neighbour index over NumPy arrays
+
+    Vectors are normalized on insert and stored in one float32 or float16
+    array; layer 0 links live in a fixed-width int32 array and the sparse
+    upper layers in dictionaries. Searches descend greedily through the
+    upper layers and run a best-first search of width ef on layer 0.
+
+    Keys can be re-added (replacing the vector) and removed; removed
+    nodes stay in the graph as routing points but are never returned,
+    and compact() rebuilds the graph without them.
+
+    save() writes plain .npy files, and load() memory-maps them
+    copy-on-write, so opening a large index reads only the pages a
+    search touches.
+    """
+
+    VECTORS_FILE = "vectors.npy"
+    LINKS_FILE = "links0.npy"
+    LEVELS_FILE = "levels.npy"
+    DELETED_FILE = "deleted.npy"
+    META_FILE = "meta.json"
+
+    def __init__(
+        self,
+        dimension: int,
+        m: int = 16,
+        ef_construction: int = 100,
+        ef_search: int = 64,
+        dtype: str = "float32",
+        capacity: int = 1024,
+        seed: int = 20251114
+    ):
+        """
+        Initialize an empty index
+
+        Args:
+            dimension: Vector length
+            m: Links per node on upper layers (2m on layer 0)
+            ef_construction: Search width while inserting
+            ef_search: Default search width while querying
+            dtype: Storage type, float32 or float16
+            capacity: Initial number of slots
+            seed: Seed for level assignment
+        """
+        if dtype not in ("float32", "float16"):
+            raise ValueError("dtype must be float32 or float16")
+
+        self.dimension = dimension
+        self.m = m
+        self.m0 = 2 * m
+        self.ef_construction = ef_construction
+        self.ef_search = ef_search
+        self.dtype = dtype
+        self._level_mult = 1 / math.log(m)
+        self._rng = random.Random(seed)
+
+        self._vectors = np.zeros((capacity, dimension), dtype=dtype)
+        self._links0 = np.full((capacity, self.m0), -1, dtype=np.int32)
+        self._levels = np.zeros(capacity, dtype=np.int8)
+        self._deleted = np.zeros(capacity, dtype=bool)
+        self._upper: List[Dict[int, List[int]]] = []
+        self._keys: List[Optional[str]] = []
+        self._slots: Dict[str, int] = {}
+        self._entry = -1
+        self._max_level = -1
+
+    def __len__(self) -> int:
+        return len(self._slots)
+
+    def __contains__(self, key: str) -> bool:
+        return key in self._slots
+
+    @property
+    def deleted_count(self) -> int:
+        """Removed nodes still present in the graph"""
+        return len(self._keys) - len(self._slots)
+
+    def add(self, key: str, vector: Sequence[float]) -> None:
+        """
+        Insert or replace a vector
+
+        Args:
+            key: Item key
+            vector: Vector of length dimension
+        """
+        query = self._normalize(vector)
+        if key in self._slots:
+            self.remove(key)
+
+        slot = len(self._keys)
+        if slot >= len(self._vectors):
+            self._grow(2 * len(self._vectors))
+
+        level = int(-math.log(1.0 - self._rng.random()) * self._level_mult)
+        self._vectors[slot] = query
+        self._levels[slot] = level
+        self._keys.append(key)
+        self._slots[key] = slot
+        while len(self._upper) < level:
+            self._upper.append({})
+
+        if self._entry < 0:
+            self._entry, self._max_level = slot, level
+            return
+
+        entry = [self._entry]
+        for layer in range(self._max_level, level, -1):
+            entry = [self._search_layer(query, entry, 1, layer)[0][1]]
+
+        for layer in range(min(level, self._max_level), -1, -1):
+            found = self._search_layer(query, entry, self.ef_construction, layer)
+            neighbours = self._select(found, self.m)
+            self._set_links(slot, layer, neighbours)
+
+            max_links = self.m0 if layer == 0 else self.m
+            for neighbour in neighbours:
+                links = self._links(neighbour, layer) + [slot]
+                if len(links) > max_links:
+                    distances = self._distances(self._vector(neighbour), links)
+                    links = self._select(sorted(zip(distances.tolist(), links)), max_links)
+                self._set_links(neighbour, layer, links)
+            entry = [node for _, node in found]
+
+        if level > self._max_level:
+            self._entry, self._max_level = slot, level
+
+    def remove(self, key: str) -> bool:
+        """
+        Remove a key
+
+        Args:
+            key: Item key
+
+        Returns:
+            True if the key was present
+        """
+        slot = self._slots.pop(key, None)
+        if slot is None:
+            return False
+        self._deleted[slot] = True
+        return True
+
+    def search(self, vector: Sequence[float], k: int = 10, ef: Optional[int] = None) -> List[Tuple[str, float]]:
+        """
+        Find the nearest keys by cosine similarity
+
+        Args:
+            vector: Query vector
+            k: Number of results
+            ef: Search width (default: ef_search); larger is slower and more accurate
+
+        Returns:
+            (key, similarity) pairs, most similar first
+        """
+        if not self._slots:
+            return []
+
+        query = self._normalize(vector)
+        ef = max(ef or self.ef_search, k)
+        # Removed nodes take up search width, so widen it by the share they hold
+        ef = int(ef * len(self._keys) / len(self._slots))
+
+        entry = [self._entry]
+        for layer in range(self._max_level, 0, -1):
+            entry = [self._search_layer(query, entry, 1, layer)[0][1]]
+
+        results = []
+        for distance, node in self._search_layer(query, entry, ef, 0):
+            if not self._deleted[node]:
+                results.append((self._keys[node], 1.0 - distance))
+                if len(results) == k:
+                    break
+        return results
+
+    def compact(self) -> "HNSWIndex":
+        """
+        Rebuild the graph without removed nodes
+
+        Returns:
+            New index with the same parameters and live items
+        """
+        index = HNSWIndex(
+            self.dimension,
+            m=self.m,
+            ef_construction=self.ef_construction,
+            ef_search=self.ef_search,
+            dtype=self.dtype,
+            capacity=max(len(self._slots), 16)
+        )
+        for key, slot in self._slots.items():
+            index.add(key, self._vector(slot))
+        return index
+
+    def save(self, path: str) -> None:
+        """
+        Write the index to a directory
+
+        Args:
+            path: Directory to write (created if missing)
+        """
+        os.makedirs(path, exist_ok=True)
+        count = len(self._keys)
+        arrays = {
+            self.VECTORS_FILE: self._vectors[:count],
+            self.LINKS_FILE: self._links0[:count],
+            self.LEVELS_FILE: self._levels[:count],
+            self.DELETED_FILE: self._deleted[:count],
+        }
+        for name, array in arrays.items():
+            temporary = os.path.join(path, f".{name}")
+            with open(temporary, "wb") as f:
+                np.save(f, np.ascontiguousarray(array))
+            os.replace(temporary, os.path.join(path, name))
+
+        meta = {
+            "dimension": self.dimension,
+            "m": self.m,
+            "ef_construction": self.ef_construction,
+            "ef_search": self.ef_search,
+            "dtype": self.dtype,
+            "entry": self._entry,
+            "max_level": self._max_level,
+            "keys": self._keys,
+            "upper": [{str(node): links for node, links in layer.items()} for layer in self._upper],
+        }
+        temporary = os.path.join(path, f".{self.META_FILE}")
+        with open(temporary, "w") as f:
+            json.dump(meta, f)
+        os.replace(temporary, os.path.join(path, self.META_FILE))
+
+    @classmethod
+    def load(cls, path: str, mmap: bool = True) -> "HNSWIndex":
+        """
+        Open an index written by save()
+
+        Args:
+            path: Index directory
+            mmap: Map arrays copy-on-write instead of reading them into memory
+
+        Returns:
+            HNSWIndex
+        """
+        with open(os.path.join(path, cls.META_FILE)) as f:
+            meta = json.load(f)
+
+        index = cls(
+            meta["dimension"],
+            m=meta["m"],
+            ef_construction=meta["ef_construction"],
+            ef_search=meta["ef_search"],
+            dtype=meta["dtype"],
+            capacity=1
+        )
+        mode = "c" if mmap else None
+        index._vectors = np.load(os.path.join(path, cls.VECTORS_FILE), mmap_mode=mode)
+        index._links0 = np.load(os.path.join(path, cls.LINKS_FILE), mmap_mode=mode)
+        index._levels = np.load(os.path.join(path, cls.LEVELS_FILE), mmap_mode=mode)
+        index._deleted = np.load(os.path.join(path, cls.DELETED_FILE), mmap_mode=mode)
+        index._upper = [{int(node): links for node, links in layer.items()} for layer in meta["upper"]]
+        index._keys = meta["keys"]
+        index._slots = {key: slot for slot, key in enumerate(index._keys) if not index._deleted[slot]}
+        index._entry = meta["entry"]
+        index._max_level = meta["max_level"]
+        return index
+
+    def _normalize(self, vector: Sequence[float]) -> np.ndarray:
+        """Unit-length float32 copy of a vector"""
+        array = np.asarray(vector, dtype=np.float32)
+        if array.shape != (self.dimension,):
+            raise ValueError(f"Expected vector of dimension {self.dimension}, got {array.shape}")
+        norm = np.linalg.norm(array)
+        return array / norm if norm > 0 else array
+
+    def _vector(self, node: int) -> np.ndarray:
+        return self._vectors[node].astype(np.float32)
+
+    def _distances(self, query: np.ndarray, nodes: List[int]) -> np.ndarray:
+        """Cosine distances from the query to nodes"""
+        return 1.0 - self._vectors[nodes].astype(np.float32) @ query
+
+    def _links(self, node: int, layer: int) -> List[int]:
+        if layer == 0:
+            row = self._links0[node]
+            return row[row >= 0].tolist()
+        return list(self._upper[layer - 1].get(node, ()))
+
+    def _set_links(self, node: int, layer: int, links: List[int]) -> None:
+        if layer == 0:
+            self._links0[node] = -1
+            self._links0[node, :len(links)] = links
+        else:
+            self._upper[layer - 1][node] = list(links)
+
+    def _search_layer(self, query: np.ndarray, entry: List[int], ef: int, layer: int) -> List[Tuple[float, int]]:
+        """Best-first search of one layer; returns (distance, node) pairs, nearest first"""
+        visited = set(entry)
+        distances = self._distances(query, entry).tolist()
+        candidates = list(zip(distances, entry))
+        heapq.heapify(candidates)
+        nearest = [(-distance, node) for distance, node in candidates]
+        heapq.heapify(nearest)
+        while len(nearest) > ef:
+            heapq.heappop(nearest)
+
+        while candidates:
+            distance, node = heapq.heappop(candidates)
+            if distance > -nearest[0][0] and len(nearest) >= ef:
+                break
+
+            unseen = [n for n in self._links(node, layer) if n not in visited]
+            if not unseen:
+                continue
+            visited.update(unseen)
+
+            for neighbour_distance, neighbour in zip(self._distances(query, unseen).tolist(), unseen):
+                if len(nearest) < ef or neighbour_distance < -nearest[0][0]:
+                    heapq.heappush(candidates, (neighbour_distance, neighbour))
+                    heapq.heappush(nearest, (-neighbour_distance, neighbour))
+                    if len(nearest) > ef:
+                        heapq.heappop(nearest)
+
+        return sorted((-distance, node) for distance, node in nearest)
+
+    def _select(self, candidates: List[Tuple[float, int]], m: int) -> List[int]:
+        """
+        Pick up to m links, preferring candidates not already covered by a closer pick
+
+        Skipping candidates nearer to a chosen link than to the node keeps
+        links pointing in different directions, which keeps clustered data
+        connected; skipped candidates fill any remaining slots.
+        """
+        selected: List[int] = []
+        skipped: List[int] = []
+        for distance, node in candidates:
+            if len(selected) >= m:
+                break
+            if selected and (self._distances(self._vector(node), selected) < distance).any():
+                skipped.append(node)
+            else:
+                selected.append(node)
+        return selected + skipped[:m - len(selected)]
+
+    def _grow(self, capacity: int) -> None:
+        """Enlarge storage (copies memory-mapped arrays into memory)"""
+        count = len(self._keys)
+
+        def grown(array: np.ndarray, fill) -> np.ndarray:
+            result = np.full((capacity,) + array.shape[1:], fill, dtype=array.dtype)
+            result[:count] = array[:count]
+            return result
+
+        self._vectors = grown(self._vectors, 0)
+        self._links0 = grown(self._links0, -1)
+        self._levels = grown(self._levels, 0)
+        self._deleted = grown(self._deleted, False)
@@ -0,0 +1,245 @@
+"""
+Near-Duplicate Detection
+MinHash signatures and LSH banding for finding similar short texts in near-linear time
+"""
+import hashlib
+import re
+import zlib
+from dataclasses import dataclass
+from typing import Dict, FrozenSet, Hashable, Iterable, List, Optional, Sequence, Set, Tuple
+
+import numpy as np
+
+
+TOKEN_PATTERN = re.compile(r"[\w']+")
+
+# Signatures are persisted, so these must not change without re-signing stored rows
+NUM_PERM = 64
+NUM_BANDS = 16
+MINHASH_SEED = 20251114
+MERSENNE_PRIME = (1 << 31) - 1
+
+
+def tokenize(text: str) -> FrozenSet[str]:
+    """Lowercased word set of a text (punctuation dropped)"""
+    return frozenset(TOKEN_PATTERN.findall(text.lower())) if text else frozenset()
+
+
+def jaccard(tokens1: FrozenSet[str], tokens2: FrozenSet[str]) -> float:
+    """Exact Jaccard similarity of two token sets (0.0 if either is empty)"""
+    if not tokens1 or not tokens2:
+        return 0.0
+    return len(tokens1 & tokens2) / len(tokens1 | tokens2)
+
+
+@dataclass(frozen=True)
+class Fingerprint:
+    """
+    MinHash signature of one text
+
+    tokens is kept for texts hashed in this process, so their similarity
+    is computed exactly; fingerprints rebuilt from stored signatures have
+    tokens None and are compared by signature agreement.
+    """
+    signature: Tuple[int, ...]
+    tokens: Optional[FrozenSet[str]] = None
+
+    @property
+    def empty(self) -> bool:
+        """Whether the text had no tokens (never a duplicate of anything)"""
+        return self.tokens is not None and not self.tokens
+
+    def similarity(self, other: "Fingerprint") -> float:
+        """
+        Jaccard similarity, exact when both token sets are known
+
+        Args:
+            other: Fingerprint to compare with
+
+        Returns:
+            Similarity in [0, 1]
+        """
+        if self.empty or other.empty:
+            return 0.0
+        if self.tokens is not None and other.tokens is not None:
+            return jaccard(self.tokens, other.tokens)
+        if len(self.signature) != len(other.signature):
+            return 0.0
+        return float(np.mean(np.asarray(self.signature) == np.asarray(other.signature)))
+
+
+class MinHasher:
+    """
+    MinHash over word sets
+
+    Each token is hashed once with CRC32 (stable across processes) and
+    pushed through num_perm universal hash functions (a*x + b) mod p; the
+    signature is the per-function minimum. The fraction of equal positions
+    in two signatures estimates the Jaccard similarity of the word sets.
+    """
+
+    def __init__(self, num_perm: int = NUM_PERM, seed: int = MINHASH_SEED):
+        """
+        Initialize hasher
+
+        Args:
+            num_perm: Number of hash functions (signature length)
+            seed: Seed for the hash function coefficients
+        """
+        self.num_perm = num_perm
+        rng = np.random.RandomState(seed)
+        self._a = rng.randint(1, MERSENNE_PRIME, size=num_perm, dtype=np.int64).astype(np.uint64)
+        self._b = rng.randint(0, MERSENNE_PRIME, size=num_perm, dtype=np.int64).astype(np.uint64)
+
+    def fingerprint(self, text: str) -> Fingerprint:
+        """
+        Tokenize and sign a text
+
+        Args:
+            text: Text to fingerprint
+
+        Returns:
+            Fingerprint with signature and token set
+        """
+        tokens = tokenize(text)
+        return Fingerprint(self.signature(tokens), tokens)
+
+    def signature(self, tokens: Iterable[str]) -> Tuple[int, ...]:
+        """
+        MinHash signature of a token set
+
+        Args:
+            tokens: Tokens to sign
+
+        Returns:
+            num_perm values below 2^31 (fit a Postgres integer column)
+        """
+        hashes = np.fromiter(
+            (zlib.crc32(token.encode("utf-8")) for token in tokens),
+            dtype=np.uint64
+        )
+        if hashes.size == 0:
+            return tuple([MERSENNE_PRIME] * self.num_perm)
+
+        # a < 2^31 and crc < 2^32, so a*x + b stays within uint64
+        values = (self._a[:, None] * hashes[None, :] + self._b[:, None]) % np.uint64(MERSENNE_PRIME)
+        return tuple(int(value) for value in values.min(axis=1))
+
+
+class NearDuplicateIndex:
+    """
+    LSH index answering "which stored text is more than threshold similar to this one"
+
+    Signatures are cut into bands of equal rows; texts sharing any band
+    hash become candidates and only candidates are compared, so adding and
+    querying n texts costs about O(n) instead of O(n²) pairwise checks. With
+    64 hash functions in 16 bands of 4 rows, pairs at 0.8 similarity
+    collide with probability above 0.999 and pairs below 0.3 rarely do.
+    Band keys are strings so they can be stored in a text[] column and
+    looked up with an array overlap query.
+    """
+
+    def __init__(
+        self,
+        threshold: float = 0.8,
+        num_bands: int = NUM_BANDS,
+        hasher: Optional[MinHasher] = None
+    ):
+        """
+        Initialize index
+
+        Args:
+            threshold: Similarity a match must exceed
+            num_bands: Number of LSH bands (must divide the signature length)
+            hasher: MinHasher (default parameters if None)
+        """
+        self.hasher = hasher or MinHasher()
+        if self.hasher.num_perm % num_bands:
+            raise ValueError(f"{num_bands} bands do not divide {self.hasher.num_perm} hash functions")
+
+        self.threshold = threshold
+        self.num_bands = num_bands
+        self.rows = self.hasher.num_perm // num_bands
+        self._buckets: Dict[str, List[Hashable]] = {}
+        self._items: Dict[Hashable, Fingerprint] = {}
+
+    def __len__(self) -> int:
+        return len(self._items)
+
+    def fingerprint(self, text: str) -> Fingerprint:
+        """Fingerprint a text with this index's hasher"""
+        return self.hasher.fingerprint(text)
+
+    def band_keys(self, signature: Sequence[int]) -> List[str]:
+        """
+        Bucket keys of a signature, one per band
+
+        Args:
+            signature: MinHash signature
+
+        Returns:
+            Keys of the form "<band>:<hash of the band's rows>"
+        """
+        values = np.asarray(signature, dtype="<i4")
+        keys = []
+        for band in range(self.num_bands):
+            rows = values[band * self.rows:(band + 1) * self.rows]
+            keys.append(f"{band}:{hashlib.blake2b(rows.tobytes(), digest_size=8).hexdigest()}")
+        return keys
+
+    def add(self, key: Hashable, fingerprint: Fingerprint) -> None:
+        """
+        Store a fingerprint under a key
+
+        Args:
+            key: Caller's identifier for the text
+            fingerprint: Fingerprint of the text
+        """
+        self._items[key] = fingerprint
+        if fingerprint.empty:
+            return
+        for band_key in self.band_keys(fingerprint.signature):
+            self._buckets.setdefault(band_key, []).append(key)
+
+    def candidates(self, fingerprint: Fingerprint) -> Set[Hashable]:
+        """Keys sharing at least one band with the fingerprint"""
+        if fingerprint.empty:
+            return set()
+        found: Set[Hashable] = set()
+        for band_key in self.band_keys(fingerprint.signature):
+            found.update(self._buckets.get(band_key, ()))
+        return found
+
+    def find(self, fingerprint: Fingerprint) -> Optional[Tuple[Hashable, float]]:
+        """
+        Most similar stored text above the threshold
+
+        Args:
+            fingerprint: Fingerprint to look up
+
+        Returns:
+            (key, similarity) of the best match, or None
+        """
+        best: Optional[Tuple[Hashable, float]] = None
+        for key in self.candidates(fingerprint):
+            similarity = fingerprint.similarity(self._items[key])
+            if similarity > self.threshold and (best is None or similarity > best[1]):
+                best = (key, similarity)
+        return best
+
+    def add_unique(self, key: Hashable, fingerprint: Fingerprint) -> Optional[Hashable]:
+        """
+        Store a fingerprint unless it duplicates one already stored
+
+        Args:
+            key: Caller's identifier for the text
+            fingerprint: Fingerprint of the text
+
+        Returns:
+            Key of the stored duplicate, or None if the fingerprint was added
+        """
+        match = self.find(fingerprint)
+        if match:
+            return match[0]
+        self.add(key, fingerprint)
+        return None
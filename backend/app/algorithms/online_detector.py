@@ -0,0 +1,466 @@
+"""
+Online (Streaming) Anomaly Detection
+Incremental, bounded-memory detection for KPI series scored one point at a time
+"""
+import logging
+import math
+from dataclasses import dataclass, field
+from typing import List, Dict, Any, Optional
+from datetime import datetime
+
+from app.models.anomaly import AnomalyType, DetectionMethod
+from app.algorithms.zscore_detector import ZScoreDetector
+from app.algorithms.iqr_detector import IQRDetector
+from app.algorithms.change_point import ChangePointState
+
+
+logger = logging.getLogger(__name__)
+
+
+class RunningStats:
+    """
+    Running mean and variance using Welford's algorithm
+
+    Numerically stable, O(1) per update and mergeable across partitions
+    (Chan et al. parallel variance).
+    """
+
+    def __init__(self, count: int = 0, mean: float = 0.0, m2: float = 0.0):
+        self.count = count
+        self.mean = mean
+        self.m2 = m2
+
+    def update(self, value: float) -> None:
+        """Add a single observation"""
+        self.count += 1
+        delta = value - self.mean
+        self.mean += delta / self.count
+        self.m2 += delta * (value - self.mean)
+
+    def merge(self, other: "RunningStats") -> "RunningStats":
+        """Merge another accumulator into this one"""
+        if other.count == 0:
+            return self
+        if self.count == 0:
+            self.count, self.mean, self.m2 = other.count, other.mean, other.m2
+            return self
+
+        total = self.count + other.count
+        delta = other.mean - self.mean
+        self.mean += delta * other.count / total
+        self.m2 += other.m2 + delta * delta * self.count * other.count / total
+        self.count = total
+        return self
+
+    @property
+    def variance(self) -> float:
+        """Population variance (matches np.var default)"""
+        return self.m2 / self.count if self.count > 0 else 0.0
+
+    @property
+    def std(self) -> float:
+        """Population standard deviation (matches np.std default)"""
+        return math.sqrt(max(self.variance, 0.0))
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {"count": self.count, "mean": self.mean, "m2": self.m2}
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "RunningStats":
+        return cls(
+            count=int(data.get("count", 0)),
+            mean=float(data.get("mean", 0.0)),
+            m2=float(data.get("m2", 0.0))
+        )
+
+
+class QuantileSketch:
+    """
+    Mergeable quantile sketch with relative-error guarantees (DDSketch style)
+
+    Values are mapped to logarithmically spaced buckets so any quantile is
+    returned within `relative_accuracy` of the true value. Memory is bounded
+    by `max_bins`; when exceeded, the lowest-magnitude buckets are collapsed.
+    Negative values and zeros are tracked in separate stores.
+    """
+
+    def __init__(self, relative_accuracy: float = 0.01, max_bins: int = 2048):
+        if not 0 < relative_accuracy < 1:
+            raise ValueError("relative_accuracy must be between 0 and 1")
+
+        self.relative_accuracy = relative_accuracy
+        self.max_bins = max_bins
+        self.gamma = (1 + relative_accuracy) / (1 - relative_accuracy)
+        self._log_gamma = math.log(self.gamma)
+
+        self.positive: Dict[int, int] = {}
+        self.negative: Dict[int, int] = {}
+        self.zero_count = 0
+        self.count = 0
+        self.min: Optional[float] = None
+        self.max: Optional[float] = None
+
+    def _key(self, magnitude: float) -> int:
+        return int(math.ceil(math.log(magnitude) / self._log_gamma))
+
+    def _value(self, key: int) -> float:
+        # Midpoint of bucket (gamma^(k-1), gamma^k] in relative terms
+        return 2 * self.gamma ** key / (1 + self.gamma)
+
+    def add(self, value: float) -> None:
+        """Add a single observation"""
+        if value > 0:
+            key = self._key(value)
+            self.positive[key] = self.positive.get(key, 0) + 1
+        elif value < 0:
+            key = self._key(-value)
+            self.negative[key] = self.negative.get(key, 0) + 1
+        else:
+            self.zero_count += 1
+
+        self.count += 1
+        self.min = value if self.min is None else min(self.min, value)
+        self.max = value if self.max is None else max(self.max, value)
+
+        self._collapse(self.positive)
+        self._collapse(self.negative)
+
+    def _collapse(self, store: Dict[int, int]) -> None:
+        """Fold the smallest-magnitude buckets together to bound memory"""
+        if len(store) <= self.max_bins:
+            return
+
+        keys = sorted(store)
+        overflow = len(keys) - self.max_bins
+        target = keys[overflow]
+        for key in keys[:overflow]:
+            store[target] += store.pop(key)
+
+    def quantile(self, q: float) -> Optional[float]:
+        """
+        Estimate the q-th quantile
+
+        Args:
+            q: Quantile in [0, 1]
+
+        Returns:
+            Estimated value, or None if the sketch is empty
+        """
+        if self.count == 0:
+            return None
+        if q <= 0:
+            return self.min
+        if q >= 1:
+            return self.max
+
+        rank = q * (self.count - 1)
+        seen = 0
+
+        # Walk from most negative to most positive
+        for key in sorted(self.negative, reverse=True):
+            seen += self.negative[key]
+            if seen > rank:
+                return self._clamp(-self._value(key))
+
+        seen += self.zero_count
+        if seen > rank:
+            return 0.0
+
+        for key in sorted(self.positive):
+            seen += self.positive[key]
+            if seen > rank:
+                return self._clamp(self._value(key))
+
+        return self.max
+
+    def _clamp(self, value: float) -> float:
+        return min(max(value, self.min), self.max)
+
+    def merge(self, other: "QuantileSketch") -> "QuantileSketch":
+        """Merge another sketch with the same accuracy into this one"""
+        if other.relative_accuracy != self.relative_accuracy:
+            raise ValueError("Cannot merge sketches with different relative accuracy")
+
+        for key, count in other.positive.items():
+            self.positive[key] = self.positive.get(key, 0) + count
+        for key, count in other.negative.items():
+            self.negative[key] = self.negative.get(key, 0) + count
+
+        self.zero_count += other.zero_count
+        self.count += other.count
+        if other.min is not None:
+            self.min = other.min if self.min is None else min(self.min, other.min)
+            self.max = other.max if self.max is None else max(self.max, other.max)
+
+        self._collapse(self.positive)
+        self._collapse(self.negative)
+        return self
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "relative_accuracy": self.relative_accuracy,
+            "max_bins": self.max_bins,
+            "positive": {str(k): v for k, v in self.positive.items()},
+            "negative": {str(k): v for k, v in self.negative.items()},
+            "zero_count": self.zero_count,
+            "count": self.count,
+            "min": self.min,
+            "max": self.max
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "QuantileSketch":
+        sketch = cls(
+            relative_accuracy=float(data.get("relative_accuracy", 0.01)),
+            max_bins=int(data.get("max_bins", 2048))
+        )
+        sketch.positive = {int(k): int(v) for k, v in data.get("positive", {}).items()}
+        sketch.negative = {int(k): int(v) for k, v in data.get("negative", {}).items()}
+        sketch.zero_count = int(data.get("zero_count", 0))
+        sketch.count = int(data.get("count", 0))
+        sketch.min = data.get("min")
+        sketch.max = data.get("max")
+        return sketch
+
+
+@dataclass
+class OnlineMetricState:
+    """Per-metric running state for the online detector (JSON serializable)"""
+    stats: RunningStats = field(default_factory=RunningStats)
+    sketch: QuantileSketch = field(default_factory=QuantileSketch)
+
+    # Additive level + seasonal smoothing used for rolling residual scoring
+    level: Optional[float] = None
+    seasonal: List[float] = field(default_factory=list)
+    residual_mean: float = 0.0
+    residual_var: float = 0.0
+
+    observations: int = 0
+    last_timestamp: Optional[datetime] = None
+
+    # Streaming change-point state (see ChangePointDetector)
+    changes: ChangePointState = field(default_factory=ChangePointState)
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "stats": self.stats.to_dict(),
+            "sketch": self.sketch.to_dict(),
+            "level": self.level,
+            "seasonal": list(self.seasonal),
+            "residual_mean": self.residual_mean,
+            "residual_var": self.residual_var,
+            "observations": self.observations,
+            "last_timestamp": self.last_timestamp.isoformat() if self.last_timestamp else None,
+            "changes": self.changes.to_dict()
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "OnlineMetricState":
+        last_timestamp = data.get("last_timestamp")
+        return cls(
+            stats=RunningStats.from_dict(data.get("stats", {})),
+            sketch=QuantileSketch.from_dict(data.get("sketch", {})),
+            level=data.get("level"),
+            seasonal=[float(s) for s in data.get("seasonal", [])],
+            residual_mean=float(data.get("residual_mean", 0.0)),
+            residual_var=float(data.get("residual_var", 0.0)),
+            observations=int(data.get("observations", 0)),
+            last_timestamp=(
+                datetime.fromisoformat(last_timestamp) if last_timestamp else None
+            ),
+            changes=ChangePointState.from_dict(data.get("changes", {}))
+        )
+
+
+class OnlineAnomalyDetector:
+    """
+    Streaming anomaly detection over per-metric running state
+
+    Each new value is scored against the state accumulated from previous
+    values and then folded into it, so scoring is O(1) in the length of the
+    history. Uses the same thresholds and severity scales as the batch
+    ZScoreDetector, IQRDetector and SeasonalDecomposer.
+    """
+
+    def __init__(
+        self,
+        zscore_threshold: float = 3.0,
+        iqr_multiplier: float = 1.5,
+        seasonal_period: int = 7,
+        seasonal_threshold: float = 2.0,
+        residual_window: int = 30,
+        min_samples: int = 10
+    ):
+        """
+        Initialize online detector
+
+        Args:
+            zscore_threshold: Z-score threshold for anomaly detection
+            iqr_multiplier: IQR multiplier for outlier bounds
+            seasonal_period: Length of seasonal cycle (e.g., 7 for weekly)
+            seasonal_threshold: Residual z-score threshold for seasonal anomalies
+            residual_window: Effective window (in points) of the rolling residual stats
+            min_samples: Minimum number of prior samples before scoring
+        """
+        self.zscore_threshold = zscore_threshold
+        self.iqr_multiplier = iqr_multiplier
+        self.seasonal_period = seasonal_period
+        self.seasonal_threshold = seasonal_threshold
+        self.alpha = 2.0 / (residual_window + 1)
+        self.min_samples = min_samples
+        self.logger = logging.getLogger(__name__)
+
+        # Reuse batch detectors for severity scales so both modes agree
+        self._zscore = ZScoreDetector(threshold=zscore_threshold, min_samples=min_samples)
+        self._iqr = IQRDetector(multiplier=iqr_multiplier, min_samples=min_samples)
+
+    def new_state(self) -> OnlineMetricState:
+        """Create empty state for a metric"""
+        return OnlineMetricState(seasonal=[0.0] * self.seasonal_period)
+
+    def fit(
+        self,
+        state: OnlineMetricState,
+        values: List[float],
+        timestamps: Optional[List[datetime]] = None
+    ) -> OnlineMetricState:
+        """
+        Fold historical values into state without scoring them
+
+        Args:
+            state: State to update in place
+            values: Historical values in chronological order
+            timestamps: Optional matching timestamps
+
+        Returns:
+            The updated state
+        """
+        for i, value in enumerate(values):
+            self._absorb(state, float(value), timestamps[i] if timestamps else None)
+        return state
+
+    def update(
+        self,
+        state: OnlineMetricState,
+        value: float,
+        timestamp: Optional[datetime] = None
+    ) -> List[Dict[str, Any]]:
+        """
+        Score a new value against state, then fold it into state
+
+        Args:
+            state: Per-metric state (updated in place)
+            value: New metric value
+            timestamp: Optional timestamp of the value
+
+        Returns:
+            List of detections ordered ZSCORE, IQR, SEASONAL_DECOMPOSITION.
+            Each detection has method, score, anomaly_type, severity,
+            expected_value and confidence.
+        """
+        value = float(value)
+        detections = []
+
+        try:
+            if state.observations >= self.min_samples:
+                detections.extend(self._score(state, value))
+        except Exception as e:
+            self.logger.error(f"Error in online scoring: {str(e)}")
+
+        self._absorb(state, value, timestamp)
+        return detections
+
+    def _score(self, state: OnlineMetricState, value: float) -> List[Dict[str, Any]]:
+        """Score value against current state"""
+        detections = []
+        sample_factor = min(state.observations / 100.0, 1.0)
+
+        # Z-score against running mean/std
+        std = state.stats.std
+        if std > 0:
+            z_score = abs(value - state.stats.mean) / std
+            if z_score > self.zscore_threshold:
+                detections.append({
+                    "method": DetectionMethod.ZSCORE,
+                    "score": float(z_score),
+                    "anomaly_type": AnomalyType.SPIKE if value > state.stats.mean else AnomalyType.DROP,
+                    "severity": self._zscore._calculate_severity(z_score),
+                    "expected_value": float(state.stats.mean),
+                    "confidence": min(sample_factor * 0.3 + min(z_score / 5.0, 1.0) * 0.7, 1.0)
+                })
+
+        # IQR bounds from the quantile sketch
+        q1 = state.sketch.quantile(0.25)
+        q3 = state.sketch.quantile(0.75)
+        if q1 is not None and q3 is not None:
+            iqr = q3 - q1
+            lower_bound = q1 - self.iqr_multiplier * iqr
+            upper_bound = q3 + self.iqr_multiplier * iqr
+
+            if value < lower_bound or value > upper_bound:
+                if value < lower_bound:
+                    deviation = abs(value - lower_bound) / iqr if iqr > 0 else 0
+                    anomaly_type = AnomalyType.DROP
+                else:
+                    deviation = abs(value - upper_bound) / iqr if iqr > 0 else 0
+                    anomaly_type = AnomalyType.SPIKE
+
+                detections.append({
+                    "method": DetectionMethod.IQR,
+                    "score": float(deviation),
+                    "anomaly_type": anomaly_type,
+                    "severity": self._iqr._calculate_severity(deviation),
+                    "expected_value": float((lower_bound + upper_bound) / 2),
+                    "confidence": min(sample_factor * 0.3 + min(deviation / 3.0, 1.0) * 0.7, 1.0)
+                })
+
+        # Rolling seasonal residual
+        if state.observations >= 2 * self.seasonal_period and state.residual_var > 0:
+            phase = state.observations % self.seasonal_period
+            expected = state.level + state.seasonal[phase]
+            residual = value - expected
+            residual_z = abs(residual - state.residual_mean) / math.sqrt(state.residual_var)
+
+            if residual_z > self.seasonal_threshold:
+                detections.append({
+                    "method": DetectionMethod.SEASONAL_DECOMPOSITION,
+                    "score": float(residual),
+                    "anomaly_type": AnomalyType.SEASONAL_DEVIATION,
+                    "severity": self._zscore._calculate_severity(residual_z),
+                    "expected_value": float(expected),
+                    "confidence": 0.8
+                })
+
+        return detections
+
+    def _absorb(
+        self,
+        state: OnlineMetricState,
+        value: float,
+        timestamp: Optional[datetime]
+    ) -> None:
+        """Fold a value into state"""
+        if len(state.seasonal) != self.seasonal_period:
+            state.seasonal = [0.0] * self.seasonal_period
+
+        phase = state.observations % self.seasonal_period
+
+        if state.level is None:
+            state.level = value
+        else:
+            # Rolling residual statistics (exponentially weighted)
+            residual = value - (state.level + state.seasonal[phase])
+            diff = residual - state.residual_mean
+            increment = self.alpha * diff
+            state.residual_mean += increment
+            state.residual_var = (1 - self.alpha) * (state.residual_var + diff * increment)
+
+            # Additive level/seasonal smoothing
+            state.seasonal[phase] += self.alpha * (value - state.level - state.seasonal[phase])
+            state.level += self.alpha * (value - state.seasonal[phase] - state.level)
+
+        state.stats.update(value)
+        state.sketch.add(value)
+        state.observations += 1
+        if timestamp is not None:
+            state.last_timestamp = timestamp
@@ -0,0 +1,38 @@
+"""
+Rank Fusion
+Combine ranked result lists from different retrievers
+"""
+from typing import Dict, Hashable, List, Optional, Sequence, Tuple
+
+
+def reciprocal_rank_fusion(
+    rankings: Sequence[Sequence[Hashable]],
+    k: int = 60,
+    weights: Optional[Sequence[float]] = None
+) -> List[Tuple[Hashable, float]]:
+    """
+    Fuse rankings with reciprocal rank fusion
+
+    Each item scores sum(weight / (k + rank)) over the rankings it appears
+    in (ranks start at 1). Only ranks matter, so retrievers with
+    incomparable scores (text rank, cosine similarity) combine without
+    calibration, and items found by several retrievers rise to the top.
+
+    Args:
+        rankings: Item IDs per retriever, best first
+        k: Damping constant; larger values flatten the rank curve
+        weights: Per-retriever weights (default: all 1)
+
+    Returns:
+        (item, score) pairs, best first; ties keep first-seen order
+    """
+    weights = weights or [1.0] * len(rankings)
+    if len(weights) != len(rankings):
+        raise ValueError("weights must match rankings")
+
+    scores: Dict[Hashable, float] = {}
+    for ranking, weight in zip(rankings, weights):
+        for rank, item in enumerate(ranking, start=1):
+            scores[item] = scores.get(item, 0.0) + weight / (k + rank)
+
+    return sorted(scores.items(), key=lambda pair: pair[1], reverse=True)
@@ -17,12 +17,19 @@ class SeasonalDecomposer:
 
     Decomposes time-series into trend, seasonal, and residual components
     Uses simple moving average approach (lighter alternative to STL)
+
+    Moving averages come from prefix sums and per-phase means from
+    phase-aligned reshapes, so decomposition is O(n) per series and runs
+    on many series at once (see decompose_batch). Several seasonal periods
+    (e.g. 24 and 168 for daily and weekly cycles in hourly data) can be
+    extracted together.
     """
 
     def __init__(
         self,
         seasonal_period: int = 7,  # 7 for weekly seasonality
-        min_samples: int = 14
+        min_samples: int = 14,
+        seasonal_periods: Optional[List[int]] = None
     ):
         """
         Initialize seasonal decomposer
@@ -30,8 +37,12 @@ class SeasonalDecomposer:
         Args:
             seasonal_period: Length of seasonal cycle (e.g., 7 for weekly)
             min_samples: Minimum number of samples required
+            seasonal_periods: Optional multiple cycle lengths (e.g., [24, 168, 720]
+                              for daily/weekly/monthly in hourly data); overrides
+                              seasonal_period, which becomes the shortest one
         """
-        self.seasonal_period = seasonal_period
+        self.seasonal_periods = sorted(set(seasonal_periods or [seasonal_period]))
+        self.seasonal_period = self.seasonal_periods[0]
         self.min_samples = min_samples
         self.logger = logging.getLogger(__name__)
 
@@ -48,7 +59,9 @@ class SeasonalDecomposer:
             timestamps: Optional list of timestamps
 
         Returns:
-            Dictionary with trend, seasonal, and residual components
+            Dictionary with trend, seasonal, and residual components.
+            When several seasonal periods are configured, "seasonal" is their
+            sum and "seasonals" maps each period to its own component.
         """
         if len(values) < self.min_samples:
             self.logger.warning(
@@ -63,27 +76,9 @@ class SeasonalDecomposer:
 
         try:
             data = np.array(values, dtype=float)
+            components = self.decompose_matrix(data[None, :], np.array([len(data)]))
 
-            # Calculate trend using moving average
-            trend = self._calculate_trend(data)
-
-            # Detrend the data
-            detrended = data - trend
-
-            # Calculate seasonal component
-            seasonal = self._calculate_seasonal(detrended)
-
-            # Calculate residual
-            residual = data - trend - seasonal
-
-            return {
-                "original": data.tolist(),
-                "trend": trend.tolist(),
-                "seasonal": seasonal.tolist(),
-                "residual": residual.tolist(),
-                "seasonal_strength": float(self._calculate_seasonal_strength(seasonal, residual)),
-                "trend_strength": float(self._calculate_trend_strength(trend, residual))
-            }
+            return self._row_result(data, components, 0, len(data))
 
         except Exception as e:
             self.logger.error(f"Error in seasonal decomposition: {str(e)}")
@@ -94,6 +89,127 @@ class SeasonalDecomposer:
                 "error": str(e)
             }
 
+    def decompose_batch(self, series: List[List[float]]) -> List[Dict[str, Any]]:
+        """
+        Decompose many series in one vectorized pass
+
+        Args:
+            series: One list of values per series (lengths may differ)
+
+        Returns:
+            One decomposition per series, as returned by decompose()
+        """
+        lengths = np.array([len(values) for values in series], dtype=int)
+        results: List[Optional[Dict[str, Any]]] = [None] * len(series)
+
+        eligible = [i for i, n in enumerate(lengths) if n >= self.min_samples]
+        for i, n in enumerate(lengths):
+            if n < self.min_samples:
+                results[i] = self.decompose(series[i])
+
+        if eligible:
+            try:
+                width = int(lengths[eligible].max())
+                matrix = np.zeros((len(eligible), width))
+                for row, i in enumerate(eligible):
+                    matrix[row, :lengths[i]] = series[i]
+
+                components = self.decompose_matrix(matrix, lengths[eligible])
+                for row, i in enumerate(eligible):
+                    results[i] = self._row_result(matrix[row, :lengths[i]], components, row, lengths[i])
+
+            except Exception as e:
+                self.logger.error(f"Error in batch seasonal decomposition: {str(e)}")
+                for i in eligible:
+                    results[i] = {
+                        "trend": series[i],
+                        "seasonal": [0] * len(series[i]),
+                        "residual": [0] * len(series[i]),
+                        "error": str(e)
+                    }
+
+        return results
+
+    def decompose_matrix(
+        self,
+        matrix: np.ndarray,
+        lengths: np.ndarray
+    ) -> Dict[str, Any]:
+        """
+        Decompose every row of a left-aligned, zero-padded matrix
+
+        Row i holds a series in its first lengths[i] columns. Trend is a
+        centered moving average over the longest seasonal period, truncated
+        at the series edges. Each seasonal component is the centered
+        per-phase mean of the detrended series with the other seasonal
+        components removed.
+
+        Args:
+            matrix: Array of shape (series, max_length)
+            lengths: Observed length of each row
+
+        Returns:
+            Dictionary of (series, max_length) arrays: trend, seasonal and
+            residual, plus "seasonals" mapping each period to its component.
+            Padding positions are 0.
+        """
+        lengths = np.asarray(lengths, dtype=int)
+        mask = np.arange(matrix.shape[1]) < lengths[:, None]
+        data = np.where(mask, matrix, 0.0)
+
+        trend = self._calculate_trend_matrix(data, lengths, max(self.seasonal_periods))
+        detrended = data - trend
+
+        seasonals = {period: np.zeros_like(data) for period in self.seasonal_periods}
+        # With one period a single pass is exact; more periods need backfitting
+        passes = 1 if len(self.seasonal_periods) == 1 else 2
+        for _ in range(passes):
+            for period in self.seasonal_periods:
+                others = sum(
+                    (component for p, component in seasonals.items() if p != period),
+                    np.zeros_like(data)
+                )
+                seasonals[period] = self._calculate_seasonal_matrix(detrended - others, mask, period)
+
+        seasonal = sum(seasonals.values(), np.zeros_like(data))
+        residual = np.where(mask, data - trend - seasonal, 0.0)
+
+        return {
+            "trend": trend,
+            "seasonal": seasonal,
+            "residual": residual,
+            "seasonals": seasonals
+        }
+
+    def _row_result(
+        self,
+        data: np.ndarray,
+        components: Dict[str, Any],
+        row: int,
+        length: int
+    ) -> Dict[str, Any]:
+        """Extract one series' decomposition from matrix components"""
+        trend = components["trend"][row, :length]
+        seasonal = components["seasonal"][row, :length]
+        residual = components["residual"][row, :length]
+
+        result = {
+            "original": data.tolist(),
+            "trend": trend.tolist(),
+            "seasonal": seasonal.tolist(),
+            "residual": residual.tolist(),
+            "seasonal_strength": float(self._calculate_seasonal_strength(seasonal, residual)),
+            "trend_strength": float(self._calculate_trend_strength(trend, residual))
+        }
+
+        if len(self.seasonal_periods) > 1:
+            result["seasonals"] = {
+                period: component[row, :length].tolist()
+                for period, component in components["seasonals"].items()
+            }
+
+        return result
+
     def _calculate_trend(self, data: np.ndarray) -> np.ndarray:
         """
         Calculate trend component using centered moving average
@@ -104,18 +220,46 @@ class SeasonalDecomposer:
         Returns:
             Trend component array
         """
-        # Use moving average with window size = seasonal_period
-        window_size = self.seasonal_period
+        data = np.asarray(data, dtype=float)
+        return self._calculate_trend_matrix(
+            data[None, :], np.array([len(data)]), max(self.seasonal_periods)
+        )[0]
+
+    def _calculate_trend_matrix(
+        self,
+        data: np.ndarray,
+        lengths: np.ndarray,
+        window_size: int
+    ) -> np.ndarray:
+        """
+        Centered moving average of every row from prefix sums
+
+        The window is truncated at both edges of each series, so every
+        output is the mean of data[max(0, i - w//2) : min(n, i + w//2 + 1)].
+
+        Args:
+            data: Zero-padded array of shape (series, max_length)
+            lengths: Observed length of each row
+            window_size: Moving average window
+
+        Returns:
+            Trend array of the same shape (0 in padding)
+        """
+        rows, width = data.shape
+        half = window_size // 2
 
-        # Pad data at edges
-        trend = np.zeros_like(data)
+        prefix = np.zeros((rows, width + 1))
+        np.cumsum(data, axis=1, out=prefix[:, 1:])
 
-        for i in range(len(data)):
-            start_idx = max(0, i - window_size // 2)
-            end_idx = min(len(data), i + window_size // 2 + 1)
-            trend[i] = np.mean(data[start_idx:end_idx])
+        positions = np.arange(width)
+        start = np.broadcast_to(np.maximum(positions - half, 0), (rows, width))
+        end = np.minimum(positions[None, :] + half + 1, lengths[:, None])
+        end = np.maximum(end, start + 1)
 
-        return trend
+        window_sum = np.take_along_axis(prefix, end, axis=1) - np.take_along_axis(prefix, start, axis=1)
+        trend = window_sum / (end - start)
+
+        return np.where(positions[None, :] < lengths[:, None], trend, 0.0)
 
     def _calculate_seasonal(self, detrended: np.ndarray) -> np.ndarray:
         """
@@ -127,28 +271,48 @@ class SeasonalDecomposer:
         Returns:
             Seasonal component array
         """
-        seasonal = np.zeros_like(detrended)
+        detrended = np.asarray(detrended, dtype=float)
+        mask = np.ones((1, len(detrended)), dtype=bool)
+        return self._calculate_seasonal_matrix(detrended[None, :], mask, self.seasonal_period)[0]
 
-        # Calculate average for each position in cycle
-        seasonal_averages = np.zeros(self.seasonal_period)
+    def _calculate_seasonal_matrix(
+        self,
+        detrended: np.ndarray,
+        mask: np.ndarray,
+        period: int
+    ) -> np.ndarray:
+        """
+        Centered per-phase means of every row, tiled back to full length
 
-        for i in range(self.seasonal_period):
-            indices = range(i, len(detrended), self.seasonal_period)
-            if indices:
-                seasonal_averages[i] = np.mean([detrended[idx] for idx in indices if idx < len(detrended)])
+        Rows are padded to a whole number of cycles and reshaped to
+        (series, cycles, period) so each phase is averaged in one reduction.
 
-        # Center the seasonal component (mean = 0)
-        seasonal_averages -= np.mean(seasonal_averages)
+        Args:
+            detrended: Array of shape (series, max_length)
+            mask: True where a row has an observation
+            period: Seasonal cycle length
 
-        # Tile the seasonal pattern
-        full_cycles = len(detrended) // self.seasonal_period
-        remainder = len(detrended) % self.seasonal_period
+        Returns:
+            Seasonal array of the same shape (0 in padding)
+        """
+        rows, width = detrended.shape
+        cycles = -(-width // period)
+        pad = cycles * period - width
+
+        shaped = np.pad(np.where(mask, detrended, 0.0), ((0, 0), (0, pad))).reshape(rows, cycles, period)
+        shaped_mask = np.pad(mask, ((0, 0), (0, pad))).reshape(rows, cycles, period)
+
+        # Average for each position in cycle, centered to mean 0 over observed phases
+        counts = shaped_mask.sum(axis=1)
+        observed = counts > 0
+        averages = shaped.sum(axis=1) / np.maximum(counts, 1)
+        centers = (averages * observed).sum(axis=1) / np.maximum(observed.sum(axis=1), 1)
+        averages = np.where(observed, averages - centers[:, None], 0.0)
 
-        seasonal = np.tile(seasonal_averages, full_cycles)
-        if remainder > 0:
-            seasonal = np.concatenate([seasonal, seasonal_averages[:remainder]])
+        # Tile the seasonal pattern
+        seasonal = np.tile(averages, (1, cycles))[:, :width]
 
-        return seasonal
+        return np.where(mask, seasonal, 0.0)
 
     def _calculate_seasonal_strength(
         self,
@@ -310,19 +474,22 @@ class SeasonalDecomposer:
             if "error" in decomposition:
                 return [values[-1]] * periods_ahead
 
-            # Get last trend value and seasonal pattern
+            # Get last trend value and seasonal pattern(s)
             trend = decomposition["trend"]
-            seasonal = decomposition["seasonal"]
+            seasonals = decomposition.get(
+                "seasonals", {self.seasonal_period: decomposition["seasonal"]}
+            )
 
             last_trend = trend[-1]
 
-            # Extend seasonal pattern
+            # Extend each seasonal pattern
             predictions = []
-            seasonal_pattern = seasonal[-self.seasonal_period:]
-
             for i in range(periods_ahead):
-                seasonal_idx = i % self.seasonal_period
-                predicted = last_trend + seasonal_pattern[seasonal_idx]
+                predicted = last_trend + sum(
+                    seasonal[-period:][i % period]
+                    for period, seasonal in seasonals.items()
+                    if len(seasonal) >= period
+                )
                 predictions.append(float(predicted))
 
             return predictions
@@ -8,6 +8,7 @@ from datetime import datetime, timedelta
 import numpy as np
 
 from app.models.anomaly import TrendDirection, AnomalySeverity
+from app.algorithms.change_point import ChangePointDetector
 
 
 logger = logging.getLogger(__name__)
@@ -318,15 +319,20 @@ class TrendAnalyzer:
         self,
         values: List[float],
         timestamps: List[datetime],
-        window_size: int = 14
+        window_size: int = 14,
+        method: str = "slope"
     ) -> List[Dict[str, Any]]:
         """
         Detect significant trend changes (inflection points)
 
+        Runs in linear time; see ChangePointDetector for the methods and
+        for the streaming variant used during KPI syncs.
+
         Args:
             values: List of metric values
             timestamps: List of timestamps
             window_size: Window size for trend comparison
+            method: "slope" (slope reversals), "cusum" or "pelt" (level shifts)
 
         Returns:
             List of detected trend changes
@@ -337,28 +343,8 @@ class TrendAnalyzer:
             if len(values) < window_size * 2:
                 return changes
 
-            # Analyze trend in sliding windows
-            for i in range(window_size, len(values) - window_size):
-                # Previous window
-                prev_values = values[i - window_size:i]
-                prev_timestamps = timestamps[i - window_size:i]
-                prev_slope, _ = self._calculate_linear_trend(prev_values, prev_timestamps)
-
-                # Next window
-                next_values = values[i:i + window_size]
-                next_timestamps = timestamps[i:i + window_size]
-                next_slope, _ = self._calculate_linear_trend(next_values, next_timestamps)
-
-                # Check for significant slope change
-                if prev_slope * next_slope < 0:  # Sign change
-                    changes.append({
-                        "index": i,
-                        "timestamp": timestamps[i],
-                        "value": values[i],
-                        "previous_slope": float(prev_slope),
-                        "next_slope": float(next_slope),
-                        "change_type": "reversal"
-                    })
+            detector = ChangePointDetector(window_size=window_size, method=method)
+            changes = detector.detect(values, timestamps)
 
         except Exception as e:
             self.logger.error(f"Error detecting trend changes: {str(e)}")
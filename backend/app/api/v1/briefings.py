@@ -8,6 +8,7 @@ from datetime import datetime, timedelta
 
 from fastapi import APIRouter, HTTPException, Depends, Query, Body
 
+from app.core.streaming import StreamFormat, stream_events
 from app.services.briefing_service import BriefingService
 from app.models.briefing import (
     BriefingResponse,
@@ -92,6 +93,28 @@ async def generate_briefing(
         raise HTTPException(status_code=500, detail=f"Error generating briefing: {str(e)}")
 
 
+@router.post("/generate/stream")
+async def stream_briefing(
+    request: BriefingGenerateRequest = Body(...),
+    stream_format: StreamFormat = Query(StreamFormat.SSE, alias="format", description="sse or ndjson"),
+    briefing_service: BriefingService = Depends(get_briefing_service)
+):
+    """
+    Generate a new briefing, streaming it as it is assembled
+
+    Emits a summary event, one section event per section and a closing
+    complete event with the saved briefing (or an error event).
+    """
+    events = briefing_service.stream_briefing(
+        workspace_id=request.workspace_id,
+        founder_id=request.founder_id,
+        briefing_type=request.briefing_type,
+        start_date=request.start_date,
+        end_date=request.end_date
+    )
+    return stream_events(events, stream_format)
+
+
 @router.get("/morning", response_model=BriefingResponse)
 async def get_morning_brief(
     workspace_id: UUID = Query(...),
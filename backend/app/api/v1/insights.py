@@ -183,45 +183,25 @@ async def trigger_analysis(
     Trigger on-demand analysis for metrics
 
     Runs anomaly detection and trend analysis on specified metrics or all metrics.
+    All metrics are analyzed together in one vectorized batch.
     """
     try:
-        # Get metrics to analyze
-        if metric_ids:
-            metrics_query = anomaly_service.supabase.table("kpi_metrics").select("id").in_(
-                "id", [str(mid) for mid in metric_ids]
-            )
-        else:
-            metrics_query = anomaly_service.supabase.table("kpi_metrics").select("id").eq(
-                "workspace_id", str(workspace_id)
-            ).eq("is_active", True)
-
-        metrics = metrics_query.execute()
+        errors: List[str] = []
+        analyses = await anomaly_service.analyze_metrics_batch(
+            workspace_id=workspace_id,
+            metric_ids=metric_ids,
+            days_back=days_back,
+            detection_methods=detection_methods,
+            errors=errors
+        )
 
         results = {
-            "analyzed_metrics": 0,
-            "anomalies_detected": 0,
-            "trends_detected": 0,
-            "errors": []
+            "analyzed_metrics": len(analyses),
+            "anomalies_detected": sum(len(a.anomalies) for a in analyses),
+            "trends_detected": sum(len(a.trends) for a in analyses),
+            "errors": errors
         }
 
-        for metric in metrics.data:
-            try:
-                metric_id = UUID(metric["id"])
-
-                analysis = await anomaly_service.analyze_metric(
-                    metric_id=metric_id,
-                    workspace_id=workspace_id,
-                    days_back=days_back,
-                    detection_methods=detection_methods
-                )
-
-                results["analyzed_metrics"] += 1
-                results["anomalies_detected"] += len(analysis.anomalies)
-                results["trends_detected"] += len(analysis.trends)
-
-            except Exception as e:
-                results["errors"].append(f"Error analyzing metric {metric['id']}: {str(e)}")
-
         return results
 
     except Exception as e:
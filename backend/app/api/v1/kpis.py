@@ -10,6 +10,7 @@ from fastapi import APIRouter, HTTPException, Depends, Query
 from fastapi.responses import JSONResponse
 
 from app.services.kpi_ingestion_service import KPIIngestionService
+from app.services.kpi_series_cache import summarize_values
 from app.models.kpi_metric import (
     KPIMetricResponse,
     KPISnapshot,
@@ -82,7 +83,8 @@ async def get_metric_history(
 
         metric = KPIMetricResponse(**metric_result.data)
 
-        # Get historical data
+        # Get historical data (served from the KPI series cache when warm)
+        series = await kpi_service.get_metric_series(metric_id, workspace_id, period)
         data_points = await kpi_service.get_metric_history(
             metric_id=metric_id,
             workspace_id=workspace_id,
@@ -95,14 +97,10 @@ async def get_metric_history(
         # Calculate statistics
         if data_points:
             values = [dp.value for dp in data_points]
-            import numpy as np
-            statistics = {
-                "mean": float(np.mean(values)),
-                "median": float(np.median(values)),
-                "min": float(np.min(values)),
-                "max": float(np.max(values)),
-                "std": float(np.std(values))
-            }
+            if series is not None and series.covers(start_date):
+                statistics = series.summary(start_date, end_date, limit)
+            else:
+                statistics = summarize_values(values)
 
             # Calculate trend
             if len(values) >= 2:
@@ -125,7 +123,8 @@ async def get_metric_history(
             period=period,
             data_points=data_points,
             statistics=statistics,
-            trend=trend
+            trend=trend,
+            rollups=series.rollups if series is not None else None
         )
 
     except HTTPException:
@@ -10,11 +10,12 @@ from datetime import datetime
 from fastapi import APIRouter, HTTPException, BackgroundTasks, Depends, Query
 from pydantic import BaseModel
 
+from app.core.streaming import StreamFormat, stream_events
 from app.models.meeting import (
     Meeting, MeetingIngestRequest, MeetingIngestResponse,
     MeetingStatus, MeetingSource
 )
-from app.models.meeting_summary import SummaryGenerationRequest, SummaryGenerationResponse
+from app.models.meeting_summary import SummarizationMethod, SummaryGenerationRequest, SummaryGenerationResponse
 from app.models.action_item import ActionItem, ConvertToTaskRequest
 from app.models.decision import Decision
 from app.services.meeting_ingestion_service import MeetingIngestionService
@@ -153,7 +154,9 @@ async def summarize_meeting(
             transcript=meeting["transcript"],
             extract_action_items=request.extract_action_items if request else True,
             extract_decisions=request.extract_decisions if request else True,
-            analyze_sentiment=request.include_sentiment if request else True
+            analyze_sentiment=request.include_sentiment if request else True,
+            method=request.summarization_method if request else SummarizationMethod.MULTI_STAGE,
+            force_regenerate=request.force_regenerate if request else False
         )
 
         processing_time = int((datetime.utcnow() - start_time).total_seconds() * 1000)
@@ -174,6 +177,53 @@ async def summarize_meeting(
         raise HTTPException(status_code=500, detail=str(e))
 
 
+@router.post("/{meeting_id}/summarize/stream")
+async def stream_meeting_summary(
+    meeting_id: UUID,
+    request: Optional[SummaryGenerationRequest] = None,
+    stream_format: StreamFormat = Query(StreamFormat.SSE, alias="format", description="sse or ndjson"),
+    supabase=Depends(get_supabase_client),
+    api_keys=Depends(get_api_keys)
+):
+    """
+    Generate AI summary for meeting, streaming results as they are ready
+
+    Emits summary, topics, action_items, decisions and sentiment events as
+    each stage finishes, token events while the final summary is refined,
+    and a closing complete event (or an error event).
+    """
+    try:
+        logger.info(f"Streaming summary for meeting: {meeting_id}")
+
+        meeting = await _get_meeting(meeting_id, supabase)
+        if not meeting:
+            raise HTTPException(status_code=404, detail="Meeting not found")
+
+        if not meeting.get("transcript"):
+            raise HTTPException(status_code=400, detail="Meeting has no transcript")
+
+        summarization_service = SummarizationService(supabase, api_keys=api_keys)
+        events = summarization_service.stream_summarize_meeting(
+            meeting_id=meeting_id,
+            workspace_id=UUID(meeting["workspace_id"]),
+            founder_id=UUID(meeting["founder_id"]),
+            transcript=meeting["transcript"],
+            extract_action_items=request.extract_action_items if request else True,
+            extract_decisions=request.extract_decisions if request else True,
+            analyze_sentiment=request.include_sentiment if request else True,
+            method=request.summarization_method if request else SummarizationMethod.MULTI_STAGE,
+            force_regenerate=request.force_regenerate if request else False
+        )
+
+        return stream_events(events, stream_format)
+
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(f"Summary streaming failed: {str(e)}")
+        raise HTTPException(status_code=500, detail=str(e))
+
+
 @router.get("/{meeting_id}/summary")
 async def get_meeting_summary(
     meeting_id: UUID,
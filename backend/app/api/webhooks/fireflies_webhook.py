@@ -10,6 +10,7 @@ from datetime import datetime
 
 from fastapi import APIRouter, Request, HTTPException, Header, BackgroundTasks
 
+from app.api.webhooks.queueing import dispatch_webhook, idempotency_key
 from app.services.meeting_ingestion_service import MeetingIngestionService
 
 
@@ -113,11 +114,17 @@ async def fireflies_webhook(
         logger.info(f"Received Fireflies webhook: {event_type}")
 
         if event_type == "transcript.ready":
-            background_tasks.add_task(
+            data = event_data.get("data", {})
+            return await dispatch_webhook(
+                "fireflies",
+                event_type,
+                data,
+                idempotency_key(event_type, data.get("transcript_id"), body),
                 _webhook_handler.handle_transcript_ready,
-                event_data.get("data", {})
+                background_tasks,
+                workspace_key=data.get("host_email") or data.get("organizer_email"),
+                signature=x_fireflies_signature
             )
-            return {"status": "processing"}
 
         return {"status": "ignored", "event": event_type}
 
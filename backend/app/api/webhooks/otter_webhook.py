@@ -10,6 +10,7 @@ from datetime import datetime
 
 from fastapi import APIRouter, Request, HTTPException, Header, BackgroundTasks
 
+from app.api.webhooks.queueing import dispatch_webhook, idempotency_key
 from app.services.meeting_ingestion_service import MeetingIngestionService
 
 
@@ -110,11 +111,21 @@ async def otter_webhook(
         logger.info(f"Received Otter webhook: {event_type}")
 
         if event_type in ["speech.created", "speech.updated"]:
-            background_tasks.add_task(
+            data = event_data.get("data", {})
+            # Each update of a speech is a separate event
+            speech_version = data.get("speech_id")
+            if speech_version and event_type == "speech.updated":
+                speech_version = f"{speech_version}@{data.get('updated_at') or event_data.get('timestamp')}"
+            return await dispatch_webhook(
+                "otter",
+                event_type,
+                data,
+                idempotency_key(event_type, speech_version, body),
                 _webhook_handler.handle_speech_created,
-                event_data.get("data", {})
+                background_tasks,
+                workspace_key=data.get("owner_email") or data.get("creator_email"),
+                signature=x_otter_signature
             )
-            return {"status": "processing"}
 
         return {"status": "ignored", "event": event_type}
 
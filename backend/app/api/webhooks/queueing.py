@@ -0,0 +1,79 @@
+"""
+Webhook Queueing
+Hands verified webhook deliveries to the durable queue
+"""
+import hashlib
+import json
+import logging
+from typing import Any, Awaitable, Callable, Dict, Optional
+
+from fastapi import BackgroundTasks
+
+from app.services.webhook_queue import get_webhook_queue
+
+
+logger = logging.getLogger(__name__)
+
+
+def idempotency_key(event_type: str, resource_id: Any, body: bytes) -> str:
+    """
+    Identity of a webhook event across redeliveries
+
+    Args:
+        event_type: Platform event name
+        resource_id: Platform ID of the meeting, transcript or speech
+        body: Raw request body, hashed when the payload has no ID
+
+    Returns:
+        Idempotency key
+    """
+    if resource_id:
+        return f"{event_type}:{resource_id}"
+    return f"{event_type}:sha256:{hashlib.sha256(body).hexdigest()}"
+
+
+async def dispatch_webhook(
+    platform: str,
+    event_type: str,
+    payload: Dict[str, Any],
+    key: str,
+    handler: Callable[[Dict[str, Any]], Awaitable[Dict[str, Any]]],
+    background_tasks: BackgroundTasks,
+    workspace_key: Optional[str] = None,
+    signature: Optional[str] = None
+) -> Dict[str, Any]:
+    """
+    Enqueue a webhook event for the worker pool
+
+    Falls back to processing in the API process when no queue is
+    configured.
+
+    Args:
+        platform: Source platform
+        event_type: Platform event name
+        payload: Event payload for the handler
+        key: Idempotency key
+        handler: Handler used when there is no queue
+        background_tasks: Request background tasks
+        workspace_key: Platform account used for per-workspace caps
+        signature: Verified signature header
+
+    Returns:
+        Webhook response body
+    """
+    queue = get_webhook_queue()
+    if queue is None:
+        background_tasks.add_task(handler, payload)
+        return {"status": "processing"}
+
+    event_id, is_duplicate = await queue.enqueue(
+        platform,
+        event_type,
+        json.loads(json.dumps(payload, default=str)),
+        key,
+        workspace_key=workspace_key,
+        signature=signature
+    )
+    if is_duplicate:
+        return {"status": "duplicate"}
+    return {"status": "queued", "event_id": str(event_id) if event_id else None}
@@ -11,6 +11,7 @@ from datetime import datetime
 from fastapi import APIRouter, Request, HTTPException, Header, BackgroundTasks
 from pydantic import BaseModel
 
+from app.api.webhooks.queueing import dispatch_webhook, idempotency_key
 from app.services.meeting_ingestion_service import MeetingIngestionService
 
 
@@ -245,12 +246,19 @@ async def zoom_webhook(
 
         # Route event to appropriate handler
         if event_type == "recording.completed":
-            # Process in background to avoid timeout
-            background_tasks.add_task(
+            # Queue for the worker pool to avoid timeout
+            payload = event_data.get("payload", {})
+            meeting_object = payload.get("object", {})
+            return await dispatch_webhook(
+                "zoom",
+                event_type,
+                payload,
+                idempotency_key(event_type, meeting_object.get("uuid") or meeting_object.get("id"), body),
                 _webhook_handler.handle_recording_completed,
-                event_data.get("payload", {})
+                background_tasks,
+                workspace_key=payload.get("account_id") or meeting_object.get("host_email"),
+                signature=x_zm_signature
             )
-            return {"status": "processing"}
 
         elif event_type == "meeting.ended":
             result = await _webhook_handler.handle_meeting_ended(
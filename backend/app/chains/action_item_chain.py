@@ -2,6 +2,7 @@
 Action Item Chain
 Extract action items from meeting transcripts
 """
+import asyncio
 import logging
 import re
 from typing import Dict, Any, List, Optional
@@ -9,7 +10,12 @@ from datetime import datetime, timedelta
 
 from langchain.prompts import PromptTemplate
 
+from app.algorithms.near_duplicates import NearDuplicateIndex
+from app.config import get_settings
+from app.chains.candidate_windows import CandidateWindowFilter
+from app.chains.phrase_scanner import get_phrase_scanner
 from app.llm.llm_provider import LLMProvider
+from app.llm.transcript_chunker import TranscriptChunker
 from app.models.action_item import ActionItemPriority, ActionItemSource
 
 
@@ -48,23 +54,29 @@ Transcript:
 Action Items:"""
     )
 
-    # Regex patterns for common action item indicators
-    ACTION_PATTERNS = [
-        r"(?:need to|should|must|have to|going to|will)\s+(.+?)(?:\.|,|\n)",
-        r"(?:action item|todo|task):\s*(.+?)(?:\.|,|\n)",
-        r"(?:@\w+)\s+(?:to|will|should)\s+(.+?)(?:\.|,|\n)",
-        r"(?:assigned to|assign)\s+(\w+)\s+to\s+(.+?)(?:\.|,|\n)",
-        r"(?:follow up|followup)\s+(?:with|on)\s+(.+?)(?:\.|,|\n)",
-    ]
+    # Phrase scanner cues marking sentences worth sending to the LLM
+    CANDIDATE_KINDS = ("action", "commitment", "assignee", "priority", "due_date")
 
-    def __init__(self, llm_provider: LLMProvider):
+    # An action item description ends at the first period, comma or line break
+    DESCRIPTION_END = re.compile(r"[.,\n]")
+
+    def __init__(self, llm_provider: LLMProvider, prefilter: Optional[bool] = None):
         """
         Initialize action item chain
 
         Args:
             llm_provider: LLM provider instance
+            prefilter: Send only candidate windows to the LLM (default: settings)
         """
+        settings = get_settings()
         self.llm_provider = llm_provider
+        self.prefilter = settings.extraction_prefilter_enabled if prefilter is None else prefilter
+        self.dedup_threshold = settings.near_duplicate_threshold
+        self.candidate_filter = CandidateWindowFilter(
+            self.CANDIDATE_KINDS,
+            context_sentences=settings.extraction_prefilter_context_sentences,
+            max_coverage=settings.extraction_prefilter_max_coverage
+        )
         self.logger = logging.getLogger(f"{__name__}.{self.__class__.__name__}")
 
     async def extract_action_items(
@@ -111,46 +123,63 @@ Action Items:"""
             raise
 
     def _regex_extraction(self, transcript: str) -> List[Dict[str, Any]]:
-        """Extract action items using regex patterns"""
+        """Extract action items from the phrase scanner's action cues"""
         items = []
-
-        for pattern in self.ACTION_PATTERNS:
-            matches = re.finditer(pattern, transcript, re.IGNORECASE)
-            for match in matches:
-                description = match.group(1).strip()
-
-                # Skip very short matches
-                if len(description) < 10:
-                    continue
-
-                # Extract assignee if present
-                assignee = self._extract_assignee(match.group(0))
-
-                items.append({
-                    "description": description,
-                    "assignee_name": assignee,
-                    "source": ActionItemSource.REGEX,
-                    "confidence_score": 0.6,  # Lower confidence for regex
-                    "context": self._get_context(transcript, match.start(), match.end())
-                })
+        consumed = 0
+
+        for cue in get_phrase_scanner().scan(transcript).of("action"):
+            # Cues inside an earlier item's description belong to that item
+            if cue.start < consumed or cue.end >= len(transcript) or transcript[cue.end] == "\n":
+                continue
+            end = self.DESCRIPTION_END.search(transcript, cue.end + 1)
+            if not end:
+                continue
+            consumed = end.end()
+
+            description = transcript[cue.end:end.start()].strip()
+
+            # Skip very short matches
+            if len(description) < 10:
+                continue
+
+            # Extract assignee if present
+            assignee = self._extract_assignee(transcript[cue.start:cue.end])
+
+            items.append({
+                "description": description,
+                "assignee_name": assignee,
+                "source": ActionItemSource.REGEX,
+                "confidence_score": 0.6,  # Lower confidence for regex
+                "context": self._get_context(transcript, cue.start, end.end())
+            })
 
         return items
 
     async def _llm_extraction(self, transcript: str) -> List[Dict[str, Any]]:
         """Extract action items using LLM"""
-        # For long transcripts, chunk them
-        if len(transcript.split()) > 3000:
-            chunks = self._chunk_transcript(transcript, chunk_size=3000)
-            all_items = []
+        transcript = self._candidate_text(transcript)
 
-            for chunk in chunks:
-                chunk_items = await self._extract_from_chunk(chunk)
-                all_items.extend(chunk_items)
+        # For long transcripts, chunk them and extract from all chunks concurrently
+        chunks = self._chunk_transcript(transcript)
+        if len(chunks) > 1:
+            results = await asyncio.gather(*[self._extract_from_chunk(chunk) for chunk in chunks])
 
-            return all_items
+            return [item for chunk_items in results for item in chunk_items]
         else:
             return await self._extract_from_chunk(transcript)
 
+    def _candidate_text(self, transcript: str) -> str:
+        """Candidate windows of the transcript, or the whole transcript if none were found"""
+        if not self.prefilter:
+            return transcript
+
+        excerpt = self.candidate_filter.render(transcript)
+        if excerpt is None:
+            return transcript
+
+        self.logger.info(f"Sending {len(excerpt)} of {len(transcript)} transcript characters for action items")
+        return excerpt
+
     async def _extract_from_chunk(self, transcript: str) -> List[Dict[str, Any]]:
         """Extract action items from a single transcript chunk"""
         prompt = self.ACTION_ITEM_PROMPT.format(transcript=transcript)
@@ -216,10 +245,14 @@ Action Items:"""
         """
         Merge and deduplicate action items from multiple sources
 
-        Priority: LLM items > Regex items (LLM has better context)
+        Priority: LLM items > Regex items (LLM has better context). LLM items
+        are deduplicated by exact description; a regex item is dropped when
+        its description is more than the dedup threshold similar to any kept
+        item, found through a MinHash/LSH index rather than pairwise checks.
         """
         all_items = []
         seen_descriptions = set()
+        index = NearDuplicateIndex(threshold=self.dedup_threshold)
 
         # Add LLM items first (higher priority)
         for item in llm_items:
@@ -228,19 +261,13 @@ Action Items:"""
                 item["source"] = ActionItemSource.HYBRID
                 all_items.append(item)
                 seen_descriptions.add(desc)
+                index.add(len(all_items), index.fingerprint(desc))
 
         # Add unique regex items
         for item in regex_items:
-            desc = item.get("description", "").lower()
-            # Check for similar descriptions (not just exact match)
-            is_duplicate = any(
-                self._similarity(desc, seen_desc) > 0.8
-                for seen_desc in seen_descriptions
-            )
-
-            if not is_duplicate:
+            desc = item.get("description", "")
+            if index.add_unique(len(all_items) + 1, index.fingerprint(desc)) is None:
                 all_items.append(item)
-                seen_descriptions.add(desc)
 
         return all_items
 
@@ -333,26 +360,6 @@ Action Items:"""
         context_end = min(len(transcript), end + window)
         return transcript[context_start:context_end].strip()
 
-    def _chunk_transcript(self, transcript: str, chunk_size: int = 3000) -> List[str]:
-        """Split transcript into chunks"""
-        words = transcript.split()
-        chunks = []
-
-        for i in range(0, len(words), chunk_size):
-            chunk_words = words[i:i + chunk_size]
-            chunks.append(" ".join(chunk_words))
-
-        return chunks
-
-    def _similarity(self, text1: str, text2: str) -> float:
-        """Calculate text similarity (simple implementation)"""
-        words1 = set(text1.lower().split())
-        words2 = set(text2.lower().split())
-
-        if not words1 or not words2:
-            return 0.0
-
-        intersection = words1 & words2
-        union = words1 | words2
-
-        return len(intersection) / len(union)
+    def _chunk_transcript(self, transcript: str, chunk_size: Optional[int] = None) -> List[str]:
+        """Split transcript into chunks of at most chunk_size tokens (provider budget if None)"""
+        return TranscriptChunker.for_provider(self.llm_provider, max_tokens=chunk_size).split_text(transcript)
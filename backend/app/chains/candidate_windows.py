@@ -0,0 +1,139 @@
+"""
+Candidate Windows
+Local pre-filter that narrows a transcript to the passages worth sending to an LLM
+"""
+from bisect import bisect_right
+from dataclasses import dataclass
+from typing import List, Optional, Sequence, Tuple
+
+from app.chains.phrase_scanner import PhraseScanner, get_phrase_scanner
+from app.llm.transcript_chunker import LINE_PATTERN, SENTENCE_PATTERN, SPEAKER_PATTERN
+
+
+WINDOW_SEPARATOR = "\n[...]\n"
+
+
+@dataclass(frozen=True)
+class CandidateWindow:
+    """A span of the transcript around one or more pattern hits"""
+    start: int
+    end: int
+    speaker: Optional[str]
+    hits: int
+
+
+class CandidateWindowFilter:
+    """
+    Find the passages of a transcript that can contain what an extractor looks for
+
+    Each sentence containing a phrase scanner cue of one of the given kinds
+    is widened by context_sentences on either side within its speaker
+    turn, and overlapping or adjacent windows are merged. render() returns
+    the windows joined into one excerpt, or None when nothing matched or
+    the windows cover so much of the transcript that sending it whole is
+    just as cheap; callers then fall back to the full transcript.
+    """
+
+    def __init__(
+        self,
+        kinds: Sequence[str],
+        context_sentences: int = 1,
+        max_coverage: float = 0.6,
+        scanner: Optional[PhraseScanner] = None
+    ):
+        """
+        Initialize filter
+
+        Args:
+            kinds: Phrase scanner cue kinds marking candidate sentences
+            context_sentences: Neighbouring sentences kept on each side of a hit
+            max_coverage: Largest fraction of the transcript worth narrowing to
+            scanner: Phrase scanner (shared process scanner if None)
+        """
+        self.kinds = tuple(kinds)
+        self.context_sentences = context_sentences
+        self.max_coverage = max_coverage
+        self.scanner = scanner or get_phrase_scanner()
+
+    def find(self, transcript: str) -> List[CandidateWindow]:
+        """
+        Locate candidate windows
+
+        Args:
+            transcript: Meeting transcript
+
+        Returns:
+            Merged windows in transcript order
+        """
+        sentences = self._sentences(transcript)
+        starts = [sentence[0] for sentence in sentences]
+        hit_sentences = sorted({
+            bisect_right(starts, cue.start) - 1
+            for cue in self.scanner.scan(transcript).of(*self.kinds)
+        } - {-1})
+
+        windows: List[CandidateWindow] = []
+        previous_last = -2
+
+        for i in hit_sentences:
+            speaker, turn = sentences[i][2], sentences[i][3]
+            first = i
+            while first > 0 and i - first < self.context_sentences and sentences[first - 1][3] == turn:
+                first -= 1
+            last = i
+            while (last + 1 < len(sentences) and last - i < self.context_sentences
+                   and sentences[last + 1][3] == turn):
+                last += 1
+
+            # Overlapping or back-to-back windows merge
+            if first <= previous_last + 1:
+                previous = windows[-1]
+                windows[-1] = CandidateWindow(previous.start, sentences[last][1], previous.speaker, previous.hits + 1)
+            else:
+                windows.append(CandidateWindow(sentences[first][0], sentences[last][1], speaker, 1))
+            previous_last = last
+
+        return windows
+
+    def render(self, transcript: str) -> Optional[str]:
+        """
+        Build the excerpt an extractor should see
+
+        Args:
+            transcript: Meeting transcript
+
+        Returns:
+            Windows joined with a separator (each prefixed with its speaker when
+            the turn label was cut off), or None to use the full transcript
+        """
+        if not transcript or not transcript.strip():
+            return None
+
+        windows = self.find(transcript)
+        if not windows:
+            return None
+
+        covered = sum(window.end - window.start for window in windows)
+        if covered > self.max_coverage * len(transcript.strip()):
+            return None
+
+        parts = []
+        for window in windows:
+            text = transcript[window.start:window.end]
+            if window.speaker and not SPEAKER_PATTERN.match(text):
+                text = f"{window.speaker}: {text}"
+            parts.append(text)
+        return WINDOW_SEPARATOR.join(parts)
+
+    @staticmethod
+    def _sentences(transcript: str) -> List[Tuple[int, int, Optional[str], int]]:
+        """(start, end, speaker, turn index) per sentence; each line is a turn"""
+        sentences = []
+        speaker = None
+        for turn, line in enumerate(LINE_PATTERN.finditer(transcript)):
+            label = SPEAKER_PATTERN.match(transcript, line.start(), line.end())
+            if label:
+                speaker = label.group(1).strip()
+            for sentence in SENTENCE_PATTERN.finditer(transcript, line.start(), line.end()):
+                sentences.append((sentence.start(), sentence.end(), speaker, turn))
+        return sentences
@@ -2,13 +2,20 @@
 Decision Chain
 Extract key decisions from meeting transcripts
 """
+import asyncio
 import logging
 import re
 from typing import Dict, Any, List, Optional
 
 from langchain.prompts import PromptTemplate
 
+from app.algorithms.near_duplicates import NearDuplicateIndex
+from app.config import get_settings
+from app.chains.candidate_windows import CandidateWindowFilter
+from app.chains import phrase_scanner
+from app.chains.phrase_scanner import find_name_pairs, get_phrase_scanner
 from app.llm.llm_provider import LLMProvider
+from app.llm.transcript_chunker import TranscriptChunker
 from app.models.decision import DecisionType, DecisionImpact
 
 
@@ -46,29 +53,28 @@ Decisions:"""
     )
 
     # Patterns indicating decisions
-    DECISION_INDICATORS = [
-        "decided",
-        "decision",
-        "agreed",
-        "consensus",
-        "resolution",
-        "concluded",
-        "settled on",
-        "approved",
-        "chose to",
-        "selected",
-        "going with",
-        "commitment to"
-    ]
-
-    def __init__(self, llm_provider: LLMProvider):
+    DECISION_INDICATORS = phrase_scanner.DECISION_INDICATORS
+
+    # Phrase scanner cues marking sentences worth sending to the LLM
+    CANDIDATE_KINDS = ("decision", "choice", "due_date")
+
+    def __init__(self, llm_provider: LLMProvider, prefilter: Optional[bool] = None):
         """
         Initialize decision chain
 
         Args:
             llm_provider: LLM provider instance
+            prefilter: Send only candidate windows to the LLM (default: settings)
         """
+        settings = get_settings()
         self.llm_provider = llm_provider
+        self.prefilter = settings.extraction_prefilter_enabled if prefilter is None else prefilter
+        self.dedup_threshold = settings.near_duplicate_threshold
+        self.candidate_filter = CandidateWindowFilter(
+            self.CANDIDATE_KINDS,
+            context_sentences=settings.extraction_prefilter_context_sentences,
+            max_coverage=settings.extraction_prefilter_max_coverage
+        )
         self.logger = logging.getLogger(f"{__name__}.{self.__class__.__name__}")
 
     async def extract_decisions(self, transcript: str) -> List[Dict[str, Any]]:
@@ -97,6 +103,9 @@ Decisions:"""
                 if processed:
                     processed_decisions.append(processed)
 
+            # The same decision can come back from several chunks
+            processed_decisions = self._deduplicate(processed_decisions)
+
             self.logger.info(f"Extracted {len(processed_decisions)} decisions")
             return processed_decisions
 
@@ -106,24 +115,33 @@ Decisions:"""
 
     def _has_decision_indicators(self, transcript: str) -> bool:
         """Check if transcript contains decision indicators"""
-        transcript_lower = transcript.lower()
-        return any(indicator in transcript_lower for indicator in self.DECISION_INDICATORS)
+        return get_phrase_scanner().scan(transcript).has("decision")
 
     async def _llm_extraction(self, transcript: str) -> List[Dict[str, Any]]:
         """Extract decisions using LLM"""
-        # For long transcripts, chunk them
-        if len(transcript.split()) > 3000:
-            chunks = self._chunk_transcript(transcript, chunk_size=3000)
-            all_decisions = []
+        transcript = self._candidate_text(transcript)
 
-            for chunk in chunks:
-                chunk_decisions = await self._extract_from_chunk(chunk)
-                all_decisions.extend(chunk_decisions)
+        # For long transcripts, chunk them and extract from all chunks concurrently
+        chunks = self._chunk_transcript(transcript)
+        if len(chunks) > 1:
+            results = await asyncio.gather(*[self._extract_from_chunk(chunk) for chunk in chunks])
 
-            return all_decisions
+            return [item for chunk_decisions in results for item in chunk_decisions]
         else:
             return await self._extract_from_chunk(transcript)
 
+    def _candidate_text(self, transcript: str) -> str:
+        """Candidate windows of the transcript, or the whole transcript if none were found"""
+        if not self.prefilter:
+            return transcript
+
+        excerpt = self.candidate_filter.render(transcript)
+        if excerpt is None:
+            return transcript
+
+        self.logger.info(f"Sending {len(excerpt)} of {len(transcript)} transcript characters for decisions")
+        return excerpt
+
     async def _extract_from_chunk(self, transcript: str) -> List[Dict[str, Any]]:
         """Extract decisions from a single transcript chunk"""
         prompt = self.DECISION_PROMPT.format(transcript=transcript)
@@ -208,6 +226,14 @@ Decisions:"""
 
         return decision
 
+    def _deduplicate(self, decisions: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """Drop decisions whose description near-duplicates an earlier one"""
+        index = NearDuplicateIndex(threshold=self.dedup_threshold)
+        return [
+            decision for i, decision in enumerate(decisions)
+            if index.add_unique(i, index.fingerprint(decision["description"])) is None
+        ]
+
     def _parse_decision_type(self, type_str: str) -> DecisionType:
         """Parse decision type from string"""
         type_str = type_str.lower()
@@ -248,9 +274,8 @@ Decisions:"""
         key_words = description.lower().split()[:5]  # First 5 words
         search_phrase = " ".join(key_words)
 
-        # Find the phrase in transcript
-        transcript_lower = transcript.lower()
-        index = transcript_lower.find(search_phrase)
+        # Find the phrase in transcript (the shared scan lowercases it once for all decisions)
+        index = get_phrase_scanner().scan(transcript).lowered.find(search_phrase)
 
         if index != -1:
             # Extract context window
@@ -262,29 +287,9 @@ Decisions:"""
 
     def _extract_stakeholders(self, text: str) -> List[str]:
         """Extract stakeholder names from text"""
-        stakeholders = []
-
-        # Look for common name patterns
-        # This is a simple implementation; you might want to use NER for better results
-        words = text.split()
-        for i, word in enumerate(words):
-            # Capitalized words that might be names
-            if word[0].isupper() and len(word) > 2 and word.lower() not in [
-                "the", "and", "but", "for", "with", "this", "that"
-            ]:
-                # Check if followed by another capitalized word (full name)
-                if i + 1 < len(words) and words[i + 1][0].isupper():
-                    stakeholders.append(f"{word} {words[i + 1]}")
-
-        return list(set(stakeholders))  # Remove duplicates
-
-    def _chunk_transcript(self, transcript: str, chunk_size: int = 3000) -> List[str]:
-        """Split transcript into chunks"""
-        words = transcript.split()
-        chunks = []
-
-        for i in range(0, len(words), chunk_size):
-            chunk_words = words[i:i + chunk_size]
-            chunks.append(" ".join(chunk_words))
-
-        return chunks
+        # Capitalized word pairs; a simple heuristic, NER would do better
+        return list(set(find_name_pairs(text)))
+
+    def _chunk_transcript(self, transcript: str, chunk_size: Optional[int] = None) -> List[str]:
+        """Split transcript into chunks of at most chunk_size tokens (provider budget if None)"""
+        return TranscriptChunker.for_provider(self.llm_provider, max_tokens=chunk_size).split_text(transcript)
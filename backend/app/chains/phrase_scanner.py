@@ -0,0 +1,340 @@
+"""
+Phrase Scanner
+Single-pass detection of action item, decision, priority and due date cues
+"""
+import re
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass
+from functools import cached_property
+from typing import Dict, List, Optional, Pattern, Sequence
+
+
+# Openers of an action item; the description runs from the end of the cue
+# to the next period, comma or line break
+ACTION_TRIGGERS = [
+    r"\b(?:need to|should|must|have to|going to|will)\s+",
+    r"\b(?:action item|todo|task):\s*",
+    r"@\w+\s+(?:to|will|should)\s+",
+    r"\b(?:assigned to|assign)\s+\w+\s+to\s+",
+    r"\b(?:follow up|followup)\s+(?:with|on)\s+",
+]
+
+# Other commitments and requests that mark a passage as worth extracting from
+COMMITMENT_PATTERNS = [
+    r"\b(?:needs to|has to|won't)\b",
+    r"\b(?:i'll|we'll|you'll|he'll|she'll|they'll|i'm on it|let me|let's)\b",
+    r"\b(?:can you|could you|would you|please|make sure)\b",
+    r"\b(?:action items?|todo|to-do|task|next steps?|follow[- ]?up|owner|assign(?:ed)?|responsible)\b",
+]
+
+# Phrases that show a decision was made (matched anywhere, as before)
+DECISION_INDICATORS = [
+    "decided",
+    "decision",
+    "agreed",
+    "consensus",
+    "resolution",
+    "concluded",
+    "settled on",
+    "approved",
+    "chose to",
+    "selected",
+    "going with",
+    "commitment to"
+]
+
+# Wider decision language, used to locate passages rather than to gate extraction
+CHOICE_PATTERNS = [
+    r"\b(?:decide|agree|approve|choose|pick|commit|sign(?:ed)? off|greenlit|final call|go ahead)\b",
+    r"\b(?:let's go|we'll go|we're going|we will go|let's do|we'll do|move forward|not going to)\b",
+    r"\b(?:instead of|rather than|vote|budget|hire|launch|cancel|drop|pause|kill)\b",
+]
+
+PRIORITY_PATTERNS = [
+    r"\b(?:urgent(?:ly)?|asap|critical|immediate(?:ly)?|blocker|top priority|high priority|low priority)\b",
+]
+
+# Dates, deadlines and timeframes
+DATE_PATTERNS = [
+    r"\b(?:today|tonight|tomorrow|yesterday)\b",
+    r"\b(?:next|this|end of(?: the)?)\s+(?:week|month|quarter|year|sprint)\b",
+    r"\b(?:monday|tuesday|wednesday|thursday|friday|saturday|sunday)\b",
+    r"\b(?:jan(?:uary)?|feb(?:ruary)?|mar(?:ch)?|apr(?:il)?|jun(?:e)?|jul(?:y)?|aug(?:ust)?"
+    r"|sep(?:t(?:ember)?)?|oct(?:ober)?|nov(?:ember)?|dec(?:ember)?)\.?\s+\d{1,2}\b",
+    r"\b\d{1,2}/\d{1,2}(?:/\d{2,4})?\b",
+    r"\b(?:the\s+)?\d{1,2}(?:st|nd|rd|th)\b",
+    r"\b(?:eod|eow|eom)\b",
+    r"\bq[1-4]\b",
+    r"\b(?:deadline|due|by then)\b",
+]
+
+CUE_PATTERNS: Dict[str, List[str]] = {
+    "action": ACTION_TRIGGERS,
+    "commitment": COMMITMENT_PATTERNS,
+    "assignee": [r"@\w+"],
+    "decision": [re.escape(indicator) for indicator in DECISION_INDICATORS],
+    "choice": CHOICE_PATTERNS,
+    "priority": PRIORITY_PATTERNS,
+    "due_date": DATE_PATTERNS,
+}
+
+# Two consecutive words starting with a letter, the first at least three
+# characters (e.g. "Alice Johnson"); find_name_pairs keeps only capitalized
+# ones, since str.isupper() covers non-ASCII capitals that [A-Z] would miss
+NAME_PAIR_PATTERN = re.compile(r"(?<!\S)(?=([^\W\d_]\S{2,})\s+([^\W\d_]\S*))")
+NAME_STOPWORDS = {"the", "and", "but", "for", "with", "this", "that"}
+
+
+LITERAL_PREFIX = re.compile(r"[a-z0-9@'\-]+")
+DIGIT_LEAD = "\\d"
+
+
+def _split_alternatives(group: str) -> List[str]:
+    """Split a group body on its top-level "|" characters"""
+    alternatives, depth, start, i = [], 0, 0, 0
+    while i < len(group):
+        char = group[i]
+        if char == "\\":
+            i += 2
+            continue
+        if char == "(":
+            depth += 1
+        elif char == ")":
+            depth -= 1
+        elif char == "|" and depth == 0:
+            alternatives.append(group[start:i])
+            start = i + 1
+        i += 1
+    alternatives.append(group[start:])
+    return alternatives
+
+
+def _literal_prefixes(pattern: str) -> Optional[List[str]]:
+    """
+    Text every match of the pattern starts with, one entry per alternative
+
+    Handles the shapes used in CUE_PATTERNS ("\\b(?:need to|should)...",
+    "@\\w+...", "\\bq[1-4]", "\\b(?:the\\s+)?\\d..."). Entries are
+    literal words, or DIGIT_LEAD for alternatives starting with a digit.
+    Returns None when a pattern has no recognizable lead, and the scanner
+    then gates on the whole pattern instead.
+    """
+    body = pattern[2:] if pattern.startswith("\\b") else pattern
+    if body.startswith("\\d"):
+        return [DIGIT_LEAD]
+    if not body.startswith("("):
+        match = LITERAL_PREFIX.match(body.replace("\\ ", " ").replace("\\-", "-"))
+        return [match.group()] if match else None
+    if not body.startswith("(?:"):
+        return None
+
+    depth = 0
+    for close, char in enumerate(body):
+        if char == "(" and body[close - 1:close] != "\\":
+            depth += 1
+        elif char == ")" and body[close - 1:close] != "\\":
+            depth -= 1
+            if depth == 0:
+                break
+
+    prefixes = []
+    for alternative in _split_alternatives(body[3:close]):
+        alternative_prefixes = _literal_prefixes(alternative)
+        if alternative_prefixes is None:
+            return None
+        prefixes.extend(alternative_prefixes)
+
+    # An optional leading group can also be skipped
+    quantifier = body[close + 1:close + 2]
+    if quantifier == "*" or quantifier == "?":
+        rest = _literal_prefixes(body[close + 2:])
+        if rest is None:
+            return None
+        prefixes.extend(rest)
+    elif quantifier == "{":
+        return None
+    return prefixes
+
+
+def _trie_pattern(words: List[str]) -> str:
+    """Regex matching any of the words, factored by shared prefixes"""
+    root: Dict[str, dict] = {}
+    for word in set(words):
+        node = root
+        for char in word:
+            node = node.setdefault(char, {})
+        node[""] = {}
+
+    def build(node: Dict[str, dict]) -> str:
+        branches = [re.escape(char) + build(child) for char, child in sorted(node.items()) if char]
+        if not branches:
+            return ""
+        body = branches[0] if len(branches) == 1 else "(?:" + "|".join(branches) + ")"
+        return f"(?:{body})?" if "" in node else body
+
+    return build(root)
+
+
+@dataclass(frozen=True)
+class PhraseMatch:
+    """One cue found in the text"""
+    kind: str
+    start: int
+    end: int
+
+
+class PhraseScan:
+    """All cues found in one text, grouped by kind"""
+
+    def __init__(self, text: str, matches: List[PhraseMatch]):
+        self.text = text
+        self.matches = matches
+        self._by_kind: Dict[str, List[PhraseMatch]] = {}
+        for match in matches:
+            self._by_kind.setdefault(match.kind, []).append(match)
+
+    def of(self, *kinds: str) -> List[PhraseMatch]:
+        """Matches of the given kinds in text order"""
+        if len(kinds) == 1:
+            return list(self._by_kind.get(kinds[0], []))
+        return [match for match in self.matches if match.kind in kinds]
+
+    def has(self, kind: str) -> bool:
+        """Whether any cue of this kind was found"""
+        return kind in self._by_kind
+
+    @cached_property
+    def lowered(self) -> str:
+        """Lowercased text, computed once for case-insensitive lookups"""
+        return self.text.lower()
+
+
+class PhraseScanner:
+    """
+    Find every cue of every kind in one pass over the text
+
+    All patterns are compiled into a single regex: a gate built as a trie
+    of every pattern's leading word (so the engine skips non-cue words
+    after one character-class test), followed by zero-width lookaheads with
+    one named group per kind. The regex engine walks the text once and
+    stops only where some cue starts; at those positions the remaining
+    kinds are tried in place, so overlapping cues of different kinds (e.g.
+    "we'll go with" as both a commitment and a decision) are all reported.
+    Cues must start at a word boundary. Recent scans are memoized by text,
+    so chains working on the same transcript share one scan.
+    """
+
+    def __init__(self, cue_patterns: Optional[Dict[str, Sequence[str]]] = None, cache_size: int = 8):
+        """
+        Initialize scanner
+
+        Args:
+            cue_patterns: Regular expressions per cue kind (CUE_PATTERNS if None)
+            cache_size: Number of recent scans kept
+        """
+        cue_patterns = cue_patterns or CUE_PATTERNS
+        self.kinds = list(cue_patterns)
+        self._later_kinds = {kind: self.kinds[i + 1:] for i, kind in enumerate(self.kinds)}
+        self._kind_patterns: Dict[str, Pattern] = {
+            kind: re.compile("|".join(f"(?:{p})" for p in patterns), re.IGNORECASE)
+            for kind, patterns in cue_patterns.items()
+        }
+
+        leading_words: List[str] = []
+        ungated: List[str] = []
+        for patterns in cue_patterns.values():
+            for pattern in patterns:
+                prefixes = _literal_prefixes(pattern)
+                if prefixes is None:
+                    ungated.append(pattern)
+                else:
+                    leading_words.extend(prefixes)
+
+        digit_lead = DIGIT_LEAD in leading_words
+        leading_words = [word for word in leading_words if word != DIGIT_LEAD]
+        leads = ([_trie_pattern(leading_words)] if leading_words else []) + ([DIGIT_LEAD] if digit_lead else [])
+        gate = [rf"(?<![\w@])(?={'|'.join(leads)})"] if leads else []
+        gate += [f"(?=(?:{pattern}))" for pattern in ungated]
+        self._combined = re.compile(
+            "(?:" + "|".join(gate) + ")(?=" + "|".join(
+                f"(?P<{kind}>{pattern.pattern})" for kind, pattern in self._kind_patterns.items()
+            ) + ")",
+            re.IGNORECASE
+        )
+
+        self.cache_size = cache_size
+        self._scans: "OrderedDict[str, PhraseScan]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def scan(self, text: str) -> PhraseScan:
+        """
+        Find all cues in a text
+
+        Args:
+            text: Transcript or other text
+
+        Returns:
+            PhraseScan with matches in text order
+        """
+        with self._lock:
+            scan = self._scans.get(text)
+            if scan is not None:
+                self._scans.move_to_end(text)
+                return scan
+
+        scan = PhraseScan(text, self._find(text))
+
+        with self._lock:
+            self._scans[text] = scan
+            while len(self._scans) > self.cache_size:
+                self._scans.popitem(last=False)
+        return scan
+
+    def _find(self, text: str) -> List[PhraseMatch]:
+        matches: List[PhraseMatch] = []
+        for hit in self._combined.finditer(text):
+            position = hit.start()
+            first_kind = hit.lastgroup
+            matches.append(PhraseMatch(first_kind, position, hit.end(first_kind)))
+
+            # Later kinds starting at the same position (earlier ones would have matched first)
+            for kind in self._later_kinds[first_kind]:
+                other = self._kind_patterns[kind].match(text, position)
+                if other:
+                    matches.append(PhraseMatch(kind, position, other.end()))
+        return matches
+
+
+def find_name_pairs(text: str) -> List[str]:
+    """
+    Capitalized word pairs that look like full names
+
+    Args:
+        text: Text to search
+
+    Returns:
+        "First Last" strings in text order (may repeat)
+    """
+    return [
+        f"{match.group(1)} {match.group(2)}"
+        for match in NAME_PAIR_PATTERN.finditer(text)
+        if match.group(1)[0].isupper() and match.group(2)[0].isupper()
+        and match.group(1).lower() not in NAME_STOPWORDS
+    ]
+
+
+_phrase_scanner: Optional[PhraseScanner] = None
+
+
+def get_phrase_scanner() -> PhraseScanner:
+    """
+    Get or create singleton phrase scanner
+
+    Returns:
+        PhraseScanner compiled from CUE_PATTERNS
+    """
+    global _phrase_scanner
+    if _phrase_scanner is None:
+        _phrase_scanner = PhraseScanner()
+    return _phrase_scanner
@@ -2,18 +2,71 @@
 Summarization Chain
 Multi-stage meeting summarization using LangChain
 """
+import asyncio
+import hashlib
 import logging
-from typing import Dict, Any, List, Optional
+from collections import OrderedDict
+from typing import Dict, Any, List, Optional, Tuple, Callable, Awaitable
 
 from langchain.prompts import PromptTemplate
 from langchain.chains import LLMChain
-from langchain.text_splitter import RecursiveCharacterTextSplitter
 
 from app.llm.llm_provider import LLMProvider, LLMResponse
+from app.config import get_settings
+from app.llm.transcript_chunker import TranscriptChunker
 
 
 logger = logging.getLogger(__name__)
 
+# Safety stop for the merge tree; each level at least halves the partials
+MAX_REDUCE_LEVELS = 8
+
+
+class PartialSummaryCache:
+    """LRU cache of chunk and merge summaries keyed by prompt content hash"""
+
+    def __init__(self, max_entries: int = 2048):
+        """
+        Initialize cache
+
+        Args:
+            max_entries: Maximum summaries held
+        """
+        self.max_entries = max_entries
+        self._summaries: "OrderedDict[str, str]" = OrderedDict()
+
+    def get(self, key: str) -> Optional[str]:
+        """Get a cached summary"""
+        summary = self._summaries.get(key)
+        if summary is not None:
+            self._summaries.move_to_end(key)
+        return summary
+
+    def put(self, key: str, summary: str) -> None:
+        """Cache a summary"""
+        self._summaries[key] = summary
+        self._summaries.move_to_end(key)
+        while len(self._summaries) > self.max_entries:
+            self._summaries.popitem(last=False)
+
+
+_partial_summary_cache: Optional[PartialSummaryCache] = None
+
+
+def get_partial_summary_cache() -> PartialSummaryCache:
+    """
+    Get or create singleton partial summary cache
+
+    Returns:
+        PartialSummaryCache instance configured from settings
+    """
+    global _partial_summary_cache
+    if _partial_summary_cache is None:
+        _partial_summary_cache = PartialSummaryCache(
+            max_entries=get_settings().summarization_partial_cache_size
+        )
+    return _partial_summary_cache
+
 
 class SummarizationChain:
     """
@@ -23,6 +76,12 @@ class SummarizationChain:
     1. Extractive: Pull key sentences from transcript
     2. Abstractive: Generate coherent summary
     3. Refinement: Polish and structure the summary
+
+    Long transcripts are summarized map-reduce style: chunks are summarized
+    in parallel, then partial summaries are merged in a tree until they fit
+    the provider's token budget. Chunk and merge summaries are cached by
+    content hash, so re-running an edited transcript only redoes the chunks
+    that changed.
     """
 
     EXTRACTIVE_PROMPT = PromptTemplate(
@@ -74,29 +133,52 @@ Draft Summary:
 Refined Summary:"""
     )
 
-    def __init__(self, llm_provider: LLMProvider):
+    MERGE_PROMPT = PromptTemplate(
+        input_variables=["summaries"],
+        template="""Combine these partial summaries of consecutive sections of one meeting into a single list of key points.
+Keep every decision, owner, number and date. Remove repetition between sections.
+
+Partial Summaries:
+{summaries}
+
+Combined Key Points (bullet points):"""
+    )
+
+    def __init__(
+        self,
+        llm_provider: LLMProvider,
+        summary_cache: Optional[PartialSummaryCache] = None,
+        refresh: bool = False
+    ):
         """
         Initialize summarization chain
 
         Args:
             llm_provider: LLM provider instance
+            summary_cache: Cache of chunk and merge summaries (shared process cache if None)
+            refresh: Ignore cached chunk and merge summaries, replacing them with new ones
         """
         self.llm_provider = llm_provider
+        self.summary_cache = summary_cache if summary_cache is not None else get_partial_summary_cache()
+        self.refresh = refresh
         self.logger = logging.getLogger(f"{__name__}.{self.__class__.__name__}")
 
     async def summarize(
         self,
         transcript: str,
         method: str = "multi_stage",
-        max_length: Optional[int] = None
+        max_length: Optional[int] = None,
+        on_token: Optional[Callable[[str], Awaitable[None]]] = None
     ) -> Dict[str, Any]:
         """
         Summarize meeting transcript
 
         Args:
             transcript: Full meeting transcript
-            method: Summarization method (extractive, abstractive, multi_stage)
+            method: Summarization method (extractive, abstractive, multi_stage, hierarchical)
             max_length: Maximum summary length in words
+            on_token: Optional callback receiving refinement text as it streams
+                (multi_stage and hierarchical only)
 
         Returns:
             Dict with summary and metadata
@@ -106,8 +188,10 @@ Refined Summary:"""
                 return await self._extractive_summarization(transcript)
             elif method == "abstractive":
                 return await self._abstractive_summarization(transcript)
+            elif method == "hierarchical":
+                return await self._hierarchical_summarization(transcript, on_token)
             else:  # multi_stage
-                return await self._multi_stage_summarization(transcript)
+                return await self._multi_stage_summarization(transcript, on_token)
 
         except Exception as e:
             self.logger.error(f"Summarization failed: {str(e)}")
@@ -116,17 +200,11 @@ Refined Summary:"""
     async def _extractive_summarization(self, transcript: str) -> Dict[str, Any]:
         """Extract key sentences from transcript"""
         try:
-            # For very long transcripts, chunk them first
-            if len(transcript.split()) > 3000:
-                chunks = self._chunk_transcript(transcript, chunk_size=3000)
-                key_points = []
-
-                for chunk in chunks:
-                    prompt = self.EXTRACTIVE_PROMPT.format(transcript=chunk)
-                    response = await self.llm_provider.complete(prompt)
-                    key_points.append(response.content)
-
-                summary = "\n\n".join(key_points)
+            # For very long transcripts, chunk them first and extract from all chunks concurrently
+            chunks = self._chunk_transcript(transcript)
+            if len(chunks) > 1:
+                partials, _ = await self._map_chunks(chunks)
+                summary = "\n\n".join(partials)
             else:
                 prompt = self.EXTRACTIVE_PROMPT.format(transcript=transcript)
                 response = await self.llm_provider.complete(prompt)
@@ -176,7 +254,11 @@ Refined Summary:"""
             self.logger.error(f"Abstractive summarization failed: {str(e)}")
             raise
 
-    async def _multi_stage_summarization(self, transcript: str) -> Dict[str, Any]:
+    async def _multi_stage_summarization(
+        self,
+        transcript: str,
+        on_token: Optional[Callable[[str], Awaitable[None]]] = None
+    ) -> Dict[str, Any]:
         """Multi-stage summarization with refinement"""
         try:
             # Stage 1: Extractive
@@ -184,6 +266,9 @@ Refined Summary:"""
             extractive_result = await self._extractive_summarization(transcript)
             key_points = extractive_result["summary"]
 
+            # Key points from many chunks can exceed the context window; merge them down first
+            key_points, _ = await self._reduce_summaries(key_points.split("\n\n"))
+
             # Stage 2: Abstractive
             self.logger.info("Stage 2: Abstractive summarization")
             prompt = self.ABSTRACTIVE_PROMPT.format(
@@ -195,10 +280,7 @@ Refined Summary:"""
 
             # Stage 3: Refinement
             self.logger.info("Stage 3: Refinement")
-            refinement_prompt = self.REFINEMENT_PROMPT.format(
-                draft_summary=draft_summary
-            )
-            final_response = await self.llm_provider.complete(refinement_prompt)
+            final_response = await self._refine(draft_summary, on_token)
 
             # Extract structured sections from final summary
             final_summary = final_response.content
@@ -222,14 +304,195 @@ Refined Summary:"""
             self.logger.error(f"Multi-stage summarization failed: {str(e)}")
             raise
 
-    def _chunk_transcript(self, transcript: str, chunk_size: int = 3000) -> List[str]:
-        """Split transcript into chunks for processing"""
-        splitter = RecursiveCharacterTextSplitter(
-            chunk_size=chunk_size * 4,  # Approximate characters per word
-            chunk_overlap=200,
-            length_function=lambda text: len(text.split())
+    async def _hierarchical_summarization(
+        self,
+        transcript: str,
+        on_token: Optional[Callable[[str], Awaitable[None]]] = None
+    ) -> Dict[str, Any]:
+        """Map-reduce summarization for transcripts longer than one chunk"""
+        try:
+            # Map: summarize chunks in parallel, reusing cached chunk summaries
+            chunks = self._chunk_transcript(transcript) or [transcript]
+            partials, cached_chunks = await self._map_chunks(chunks)
+
+            # Reduce: merge partial summaries in a tree until they fit one prompt
+            key_points, levels = await self._reduce_summaries(partials)
+
+            prompt = self.ABSTRACTIVE_PROMPT.format(
+                key_points=key_points,
+                transcript_length=len(transcript.split())
+            )
+            draft_response = await self.llm_provider.complete(prompt)
+            final_response = await self._refine(draft_response.content, on_token)
+
+            final_summary = final_response.content
+            sections = self._parse_summary_sections(final_summary)
+
+            return {
+                "summary": final_summary,
+                "executive_summary": sections.get("executive_summary", ""),
+                "detailed_summary": sections.get("detailed_summary", final_summary),
+                "key_points": self._extract_bullet_points(key_points),
+                "method": "hierarchical",
+                "metadata": {
+                    "original_length": len(transcript.split()),
+                    "summary_length": len(final_summary.split()),
+                    "chunk_count": len(chunks),
+                    "cached_chunks": cached_chunks,
+                    "reduce_levels": levels,
+                    "total_tokens": draft_response.total_tokens + final_response.total_tokens,
+                    "total_cost_usd": (draft_response.cost_usd or 0) + (final_response.cost_usd or 0)
+                }
+            }
+
+        except Exception as e:
+            self.logger.error(f"Hierarchical summarization failed: {str(e)}")
+            raise
+
+    async def _refine(
+        self,
+        draft_summary: str,
+        on_token: Optional[Callable[[str], Awaitable[None]]] = None
+    ) -> LLMResponse:
+        """
+        Run the refinement stage, streaming it when a token callback is given
+
+        Streamed responses carry no usage data, so token counts and cost are
+        computed locally with the provider's tokenizer and pricing.
+
+        Args:
+            draft_summary: Abstractive draft
+            on_token: Optional callback receiving each streamed text piece
+
+        Returns:
+            LLMResponse with the refined summary
+        """
+        prompt = self.REFINEMENT_PROMPT.format(draft_summary=draft_summary)
+        if on_token is None:
+            return await self.llm_provider.complete(prompt)
+
+        pieces = []
+        async for piece in self.llm_provider.stream_complete(prompt):
+            pieces.append(piece)
+            await on_token(piece)
+
+        content = "".join(pieces)
+        prompt_tokens = self.llm_provider.count_tokens(prompt)
+        completion_tokens = self.llm_provider.count_tokens(content)
+        return LLMResponse(
+            content=content,
+            provider=self.llm_provider.config.provider,
+            model=self.llm_provider.config.model_name,
+            prompt_tokens=prompt_tokens,
+            completion_tokens=completion_tokens,
+            total_tokens=prompt_tokens + completion_tokens,
+            cost_usd=self.llm_provider.calculate_cost(prompt_tokens, completion_tokens),
+            finish_reason="stop",
+            metadata={"streamed": True}
         )
-        return splitter.split_text(transcript)
+
+    async def _map_chunks(self, chunks: List[str]) -> Tuple[List[str], int]:
+        """
+        Extract key points from every chunk concurrently
+
+        Args:
+            chunks: Transcript chunks
+
+        Returns:
+            Tuple of (per-chunk key points, number served from cache)
+        """
+        prompts = [self.EXTRACTIVE_PROMPT.format(transcript=chunk) for chunk in chunks]
+        cached = [
+            None if self.refresh else self.summary_cache.get(self._summary_key(prompt))
+            for prompt in prompts
+        ]
+        missing = [i for i, summary in enumerate(cached) if summary is None]
+
+        responses = await asyncio.gather(*[self.llm_provider.complete(prompts[i]) for i in missing])
+        for i, response in zip(missing, responses):
+            cached[i] = response.content
+            self.summary_cache.put(self._summary_key(prompts[i]), response.content)
+
+        return cached, len(chunks) - len(missing)
+
+    async def _reduce_summaries(self, partials: List[str]) -> Tuple[str, int]:
+        """
+        Merge partial summaries in a tree until they fit the token budget
+
+        Each level groups consecutive partials up to the budget and merges
+        the groups concurrently, so depth grows logarithmically with the
+        number of chunks.
+
+        Args:
+            partials: Partial summaries in transcript order
+
+        Returns:
+            Tuple of (combined key points, number of merge levels)
+        """
+        chunker = TranscriptChunker.for_provider(self.llm_provider)
+        budget = chunker.max_tokens
+        partials = [partial for partial in partials if partial.strip()]
+
+        levels = 0
+        while len(partials) > 1 and levels < MAX_REDUCE_LEVELS:
+            counts = chunker.count_tokens_batch(partials)
+            if sum(counts) <= budget:
+                break
+
+            groups = self._group_partials(partials, counts, budget)
+            partials = list(await asyncio.gather(*[self._merge_group(group) for group in groups]))
+            levels += 1
+
+        return "\n\n".join(partials), levels
+
+    @staticmethod
+    def _group_partials(partials: List[str], counts: List[int], budget: int) -> List[List[str]]:
+        """Consecutive groups of at least two partials, each within budget where possible"""
+        groups: List[List[str]] = []
+        current: List[str] = []
+        used = 0
+        for partial, tokens in zip(partials, counts):
+            if len(current) >= 2 and used + tokens > budget:
+                groups.append(current)
+                current, used = [], 0
+            current.append(partial)
+            used += tokens
+        if len(current) == 1 and groups:
+            groups[-1].append(current[0])
+        elif current:
+            groups.append(current)
+        return groups
+
+    async def _merge_group(self, group: List[str]) -> str:
+        if len(group) == 1:
+            return group[0]
+
+        prompt = self.MERGE_PROMPT.format(summaries="\n\n---\n\n".join(group))
+        key = self._summary_key(prompt)
+        merged = None if self.refresh else self.summary_cache.get(key)
+        if merged is None:
+            response = await self.llm_provider.complete(prompt)
+            merged = response.content
+            self.summary_cache.put(key, merged)
+        return merged
+
+    def _summary_key(self, prompt: str) -> str:
+        config = getattr(self.llm_provider, "config", None)
+        model = f"{getattr(config, 'provider', '')}:{getattr(config, 'model_name', '')}"
+        return hashlib.sha256(f"{model}\0{prompt}".encode("utf-8")).hexdigest()
+
+    def _chunk_transcript(self, transcript: str, chunk_size: Optional[int] = None) -> List[str]:
+        """
+        Split transcript into token-budgeted chunks
+
+        Args:
+            transcript: Full transcript text
+            chunk_size: Max tokens per chunk (sized to the provider's context window if None)
+
+        Returns:
+            Chunk texts; plans are shared with other chains chunking the same transcript
+        """
+        return TranscriptChunker.for_provider(self.llm_provider, max_tokens=chunk_size).split_text(transcript)
 
     def _parse_summary_sections(self, summary: str) -> Dict[str, str]:
         """Parse summary into structured sections"""
@@ -91,14 +91,173 @@ class Settings(BaseSettings):
     enable_health_checks: bool = Field(default=True, description="Enable scheduled health checks")
     health_check_interval_hours: int = Field(default=6, description="Health check interval in hours")
 
+    # KPI Analytics
+    enable_streaming_anomaly_detection: bool = Field(
+        default=True,
+        description="Score each KPI data point with the online detector as it is ingested"
+    )
+    kpi_sync_interval_hours: int = Field(default=6, description="KPI sync interval in hours")
+    kpi_sync_max_concurrency: int = Field(default=8, description="Workspaces synced concurrently")
+    kpi_sync_rate_per_second: float = Field(default=2.0, description="Sync starts per second per integration")
+    kpi_sync_burst: int = Field(default=5, description="Sync start burst size per integration")
+    kpi_sync_spread_minutes: int = Field(
+        default=300,
+        description="Window over which scheduled syncs spread workspace start times"
+    )
+    kpi_sync_timeout_seconds: int = Field(default=120, description="Per-workspace KPI sync timeout")
+    kpi_series_cache_ttl_seconds: int = Field(default=300, description="Lifetime of cached KPI series")
+    kpi_series_cache_max_entries: int = Field(default=2048, description="Max KPI series cached per process")
+    kpi_series_cache_redis_url: Optional[str] = Field(
+        default=None,
+        description="Redis URL for sharing cached KPI series across workers (in-process only when unset)"
+    )
+
+    # Meeting Summarization
+    llm_max_concurrent_requests: int = Field(default=4, description="In-flight requests per LLM provider")
+    summarization_parallel_stages: bool = Field(
+        default=True,
+        description="Run summary, topic, action item, decision and sentiment stages concurrently"
+    )
+    summarization_deadline_seconds: int = Field(
+        default=300,
+        description="Shared deadline for concurrent summarization stages"
+    )
+    llm_response_cache_enabled: bool = Field(default=True, description="Reuse responses for identical LLM requests")
+    llm_response_cache_ttl_seconds: int = Field(default=86400, description="Lifetime of cached LLM responses")
+    llm_response_cache_max_entries: int = Field(default=1024, description="Max LLM responses cached per process")
+    llm_response_cache_sqlite_path: Optional[str] = Field(
+        default=None,
+        description="SQLite file persisting cached LLM responses (in-process only when unset)"
+    )
+    llm_request_coalescing_enabled: bool = Field(
+        default=True,
+        description="Share one LLM call among concurrent identical requests"
+    )
+    transcript_chunk_max_tokens: int = Field(default=3000, description="Max tokens per transcript chunk sent to an LLM")
+    transcript_chunk_overlap_tokens: int = Field(default=100, description="Tokens of context repeated between chunks")
+    transcript_chunk_prompt_reserve_tokens: int = Field(
+        default=1000,
+        description="Context window tokens kept free for the prompt template around a chunk"
+    )
+    transcript_chunk_cache_size: int = Field(default=64, description="Max transcript chunk plans cached per process")
+    summarization_partial_cache_size: int = Field(
+        default=2048,
+        description="Max chunk and merge summaries cached for hierarchical summarization"
+    )
+    extraction_prefilter_enabled: bool = Field(
+        default=True,
+        description="Send only candidate windows of a transcript to action item and decision extraction"
+    )
+    extraction_prefilter_context_sentences: int = Field(
+        default=1,
+        description="Sentences of context kept around each candidate sentence"
+    )
+    extraction_prefilter_max_coverage: float = Field(
+        default=0.6,
+        description="Use the full transcript when candidate windows cover more than this fraction of it"
+    )
+    llm_routing_enabled: bool = Field(
+        default=True,
+        description="Route across every provider with an API key, failing over on errors"
+    )
+    llm_router_hedge_after_ms: Optional[int] = Field(
+        default=None,
+        description="Send a hedged duplicate request to the next provider after this latency (disabled when unset)"
+    )
+    llm_router_failure_threshold: int = Field(default=3, description="Consecutive failures that open a provider circuit")
+    llm_router_cooldown_seconds: int = Field(default=30, description="Time a provider circuit stays open")
+    llm_router_latency_window: int = Field(default=100, description="Recent calls used for provider latency stats")
+    near_duplicate_threshold: float = Field(
+        default=0.8,
+        description="Word-set similarity above which two action items or decisions are the same"
+    )
+    recurring_item_detection_enabled: bool = Field(
+        default=True,
+        description="Link action items and decisions that repeat ones from earlier meetings in the workspace"
+    )
+    recurring_item_lookback_days: int = Field(default=90, description="How far back to look for recurring items")
+    meeting_dedup_filter_enabled: bool = Field(
+        default=True,
+        description="Skip the duplicate lookup for meetings a per-workspace Bloom filter has never seen"
+    )
+    meeting_dedup_filter_ttl_seconds: int = Field(default=300, description="Age at which a workspace's filter is rebuilt")
+    meeting_dedup_filter_error_rate: float = Field(default=0.01, description="Bloom filter false positive rate")
+
     # Discord Daily Briefing Configuration
     enable_discord_briefings: bool = Field(default=True, description="Enable automated Discord briefings")
     discord_briefing_hour: int = Field(default=8, description="Hour to send Discord briefings (local time)")
     default_timezone: str = Field(default="UTC", description="Default timezone for briefings")
 
+    # Webhook Queue Configuration
+    webhook_queue_enabled: bool = Field(
+        default=False,
+        description=(
+            "Persist webhook deliveries for the worker pool instead of processing them in the API process; "
+            "enable only where a webhook worker (python -m app.tasks.webhook_worker) is deployed"
+        )
+    )
+    webhook_worker_concurrency: int = Field(default=8, description="Webhook events processed at once per worker process")
+    webhook_worker_workspace_limit: int = Field(default=2, description="Webhook events processed at once per workspace")
+    webhook_lease_seconds: int = Field(default=300, description="Time a claimed webhook event is reserved for its worker")
+    webhook_max_attempts: int = Field(default=5, description="Processing attempts before a webhook event is dead-lettered")
+    webhook_retry_base_seconds: float = Field(default=10.0, description="First retry delay; doubles on each attempt")
+    webhook_retry_max_seconds: float = Field(default=900.0, description="Longest retry delay")
+    webhook_poll_interval_seconds: float = Field(default=1.0, description="Idle wait between queue polls")
+
     # Vector Search Configuration
     embedding_dimension: int = Field(default=1536, description="Dimension of embedding vectors")
     vector_similarity_threshold: float = Field(default=0.7, description="Minimum similarity score for vector search")
+    vector_search_ef_search: Optional[int] = Field(
+        default=None,
+        description="HNSW ef_search used by vector searches (server default when unset)"
+    )
+    vector_search_probes: Optional[int] = Field(
+        default=None,
+        description="IVFFlat probes used by vector searches (server default when unset)"
+    )
+    vector_search_backend: str = Field(
+        default="pgvector",
+        description="Vector search backend: pgvector, or local (in-process HNSW shards on disk, for offline deployments)"
+    )
+    local_vector_index_path: str = Field(default="data/vector_index", description="Directory holding local HNSW shards")
+    local_vector_index_dtype: str = Field(default="float32", description="Local index vector storage: float32 or float16")
+    local_vector_index_m: int = Field(default=16, description="Local HNSW links per node")
+    local_vector_index_ef_construction: int = Field(default=100, description="Local HNSW search width while inserting")
+    local_vector_index_ef_search: int = Field(default=64, description="Local HNSW search width while querying")
+    vector_search_cache_workspaces: int = Field(
+        default=0,
+        description="Most-queried workspaces served from exact in-memory shards in front of pgvector (0 disables)"
+    )
+    vector_search_cache_ttl_seconds: int = Field(default=300, description="Age after which a cached shard is refreshed")
+    vector_search_cache_min_queries: int = Field(default=20, description="Searches before a workspace is cached")
+    vector_search_cache_max_rows: int = Field(default=5000, description="Largest workspace (in rows) worth caching")
+    hybrid_search_candidates: int = Field(default=50, description="Results taken from each retriever before fusion")
+    hybrid_search_rrf_k: int = Field(default=60, description="Reciprocal rank fusion damping constant")
+    federated_search_candidates: int = Field(default=30, description="Nearest rows taken from each table before merging")
+    federated_search_min_similarity: float = Field(
+        default=0.3,
+        description="Raw cosine similarity a row needs to appear in federated results, whatever its table's scores"
+    )
+    federated_search_timeout_ms: int = Field(
+        default=2000,
+        description="Time a federated search waits for slow tables before returning without them"
+    )
+    embedding_backend: str = Field(
+        default="auto",
+        description=(
+            "Embedding backend: openai, hashing (local and deterministic, for development and tests) "
+            "or auto (openai when a key is set, otherwise embeddings are disabled)"
+        )
+    )
+    openai_api_key: Optional[str] = Field(default=None, description="OpenAI API key used for embeddings")
+    embedding_model: str = Field(default="text-embedding-3-small", description="OpenAI embedding model")
+    embedding_pipeline_enabled: bool = Field(default=True, description="Embed transcript chunks during ingestion")
+    embedding_batch_size: int = Field(default=256, description="Texts per embedding request")
+    embedding_max_concurrency: int = Field(default=4, description="Embedding requests in flight per process")
+    embedding_batch_wait_ms: int = Field(
+        default=50,
+        description="Time a partial batch waits for chunks from concurrent ingestions"
+    )
 
     @validator("environment")
     def validate_environment(cls, v):
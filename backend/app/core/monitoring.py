@@ -3,7 +3,7 @@ Prometheus Metrics Collection and Monitoring
 Centralized metrics for observability and monitoring
 """
 import time
-from typing import Callable, Optional
+from typing import Callable, Dict, Optional
 from functools import wraps
 
 from prometheus_client import (
@@ -129,6 +129,57 @@ task_syncs_total = Counter(
     registry=registry
 )
 
+kpi_syncs_total = Counter(
+    'kpi_syncs_total',
+    'Total workspace KPI syncs',
+    ['source', 'status'],
+    registry=registry
+)
+
+kpi_sync_duration_seconds = Histogram(
+    'kpi_sync_duration_seconds',
+    'Workspace KPI sync duration in seconds',
+    ['source'],
+    buckets=(0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0, 120.0),
+    registry=registry
+)
+
+kpi_sync_rate_limit_wait_seconds = Counter(
+    'kpi_sync_rate_limit_wait_seconds',
+    'Total seconds KPI syncs waited on integration rate limits',
+    ['source'],
+    registry=registry
+)
+
+kpi_sync_workspaces = Gauge(
+    'kpi_sync_workspaces',
+    'Workspaces in the current KPI sync run by state',
+    ['state'],
+    registry=registry
+)
+
+webhook_events_total = Counter(
+    'webhook_events_total',
+    'Webhook events by outcome (enqueued, duplicate, processed, retried, dead)',
+    ['platform', 'status'],
+    registry=registry
+)
+
+webhook_processing_duration_seconds = Histogram(
+    'webhook_processing_duration_seconds',
+    'Webhook event processing duration in seconds',
+    ['platform'],
+    buckets=(0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0, 120.0, 300.0),
+    registry=registry
+)
+
+webhook_queue_depth = Gauge(
+    'webhook_queue_depth',
+    'Unfinished webhook events by queue state',
+    ['state'],
+    registry=registry
+)
+
 vector_searches_total = Counter(
     'vector_searches_total',
     'Total vector searches performed',
@@ -373,6 +424,42 @@ class MetricsRecorder:
         """Record meeting summary generation"""
         meeting_summaries_generated_total.labels(source=source).inc()
 
+    @staticmethod
+    def record_kpi_sync(source: str, status: str, duration: float, rate_limit_wait: float = 0.0):
+        """Record a workspace KPI sync"""
+        kpi_syncs_total.labels(source=source, status=status).inc()
+        kpi_sync_duration_seconds.labels(source=source).observe(duration)
+        if rate_limit_wait > 0.0:
+            kpi_sync_rate_limit_wait_seconds.labels(source=source).inc(rate_limit_wait)
+
+    @staticmethod
+    def update_kpi_sync_progress(pending: int, running: int, completed: int):
+        """Update KPI sync run progress gauges"""
+        kpi_sync_workspaces.labels(state="pending").set(pending)
+        kpi_sync_workspaces.labels(state="running").set(running)
+        kpi_sync_workspaces.labels(state="completed").set(completed)
+
+    @staticmethod
+    def record_webhook_event(platform: str, status: str, duration: Optional[float] = None):
+        """Record a webhook event outcome"""
+        webhook_events_total.labels(platform=platform, status=status).inc()
+        if duration is not None:
+            webhook_processing_duration_seconds.labels(platform=platform).observe(duration)
+
+    @staticmethod
+    def update_webhook_queue_depth(depth: Dict[str, int]):
+        """Update webhook queue depth gauges"""
+        for state in ("pending", "leased", "dead"):
+            webhook_queue_depth.labels(state=state).set(depth.get(state, 0))
+
+    @staticmethod
+    def record_cache_lookup(cache_type: str, hit: bool):
+        """Record a cache hit or miss"""
+        if hit:
+            cache_hits_total.labels(cache_type=cache_type).inc()
+        else:
+            cache_misses_total.labels(cache_type=cache_type).inc()
+
     @staticmethod
     def record_vector_search(duration: float, success: bool):
         """Record vector search operation"""
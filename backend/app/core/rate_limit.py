@@ -0,0 +1,124 @@
+"""
+Rate Limiting Primitives
+Async token buckets and concurrency caps for calls to external platforms
+"""
+import asyncio
+import time
+import weakref
+from typing import Dict, Optional
+
+
+class TokenBucket:
+    """
+    Async token bucket
+
+    Holds up to `capacity` tokens and refills at `rate` tokens per second.
+    acquire() waits until enough tokens are available, so callers sharing a
+    bucket are paced to the configured rate with bursts up to the capacity.
+    """
+
+    def __init__(self, rate: float, capacity: float):
+        """
+        Initialize token bucket
+
+        Args:
+            rate: Tokens added per second
+            capacity: Maximum tokens held (burst size)
+        """
+        if rate <= 0 or capacity <= 0:
+            raise ValueError("Token bucket rate and capacity must be positive")
+
+        self.rate = rate
+        self.capacity = capacity
+        self.tokens = capacity
+        self.updated_at = time.monotonic()
+        self._lock = asyncio.Lock()
+
+    def _refill(self) -> None:
+        now = time.monotonic()
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated_at) * self.rate)
+        self.updated_at = now
+
+    async def acquire(self, tokens: float = 1.0) -> float:
+        """
+        Take tokens, waiting for the bucket to refill if needed
+
+        Args:
+            tokens: Number of tokens to take
+
+        Returns:
+            Seconds spent waiting
+        """
+        if tokens > self.capacity:
+            raise ValueError(f"Cannot acquire {tokens} tokens from a bucket of {self.capacity}")
+
+        waited = 0.0
+        async with self._lock:
+            self._refill()
+            while self.tokens < tokens:
+                delay = (tokens - self.tokens) / self.rate
+                await asyncio.sleep(delay)
+                waited += delay
+                self._refill()
+            self.tokens -= tokens
+        return waited
+
+
+class TokenBucketRegistry:
+    """Token buckets keyed by name (e.g. one per integration platform)"""
+
+    def __init__(self, rate: float, capacity: float):
+        """
+        Initialize registry
+
+        Args:
+            rate: Default tokens per second for new buckets
+            capacity: Default burst size for new buckets
+        """
+        self.rate = rate
+        self.capacity = capacity
+        self._buckets: Dict[str, TokenBucket] = {}
+
+    def get(self, key: str) -> TokenBucket:
+        """Get or create the bucket for a key"""
+        if key not in self._buckets:
+            self._buckets[key] = TokenBucket(self.rate, self.capacity)
+        return self._buckets[key]
+
+
+class ConcurrencyLimiterRegistry:
+    """
+    Semaphores keyed by name (e.g. one per LLM provider) capping in-flight calls
+
+    Semaphores are kept per event loop, since an asyncio semaphore cannot be
+    shared between loops.
+    """
+
+    def __init__(self, limit: int):
+        """
+        Initialize registry
+
+        Args:
+            limit: Maximum concurrent holders per key
+        """
+        if limit <= 0:
+            raise ValueError("Concurrency limit must be positive")
+
+        self.limit = limit
+        self._by_loop: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, Dict[str, asyncio.Semaphore]]" = (
+            weakref.WeakKeyDictionary()
+        )
+        self._no_loop: Dict[str, asyncio.Semaphore] = {}
+
+    def get(self, key: str) -> asyncio.Semaphore:
+        """Get or create the semaphore for a key in the running event loop"""
+        loop: Optional[asyncio.AbstractEventLoop]
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            loop = None
+
+        semaphores = self._no_loop if loop is None else self._by_loop.setdefault(loop, {})
+        if key not in semaphores:
+            semaphores[key] = asyncio.Semaphore(self.limit)
+        return semaphores[key]
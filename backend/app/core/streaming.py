@@ -0,0 +1,125 @@
+"""
+Streaming Responses
+Server-sent events and NDJSON framing for incremental API results
+"""
+import asyncio
+import json
+import logging
+from enum import Enum
+from typing import Any, AsyncIterator, Awaitable, Callable, Dict
+
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import StreamingResponse
+
+
+logger = logging.getLogger(__name__)
+
+
+class StreamFormat(str, Enum):
+    """Wire formats for streamed events"""
+    SSE = "sse"
+    NDJSON = "ndjson"
+
+
+MEDIA_TYPES = {
+    StreamFormat.SSE: "text/event-stream",
+    StreamFormat.NDJSON: "application/x-ndjson",
+}
+
+
+def format_event(event: str, data: Any, stream_format: StreamFormat = StreamFormat.SSE) -> str:
+    """
+    Frame one event for the wire
+
+    Args:
+        event: Event name (e.g. "summary", "token", "complete")
+        data: JSON-serializable payload (models, UUIDs and datetimes are encoded)
+        stream_format: SSE or NDJSON
+
+    Returns:
+        Framed event text
+    """
+    payload = jsonable_encoder(data)
+    if stream_format == StreamFormat.NDJSON:
+        return json.dumps({"event": event, "data": payload}) + "\n"
+    return f"event: {event}\ndata: {json.dumps(payload)}\n\n"
+
+
+EventCallback = Callable[[str, Any], Awaitable[None]]
+
+
+async def stream_callback_events(
+    run: Callable[[EventCallback], Awaitable[Any]],
+    complete: Callable[[Any], Any] = lambda result: result
+) -> AsyncIterator[Dict[str, Any]]:
+    """
+    Turn a coroutine that reports progress through a callback into an event stream
+
+    run() is started as a task with an on_event(name, data) callback; every
+    reported event is yielded as {"event": name, "data": data}, followed by
+    a "complete" event carrying complete(result). Errors from run()
+    propagate to the consumer, and closing the iterator early cancels run().
+
+    Args:
+        run: Coroutine factory taking the on_event callback
+        complete: Maps run()'s result to the "complete" payload
+
+    Yields:
+        Event dicts
+    """
+    queue: asyncio.Queue = asyncio.Queue()
+
+    async def on_event(event: str, data: Any) -> None:
+        await queue.put({"event": event, "data": data})
+
+    task = asyncio.create_task(run(on_event))
+    task.add_done_callback(lambda _: queue.put_nowait(None))
+
+    try:
+        while True:
+            item = await queue.get()
+            if item is None:
+                break
+            yield item
+
+        yield {"event": "complete", "data": complete(task.result())}
+    finally:
+        if not task.done():
+            task.cancel()
+
+
+async def _frame_events(
+    events: AsyncIterator[Dict[str, Any]],
+    stream_format: StreamFormat
+) -> AsyncIterator[str]:
+    try:
+        async for item in events:
+            yield format_event(item["event"], item.get("data"), stream_format)
+    except Exception as e:
+        # Headers are already sent, so failures are reported in-band
+        logger.error(f"Stream failed: {str(e)}")
+        yield format_event("error", {"detail": str(e)}, stream_format)
+
+
+def stream_events(
+    events: AsyncIterator[Dict[str, Any]],
+    stream_format: StreamFormat = StreamFormat.SSE
+) -> StreamingResponse:
+    """
+    Stream {"event", "data"} dicts as SSE or NDJSON
+
+    An exception raised by the event source ends the stream with an
+    "error" event.
+
+    Args:
+        events: Async iterator of {"event": name, "data": payload}
+        stream_format: SSE or NDJSON
+
+    Returns:
+        StreamingResponse with proxy buffering disabled
+    """
+    return StreamingResponse(
+        _frame_events(events, stream_format),
+        media_type=MEDIA_TYPES[stream_format],
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
@@ -9,11 +9,18 @@ ZeroDB provides PostgreSQL with 60+ database service endpoints including:
 - Graph queries
 - And more...
 """
+import asyncio
 import logging
-from typing import Optional, AsyncGenerator, Any, Dict, List
+import re
+import threading
+import time
+import weakref
+from functools import lru_cache
+from typing import Optional, AsyncGenerator, Any, Callable, Dict, List, Tuple
 from contextlib import asynccontextmanager
 
 import asyncpg
+from pgvector.asyncpg import register_vector
 import psycopg2
 from psycopg2 import pool
 from sqlalchemy import create_engine, text
@@ -21,6 +28,8 @@ from sqlalchemy.orm import sessionmaker, Session
 from sqlalchemy.ext.asyncio import create_async_engine, AsyncSession, async_sessionmaker
 
 from app.config import get_settings
+from app.core.monitoring import MetricsRecorder
+from app.services.local_vector_index import get_local_vector_index, get_vector_search_cache
 
 logger = logging.getLogger(__name__)
 
@@ -89,7 +98,8 @@ class DatabaseManager:
                     user=self.settings.zerodb_user,
                     password=self.settings.zerodb_password,
                     min_size=1,
-                    max_size=self.settings.db_pool_size
+                    max_size=self.settings.db_pool_size,
+                    init=_init_connection
                 )
                 logger.info("ZeroDB async connection pool initialized")
             except Exception as e:
@@ -302,6 +312,37 @@ async def get_db_context() -> AsyncGenerator[AsyncSession, None]:
             await session.close()
 
 
+# Per-session locks serializing work handed to threads by run_in_session
+_session_locks: "weakref.WeakKeyDictionary[Session, threading.Lock]" = weakref.WeakKeyDictionary()
+
+
+async def run_in_session(db: Session, func: Callable[..., Any], *args: Any) -> Any:
+    """
+    Run blocking work on a sync session in a worker thread
+
+    Keeps the event loop free while SQLAlchemy blocks on the database, so
+    asyncio timeouts and concurrent workspace syncs keep running. A
+    cancelled caller cannot stop the thread; calls on one session are
+    serialized, so closing the session through this function waits for
+    work still in flight.
+
+    Args:
+        db: Database session the work uses
+        func: Blocking callable
+        *args: Arguments for func
+
+    Returns:
+        Result of func
+    """
+    lock = _session_locks.setdefault(db, threading.Lock())
+
+    def locked_call() -> Any:
+        with lock:
+            return func(*args)
+
+    return await asyncio.to_thread(locked_call)
+
+
 # Utility functions for common database operations
 
 async def execute_query(
@@ -336,17 +377,73 @@ async def execute_query(
         raise
 
 
+VECTOR_IDENTIFIER = re.compile(r"^[A-Za-z_][A-Za-z0-9_]*(\.[A-Za-z_][A-Za-z0-9_]*)?$")
+
+
+async def _init_connection(conn: asyncpg.Connection) -> None:
+    """Register the pgvector binary codec on a new pool connection"""
+    try:
+        await register_vector(conn)
+    except Exception as e:
+        # Databases without the vector extension still serve everything else
+        logger.warning(f"pgvector codec not registered: {str(e)}")
+
+
+def _quote_identifier(name: str) -> str:
+    """Quote a (schema-qualified) table or column name"""
+    if not VECTOR_IDENTIFIER.match(name):
+        raise ValueError(f"Invalid identifier: {name}")
+    return ".".join(f'"{part}"' for part in name.split("."))
+
+
+@lru_cache(maxsize=128)
+def _vector_search_sql(table: str, embedding_column: str, filter_workspace: bool) -> str:
+    """
+    Build the nearest-neighbour query for a table and vector column
+
+    The text is identical for every search on the same (table, column),
+    so each pooled connection prepares it once and reuses the plan from
+    asyncpg's statement cache. Parameters: $1 query vector, $2 limit,
+    $3 maximum cosine distance, $4 workspace ID.
+    """
+    column = _quote_identifier(embedding_column)
+    workspace_filter = "AND t.workspace_id = $4" if filter_workspace else ""
+
+    # The inner query is the index scan; the similarity cut runs on its output
+    return f"""
+        SELECT nearest.*, 1 - nearest.distance AS similarity
+        FROM (
+            SELECT t.*, t.{column} <=> $1 AS distance
+            FROM {_quote_identifier(table)} t
+            WHERE t.{column} IS NOT NULL
+            {workspace_filter}
+            ORDER BY distance
+            LIMIT $2
+        ) nearest
+        WHERE nearest.distance < $3
+        ORDER BY nearest.distance
+    """
+
+
 async def vector_search(
     table: str,
     embedding_column: str,
     query_embedding: List[float],
     similarity_threshold: float = 0.7,
     limit: int = 10,
-    workspace_id: Optional[str] = None
+    workspace_id: Optional[str] = None,
+    ef_search: Optional[int] = None,
+    probes: Optional[int] = None
 ) -> List[Dict[str, Any]]:
     """
     Perform vector similarity search using pgvector via ZeroDB
 
+    The query vector is sent as a binary bound parameter and the cosine
+    distance is computed once per row, by the index scan. With the local
+    backend configured, the search runs on in-process HNSW shards instead;
+    with the cache enabled, the busiest workspaces are answered from
+    in-memory shards loaded from pgvector.
+
     Args:
         table: Table name with vector column
         embedding_column: Name of the vector column
@@ -354,37 +451,127 @@ async def vector_search(
         similarity_threshold: Minimum similarity score (0-1)
         limit: Maximum number of results
         workspace_id: Optional workspace filter for RLS
+        ef_search: HNSW candidate list size for this query (default: settings)
+        probes: IVFFlat lists scanned for this query (default: settings)
 
     Returns:
-        List of similar records with similarity scores
+        List of similar records with distance and similarity scores
     """
+    settings = get_settings()
+    start = time.perf_counter()
     try:
-        # Convert embedding to string format for PostgreSQL
-        embedding_str = f"[{','.join(map(str, query_embedding))}]"
+        if settings.vector_search_backend == "local":
+            results = get_local_vector_index().search(
+                table, embedding_column, query_embedding, similarity_threshold, limit, workspace_id, ef_search
+            )
+            MetricsRecorder.record_vector_search(time.perf_counter() - start, True)
+            return results
+
+        cache = get_vector_search_cache() if workspace_id is not None else None
+        if cache is not None:
+            results = await cache.search(
+                table, embedding_column, query_embedding, similarity_threshold, limit, workspace_id,
+                loader=_load_vector_rows
+            )
+            if results is not None:
+                MetricsRecorder.record_vector_search(time.perf_counter() - start, True)
+                return results
 
-        # Build query with optional workspace filter
-        where_clause = ""
-        if workspace_id:
-            where_clause = f"WHERE workspace_id = '{workspace_id}'"
+        query = _vector_search_sql(table, embedding_column, workspace_id is not None)
+        args = [query_embedding, limit, 1 - similarity_threshold]
+        if workspace_id is not None:
+            args.append(workspace_id)
 
-        query = f"""
-            SELECT *,
-                   1 - ({embedding_column} <=> '{embedding_str}'::vector) as similarity
-            FROM {table}
-            {where_clause}
-            WHERE 1 - ({embedding_column} <=> '{embedding_str}'::vector) > {similarity_threshold}
-            ORDER BY {embedding_column} <=> '{embedding_str}'::vector
-            LIMIT {limit}
-        """
-
-        results = await execute_query(query, fetch_all=True)
+        results = await fetch_vector_query(query, *args, ef_search=ef_search, probes=probes)
+        MetricsRecorder.record_vector_search(time.perf_counter() - start, True)
         return [dict(row) for row in results]
 
     except Exception as e:
+        MetricsRecorder.record_vector_search(time.perf_counter() - start, False)
         logger.error(f"Vector search failed: {str(e)}")
         raise
 
 
+# Column list selected by _load_vector_rows, per (table, vector column)
+_vector_row_columns: Dict[Tuple[str, str], str] = {}
+
+
+async def _vector_row_select(conn: asyncpg.Connection, table: str, embedding_column: str) -> str:
+    """The vector column plus every column except other vector and text search columns"""
+    key = (table, embedding_column)
+    if key not in _vector_row_columns:
+        schema, _, name = table.rpartition(".")
+        rows = await conn.fetch(
+            """
+            SELECT column_name FROM information_schema.columns
+            WHERE table_schema = $1 AND table_name = $2
+            AND udt_name NOT IN ('vector', 'halfvec', 'tsvector')
+            ORDER BY ordinal_position
+            """,
+            schema or "public",
+            name
+        )
+        columns = [embedding_column] + [row["column_name"] for row in rows if row["column_name"] != embedding_column]
+        _vector_row_columns[key] = ", ".join("t." + '"' + column.replace('"', '""') + '"' for column in columns)
+    return _vector_row_columns[key]
+
+
+async def _load_vector_rows(
+    table: str,
+    embedding_column: str,
+    workspace_id: str,
+    limit: int
+) -> List[asyncpg.Record]:
+    """Up to `limit` embedded rows of a workspace, for the vector search cache"""
+    column = _quote_identifier(embedding_column)
+    pool = await db_manager._get_async_pool()
+    async with pool.acquire() as conn:
+        query = f"""
+            SELECT {await _vector_row_select(conn, table, embedding_column)}
+            FROM {_quote_identifier(table)} t
+            WHERE t.{column} IS NOT NULL
+            AND t.workspace_id = $1
+            LIMIT $2
+        """
+        return await conn.fetch(query, workspace_id, limit)
+
+
+async def fetch_vector_query(
+    query: str,
+    *args: Any,
+    ef_search: Optional[int] = None,
+    probes: Optional[int] = None
+) -> List[asyncpg.Record]:
+    """
+    Run a query that scans a vector index, with per-query index tuning
+
+    Args:
+        query: SQL query with positional parameters
+        *args: Query parameters
+        ef_search: HNSW candidate list size (default: settings)
+        probes: IVFFlat lists scanned (default: settings)
+
+    Returns:
+        Result rows
+    """
+    settings = get_settings()
+    ef_search = ef_search if ef_search is not None else settings.vector_search_ef_search
+    probes = probes if probes is not None else settings.vector_search_probes
+
+    pool = await db_manager._get_async_pool()
+    async with pool.acquire() as conn:
+        if not (ef_search or probes):
+            return await conn.fetch(query, *args)
+
+        # Index settings apply to this query's transaction only
+        async with conn.transaction():
+            if ef_search:
+                await conn.execute("SELECT set_config('hnsw.ef_search', $1, true)", str(ef_search))
+            if probes:
+                await conn.execute("SELECT set_config('ivfflat.probes', $1, true)", str(probes))
+            return await conn.fetch(query, *args)
+
+
 async def execute_rpc(
     function_name: str,
     params: Optional[Dict[str, Any]] = None
@@ -416,6 +603,23 @@ async def execute_rpc(
         raise
 
 
+def is_unique_violation(error: Exception) -> bool:
+    """
+    Whether a database error is a unique constraint violation
+
+    Recognizes PostgREST/asyncpg errors carrying SQLSTATE 23505 and falls
+    back to the Postgres message text for clients that only expose it.
+
+    Args:
+        error: Exception raised by an insert
+
+    Returns:
+        True if the insert conflicted with an existing row
+    """
+    code = getattr(error, "code", None) or getattr(error, "sqlstate", None)
+    return code == "23505" or "duplicate key value" in str(error)
+
+
 def get_supabase_client():
     """
     Legacy function for backward compatibility with older services
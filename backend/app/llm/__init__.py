@@ -2,18 +2,32 @@
 LLM Provider Package
 Abstraction layer for multiple LLM providers
 """
-from app.llm.llm_provider import LLMProvider, LLMResponse, LLMConfig
+from app.llm.llm_provider import LLMProvider, LLMResponse, LLMConfig, BoundedLLMProvider
 from app.llm.openai_provider import OpenAIProvider
 from app.llm.anthropic_provider import AnthropicProvider
 from app.llm.deepseek_provider import DeepSeekProvider
 from app.llm.ollama_provider import OllamaProvider
+from app.llm.response_cache import CachedLLMProvider, LLMResponseCache
+from app.llm.transcript_chunker import TranscriptChunker
+from app.llm.provider_router import RoutingLLMProvider
+from app.llm.request_coalescing import CoalescingLLMProvider
+from app.llm.embeddings import EmbeddingBackend, HashingEmbeddingBackend, OpenAIEmbeddingBackend
 
 __all__ = [
     "LLMProvider",
     "LLMResponse",
     "LLMConfig",
+    "BoundedLLMProvider",
     "OpenAIProvider",
     "AnthropicProvider",
     "DeepSeekProvider",
-    "OllamaProvider"
+    "OllamaProvider",
+    "CachedLLMProvider",
+    "LLMResponseCache",
+    "TranscriptChunker",
+    "RoutingLLMProvider",
+    "CoalescingLLMProvider",
+    "EmbeddingBackend",
+    "HashingEmbeddingBackend",
+    "OpenAIEmbeddingBackend"
 ]
@@ -21,6 +21,13 @@ class AnthropicProvider(LLMProvider):
         "claude-3-haiku-20240307": {"input": 0.25, "output": 1.25},
     }
 
+    CONTEXT_WINDOWS = {
+        "claude-3-5-sonnet-20241022": 200000,
+        "claude-3-opus-20240229": 200000,
+        "claude-3-sonnet-20240229": 200000,
+        "claude-3-haiku-20240307": 200000,
+    }
+
     def __init__(self, config: LLMConfig):
         super().__init__(config)
         self.client = AsyncAnthropic(api_key=config.api_key)
@@ -19,6 +19,11 @@ class DeepSeekProvider(LLMProvider):
         "deepseek-coder": {"input": 0.14, "output": 0.28},
     }
 
+    CONTEXT_WINDOWS = {
+        "deepseek-chat": 64000,
+        "deepseek-coder": 64000,
+    }
+
     def __init__(self, config: LLMConfig):
         super().__init__(config)
         self.base_url = config.base_url or "https://api.deepseek.com/v1"
@@ -0,0 +1,172 @@
+"""
+Embedding Backends
+Text embedding providers used by the embedding pipeline
+"""
+import hashlib
+import re
+from abc import ABC, abstractmethod
+from typing import Dict, List, Optional
+
+import numpy as np
+
+from app.config import get_settings
+
+
+TOKEN_PATTERN = re.compile(r"[a-z0-9]+(?:'[a-z]+)?")
+
+
+class EmbeddingBackend(ABC):
+    """Abstract base class for embedding providers"""
+
+    @property
+    @abstractmethod
+    def model_name(self) -> str:
+        """Model identifier; vectors from different models are never mixed"""
+        pass
+
+    @property
+    @abstractmethod
+    def dimension(self) -> int:
+        """Length of the returned vectors"""
+        pass
+
+    @property
+    def max_batch_size(self) -> int:
+        """Most texts accepted by one embed_batch call"""
+        return 256
+
+    @abstractmethod
+    async def embed_batch(self, texts: List[str]) -> List[List[float]]:
+        """
+        Embed texts in one request
+
+        Args:
+            texts: Texts to embed (at most max_batch_size)
+
+        Returns:
+            One vector per text, in order
+        """
+        pass
+
+
+class HashingEmbeddingBackend(EmbeddingBackend):
+    """
+    Deterministic local embedder using signed feature hashing
+
+    Words and adjacent word pairs are hashed into `dimension` buckets and
+    the vector is L2-normalized, so cosine similarity tracks word overlap.
+    Needs no network or model download, which makes it the backend for
+    offline development and tests.
+    """
+
+    def __init__(self, dimension: int = 1536):
+        self._dimension = dimension
+
+    @property
+    def model_name(self) -> str:
+        return f"hashing-{self._dimension}"
+
+    @property
+    def dimension(self) -> int:
+        return self._dimension
+
+    @property
+    def max_batch_size(self) -> int:
+        return 4096
+
+    async def embed_batch(self, texts: List[str]) -> List[List[float]]:
+        """Embed texts by hashing their words and word pairs"""
+        return [self.embed_text(text) for text in texts]
+
+    def embed_text(self, text: str) -> List[float]:
+        """
+        Embed a single text
+
+        Args:
+            text: Text to embed
+
+        Returns:
+            Unit-length vector (all zeros for text without words)
+        """
+        vector = np.zeros(self._dimension, dtype=np.float32)
+        tokens = TOKEN_PATTERN.findall(text.lower())
+        features = tokens + [f"{a} {b}" for a, b in zip(tokens, tokens[1:])]
+
+        for feature in features:
+            digest = hashlib.blake2b(feature.encode(), digest_size=8).digest()
+            bucket = int.from_bytes(digest[:4], "little") % self._dimension
+            vector[bucket] += 1.0 if digest[4] & 1 else -1.0
+
+        norm = np.linalg.norm(vector)
+        if norm > 0:
+            vector /= norm
+        return vector.tolist()
+
+
+class OpenAIEmbeddingBackend(EmbeddingBackend):
+    """OpenAI embeddings API backend"""
+
+    def __init__(self, api_key: str, model_name: str = "text-embedding-3-small", dimension: int = 1536):
+        from openai import AsyncOpenAI
+
+        self.client = AsyncOpenAI(api_key=api_key)
+        self._model_name = model_name
+        self._dimension = dimension
+
+    @property
+    def model_name(self) -> str:
+        return self._model_name
+
+    @property
+    def dimension(self) -> int:
+        return self._dimension
+
+    @property
+    def max_batch_size(self) -> int:
+        return 2048
+
+    async def embed_batch(self, texts: List[str]) -> List[List[float]]:
+        """Embed texts with one embeddings API request"""
+        response = await self.client.embeddings.create(
+            model=self._model_name,
+            input=texts,
+            dimensions=self._dimension
+        )
+        return [item.embedding for item in sorted(response.data, key=lambda item: item.index)]
+
+
+def get_embedding_backend(api_keys: Optional[Dict[str, str]] = None) -> Optional[EmbeddingBackend]:
+    """
+    Build the configured embedding backend
+
+    The OpenAI key comes from api_keys, falling back to settings. With
+    embedding_backend "auto", OpenAI is used when a key is available and
+    embeddings are disabled otherwise; the hashing embedder is only used
+    when configured explicitly, since its vectors do not match OpenAI's.
+
+    Args:
+        api_keys: Available API keys (default: settings)
+
+    Returns:
+        Embedding backend, or None when embeddings are disabled
+
+    Raises:
+        ValueError: If the OpenAI backend is configured without a key
+    """
+    settings = get_settings()
+    api_key = (api_keys or {}).get("openai") or settings.openai_api_key
+    backend = settings.embedding_backend
+
+    if backend == "hashing":
+        return HashingEmbeddingBackend(dimension=settings.embedding_dimension)
+
+    if backend == "openai" or (backend == "auto" and api_key):
+        if not api_key:
+            raise ValueError("OpenAI embedding backend requires an OpenAI API key")
+        return OpenAIEmbeddingBackend(
+            api_key,
+            model_name=settings.embedding_model,
+            dimension=settings.embedding_dimension
+        )
+
+    return None
@@ -2,6 +2,7 @@
 LLM Provider Base Class
 Abstract interface for all LLM providers
 """
+import asyncio
 import logging
 from abc import ABC, abstractmethod
 from typing import Dict, Any, List, Optional
@@ -10,6 +11,8 @@ from dataclasses import dataclass
 
 from pydantic import BaseModel, Field
 
+from app.core.rate_limit import ConcurrencyLimiterRegistry
+
 
 class LLMProviderType(str, Enum):
     """Supported LLM providers"""
@@ -74,6 +77,10 @@ class LLMProvider(ABC):
     - calculate_cost(): Calculate API cost
     """
 
+    # Context window (prompt + completion tokens) per model
+    CONTEXT_WINDOWS: Dict[str, int] = {}
+    DEFAULT_CONTEXT_WINDOW = 4096
+
     def __init__(self, config: LLMConfig):
         """
         Initialize provider
@@ -155,6 +162,25 @@ class LLMProvider(ABC):
         """
         pass
 
+    def count_tokens_batch(self, texts: List[str]) -> List[int]:
+        """
+        Count tokens for many texts at once
+
+        Providers with a local tokenizer override this to encode in one pass.
+
+        Args:
+            texts: Input texts
+
+        Returns:
+            Number of tokens per text
+        """
+        return [self.count_tokens(text) for text in texts]
+
+    @property
+    def context_window(self) -> int:
+        """Maximum prompt plus completion tokens for the configured model"""
+        return self.CONTEXT_WINDOWS.get(self.config.model_name, self.DEFAULT_CONTEXT_WINDOW)
+
     @abstractmethod
     def calculate_cost(self, prompt_tokens: int, completion_tokens: int) -> float:
         """
@@ -194,6 +220,69 @@ class LLMProvider(ABC):
         return True
 
 
+class BoundedLLMProvider:
+    """
+    Provider wrapper that caps concurrent completions
+
+    Every complete() call, and every stream_complete() stream for its full
+    duration, holds the semaphore for the wrapped provider, so stages and
+    chunk fan-outs running concurrently share one per-provider limit. All
+    other attributes are delegated to the wrapped provider.
+    """
+
+    def __init__(self, provider: LLMProvider, semaphore: asyncio.Semaphore):
+        """
+        Initialize bounded provider
+
+        Args:
+            provider: Provider to wrap
+            semaphore: Semaphore shared by all callers of this provider
+        """
+        self.provider = provider
+        self.semaphore = semaphore
+
+    async def complete(self, *args, **kwargs) -> LLMResponse:
+        """Generate a completion once a concurrency slot is free"""
+        async with self.semaphore:
+            return await self.provider.complete(*args, **kwargs)
+
+    async def stream_complete(self, *args, **kwargs):
+        """Stream a completion once a concurrency slot is free"""
+        async with self.semaphore:
+            async for text in self.provider.stream_complete(*args, **kwargs):
+                yield text
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(self.provider, name)
+
+
+_concurrency_limits: Optional[ConcurrencyLimiterRegistry] = None
+
+
+def get_provider_concurrency_limits() -> ConcurrencyLimiterRegistry:
+    """Get the process-wide per-provider concurrency limits"""
+    global _concurrency_limits
+    if _concurrency_limits is None:
+        from app.config import get_settings
+        _concurrency_limits = ConcurrencyLimiterRegistry(get_settings().llm_max_concurrent_requests)
+    return _concurrency_limits
+
+
+def bound_provider(provider: LLMProvider, config: LLMConfig) -> BoundedLLMProvider:
+    """
+    Wrap a provider with the shared concurrency cap for its provider type
+
+    Args:
+        provider: Provider instance
+        config: Configuration the provider was created from
+
+    Returns:
+        BoundedLLMProvider
+    """
+    key = getattr(config.provider, "value", str(config.provider))
+    return BoundedLLMProvider(provider, get_provider_concurrency_limits().get(key))
+
+
 def get_provider(config: LLMConfig) -> LLMProvider:
     """
     Factory function to get appropriate LLM provider
@@ -301,3 +390,41 @@ def select_best_provider(
         max_tokens=2000,
         base_url="http://localhost:11434"
     )
+
+
+def select_fallback_providers(
+    primary: LLMConfig,
+    task_type: str = "general",
+    budget_tier: LLMModelTier = LLMModelTier.STANDARD,
+    api_keys: Optional[Dict[str, str]] = None
+) -> List[LLMConfig]:
+    """
+    Select providers to fail over to when the primary is slow or failing
+
+    Every hosted provider with an API key qualifies, at the model
+    select_best_provider would pick for it in this tier (its premium model
+    when the tier has none for that provider).
+
+    Args:
+        primary: Configuration of the primary provider
+        task_type: Type of task (general, summarization, extraction, etc.)
+        budget_tier: Budget tier for model selection
+        api_keys: Available API keys
+
+    Returns:
+        Fallback LLM configurations in preference order (excluding the primary)
+    """
+    api_keys = api_keys or {}
+    fallbacks = []
+    for name in ("openai", "anthropic", "deepseek"):
+        if name == primary.provider.value or not api_keys.get(name):
+            continue
+        single_key = {name: api_keys[name]}
+        config = select_best_provider(task_type, budget_tier, single_key)
+        if config.provider == LLMProviderType.OLLAMA:
+            config = select_best_provider(task_type, LLMModelTier.PREMIUM, single_key)
+        if config.provider == LLMProviderType.OLLAMA:
+            config = select_best_provider(task_type, LLMModelTier.BUDGET, single_key)
+        if config.provider != LLMProviderType.OLLAMA:
+            fallbacks.append(config)
+    return fallbacks
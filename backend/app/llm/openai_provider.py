@@ -22,6 +22,13 @@ class OpenAIProvider(LLMProvider):
         "gpt-3.5-turbo-16k": {"input": 3.0, "output": 4.0},
     }
 
+    CONTEXT_WINDOWS = {
+        "gpt-4-turbo-preview": 128000,
+        "gpt-4": 8192,
+        "gpt-3.5-turbo": 16385,
+        "gpt-3.5-turbo-16k": 16385,
+    }
+
     def __init__(self, config: LLMConfig):
         super().__init__(config)
         self.client = AsyncOpenAI(api_key=config.api_key)
@@ -136,22 +143,30 @@ class OpenAIProvider(LLMProvider):
             self.logger.error(f"OpenAI streaming failed: {str(e)}")
             raise
 
+    def _encoding(self):
+        """Get the tiktoken encoding for the configured model"""
+        encoding_name = "cl100k_base"  # Used by gpt-4 and gpt-3.5-turbo
+        if "gpt-3.5" in self.config.model_name or "gpt-4" in self.config.model_name:
+            return tiktoken.get_encoding(encoding_name)
+        return tiktoken.encoding_for_model(self.config.model_name)
+
     def count_tokens(self, text: str) -> int:
         """Count tokens using tiktoken"""
         try:
-            # Get encoding for model
-            encoding_name = "cl100k_base"  # Used by gpt-4 and gpt-3.5-turbo
-            if "gpt-3.5" in self.config.model_name or "gpt-4" in self.config.model_name:
-                encoding = tiktoken.get_encoding(encoding_name)
-            else:
-                encoding = tiktoken.encoding_for_model(self.config.model_name)
-
-            return len(encoding.encode(text))
+            return len(self._encoding().encode(text))
         except Exception as e:
             self.logger.warning(f"Token counting failed, using estimation: {str(e)}")
             # Fallback: rough estimation (1 token ~= 4 characters)
             return len(text) // 4
 
+    def count_tokens_batch(self, texts: List[str]) -> List[int]:
+        """Count tokens for many texts in one tiktoken batch encode"""
+        try:
+            return [len(tokens) for tokens in self._encoding().encode_batch(texts)]
+        except Exception as e:
+            self.logger.warning(f"Batch token counting failed, using estimation: {str(e)}")
+            return [len(text) // 4 for text in texts]
+
     def calculate_cost(self, prompt_tokens: int, completion_tokens: int) -> float:
         """Calculate cost in USD"""
         pricing = self.PRICING.get(self.config.model_name)
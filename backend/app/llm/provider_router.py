@@ -0,0 +1,384 @@
+"""
+LLM Provider Router
+Latency-aware routing across providers with hedged requests and circuit breaking
+"""
+import asyncio
+import logging
+import time
+from collections import deque
+from typing import Any, Deque, Dict, List, Optional
+
+from app.config import get_settings
+from app.core.monitoring import metrics
+from app.llm.llm_provider import LLMResponse
+
+
+# Each point of error rate adds this multiple of the p95 latency to a provider's score
+ERROR_RATE_PENALTY = 4.0
+
+
+def provider_key(provider: Any) -> str:
+    """Identify a provider by type and model (e.g. "openai:gpt-3.5-turbo")"""
+    config = provider.config
+    return f"{getattr(config.provider, 'value', config.provider)}:{config.model_name}"
+
+
+def _percentile(values: List[float], q: float) -> float:
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(round(q * (len(ordered) - 1))))]
+
+
+class ProviderHealth:
+    """
+    Rolling latency, error rate and circuit breaker for one provider/model
+
+    The circuit opens after `failure_threshold` consecutive failures. Once
+    `cooldown_seconds` have passed it is half-open: a single trial call is
+    let through, and its outcome closes or re-opens the circuit.
+    """
+
+    def __init__(self, window: int = 100, failure_threshold: int = 3, cooldown_seconds: float = 30.0):
+        """
+        Initialize health tracker
+
+        Args:
+            window: Number of recent calls kept for latency and error rate
+            failure_threshold: Consecutive failures that open the circuit
+            cooldown_seconds: Time the circuit stays open before a trial call
+        """
+        self.failure_threshold = failure_threshold
+        self.cooldown_seconds = cooldown_seconds
+        self.latencies: Deque[float] = deque(maxlen=window)
+        self.outcomes: Deque[bool] = deque(maxlen=window)
+        self.consecutive_failures = 0
+        self.opened_at: Optional[float] = None
+        self.trial_in_flight = False
+
+    @property
+    def state(self) -> str:
+        """closed, open or half_open"""
+        if self.opened_at is None:
+            return "closed"
+        if time.monotonic() - self.opened_at >= self.cooldown_seconds:
+            return "half_open"
+        return "open"
+
+    def available(self) -> bool:
+        """Whether a call may be routed here now"""
+        state = self.state
+        return state == "closed" or (state == "half_open" and not self.trial_in_flight)
+
+    def begin(self) -> None:
+        """Mark a call as started (claims the trial slot when half-open)"""
+        if self.state == "half_open":
+            self.trial_in_flight = True
+
+    def record_success(self, latency_ms: float) -> None:
+        self.latencies.append(latency_ms)
+        self.outcomes.append(True)
+        self.consecutive_failures = 0
+        self.opened_at = None
+        self.trial_in_flight = False
+
+    def record_failure(self) -> None:
+        self.outcomes.append(False)
+        self.consecutive_failures += 1
+        if self.trial_in_flight or self.consecutive_failures >= self.failure_threshold:
+            self.opened_at = time.monotonic()
+        self.trial_in_flight = False
+
+    def abandon(self) -> None:
+        """A call was cancelled (e.g. it lost a hedge race); record nothing"""
+        self.trial_in_flight = False
+
+    @property
+    def p50(self) -> Optional[float]:
+        return _percentile(list(self.latencies), 0.5) if self.latencies else None
+
+    @property
+    def p95(self) -> Optional[float]:
+        return _percentile(list(self.latencies), 0.95) if self.latencies else None
+
+    @property
+    def error_rate(self) -> float:
+        return self.outcomes.count(False) / len(self.outcomes) if self.outcomes else 0.0
+
+    def score(self) -> Optional[float]:
+        """Lower is better; None until a call has succeeded"""
+        if not self.latencies:
+            return None
+        return self.p95 * (1 + ERROR_RATE_PENALTY * self.error_rate)
+
+    def snapshot(self) -> Dict[str, Any]:
+        return {
+            "state": self.state,
+            "p50_ms": self.p50,
+            "p95_ms": self.p95,
+            "error_rate": self.error_rate,
+            "calls": len(self.outcomes),
+            "consecutive_failures": self.consecutive_failures
+        }
+
+
+class ProviderHealthRegistry:
+    """ProviderHealth keyed by provider/model, shared by every router in the process"""
+
+    def __init__(self, window: int = 100, failure_threshold: int = 3, cooldown_seconds: float = 30.0):
+        """
+        Initialize registry
+
+        Args:
+            window: Calls kept per provider
+            failure_threshold: Consecutive failures that open a circuit
+            cooldown_seconds: Time a circuit stays open before a trial call
+        """
+        self.window = window
+        self.failure_threshold = failure_threshold
+        self.cooldown_seconds = cooldown_seconds
+        self._health: Dict[str, ProviderHealth] = {}
+
+    def get(self, key: str) -> ProviderHealth:
+        """Get or create the health tracker for a provider key"""
+        if key not in self._health:
+            self._health[key] = ProviderHealth(self.window, self.failure_threshold, self.cooldown_seconds)
+        return self._health[key]
+
+    def snapshot(self) -> Dict[str, Dict[str, Any]]:
+        return {key: health.snapshot() for key, health in self._health.items()}
+
+
+class RoutingLLMProvider:
+    """
+    Provider that routes each call to the healthiest of several providers
+
+    Candidates are ranked by rolling p95 latency weighted by error rate;
+    providers without successful calls yet follow in declared order,
+    providers with an open circuit are skipped, and a provider whose
+    cooldown has passed gets one trial call ahead of the others. A failed call fails over to
+    the next candidate. With hedge_after_ms set, a duplicate request goes
+    to the next candidate if the first has not answered in time, and the
+    first success wins. Token counting, pricing and other attributes are
+    delegated to the first provider.
+    """
+
+    def __init__(
+        self,
+        providers: List[Any],
+        health: Optional[ProviderHealthRegistry] = None,
+        hedge_after_ms: Optional[float] = None
+    ):
+        """
+        Initialize router
+
+        Args:
+            providers: Providers in preference order (each needs .config and async complete())
+            health: Health registry (shared process registry if None)
+            hedge_after_ms: Latency after which a hedged request is sent (None disables hedging)
+        """
+        if not providers:
+            raise ValueError("RoutingLLMProvider needs at least one provider")
+
+        self.providers = providers
+        self.config = providers[0].config
+        self.health = health if health is not None else get_provider_health_registry()
+        self.hedge_after_ms = hedge_after_ms
+        self.logger = logging.getLogger(f"{__name__}.{self.__class__.__name__}")
+
+    def ranked_providers(self) -> List[Any]:
+        """Providers with a closed or trial-ready circuit, best first"""
+        candidates = []
+        for index, provider in enumerate(self.providers):
+            health = self.health.get(provider_key(provider))
+            if not health.available():
+                continue
+            # A half-open provider gets its single trial call first so it can recover
+            score = health.score()
+            candidates.append(((health.state != "half_open", score is None, score or 0.0, index), provider))
+
+        candidates.sort(key=lambda candidate: candidate[0])
+        return [provider for _, provider in candidates]
+
+    async def complete(self, prompt: str, system_prompt: Optional[str] = None, **kwargs) -> LLMResponse:
+        """
+        Generate a completion on the best available provider
+
+        Args:
+            prompt: User prompt/message
+            system_prompt: Optional system message
+            **kwargs: Additional provider-specific parameters
+
+        Returns:
+            LLMResponse from the first provider to succeed
+
+        Raises:
+            RuntimeError: If every provider's circuit is open
+            Exception: The last provider error if every attempt failed
+        """
+        if system_prompt is not None:
+            kwargs["system_prompt"] = system_prompt
+
+        queue = self.ranked_providers()
+        if not queue:
+            raise RuntimeError("No LLM provider available: all circuits are open")
+
+        pending: Dict[asyncio.Task, Any] = {}
+        hedged = False
+        last_error: Optional[BaseException] = None
+
+        def launch(hedge: bool = False) -> None:
+            provider = queue.pop(0)
+            task = asyncio.create_task(self._call(provider, prompt, kwargs, hedge))
+            pending[task] = provider
+
+        launch()
+        try:
+            while pending:
+                can_hedge = self.hedge_after_ms is not None and not hedged and queue and len(pending) == 1
+                done, _ = await asyncio.wait(
+                    pending,
+                    timeout=self.hedge_after_ms / 1000 if can_hedge else None,
+                    return_when=asyncio.FIRST_COMPLETED
+                )
+
+                if not done:
+                    hedged = True
+                    self.logger.info(f"Hedging LLM request to {provider_key(queue[0])}")
+                    launch(hedge=True)
+                    continue
+
+                for task in done:
+                    provider = pending.pop(task)
+                    if task.exception() is None:
+                        return task.result()
+                    last_error = task.exception()
+                    self.logger.warning(f"LLM provider {provider_key(provider)} failed: {str(last_error)}")
+
+                if not pending and queue:
+                    launch()
+        finally:
+            for task in pending:
+                task.cancel()
+            if pending:
+                await asyncio.gather(*pending, return_exceptions=True)
+
+        raise last_error
+
+    async def stream_complete(self, prompt: str, system_prompt: Optional[str] = None, **kwargs):
+        """
+        Stream a completion from the best available provider
+
+        Fails over to the next provider only if nothing has been streamed yet.
+        """
+        if system_prompt is not None:
+            kwargs["system_prompt"] = system_prompt
+
+        candidates = self.ranked_providers()
+        if not candidates:
+            raise RuntimeError("No LLM provider available: all circuits are open")
+
+        last_error: Optional[BaseException] = None
+        for provider in candidates:
+            health = self.health.get(provider_key(provider))
+            health.begin()
+            start = time.monotonic()
+            started = False
+            try:
+                async for text in provider.stream_complete(prompt, **kwargs):
+                    started = True
+                    yield text
+            except Exception as e:
+                health.record_failure()
+                if started:
+                    raise
+                last_error = e
+                self.logger.warning(f"LLM provider {provider_key(provider)} stream failed: {str(e)}")
+                continue
+            except BaseException:
+                # Consumer closed or cancelled the stream: release a half-open trial slot
+                health.abandon()
+                raise
+
+            health.record_success((time.monotonic() - start) * 1000)
+            return
+
+        raise last_error
+
+    async def _call(self, provider: Any, prompt: str, kwargs: Dict[str, Any], hedge: bool) -> LLMResponse:
+        key = provider_key(provider)
+        provider_name, model = key.split(":", 1)
+        health = self.health.get(key)
+        health.begin()
+        start = time.monotonic()
+
+        try:
+            response = await provider.complete(prompt, **kwargs)
+        except asyncio.CancelledError:
+            health.abandon()
+            raise
+        except Exception:
+            duration = time.monotonic() - start
+            health.record_failure()
+            metrics.record_llm_request(provider_name, model, "error", duration)
+            raise
+
+        duration = time.monotonic() - start
+        health.record_success(duration * 1000)
+        metrics.record_llm_request(
+            provider_name,
+            model,
+            "success",
+            duration,
+            input_tokens=response.prompt_tokens,
+            output_tokens=response.completion_tokens,
+            cost=response.cost_usd or 0.0
+        )
+        response.metadata["routed_to"] = key
+        if hedge:
+            response.metadata["hedged"] = True
+        return response
+
+    def stats(self) -> Dict[str, Dict[str, Any]]:
+        """Health snapshot for each routed provider"""
+        return {
+            provider_key(provider): self.health.get(provider_key(provider)).snapshot()
+            for provider in self.providers
+        }
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(self.providers[0], name)
+
+
+_provider_health: Optional[ProviderHealthRegistry] = None
+
+
+def get_provider_health_registry() -> ProviderHealthRegistry:
+    """
+    Get or create singleton provider health registry
+
+    Returns:
+        ProviderHealthRegistry instance configured from settings
+    """
+    global _provider_health
+    if _provider_health is None:
+        settings = get_settings()
+        _provider_health = ProviderHealthRegistry(
+            window=settings.llm_router_latency_window,
+            failure_threshold=settings.llm_router_failure_threshold,
+            cooldown_seconds=settings.llm_router_cooldown_seconds
+        )
+    return _provider_health
+
+
+def route_providers(providers: List[Any]) -> Any:
+    """
+    Route across providers when there is more than one
+
+    Args:
+        providers: Providers in preference order
+
+    Returns:
+        The single provider, or a RoutingLLMProvider configured from settings
+    """
+    if len(providers) == 1:
+        return providers[0]
+    return RoutingLLMProvider(providers, hedge_after_ms=get_settings().llm_router_hedge_after_ms)
@@ -0,0 +1,180 @@
+"""
+LLM Request Coalescing
+Single-flight deduplication of concurrent identical LLM requests
+"""
+import asyncio
+from typing import Any, Awaitable, Callable, Dict, Optional, Tuple
+
+from app.config import get_settings
+from app.core.monitoring import metrics
+from app.llm.llm_provider import LLMConfig, LLMResponse
+from app.llm.response_cache import completion_key
+
+
+COALESCE_TYPE = "llm_inflight"
+
+
+class SingleFlight:
+    """
+    Join concurrent calls with the same key onto one outstanding call
+
+    The first caller for a key runs the call itself; callers arriving while
+    it runs wait on a shared future for its result or error. A waiting
+    caller that is cancelled leaves without disturbing the others, and if
+    the running caller is cancelled its waiters start over (one of them
+    runs the call). Flights are scoped to the running event loop and
+    forgotten as soon as they finish, so nothing is cached.
+    """
+
+    def __init__(self):
+        self._flights: Dict[Tuple[int, str], asyncio.Future] = {}
+        self.started = 0
+        self.joined = 0
+
+    async def do(self, key: str, call: Callable[[], Awaitable[Any]]) -> Tuple[Any, bool]:
+        """
+        Run call() once for all concurrent callers with this key
+
+        Args:
+            key: Request fingerprint
+            call: Coroutine factory run by the first caller
+
+        Returns:
+            (result, joined) where joined is True for callers that shared another's call
+        """
+        loop = asyncio.get_running_loop()
+        flight_key = (id(loop), key)
+
+        while True:
+            flight = self._flights.get(flight_key)
+            if flight is None:
+                break
+
+            self.joined += 1
+            metrics.record_cache_lookup(COALESCE_TYPE, hit=True)
+            try:
+                return await asyncio.shield(flight), True
+            except asyncio.CancelledError:
+                if not flight.cancelled() or asyncio.current_task().cancelling():
+                    raise
+                # The caller running the request was cancelled; start over
+
+        flight = loop.create_future()
+        self._flights[flight_key] = flight
+        self.started += 1
+        metrics.record_cache_lookup(COALESCE_TYPE, hit=False)
+        try:
+            result = await call()
+        except asyncio.CancelledError:
+            flight.cancel()
+            raise
+        except Exception as e:
+            flight.set_exception(e)
+            flight.exception()  # Retrieved here so an unjoined flight does not warn
+            raise
+        else:
+            flight.set_result(result)
+            return result, False
+        finally:
+            if self._flights.get(flight_key) is flight:
+                del self._flights[flight_key]
+
+    def in_flight(self) -> int:
+        """Number of calls currently outstanding"""
+        return len(self._flights)
+
+    def stats(self) -> Dict[str, Any]:
+        """Started and joined call counts"""
+        total = self.started + self.joined
+        return {
+            "in_flight": self.in_flight(),
+            "started": self.started,
+            "joined": self.joined,
+            "join_ratio": self.joined / total if total else 0.0
+        }
+
+
+class CoalescingLLMProvider:
+    """
+    Provider wrapper that shares one completion among concurrent identical requests
+
+    Requests are fingerprinted like response cache keys (provider, model,
+    temperature, system prompt, prompt and extra parameters). A request
+    identical to one already in flight waits for that call instead of
+    issuing its own; joined callers get a copy of the response with no
+    cost and metadata["coalesced"] set. Unlike the response cache this
+    holds nothing once the call returns. All other attributes are
+    delegated to the wrapped provider.
+    """
+
+    def __init__(self, provider: Any, config: LLMConfig, flights: SingleFlight):
+        """
+        Initialize coalescing provider
+
+        Args:
+            provider: Provider to wrap (any object with an async complete())
+            config: Configuration the provider was created from
+            flights: Single-flight group shared by every caller
+        """
+        self.provider = provider
+        self.coalesce_config = config
+        self.flights = flights
+
+    async def complete(self, prompt: str, system_prompt: Optional[str] = None, **kwargs) -> LLMResponse:
+        """
+        Generate a completion, joining an identical request already in flight
+
+        Args:
+            prompt: User prompt/message
+            system_prompt: Optional system message
+            **kwargs: Additional provider-specific parameters
+
+        Returns:
+            LLMResponse
+        """
+        if system_prompt is not None:
+            kwargs["system_prompt"] = system_prompt
+
+        key = completion_key(self.coalesce_config, prompt, kwargs)
+        response, joined = await self.flights.do(key, lambda: self.provider.complete(prompt, **kwargs))
+        if not joined:
+            return response
+        return response.model_copy(update={
+            "cost_usd": 0.0,
+            "metadata": {**response.metadata, "coalesced": True}
+        })
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(self.provider, name)
+
+
+_single_flight: Optional[SingleFlight] = None
+
+
+def get_single_flight() -> SingleFlight:
+    """
+    Get or create singleton single-flight group for LLM requests
+
+    Returns:
+        SingleFlight instance
+    """
+    global _single_flight
+    if _single_flight is None:
+        _single_flight = SingleFlight()
+    return _single_flight
+
+
+def coalesced_provider(provider: Any, config: LLMConfig) -> Any:
+    """
+    Wrap a provider with the shared single-flight group when coalescing is enabled
+
+    Args:
+        provider: Provider instance
+        config: Configuration the provider was created from
+
+    Returns:
+        CoalescingLLMProvider, or the provider itself when coalescing is disabled
+    """
+    if not get_settings().llm_request_coalescing_enabled:
+        return provider
+    return CoalescingLLMProvider(provider, config, get_single_flight())
@@ -0,0 +1,336 @@
+"""
+LLM Response Cache
+Content-addressed cache of LLM completions shared by all providers
+"""
+import hashlib
+import json
+import logging
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from typing import Dict, Any, Optional, Tuple
+
+from app.config import get_settings
+from app.core.monitoring import metrics
+from app.llm.llm_provider import LLMConfig, LLMResponse
+
+
+CACHE_TYPE = "llm_response"
+
+
+def response_cache_key(
+    provider: str,
+    model: str,
+    temperature: float,
+    prompt: str,
+    system_prompt: Optional[str] = None,
+    **params: Any
+) -> str:
+    """
+    Content hash identifying a completion request
+
+    Args:
+        provider: Provider name
+        model: Model name
+        temperature: Sampling temperature
+        prompt: User prompt
+        system_prompt: Optional system prompt
+        **params: Any other request parameters that change the output
+
+    Returns:
+        Hex SHA-256 digest
+    """
+    payload = json.dumps(
+        {
+            "provider": provider,
+            "model": model,
+            "temperature": temperature,
+            "system_prompt": system_prompt,
+            "prompt": prompt,
+            "params": params
+        },
+        sort_keys=True,
+        default=str
+    )
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+def completion_key(config: LLMConfig, prompt: str, kwargs: Dict[str, Any]) -> str:
+    """
+    Key for a complete() call, filling unset parameters from the provider config
+
+    Args:
+        config: Configuration the provider was created from
+        prompt: User prompt
+        kwargs: Keyword arguments passed to complete(), including system_prompt
+
+    Returns:
+        Key from response_cache_key
+    """
+    params = dict(kwargs)
+    return response_cache_key(
+        provider=getattr(config.provider, "value", str(config.provider)),
+        model=params.pop("model", config.model_name),
+        temperature=params.pop("temperature", config.temperature),
+        prompt=prompt,
+        system_prompt=params.pop("system_prompt", None),
+        max_tokens=params.pop("max_tokens", config.max_tokens),
+        **params
+    )
+
+
+class LLMResponseCache:
+    """
+    In-process LRU/TTL cache of LLM responses with an optional SQLite store
+
+    The SQLite store survives restarts and is shared by workers on the same
+    host; entries there expire by TTL and are pruned periodically.
+    """
+
+    PRUNE_EVERY_WRITES = 100
+
+    def __init__(
+        self,
+        ttl_seconds: int = 86400,
+        max_entries: int = 1024,
+        sqlite_path: Optional[str] = None
+    ):
+        """
+        Initialize the cache
+
+        Args:
+            ttl_seconds: Lifetime of cached responses
+            max_entries: Maximum responses held in process
+            sqlite_path: Optional SQLite database file for the persistent store
+        """
+        self.logger = logging.getLogger(__name__)
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[str, Tuple[float, LLMResponse]]" = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+        self._db: Optional[sqlite3.Connection] = None
+        self._db_lock = threading.Lock()
+        self._writes = 0
+        if sqlite_path:
+            try:
+                self._db = sqlite3.connect(sqlite_path, check_same_thread=False)
+                self._db.execute("""
+                    CREATE TABLE IF NOT EXISTS llm_response_cache (
+                        key TEXT PRIMARY KEY,
+                        response TEXT NOT NULL,
+                        expires_at REAL NOT NULL
+                    )
+                """)
+                self._db.commit()
+            except Exception as e:
+                self.logger.error(f"Error opening LLM response cache store: {str(e)}")
+                self._db = None
+
+    def get(self, key: str) -> Optional[LLMResponse]:
+        """
+        Look up a cached response
+
+        Args:
+            key: Key from response_cache_key
+
+        Returns:
+            Cached LLMResponse or None on a miss
+        """
+        response = self._get_local(key)
+
+        if response is None and self._db is not None:
+            try:
+                with self._db_lock:
+                    row = self._db.execute(
+                        "SELECT response, expires_at FROM llm_response_cache WHERE key = ?",
+                        (key,)
+                    ).fetchone()
+                if row and row[1] > time.time():
+                    response = LLMResponse.model_validate_json(row[0])
+                    self._set_local(key, response, ttl=row[1] - time.time())
+            except Exception as e:
+                self.logger.error(f"Error reading LLM response cache store: {str(e)}")
+
+        if response is None:
+            self.misses += 1
+        else:
+            self.hits += 1
+        metrics.record_cache_lookup(CACHE_TYPE, hit=response is not None)
+        return response
+
+    def put(self, key: str, response: LLMResponse) -> None:
+        """
+        Cache a response
+
+        Args:
+            key: Key from response_cache_key
+            response: Provider response
+        """
+        self._set_local(key, response)
+
+        if self._db is None:
+            return
+        try:
+            with self._db_lock:
+                self._db.execute(
+                    "INSERT OR REPLACE INTO llm_response_cache (key, response, expires_at) VALUES (?, ?, ?)",
+                    (key, response.model_dump_json(), time.time() + self.ttl_seconds)
+                )
+                self._writes += 1
+                if self._writes % self.PRUNE_EVERY_WRITES == 0:
+                    self._db.execute("DELETE FROM llm_response_cache WHERE expires_at < ?", (time.time(),))
+                self._db.commit()
+        except Exception as e:
+            self.logger.error(f"Error writing LLM response cache store: {str(e)}")
+
+    def clear(self) -> None:
+        """Drop every entry, including the persistent store"""
+        self._entries.clear()
+        self.hits = 0
+        self.misses = 0
+        if self._db is not None:
+            with self._db_lock:
+                self._db.execute("DELETE FROM llm_response_cache")
+                self._db.commit()
+
+    def stats(self) -> Dict[str, Any]:
+        """Cache size and hit ratio"""
+        lookups = self.hits + self.misses
+        return {
+            "entries": len(self._entries),
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_ratio": self.hits / lookups if lookups else 0.0,
+            "persistent_store": self._db is not None
+        }
+
+    def _get_local(self, key: str) -> Optional[LLMResponse]:
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+
+        expires_at, response = entry
+        if expires_at < time.monotonic():
+            del self._entries[key]
+            return None
+
+        self._entries.move_to_end(key)
+        return response
+
+    def _set_local(self, key: str, response: LLMResponse, ttl: Optional[float] = None) -> None:
+        self._entries[key] = (time.monotonic() + (self.ttl_seconds if ttl is None else ttl), response)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+
+class CachedLLMProvider:
+    """
+    Provider wrapper that serves repeated completions from an LLMResponseCache
+
+    Requests are keyed by provider, model, temperature, system prompt,
+    prompt and any extra parameters. Pass use_cache=False to complete() for
+    calls whose output should differ on every run. A refreshing provider
+    never serves cached responses but stores the new ones, so a forced
+    regeneration replaces what later requests get. Cache hits cost nothing
+    and are marked with metadata["cache_hit"]. All other attributes are
+    delegated to the wrapped provider.
+    """
+
+    def __init__(self, provider: Any, config: LLMConfig, cache: LLMResponseCache, refresh: bool = False):
+        """
+        Initialize cached provider
+
+        Args:
+            provider: Provider to wrap (any object with an async complete())
+            config: Configuration the provider was created from
+            cache: Response cache
+            refresh: Skip cache lookups and overwrite entries with new responses
+        """
+        self.provider = provider
+        self.cache_config = config
+        self.cache = cache
+        self.refresh = refresh
+
+    async def complete(
+        self,
+        prompt: str,
+        system_prompt: Optional[str] = None,
+        use_cache: bool = True,
+        **kwargs
+    ) -> LLMResponse:
+        """
+        Generate a completion, reusing a cached response for identical requests
+
+        Args:
+            prompt: User prompt/message
+            system_prompt: Optional system message
+            use_cache: Set False to bypass the cache for non-deterministic calls
+            **kwargs: Additional provider-specific parameters
+
+        Returns:
+            LLMResponse
+        """
+        if system_prompt is not None:
+            kwargs["system_prompt"] = system_prompt
+
+        if not use_cache:
+            return await self.provider.complete(prompt, **kwargs)
+
+        key = completion_key(self.cache_config, prompt, kwargs)
+
+        cached = None if self.refresh else self.cache.get(key)
+        if cached is not None:
+            return cached.model_copy(update={
+                "cost_usd": 0.0,
+                "latency_ms": 0,
+                "metadata": {**cached.metadata, "cache_hit": True}
+            })
+
+        response = await self.provider.complete(prompt, **kwargs)
+        self.cache.put(key, response)
+        return response
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(self.provider, name)
+
+
+_llm_response_cache: Optional[LLMResponseCache] = None
+
+
+def get_llm_response_cache() -> LLMResponseCache:
+    """
+    Get or create singleton LLM response cache
+
+    Returns:
+        LLMResponseCache instance configured from settings
+    """
+    global _llm_response_cache
+    if _llm_response_cache is None:
+        settings = get_settings()
+        _llm_response_cache = LLMResponseCache(
+            ttl_seconds=settings.llm_response_cache_ttl_seconds,
+            max_entries=settings.llm_response_cache_max_entries,
+            sqlite_path=settings.llm_response_cache_sqlite_path
+        )
+    return _llm_response_cache
+
+
+def cached_provider(provider: Any, config: LLMConfig, refresh: bool = False) -> Any:
+    """
+    Wrap a provider with the shared response cache when caching is enabled
+
+    Args:
+        provider: Provider instance
+        config: Configuration the provider was created from
+        refresh: Bypass cached responses, replacing them with new ones
+
+    Returns:
+        CachedLLMProvider, or the provider itself when caching is disabled
+    """
+    if not get_settings().llm_response_cache_enabled:
+        return provider
+    return CachedLLMProvider(provider, config, get_llm_response_cache(), refresh=refresh)
@@ -0,0 +1,372 @@
+"""
+Transcript Chunker
+Token-aware transcript splitting shared by the meeting chains and ingestion
+"""
+import asyncio
+import hashlib
+import re
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any, Callable, List, Optional, Sequence, Tuple
+
+from app.config import get_settings
+
+
+SPEAKER_PATTERN = re.compile(r"\s*(?:\[[^\]\n]*\]\s*)?([A-Z][\w.'\- ]{0,40}?):\s")
+LINE_PATTERN = re.compile(r"[^\n]+")
+SENTENCE_PATTERN = re.compile(r"\S[^\n]*?(?:[.!?]+[\"')\]]*(?=\s)|$)")
+WORD_PATTERN = re.compile(r"\S+")
+
+# A speaker turn that does not fit is moved whole to the next chunk once the
+# current chunk is at least this full
+TURN_BREAK_FILL = 0.5
+MIN_CHUNK_TOKENS = 256
+
+BatchCounter = Callable[[List[str]], List[int]]
+
+
+def count_words(texts: List[str]) -> List[int]:
+    """Word counts, the fallback when no provider tokenizer is available"""
+    return [len(text.split()) for text in texts]
+
+
+@dataclass(frozen=True)
+class TextChunk:
+    """One chunk of a transcript, as a span of the original text"""
+    text: str
+    index: int
+    token_count: int
+    start_char: int
+    end_char: int
+    speaker: Optional[str] = None
+
+
+@dataclass
+class _Unit:
+    start: int
+    end: int
+    speaker: Optional[str]
+    turn_start: bool
+
+
+class ChunkPlanCache:
+    """LRU cache of chunk plans keyed by transcript hash, budget and tokenizer"""
+
+    def __init__(self, max_entries: int = 64):
+        """
+        Initialize cache
+
+        Args:
+            max_entries: Maximum chunk plans held
+        """
+        self.max_entries = max_entries
+        self._plans: "OrderedDict[Tuple, Tuple[TextChunk, ...]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key: Tuple) -> Optional[Tuple[TextChunk, ...]]:
+        """Get a cached plan"""
+        with self._lock:
+            plan = self._plans.get(key)
+            if plan is None:
+                self.misses += 1
+                return None
+            self._plans.move_to_end(key)
+            self.hits += 1
+            return plan
+
+    def put(self, key: Tuple, plan: Tuple[TextChunk, ...]) -> None:
+        """Cache a plan"""
+        with self._lock:
+            self._plans[key] = plan
+            self._plans.move_to_end(key)
+            while len(self._plans) > self.max_entries:
+                self._plans.popitem(last=False)
+
+    def clear(self) -> None:
+        """Drop every plan"""
+        with self._lock:
+            self._plans.clear()
+            self.hits = 0
+            self.misses = 0
+
+
+class TranscriptChunker:
+    """
+    Split transcripts into chunks that fit a token budget
+
+    The transcript is segmented into sentences within speaker turns, every
+    segment is counted in one batch call to the tokenizer, and segments are
+    packed greedily up to max_tokens. A turn that does not fit is moved whole
+    to the next chunk when the current chunk is already half full, and each
+    new chunk repeats up to overlap_tokens of whole sentences from the end of
+    the previous one. Sentences longer than the budget are split on words.
+
+    Plans are cached by transcript hash, so chains that chunk the same
+    transcript with the same provider share one split.
+    """
+
+    def __init__(
+        self,
+        max_tokens: int,
+        overlap_tokens: int = 0,
+        count_tokens_batch: Optional[BatchCounter] = None,
+        tokenizer_key: str = "words",
+        cache: Optional[ChunkPlanCache] = None
+    ):
+        """
+        Initialize chunker
+
+        Args:
+            max_tokens: Maximum tokens per chunk
+            overlap_tokens: Tokens of trailing context repeated in the next chunk
+            count_tokens_batch: Function counting tokens for a list of texts (word counts if None)
+            tokenizer_key: Identifies the tokenizer in cache keys
+            cache: Chunk plan cache (shared process cache if None)
+        """
+        if max_tokens <= 0:
+            raise ValueError("max_tokens must be greater than 0")
+        if overlap_tokens < 0 or overlap_tokens >= max_tokens:
+            raise ValueError("overlap_tokens must be non-negative and less than max_tokens")
+
+        self.max_tokens = max_tokens
+        self.overlap_tokens = overlap_tokens
+        self.count_tokens_batch = count_tokens_batch or count_words
+        self.tokenizer_key = tokenizer_key
+        self.cache = cache if cache is not None else get_chunk_plan_cache()
+
+    @classmethod
+    def for_provider(
+        cls,
+        provider: Any,
+        max_tokens: Optional[int] = None,
+        overlap_tokens: Optional[int] = None
+    ) -> "TranscriptChunker":
+        """
+        Build a chunker sized to a provider's tokenizer and context window
+
+        Args:
+            provider: LLM provider (or wrapper); word counts are used if it has no tokenizer
+            max_tokens: Explicit chunk budget (derived from the context window if None)
+            overlap_tokens: Overlap between chunks (from settings if None)
+
+        Returns:
+            TranscriptChunker
+        """
+        settings = get_settings()
+        counter, tokenizer_key = _provider_counter(provider)
+
+        if max_tokens is None:
+            max_tokens = chunk_token_budget(provider)
+        if overlap_tokens is None:
+            overlap_tokens = settings.transcript_chunk_overlap_tokens
+        overlap_tokens = min(overlap_tokens, max_tokens // 4)
+
+        return cls(
+            max_tokens=max_tokens,
+            overlap_tokens=overlap_tokens,
+            count_tokens_batch=counter,
+            tokenizer_key=tokenizer_key
+        )
+
+    def split(self, transcript: Optional[str]) -> List[TextChunk]:
+        """
+        Split a transcript into chunks
+
+        Args:
+            transcript: Full transcript text
+
+        Returns:
+            List of TextChunk in transcript order
+        """
+        if not transcript or not transcript.strip():
+            return []
+
+        key = (
+            hashlib.sha256(transcript.encode("utf-8")).hexdigest(),
+            self.max_tokens,
+            self.overlap_tokens,
+            self.tokenizer_key
+        )
+        plan = self.cache.get(key)
+        if plan is None:
+            plan = tuple(self._plan(transcript))
+            self.cache.put(key, plan)
+        return list(plan)
+
+    def split_text(self, transcript: Optional[str]) -> List[str]:
+        """Split a transcript and return just the chunk texts"""
+        return [chunk.text for chunk in self.split(transcript)]
+
+    def _plan(self, transcript: str) -> List[TextChunk]:
+        units = self._segment(transcript)
+        counts = self.count_tokens_batch([transcript[u.start:u.end] for u in units])
+        units, counts = self._split_oversized(transcript, units, counts)
+
+        # Tokens from each turn-starting unit to the end of its turn
+        turn_tokens = [0] * len(units)
+        running = 0
+        for i in range(len(units) - 1, -1, -1):
+            running += counts[i]
+            if units[i].turn_start:
+                turn_tokens[i] = running
+                running = 0
+
+        chunks: List[TextChunk] = []
+        current: List[int] = []
+        used = 0
+
+        def emit():
+            chunks.append(TextChunk(
+                text=transcript[units[current[0]].start:units[current[-1]].end],
+                index=len(chunks),
+                token_count=used,
+                start_char=units[current[0]].start,
+                end_char=units[current[-1]].end,
+                speaker=units[current[0]].speaker
+            ))
+
+        for i, unit in enumerate(units):
+            overflow = used + counts[i] > self.max_tokens
+            turn_break = (
+                unit.turn_start
+                and used >= self.max_tokens * TURN_BREAK_FILL
+                and used + turn_tokens[i] > self.max_tokens
+            )
+            if current and (overflow or turn_break):
+                emit()
+                tail: List[int] = []
+                tail_tokens = 0
+                for j in reversed(current):
+                    if tail_tokens + counts[j] > self.overlap_tokens:
+                        break
+                    tail.insert(0, j)
+                    tail_tokens += counts[j]
+                if tail_tokens + counts[i] > self.max_tokens:
+                    tail, tail_tokens = [], 0
+                current, used = tail, tail_tokens
+
+            current.append(i)
+            used += counts[i]
+
+        if current:
+            emit()
+        return chunks
+
+    def _segment(self, transcript: str) -> List[_Unit]:
+        """Sentences within lines; each line starts a turn"""
+        units: List[_Unit] = []
+        speaker = None
+        for line in LINE_PATTERN.finditer(transcript):
+            label = SPEAKER_PATTERN.match(transcript, line.start(), line.end())
+            if label:
+                speaker = label.group(1).strip()
+
+            first = True
+            for sentence in SENTENCE_PATTERN.finditer(transcript, line.start(), line.end()):
+                units.append(_Unit(sentence.start(), sentence.end(), speaker, first))
+                first = False
+        return units
+
+    def _split_oversized(
+        self,
+        transcript: str,
+        units: List[_Unit],
+        counts: Sequence[int]
+    ) -> Tuple[List[_Unit], List[int]]:
+        """Split units over the budget on words (or characters for a single long word)"""
+        result_units: List[_Unit] = []
+        result_counts: List[int] = []
+        for unit, tokens in zip(units, counts):
+            for piece, piece_tokens in self._fit(transcript, unit, tokens):
+                result_units.append(piece)
+                result_counts.append(piece_tokens)
+        return result_units, result_counts
+
+    def _fit(self, transcript: str, unit: _Unit, tokens: int) -> List[Tuple[_Unit, int]]:
+        if tokens <= self.max_tokens or unit.end - unit.start <= 1:
+            return [(unit, tokens)]
+
+        pieces = self._split_unit(transcript, unit, tokens)
+        piece_counts = self.count_tokens_batch([transcript[p.start:p.end] for p in pieces])
+
+        fitted: List[Tuple[_Unit, int]] = []
+        for piece, piece_tokens in zip(pieces, piece_counts):
+            fitted.extend(self._fit(transcript, piece, piece_tokens))
+        return fitted
+
+    def _split_unit(self, transcript: str, unit: _Unit, tokens: int) -> List[_Unit]:
+        words = [(m.start(), m.end()) for m in WORD_PATTERN.finditer(transcript, unit.start, unit.end)]
+        if len(words) > 1:
+            per_piece = max(1, len(words) * self.max_tokens // tokens)
+            spans = [
+                (words[k][0], words[min(k + per_piece, len(words)) - 1][1])
+                for k in range(0, len(words), per_piece)
+            ]
+        else:
+            width = max(1, (unit.end - unit.start) * self.max_tokens // tokens)
+            spans = [(s, min(s + width, unit.end)) for s in range(unit.start, unit.end, width)]
+
+        return [
+            _Unit(start, end, unit.speaker, unit.turn_start and k == 0)
+            for k, (start, end) in enumerate(spans)
+        ]
+
+
+def _provider_counter(provider: Any) -> Tuple[BatchCounter, str]:
+    """Use the provider's batch tokenizer when it returns real counts"""
+    counter = getattr(provider, "count_tokens_batch", None)
+    if callable(counter):
+        try:
+            probe = counter(["probe"])
+        except Exception:
+            probe = None
+        if asyncio.iscoroutine(probe):
+            probe.close()
+        elif isinstance(probe, list) and all(isinstance(n, int) for n in probe):
+            config = getattr(provider, "config", None)
+            provider_name = getattr(getattr(config, "provider", None), "value", "unknown")
+            return counter, f"{provider_name}:{getattr(config, 'model_name', 'unknown')}"
+    return count_words, "words"
+
+
+def chunk_token_budget(provider: Any) -> int:
+    """
+    Largest chunk that fits the provider's context window
+
+    Leaves room for the completion (config.max_tokens) and the prompt
+    template, and never exceeds the configured chunk size.
+
+    Args:
+        provider: LLM provider (or wrapper)
+
+    Returns:
+        Token budget per chunk
+    """
+    settings = get_settings()
+    budget = settings.transcript_chunk_max_tokens
+
+    window = getattr(provider, "context_window", None)
+    completion = getattr(getattr(provider, "config", None), "max_tokens", None)
+    if isinstance(window, int) and isinstance(completion, int):
+        available = window - completion - settings.transcript_chunk_prompt_reserve_tokens
+        budget = min(budget, max(MIN_CHUNK_TOKENS, available))
+    return budget
+
+
+_chunk_plan_cache: Optional[ChunkPlanCache] = None
+
+
+def get_chunk_plan_cache() -> ChunkPlanCache:
+    """
+    Get or create singleton chunk plan cache
+
+    Returns:
+        ChunkPlanCache instance configured from settings
+    """
+    global _chunk_plan_cache
+    if _chunk_plan_cache is None:
+        _chunk_plan_cache = ChunkPlanCache(max_entries=get_settings().transcript_chunk_cache_size)
+    return _chunk_plan_cache
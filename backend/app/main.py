@@ -62,6 +62,18 @@ async def lifespan(app: FastAPI):
         if settings.environment == "production":
             raise
 
+    # Initialize the webhook queue; events are processed by the webhook worker processes
+    if settings.webhook_queue_enabled:
+        try:
+            from app.database import get_supabase_client
+            from app.services.webhook_queue import init_webhook_queue
+            if init_webhook_queue(get_supabase_client()):
+                logger.info("Webhook queue initialized")
+            else:
+                logger.warning("Webhook queue unavailable, webhooks will be processed in the API process")
+        except Exception as e:
+            logger.error(f"Failed to initialize webhook queue: {str(e)}")
+
     # Initialize background tasks
     if settings.enable_health_checks:
         try:
@@ -74,6 +74,11 @@ class ActionItem(BaseModel):
     # Tags
     tags: List[str] = Field(default_factory=list)
 
+    # Recurrence across meetings (see app/services/recurrence_service.py)
+    minhash_signature: Optional[List[int]] = None
+    lsh_bands: List[str] = Field(default_factory=list)
+    duplicate_of: Optional[UUID] = None  # Same item from an earlier meeting
+
     class Config:
         json_schema_extra = {
             "example": {
@@ -34,6 +34,7 @@ class DetectionMethod(str, Enum):
     IQR = "iqr"
     MOVING_AVERAGE = "moving_average"
     SEASONAL_DECOMPOSITION = "seasonal_decomposition"
+    CHANGE_POINT = "change_point"
     THRESHOLD = "threshold"
     MACHINE_LEARNING = "machine_learning"
 
@@ -213,7 +214,7 @@ class MetricAnalysis(BaseModel):
     time_range: Dict[str, datetime]
     current_value: float
     previous_value: float
-    change: Dict[str, float] = Field(
+    change: Dict[str, Any] = Field(
         ...,
         description="Change information (absolute, percentage, direction)"
     )
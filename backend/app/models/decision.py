@@ -83,6 +83,11 @@ class Decision(BaseModel):
     follow_up_needed: bool = False
     follow_up_notes: Optional[str] = None
 
+    # Recurrence across meetings (see app/services/recurrence_service.py)
+    minhash_signature: Optional[List[int]] = None
+    lsh_bands: List[str] = Field(default_factory=list)
+    duplicate_of: Optional[UUID] = None  # Same item from an earlier meeting
+
     class Config:
         json_schema_extra = {
             "example": {
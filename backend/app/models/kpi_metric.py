@@ -146,6 +146,10 @@ class KPITimeSeriesResponse(BaseModel):
         None,
         description="Trend information (direction, percentage_change)"
     )
+    rollups: Optional[Dict[str, List[Dict[str, Any]]]] = Field(
+        None,
+        description="Daily, weekly and monthly rollups (count, sum, mean, min, max, last)"
+    )
 
 
 class DerivedMetric(BaseModel):
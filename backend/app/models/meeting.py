@@ -90,6 +90,7 @@ class Meeting(BaseModel):
 
     # Metadata
     metadata: MeetingMetadata = Field(default_factory=MeetingMetadata)
+    duplicate_hash: Optional[str] = None  # Source + platform ID hash, unique per workspace
 
     # Vector embeddings
     embedding: Optional[List[float]] = None
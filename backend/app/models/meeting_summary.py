@@ -16,6 +16,7 @@ class SummarizationMethod(str, Enum):
     ABSTRACTIVE = "abstractive"
     HYBRID = "hybrid"
     MULTI_STAGE = "multi_stage"
+    HIERARCHICAL = "hierarchical"
 
 
 class SentimentScore(str, Enum):
@@ -112,6 +113,7 @@ class SummaryGenerationRequest(BaseModel):
     meeting_id: UUID
     force_regenerate: bool = False
     llm_provider: Optional[str] = None  # Override default provider
+    summarization_method: SummarizationMethod = SummarizationMethod.MULTI_STAGE  # hierarchical for long transcripts
     include_sentiment: bool = True
     extract_action_items: bool = True
     extract_decisions: bool = True
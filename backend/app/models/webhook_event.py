@@ -0,0 +1,40 @@
+"""
+Webhook Event Data Models
+Queued webhook deliveries awaiting processing by the worker pool
+"""
+from datetime import datetime
+from enum import Enum
+from typing import Any, Dict, Optional
+from uuid import UUID
+
+from pydantic import BaseModel, Field
+
+
+class WebhookEventStatus(str, Enum):
+    """Webhook event queue state"""
+    PENDING = "pending"  # Waiting for a worker (or for its retry time)
+    LEASED = "leased"  # Claimed by a worker until leased_until
+    PROCESSED = "processed"
+    DEAD = "dead"  # Gave up after max_attempts
+
+
+class WebhookEvent(BaseModel):
+    """Webhook delivery stored in mcp.webhook_events"""
+    id: UUID
+    platform: str  # zoom, fireflies, otter
+    event_type: str
+    payload: Dict[str, Any] = Field(default_factory=dict)
+    idempotency_key: str
+    workspace_key: Optional[str] = None  # Platform account the event belongs to
+
+    # Queue state
+    status: WebhookEventStatus = WebhookEventStatus.PENDING
+    attempts: int = 0
+    max_attempts: int = 5
+    available_at: Optional[datetime] = None
+    leased_until: Optional[datetime] = None
+    leased_by: Optional[str] = None
+    error_message: Optional[str] = None
+
+    received_at: Optional[datetime] = None
+    processed_at: Optional[datetime] = None
@@ -3,15 +3,20 @@ Anomaly Detection Service
 Service for detecting anomalies and analyzing trends in KPI data
 """
 import logging
+from collections import OrderedDict
 from datetime import datetime, timedelta
-from typing import List, Optional, Dict, Any
+from typing import List, Optional, Dict, Any, Tuple
 from uuid import UUID
 
 from app.algorithms.zscore_detector import ZScoreDetector
 from app.algorithms.iqr_detector import IQRDetector
 from app.algorithms.trend_analyzer import TrendAnalyzer
 from app.algorithms.seasonal_decomposition import SeasonalDecomposer
+from app.algorithms.online_detector import OnlineAnomalyDetector, OnlineMetricState
+from app.algorithms.batch_detector import BatchAnomalyDetector, SeriesBatch
+from app.algorithms.change_point import ChangePointDetector
 from app.models.anomaly import (
+    AnomalyType,
     AnomalyCreate,
     AnomalyResponse,
     TrendCreate,
@@ -21,6 +26,7 @@ from app.models.anomaly import (
 )
 from app.models.kpi_metric import AggregationPeriod
 from app.database import get_supabase_client
+from app.services.kpi_series_cache import get_kpi_series_cache
 
 
 logger = logging.getLogger(__name__)
@@ -29,9 +35,16 @@ logger = logging.getLogger(__name__)
 class AnomalyDetectionService:
     """Service for detecting anomalies and trends in time-series data"""
 
+    # Streaming states kept in memory; evicted ones are reloaded from kpi_detector_state
+    MAX_ONLINE_STATES = 10000
+    # Batch loads: metrics per data point query, and rows per page (PostgREST max-rows)
+    METRICS_PER_QUERY = 20
+    DATA_PAGE_SIZE = 1000
+
     def __init__(self):
         self.supabase = get_supabase_client()
         self.logger = logging.getLogger(__name__)
+        self.series_cache = get_kpi_series_cache()
 
         # Initialize detectors
         self.zscore_detector = ZScoreDetector(threshold=3.0)
@@ -39,6 +52,23 @@ class AnomalyDetectionService:
         self.trend_analyzer = TrendAnalyzer(significance_threshold=0.10)
         self.seasonal_decomposer = SeasonalDecomposer(seasonal_period=7)
 
+        # Streaming detection state, keyed by (workspace_id, metric_id)
+        self.online_detector = OnlineAnomalyDetector(
+            zscore_threshold=3.0,
+            iqr_multiplier=1.5,
+            seasonal_period=7
+        )
+        self._online_states: "OrderedDict[Tuple[str, str], OnlineMetricState]" = OrderedDict()
+        self.change_detector = ChangePointDetector(window_size=14, method="cusum")
+
+        # Vectorized multi-metric analysis sharing the detector configuration
+        self.batch_detector = BatchAnomalyDetector(
+            zscore_detector=self.zscore_detector,
+            iqr_detector=self.iqr_detector,
+            trend_analyzer=self.trend_analyzer,
+            seasonal_decomposer=self.seasonal_decomposer
+        )
+
     async def analyze_metric(
         self,
         metric_id: UUID,
@@ -101,50 +131,207 @@ class AnomalyDetectionService:
             # Calculate statistics
             statistics = self.zscore_detector.get_statistics(values)
 
-            # Get current and previous values
-            current_value = values[-1] if values else 0.0
-            previous_value = values[-2] if len(values) >= 2 else current_value
+            return self._build_analysis(
+                metric_id, metric, values, timestamps, anomalies, trends, statistics
+            )
+
+        except Exception as e:
+            self.logger.error(f"Error analyzing metric {metric_id}: {str(e)}")
+            raise
 
-            # Calculate change
-            absolute_change = current_value - previous_value
-            percentage_change = (
-                (absolute_change / abs(previous_value)) * 100
-                if previous_value != 0 else 0.0
+    async def analyze_metrics_batch(
+        self,
+        workspace_id: UUID,
+        metric_ids: Optional[List[UUID]] = None,
+        days_back: int = 30,
+        detection_methods: Optional[List[DetectionMethod]] = None,
+        periods: Optional[List[str]] = None,
+        auto_save: bool = True,
+        errors: Optional[List[str]] = None
+    ) -> List[MetricAnalysis]:
+        """
+        Analyze many metrics of a workspace in one vectorized pass
+
+        Loads metric metadata and data points in a few paged queries, packs
+        all series into a padded matrix, runs every detector across all
+        series at once and bulk-inserts the resulting anomalies and trends.
+        Results match calling analyze_metric for each metric.
+
+        A metric whose data cannot be loaded or analyzed is left out of the
+        results and reported in errors; the other metrics are unaffected.
+
+        Args:
+            workspace_id: Workspace ID
+            metric_ids: Metrics to analyze (default: all active metrics)
+            days_back: Number of days of historical data to analyze
+            detection_methods: Methods to use (default: ZSCORE and IQR)
+            periods: Trend periods to analyze (default: WoW, MoM)
+            auto_save: Whether to save detected anomalies and trends
+            errors: List receiving one message per metric that failed
+
+        Returns:
+            MetricAnalysis for each analyzed metric, in metric query order
+        """
+        if errors is None:
+            errors = []
+        try:
+            metrics_query = self.supabase.table("kpi_metrics").select("*").eq(
+                "workspace_id", str(workspace_id)
             )
+            if metric_ids:
+                metrics_query = metrics_query.in_("id", [str(mid) for mid in metric_ids])
+            else:
+                metrics_query = metrics_query.eq("is_active", True)
+
+            metrics = metrics_query.execute().data or []
+            if not metrics:
+                return []
 
-            # Generate insights
-            insights = self._generate_insights(
-                metric,
-                values,
-                anomalies,
-                trends,
-                statistics
+            start_date = datetime.utcnow() - timedelta(days=days_back)
+            points_by_metric, load_errors = await self._get_workspace_metric_data(
+                workspace_id, [m["id"] for m in metrics], start_date
+            )
+            failed = dict(load_errors)
+
+            # Series with fewer than two points get an empty analysis
+            series = []
+            timestamps = []
+            for metric in metrics:
+                data_points = points_by_metric.get(str(metric["id"]), [])
+                if str(metric["id"]) in failed or len(data_points) < 2:
+                    continue
+                try:
+                    timestamps.append([
+                        datetime.fromisoformat(dp["timestamp"].replace("Z", "+00:00")) for dp in data_points
+                    ])
+                    series.append((metric, data_points))
+                except Exception as e:
+                    failed[str(metric["id"])] = str(e)
+
+            batch = SeriesBatch.from_series(
+                [[dp["value"] for dp in points] for _, points in series],
+                timestamps
             )
 
-            return MetricAnalysis(
-                metric_id=metric_id,
-                metric_name=metric["name"],
-                time_range={
-                    "start": timestamps[0],
-                    "end": timestamps[-1]
-                },
-                current_value=current_value,
-                previous_value=previous_value,
-                change={
-                    "absolute": absolute_change,
-                    "percentage": percentage_change,
-                    "direction": "up" if absolute_change > 0 else "down" if absolute_change < 0 else "stable"
-                },
-                anomalies=anomalies,
-                trends=trends,
-                statistics=statistics,
-                insights=insights
+            detections = self.batch_detector.detect(batch, detection_methods)
+            trend_results = self.batch_detector.analyze_trends(batch, periods)
+            statistics = self.batch_detector.statistics(batch)
+
+            # Build all records first, then write each table in one round trip
+            anomaly_records = []
+            trend_records = []
+            for row, (metric, points) in enumerate(series):
+                try:
+                    metric_anomalies, metric_trends = self._batch_records(
+                        workspace_id, metric, points, timestamps[row], detections[row], trend_results[row]
+                    )
+                except Exception as e:
+                    failed[str(metric["id"])] = str(e)
+                    continue
+                anomaly_records.extend((row, record) for record in metric_anomalies)
+                trend_records.extend((row, record) for record in metric_trends)
+
+            anomalies = self._bulk_create_anomalies([r for _, r in anomaly_records], auto_save)
+            trends = self._bulk_create_trends([r for _, r in trend_records], auto_save)
+
+            anomalies_by_row: Dict[int, List[AnomalyResponse]] = {}
+            for (row, _), anomaly in zip(anomaly_records, anomalies):
+                anomalies_by_row.setdefault(row, []).append(anomaly)
+            trends_by_row: Dict[int, List[TrendResponse]] = {}
+            for (row, _), trend in zip(trend_records, trends):
+                trends_by_row.setdefault(row, []).append(trend)
+
+            analyses = {}
+            for row, (metric, points) in enumerate(series):
+                if str(metric["id"]) in failed:
+                    continue
+                try:
+                    analyses[str(metric["id"])] = self._build_analysis(
+                        UUID(str(metric["id"])),
+                        metric,
+                        [dp["value"] for dp in points],
+                        timestamps[row],
+                        anomalies_by_row.get(row, []),
+                        trends_by_row.get(row, []),
+                        statistics[row]
+                    )
+                except Exception as e:
+                    failed[str(metric["id"])] = str(e)
+
+            for metric in metrics:
+                if str(metric["id"]) in failed:
+                    message = f"Error analyzing metric {metric['id']}: {failed[str(metric['id'])]}"
+                    self.logger.error(message)
+                    errors.append(message)
+
+            self.logger.info(
+                f"Batch analyzed {len(metrics) - len(failed)} metrics for workspace {workspace_id}: "
+                f"{len(anomalies)} anomalies, {len(trends)} trends"
             )
 
+            return [
+                analyses.get(str(metric["id"])) or self._empty_analysis(
+                    UUID(str(metric["id"])), metric["name"]
+                )
+                for metric in metrics
+                if str(metric["id"]) not in failed
+            ]
+
         except Exception as e:
-            self.logger.error(f"Error analyzing metric {metric_id}: {str(e)}")
+            self.logger.error(f"Error batch analyzing workspace {workspace_id}: {str(e)}")
             raise
 
+    def _batch_records(
+        self,
+        workspace_id: UUID,
+        metric: Dict[str, Any],
+        points: List[Dict[str, Any]],
+        timestamps: List[datetime],
+        detections: List[Dict[str, Any]],
+        trend_results: List[Dict[str, Any]]
+    ) -> Tuple[List[AnomalyCreate], List[TrendCreate]]:
+        """Anomaly and trend records for one metric of a batch"""
+        metric_id = UUID(str(metric["id"]))
+        anomalies = []
+        for detection in detections:
+            idx = detection["index"]
+            anomalies.append(AnomalyCreate(
+                metric_id=metric_id,
+                workspace_id=workspace_id,
+                data_point_id=UUID(str(points[idx]["id"])),
+                anomaly_type=detection["anomaly_type"],
+                severity=detection["severity"],
+                detection_method=detection["method"],
+                expected_value=detection["expected_value"],
+                actual_value=points[idx]["value"],
+                deviation=abs(detection["score"]),
+                confidence_score=detection["confidence"],
+                context={
+                    "method": detection["method"].value,
+                    "detected_at": datetime.utcnow().isoformat()
+                }
+            ))
+
+        trends = []
+        for trend in trend_results:
+            end_date = timestamps[-1]
+            trends.append(TrendCreate(
+                metric_id=metric_id,
+                workspace_id=workspace_id,
+                direction=trend["direction"],
+                period=trend["period"],
+                start_date=end_date - timedelta(days=trend["days"]),
+                end_date=end_date,
+                start_value=points[trend["start_index"]]["value"],
+                end_value=points[-1]["value"],
+                percentage_change=trend["percentage_change"],
+                absolute_change=trend["absolute_change"],
+                confidence_score=trend["confidence_score"],
+                is_significant=trend["is_significant"]
+            ))
+
+        return anomalies, trends
+
     async def detect_anomalies(
         self,
         metric_id: UUID,
@@ -254,6 +441,148 @@ class AnomalyDetectionService:
 
         return all_anomalies
 
+    async def score_data_point(
+        self,
+        metric_id: UUID,
+        workspace_id: UUID,
+        data_point_id: UUID,
+        value: float,
+        timestamp: datetime,
+        bootstrap_days: int = 30,
+        auto_save: bool = True
+    ) -> Optional[AnomalyResponse]:
+        """
+        Score a single newly ingested data point in O(1)
+
+        Uses persisted per-metric running state instead of reloading history.
+        State is bootstrapped once from the last `bootstrap_days` of data when
+        no persisted state exists, then updated and saved after every point.
+        Level shifts confirmed by streaming CUSUM change-point detection are
+        reported as TREND_CHANGE anomalies, taking precedence over point
+        detections on the same value.
+
+        Args:
+            metric_id: Metric ID
+            workspace_id: Workspace ID
+            data_point_id: ID of the inserted data point
+            value: Data point value
+            timestamp: Data point timestamp
+            bootstrap_days: History window used when no state exists yet
+            auto_save: Whether to save a detected anomaly
+
+        Returns:
+            Detected anomaly, or None
+        """
+        try:
+            state = await self._load_online_state(
+                metric_id, workspace_id, bootstrap_days, exclude_id=data_point_id
+            )
+            detections = self.online_detector.update(state, value, timestamp)
+            change = self.change_detector.update(state.changes, value, timestamp)
+            await self._save_online_state(metric_id, workspace_id, state)
+
+            if change:
+                # A confirmed level shift explains any point outlier here too
+                return await self._create_anomaly(
+                    metric_id=metric_id,
+                    workspace_id=workspace_id,
+                    data_point_id=data_point_id,
+                    anomaly_type=AnomalyType.TREND_CHANGE,
+                    severity=self.zscore_detector._calculate_severity(abs(change["deviation"])),
+                    detection_method=DetectionMethod.CHANGE_POINT,
+                    expected_value=change["previous_mean"],
+                    actual_value=value,
+                    deviation=abs(change["deviation"]),
+                    confidence=0.8,
+                    auto_save=auto_save
+                )
+
+            if not detections:
+                return None
+
+            # One anomaly per data point, same method precedence as detect_anomalies
+            detection = detections[0]
+            return await self._create_anomaly(
+                metric_id=metric_id,
+                workspace_id=workspace_id,
+                data_point_id=data_point_id,
+                anomaly_type=detection["anomaly_type"],
+                severity=detection["severity"],
+                detection_method=detection["method"],
+                expected_value=detection["expected_value"],
+                actual_value=value,
+                deviation=abs(detection["score"]),
+                confidence=detection["confidence"],
+                auto_save=auto_save
+            )
+
+        except Exception as e:
+            self.logger.error(f"Error scoring data point {data_point_id}: {str(e)}")
+            return None
+
+    async def _load_online_state(
+        self,
+        metric_id: UUID,
+        workspace_id: UUID,
+        bootstrap_days: int,
+        exclude_id: Optional[UUID] = None
+    ) -> OnlineMetricState:
+        """Load streaming state from memory, persisted store, or history"""
+        key = (str(workspace_id), str(metric_id))
+        if key in self._online_states:
+            self._online_states.move_to_end(key)
+            return self._online_states[key]
+
+        state = None
+        if self.supabase:
+            try:
+                result = self.supabase.table("kpi_detector_state").select("state").eq(
+                    "metric_id", str(metric_id)
+                ).eq("workspace_id", str(workspace_id)).execute()
+
+                if result.data:
+                    state = OnlineMetricState.from_dict(result.data[0]["state"])
+            except Exception as e:
+                self.logger.error(f"Error loading detector state: {str(e)}")
+
+        if state is None:
+            # One-time warm-up from history; afterwards state is resumed
+            state = self.online_detector.new_state()
+            start_date = datetime.utcnow() - timedelta(days=bootstrap_days)
+            data_points = await self._get_metric_data(metric_id, workspace_id, start_date)
+            history = [
+                dp for dp in data_points or []
+                if exclude_id is None or dp.get("id") != str(exclude_id)
+            ]
+            self.online_detector.fit(state, [dp["value"] for dp in history])
+            self.change_detector.fit(state.changes, [dp["value"] for dp in history])
+
+        self._online_states[key] = state
+        while len(self._online_states) > self.MAX_ONLINE_STATES:
+            self._online_states.popitem(last=False)
+        return state
+
+    async def _save_online_state(
+        self,
+        metric_id: UUID,
+        workspace_id: UUID,
+        state: OnlineMetricState
+    ) -> None:
+        """Persist streaming state so a restarted worker can resume"""
+        if not self.supabase:
+            return
+
+        try:
+            self.supabase.table("kpi_detector_state").upsert({
+                "metric_id": str(metric_id),
+                "workspace_id": str(workspace_id),
+                "state": state.to_dict(),
+                "observations": state.observations,
+                "updated_at": datetime.utcnow().isoformat()
+            }).execute()
+        except Exception as e:
+            self.logger.error(f"Error saving detector state: {str(e)}")
+
     async def analyze_trends(
         self,
         metric_id: UUID,
@@ -437,7 +766,11 @@ class AnomalyDetectionService:
         workspace_id: UUID,
         start_date: datetime
     ) -> List[Dict[str, Any]]:
-        """Get metric data points"""
+        """Get metric data points, served from the KPI series cache when it covers start_date"""
+        series = self.series_cache.get(workspace_id, metric_id)
+        if series is not None and series.covers(start_date):
+            return series.window(start_date)
+
         try:
             result = self.supabase.table("kpi_data_points").select("*").eq(
                 "metric_id", str(metric_id)
@@ -445,12 +778,184 @@ class AnomalyDetectionService:
                 "timestamp", start_date.isoformat()
             ).order("timestamp").execute()
 
-            return result.data
+            return self.series_cache.put(
+                workspace_id, metric_id, result.data, since=start_date
+            ).points
 
         except Exception as e:
             self.logger.error(f"Error getting metric data: {str(e)}")
             return []
 
+    def _bulk_create_anomalies(
+        self,
+        records: List[AnomalyCreate],
+        auto_save: bool = True
+    ) -> List[AnomalyResponse]:
+        """Create and optionally save many anomalies with a single insert"""
+        if not records:
+            return []
+
+        if auto_save:
+            try:
+                result = self.supabase.table("anomalies").insert(
+                    [record.model_dump(mode="json") for record in records]
+                ).execute()
+
+                if result.data and len(result.data) == len(records):
+                    return [AnomalyResponse(**row) for row in result.data]
+            except Exception as e:
+                self.logger.error(f"Error bulk saving anomalies: {str(e)}")
+
+        return [
+            AnomalyResponse(
+                id=UUID("00000000-0000-0000-0000-000000000000"),  # Placeholder
+                detected_at=datetime.utcnow(),
+                created_at=datetime.utcnow(),
+                **record.model_dump()
+            )
+            for record in records
+        ]
+
+    def _bulk_create_trends(
+        self,
+        records: List[TrendCreate],
+        auto_save: bool = True
+    ) -> List[TrendResponse]:
+        """Create and optionally save many trends with a single insert"""
+        if not records:
+            return []
+
+        if auto_save:
+            try:
+                result = self.supabase.table("trends").insert(
+                    [record.model_dump(mode="json") for record in records]
+                ).execute()
+
+                if result.data and len(result.data) == len(records):
+                    return [TrendResponse(**row) for row in result.data]
+            except Exception as e:
+                self.logger.error(f"Error bulk saving trends: {str(e)}")
+
+        return [
+            TrendResponse(
+                id=UUID("00000000-0000-0000-0000-000000000000"),
+                created_at=datetime.utcnow(),
+                **record.model_dump()
+            )
+            for record in records
+        ]
+
+    async def _get_workspace_metric_data(
+        self,
+        workspace_id: UUID,
+        metric_ids: List[str],
+        start_date: datetime
+    ) -> Tuple[Dict[str, List[Dict[str, Any]]], Dict[str, str]]:
+        """
+        Get data points for many metrics, loading cache misses in paged queries
+
+        Misses are loaded METRICS_PER_QUERY metrics at a time, page by page
+        (PostgREST caps each response at its max-rows), and only a fully
+        read series is cached. A failed query fails just its metrics.
+
+        Returns:
+            Tuple of (points by metric ID, error message by metric ID)
+        """
+        grouped: Dict[str, List[Dict[str, Any]]] = {}
+        failed: Dict[str, str] = {}
+        missing = []
+
+        for mid in metric_ids:
+            series = self.series_cache.get(workspace_id, mid)
+            if series is not None and series.covers(start_date):
+                grouped[str(mid)] = series.window(start_date)
+            else:
+                missing.append(str(mid))
+
+        for start in range(0, len(missing), self.METRICS_PER_QUERY):
+            chunk = missing[start:start + self.METRICS_PER_QUERY]
+            try:
+                loaded: Dict[str, List[Dict[str, Any]]] = {mid: [] for mid in chunk}
+                offset = 0
+                while True:
+                    result = self.supabase.table("kpi_data_points").select("*").eq(
+                        "workspace_id", str(workspace_id)
+                    ).in_("metric_id", chunk).gte(
+                        "timestamp", start_date.isoformat()
+                    ).order("timestamp").order("id").range(
+                        offset, offset + self.DATA_PAGE_SIZE - 1
+                    ).execute()
+
+                    page = result.data or []
+                    for dp in page:
+                        loaded.setdefault(str(dp["metric_id"]), []).append(dp)
+                    if len(page) < self.DATA_PAGE_SIZE:
+                        break
+                    offset += len(page)
+
+                for mid, points in loaded.items():
+                    series = self.series_cache.put(workspace_id, mid, points, since=start_date)
+                    if series.points:
+                        grouped[mid] = series.points
+
+            except Exception as e:
+                self.logger.error(f"Error getting workspace metric data: {str(e)}")
+                for mid in chunk:
+                    failed[mid] = f"data could not be loaded: {str(e)}"
+
+        return grouped, failed
+
+    def _build_analysis(
+        self,
+        metric_id: UUID,
+        metric: Dict[str, Any],
+        values: List[float],
+        timestamps: List[datetime],
+        anomalies: List[AnomalyResponse],
+        trends: List[TrendResponse],
+        statistics: Dict[str, float]
+    ) -> MetricAnalysis:
+        """Assemble a MetricAnalysis from detection results"""
+        # Get current and previous values
+        current_value = values[-1] if values else 0.0
+        previous_value = values[-2] if len(values) >= 2 else current_value
+
+        # Calculate change
+        absolute_change = current_value - previous_value
+        percentage_change = (
+            (absolute_change / abs(previous_value)) * 100
+            if previous_value != 0 else 0.0
+        )
+
+        # Generate insights
+        insights = self._generate_insights(
+            metric,
+            values,
+            anomalies,
+            trends,
+            statistics
+        )
+
+        return MetricAnalysis(
+            metric_id=metric_id,
+            metric_name=metric["name"],
+            time_range={
+                "start": timestamps[0],
+                "end": timestamps[-1]
+            },
+            current_value=current_value,
+            previous_value=previous_value,
+            change={
+                "absolute": absolute_change,
+                "percentage": percentage_change,
+                "direction": "up" if absolute_change > 0 else "down" if absolute_change < 0 else "stable"
+            },
+            anomalies=anomalies,
+            trends=trends,
+            statistics=statistics,
+            insights=insights
+        )
+
     def _empty_analysis(self, metric_id: UUID, metric_name: str) -> MetricAnalysis:
         """Return empty analysis when insufficient data"""
         return MetricAnalysis(
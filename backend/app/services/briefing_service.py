@@ -4,7 +4,7 @@ Service for generating daily briefings and summaries
 """
 import logging
 from datetime import datetime, timedelta
-from typing import Optional, Dict, Any, List
+from typing import Optional, Dict, Any, List, AsyncIterator, Awaitable, Callable
 from uuid import UUID
 from pathlib import Path
 
@@ -19,6 +19,8 @@ from app.models.briefing import (
     InvestorSummaryContent
 )
 from app.models.founder import FounderResponse
+from app.core.streaming import stream_callback_events
+from app.services.kpi_ingestion_service import KPIIngestionService
 from sqlalchemy.orm import Session
 from sqlalchemy import text
 import json
@@ -33,6 +35,7 @@ class BriefingService:
     def __init__(self):
         self.logger = logging.getLogger(__name__)
         self.templates_dir = Path(__file__).parent.parent / "templates" / "briefings"
+        self.kpi_service = KPIIngestionService()
 
     async def generate_briefing(
         self,
@@ -41,7 +44,8 @@ class BriefingService:
         briefing_type: BriefingType,
         start_date: Optional[datetime] = None,
         end_date: Optional[datetime] = None,
-        db: Optional[Session] = None
+        db: Optional[Session] = None,
+        on_event: Optional[Callable[[str, Any], Awaitable[None]]] = None
     ) -> Optional[BriefingResponse]:
         """
         Generate a briefing
@@ -52,6 +56,8 @@ class BriefingService:
             briefing_type: Type of briefing
             start_date: Start of reporting period
             end_date: End of reporting period
+            on_event: Optional callback receiving ("section", section) for each
+                section and ("summary", ...) before the briefing is saved
 
         Returns:
             Generated briefing
@@ -92,6 +98,16 @@ class BriefingService:
             else:
                 raise ValueError(f"Unsupported briefing type: {briefing_type}")
 
+            if on_event:
+                await on_event("summary", {
+                    "title": title,
+                    "summary": content.get("summary", ""),
+                    "key_highlights": content.get("highlights", []),
+                    "action_items": content.get("action_items", [])
+                })
+                for section in sections:
+                    await on_event("section", section)
+
             # Create briefing
             briefing = BriefingCreate(
                 workspace_id=workspace_id,
@@ -139,6 +155,40 @@ class BriefingService:
             self.logger.error(f"Error generating briefing: {str(e)}")
             return None
 
+    async def stream_briefing(
+        self,
+        workspace_id: UUID,
+        founder_id: UUID,
+        briefing_type: BriefingType,
+        start_date: Optional[datetime] = None,
+        end_date: Optional[datetime] = None,
+        db: Optional[Session] = None
+    ) -> AsyncIterator[Dict[str, Any]]:
+        """
+        Generate a briefing, yielding the summary and sections before it is saved
+
+        Yields {"event": "summary"}, one {"event": "section"} per section, then
+        {"event": "complete"} with the saved briefing.
+
+        Raises:
+            ValueError: If the briefing could not be generated
+        """
+        events = stream_callback_events(
+            lambda on_event: self.generate_briefing(
+                workspace_id=workspace_id,
+                founder_id=founder_id,
+                briefing_type=briefing_type,
+                start_date=start_date,
+                end_date=end_date,
+                db=db,
+                on_event=on_event
+            )
+        )
+        async for item in events:
+            if item["event"] == "complete" and item["data"] is None:
+                raise ValueError("Failed to generate briefing")
+            yield item
+
     async def _generate_morning_brief(
         self,
         workspace_id: UUID,
@@ -394,6 +444,18 @@ class BriefingService:
                 """)
                 result = db.execute(query, {"workspace_id": str(workspace_id)})
                 metrics = [dict(row._mapping) for row in result.fetchall()]
+
+                # Attach latest values and statistics from the KPI series cache
+                series_by_metric = await self.kpi_service.get_workspace_series(
+                    workspace_id, [m["id"] for m in metrics], db=db
+                )
+                for metric in metrics:
+                    series = series_by_metric.get(str(metric["id"]))
+                    if series is not None and series.latest:
+                        metric["current_value"] = series.latest["value"]
+                        metric["last_updated"] = series.latest["timestamp"]
+                        metric["statistics"] = series.statistics
+
                 return {"metrics": metrics}
             return {}
         except:
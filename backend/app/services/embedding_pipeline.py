@@ -0,0 +1,338 @@
+"""
+Embedding Pipeline
+Batched, content-hash-deduplicated embedding of transcript and media chunks
+"""
+import asyncio
+import hashlib
+import json
+import logging
+from collections import OrderedDict
+from typing import Any, Dict, List, Optional
+from uuid import UUID
+
+from app.config import get_settings
+from app.llm.embeddings import EmbeddingBackend, get_embedding_backend
+from app.models.meeting import Meeting, TranscriptChunk
+from app.services.local_vector_index import LocalVectorIndex, get_local_vector_index
+
+
+logger = logging.getLogger(__name__)
+
+
+def content_hash(text: str) -> str:
+    """
+    Identity of a chunk's text for embedding reuse
+
+    Args:
+        text: Chunk text
+
+    Returns:
+        sha256 hex digest of the whitespace-normalized text
+    """
+    return hashlib.sha256(" ".join(text.split()).encode()).hexdigest()
+
+
+class EmbeddingPipeline:
+    """
+    Embeds chunk text in large batches and reuses vectors by content hash
+
+    Texts submitted by concurrent callers (for example several webhook
+    ingestions) are gathered into shared batches of up to batch_size, or
+    whatever arrived within batch_wait_seconds. Each text is embedded once
+    per model: repeats within the process share one in-flight request, and
+    vectors already stored in the embedding cache table are read back
+    instead of recomputed. At most max_concurrency requests reach the
+    backend at once.
+    """
+
+    CACHE_TABLE = "embedding_cache"
+    LOOKUP_PAGE_SIZE = 500
+    WRITE_PAGE_SIZE = 500
+
+    def __init__(
+        self,
+        backend: EmbeddingBackend,
+        supabase_client=None,
+        batch_size: int = 256,
+        max_concurrency: int = 4,
+        batch_wait_seconds: float = 0.05,
+        local_index: Optional[LocalVectorIndex] = None
+    ):
+        """
+        Initialize embedding pipeline
+
+        Args:
+            backend: Embedding backend
+            supabase_client: Supabase client for the embedding cache and chunk tables
+            batch_size: Texts per backend request
+            max_concurrency: Backend requests in flight
+            batch_wait_seconds: Time a partial batch waits for more texts
+            local_index: Local vector index that also receives chunk vectors
+        """
+        self.backend = backend
+        self.supabase = supabase_client
+        self.local_index = local_index
+        self.batch_size = max(1, min(batch_size, backend.max_batch_size))
+        self.batch_wait_seconds = batch_wait_seconds
+        self.logger = logging.getLogger(f"{__name__}.{self.__class__.__name__}")
+
+        self.max_concurrency = max_concurrency
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._reset()
+        self.stats = {"requested": 0, "reused": 0, "cached": 0, "embedded": 0, "batches": 0}
+
+    async def embed(self, texts: List[str]) -> List[List[float]]:
+        """
+        Embed texts, reusing vectors for text embedded before
+
+        Args:
+            texts: Texts to embed
+
+        Returns:
+            One vector per text, in order
+        """
+        hashes = [content_hash(text) for text in texts]
+        futures: Dict[str, asyncio.Future] = {}
+        for key, text in zip(hashes, texts):
+            self.stats["requested"] += 1
+            if key in futures:
+                self.stats["reused"] += 1
+            else:
+                futures[key] = self._submit(key, text)
+
+        vectors = dict(zip(futures, await asyncio.gather(*futures.values())))
+        return [vectors[key] for key in hashes]
+
+    async def embed_meeting_chunks(self, meeting: Meeting) -> int:
+        """
+        Embed a meeting's transcript chunks and write them to transcript_chunks
+
+        Args:
+            meeting: Ingested meeting
+
+        Returns:
+            Number of chunks written
+        """
+        rows = await self._chunk_rows(meeting.transcript_chunks, {"meeting_id": str(meeting.id)})
+        await self.write_vectors("transcript_chunks", rows, on_conflict="meeting_id,chunk_index")
+
+        if self.local_index is not None and rows:
+            await asyncio.to_thread(self._index_locally, meeting, rows)
+        return len(rows)
+
+    async def embed_media_chunks(self, media_transcript_id: UUID, chunks: List[TranscriptChunk]) -> int:
+        """
+        Embed a media transcript's chunks and write them to media_chunks
+
+        Args:
+            media_transcript_id: Media transcript the chunks belong to
+            chunks: Transcript chunks
+
+        Returns:
+            Number of chunks written
+        """
+        rows = await self._chunk_rows(chunks, {"media_transcript_id": str(media_transcript_id)})
+        for row in rows:
+            row.pop("speaker_email", None)
+        await self.write_vectors("media_chunks", rows, on_conflict="media_transcript_id,chunk_index")
+        return len(rows)
+
+    async def write_vectors(self, table: str, rows: List[Dict[str, Any]], on_conflict: str) -> None:
+        """
+        Bulk upsert rows carrying embeddings
+
+        Args:
+            table: Destination table
+            rows: Rows to write
+            on_conflict: Columns identifying an existing row
+        """
+        if not self.supabase or not rows:
+            return
+
+        for start in range(0, len(rows), self.WRITE_PAGE_SIZE):
+            page = rows[start:start + self.WRITE_PAGE_SIZE]
+            self.supabase.table(table).upsert(page, on_conflict=on_conflict).execute()
+
+    def _index_locally(self, meeting: Meeting, rows: List[Dict[str, Any]]) -> None:
+        """Add a meeting's chunk vectors to the local index and persist its shard"""
+        for row in rows:
+            record = {name: value for name, value in row.items() if name != "embedding"}
+            key = f"{meeting.id}:{row['chunk_index']}"
+            self.local_index.upsert("transcript_chunks", "embedding", meeting.workspace_id, key, row["embedding"], record)
+        self.local_index.save()
+
+    async def _chunk_rows(self, chunks: List[TranscriptChunk], owner: Dict[str, str]) -> List[Dict[str, Any]]:
+        """Embed chunks and build their table rows"""
+        chunks = [chunk for chunk in chunks if chunk.text and chunk.text.strip()]
+        if not chunks:
+            return []
+
+        vectors = await self.embed([chunk.text for chunk in chunks])
+        return [
+            {
+                **owner,
+                "chunk_index": chunk.chunk_index,
+                "speaker": chunk.speaker_name,
+                "speaker_email": chunk.speaker_email,
+                "start_sec": int(chunk.start_time) if chunk.start_time is not None else None,
+                "end_sec": int(chunk.end_time) if chunk.end_time is not None else None,
+                "text": chunk.text,
+                "content_hash": content_hash(chunk.text),
+                "embedding": vector,
+                "metadata": {"embedding_model": self.backend.model_name}
+            }
+            for chunk, vector in zip(chunks, vectors)
+        ]
+
+    def _reset(self) -> None:
+        """Drop batching state bound to an event loop"""
+        self._semaphore = asyncio.Semaphore(self.max_concurrency)
+        self._pending: "OrderedDict[str, str]" = OrderedDict()
+        self._in_flight: Dict[str, asyncio.Future] = {}
+        self._timer: Optional[asyncio.TimerHandle] = None
+        self._batches: set = set()
+
+    def _submit(self, key: str, text: str) -> asyncio.Future:
+        """Queue a text for the next batch, joining an in-flight request for the same text"""
+        loop = asyncio.get_running_loop()
+        if loop is not self._loop:
+            # Shared pipelines outlive event loops in tests and worker restarts
+            self._reset()
+            self._loop = loop
+
+        future = self._in_flight.get(key)
+        if future is not None:
+            self.stats["reused"] += 1
+            return future
+
+        future = loop.create_future()
+        self._in_flight[key] = future
+        self._pending[key] = text
+
+        if len(self._pending) >= self.batch_size:
+            self._dispatch()
+        elif self._timer is None:
+            self._timer = loop.call_later(self.batch_wait_seconds, self._dispatch)
+        return future
+
+    def _dispatch(self) -> None:
+        """Start batches for every pending text"""
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+
+        while self._pending:
+            batch = OrderedDict()
+            while self._pending and len(batch) < self.batch_size:
+                key, text = self._pending.popitem(last=False)
+                batch[key] = text
+            task = asyncio.create_task(self._run_batch(batch))
+            self._batches.add(task)
+            task.add_done_callback(self._batches.discard)
+
+    async def _run_batch(self, batch: Dict[str, str]) -> None:
+        """Resolve one batch from the cache and the backend"""
+        try:
+            async with self._semaphore:
+                vectors = await self._load_cached(list(batch))
+                self.stats["cached"] += len(vectors)
+
+                missing = [key for key in batch if key not in vectors]
+                if missing:
+                    embedded = await self.backend.embed_batch([batch[key] for key in missing])
+                    fresh = dict(zip(missing, embedded))
+                    self.stats["embedded"] += len(fresh)
+                    self.stats["batches"] += 1
+                    await self._store_cached(fresh)
+                    vectors.update(fresh)
+
+            for key in batch:
+                future = self._in_flight.get(key)
+                if future is not None and not future.done():
+                    future.set_result(vectors[key])
+
+        except Exception as e:
+            self.logger.error(f"Embedding batch of {len(batch)} failed: {str(e)}")
+            for key in batch:
+                future = self._in_flight.get(key)
+                if future is not None and not future.done():
+                    future.set_exception(e)
+
+        finally:
+            for key in batch:
+                self._in_flight.pop(key, None)
+
+    async def _load_cached(self, keys: List[str]) -> Dict[str, List[float]]:
+        """Read stored vectors for content hashes"""
+        if not self.supabase:
+            return {}
+
+        vectors: Dict[str, List[float]] = {}
+        try:
+            for start in range(0, len(keys), self.LOOKUP_PAGE_SIZE):
+                page = keys[start:start + self.LOOKUP_PAGE_SIZE]
+                result = self.supabase.table(self.CACHE_TABLE).select("content_hash, embedding").eq(
+                    "model", self.backend.model_name
+                ).in_("content_hash", page).execute()
+
+                for row in result.data or []:
+                    embedding = row["embedding"]
+                    # PostgREST returns pgvector values as text
+                    vectors[row["content_hash"]] = json.loads(embedding) if isinstance(embedding, str) else embedding
+        except Exception as e:
+            self.logger.error(f"Failed to read embedding cache: {str(e)}")
+
+        return vectors
+
+    async def _store_cached(self, vectors: Dict[str, List[float]]) -> None:
+        """Store new vectors for reuse"""
+        if not self.supabase or not vectors:
+            return
+
+        rows = [
+            {"model": self.backend.model_name, "content_hash": key, "embedding": vector}
+            for key, vector in vectors.items()
+        ]
+        try:
+            await self.write_vectors(self.CACHE_TABLE, rows, on_conflict="model,content_hash")
+        except Exception as e:
+            self.logger.error(f"Failed to write embedding cache: {str(e)}")
+
+
+_embedding_pipeline: Optional[EmbeddingPipeline] = None
+
+
+def get_embedding_pipeline(supabase_client=None, api_keys: Optional[Dict[str, str]] = None) -> Optional[EmbeddingPipeline]:
+    """
+    Get or create singleton embedding pipeline
+
+    Args:
+        supabase_client: Supabase client used when the pipeline is created
+        api_keys: Available API keys for the embedding backend
+
+    Returns:
+        EmbeddingPipeline, or None when the pipeline or embeddings are disabled
+
+    Raises:
+        ValueError: If the configured embedding backend cannot be built
+    """
+    global _embedding_pipeline
+    settings = get_settings()
+    if not settings.embedding_pipeline_enabled:
+        return None
+
+    if _embedding_pipeline is None:
+        backend = get_embedding_backend(api_keys)
+        if backend is None:
+            logger.warning("No embedding backend configured, transcript chunks will not be embedded")
+            return None
+
+        _embedding_pipeline = EmbeddingPipeline(
+            backend,
+            supabase_client,
+            batch_size=settings.embedding_batch_size,
+            max_concurrency=settings.embedding_max_concurrency,
+            batch_wait_seconds=settings.embedding_batch_wait_ms / 1000,
+            local_index=get_local_vector_index() if settings.vector_search_backend == "local" else None
+        )
+    return _embedding_pipeline
@@ -0,0 +1,311 @@
+"""
+Federated Search Service
+One semantic query across contacts, communications, meeting and media chunks
+"""
+import asyncio
+import heapq
+import itertools
+import json
+import logging
+import statistics
+import time
+from datetime import datetime
+from typing import Any, AsyncIterator, Dict, Hashable, List, Optional, Sequence, Tuple
+from uuid import UUID
+
+from app.config import get_settings
+from app.core.monitoring import MetricsRecorder
+from app.database import fetch_vector_query
+from app.llm.embeddings import EmbeddingBackend, get_embedding_backend
+from app.services.search_sources import SEARCH_SOURCES, SearchSource, get_search_source, semantic_sql
+
+
+logger = logging.getLogger(__name__)
+
+
+class TopK:
+    """
+    Best k items by score, at most one per key
+
+    A min-heap of size k holds the admission threshold, so each offer is
+    O(log k). A better item for a key already held replaces it; the old
+    heap entry is left in place and skipped when it reaches the top.
+    """
+
+    def __init__(self, k: int):
+        """
+        Initialize top-k
+
+        Args:
+            k: Items kept
+        """
+        self.k = k
+        self._heap: List[Tuple[float, int, Hashable]] = []
+        self._best: Dict[Hashable, Tuple[float, int, Any]] = {}
+        self._sequence = itertools.count()
+
+    def __len__(self) -> int:
+        return len(self._best)
+
+    def __contains__(self, key: Hashable) -> bool:
+        return key in self._best
+
+    def offer(self, key: Hashable, score: float, item: Any) -> bool:
+        """
+        Offer an item
+
+        Args:
+            key: Identity items are deduplicated by
+            score: Higher is better
+            item: Payload
+
+        Returns:
+            True if the item is now among the best k
+        """
+        current = self._best.get(key)
+        if current is not None and current[0] >= score:
+            return False
+        if current is None and len(self._best) >= self.k and score <= self._threshold():
+            return False
+
+        sequence = next(self._sequence)
+        self._best[key] = (score, sequence, item)
+        heapq.heappush(self._heap, (score, sequence, key))
+        while len(self._best) > self.k:
+            _, popped_sequence, popped_key = heapq.heappop(self._heap)
+            if self._best[popped_key][1] == popped_sequence:
+                del self._best[popped_key]
+        return True
+
+    def items(self) -> List[Any]:
+        """Items held, best first"""
+        return [item for _, _, item in sorted(self._best.values(), key=lambda entry: (-entry[0], entry[1]))]
+
+    def _threshold(self) -> float:
+        """Lowest score held, dropping superseded heap entries on the way"""
+        while self._best[self._heap[0][2]][1] != self._heap[0][1]:
+            heapq.heappop(self._heap)
+        return self._heap[0][0]
+
+
+class FederatedSearchService:
+    """
+    Searches every table by meaning at once and merges one ranking
+
+    One nearest-neighbour query per table runs concurrently, each on its
+    own pooled connection. Raw cosine similarity is not comparable across
+    tables (chunks of one transcript all look alike; contact profiles do
+    not), so every table's similarities are standardized the same way: a
+    row scores by how many standard deviations it stands out from the
+    candidates its table returned. Tables returning too few rows to
+    estimate that background (or rows that are all alike) are scored
+    against a fixed one instead. Standardizing makes every table's best
+    row look good, so rows below an absolute similarity floor are left
+    out of the results (while still counting toward their table's
+    background); a table with only weak matches contributes nothing.
+    Chunks of the same document (meeting, video, email thread) collapse
+    into their best chunk, and a heap-based top-k keeps the overall best
+    documents. Tables slower than the timeout are dropped rather than
+    holding up the answer.
+    """
+
+    # Fewest candidates a table's own background is estimated from
+    MIN_BACKGROUND_ROWS = 3
+    # Background similarity mean and spread assumed below that
+    FALLBACK_MEAN = 0.5
+    FALLBACK_STDEV = 0.15
+
+    def __init__(
+        self,
+        embedding_backend: Optional[EmbeddingBackend] = None,
+        candidates: Optional[int] = None,
+        timeout_seconds: Optional[float] = None,
+        min_similarity: Optional[float] = None
+    ):
+        """
+        Initialize federated search
+
+        Args:
+            embedding_backend: Backend embedding query text; must match the stored vectors
+                (default: configured backend)
+            candidates: Nearest rows taken from each table (default: settings)
+            timeout_seconds: Time to wait for slow tables (default: settings)
+            min_similarity: Raw similarity a row needs to be returned (default: settings)
+        """
+        settings = get_settings()
+        self.embedding_backend = embedding_backend
+        self.candidates = candidates or settings.federated_search_candidates
+        self.timeout_seconds = (
+            timeout_seconds if timeout_seconds is not None else settings.federated_search_timeout_ms / 1000
+        )
+        self.min_similarity = (
+            min_similarity if min_similarity is not None else settings.federated_search_min_similarity
+        )
+        self.logger = logging.getLogger(f"{__name__}.{self.__class__.__name__}")
+
+    async def search(
+        self,
+        query: Optional[str] = None,
+        sources: Optional[Sequence[str]] = None,
+        workspace_id: Optional[UUID] = None,
+        founder_id: Optional[UUID] = None,
+        since: Optional[datetime] = None,
+        until: Optional[datetime] = None,
+        limit: int = 10,
+        query_embedding: Optional[List[float]] = None
+    ) -> List[Dict[str, Any]]:
+        """
+        Search all sources and return the merged ranking
+
+        Args:
+            query: Search text (ignored when query_embedding is given)
+            sources: Source names (default: all)
+            workspace_id: Workspace to search
+            founder_id: Founder to search
+            since: Earliest document date
+            until: Latest document date
+            limit: Maximum results
+            query_embedding: Precomputed embedding of the query text
+
+        Returns:
+            One result per document, best first
+        """
+        top = TopK(limit)
+        async for result in self.stream(
+            query, sources, workspace_id, founder_id, since, until, limit, query_embedding
+        ):
+            top.offer((result["source"], result["document_id"]), result["score"], result)
+        return top.items()
+
+    async def stream(
+        self,
+        query: Optional[str] = None,
+        sources: Optional[Sequence[str]] = None,
+        workspace_id: Optional[UUID] = None,
+        founder_id: Optional[UUID] = None,
+        since: Optional[datetime] = None,
+        until: Optional[datetime] = None,
+        limit: int = 10,
+        query_embedding: Optional[List[float]] = None
+    ) -> AsyncIterator[Dict[str, Any]]:
+        """
+        Search all sources, yielding results as each table answers
+
+        Each yielded result is in the top `limit` of everything received
+        so far; a result from a later table can still push an earlier one
+        out of the final ranking, which search() returns settled.
+
+        Args:
+            query: Search text (ignored when query_embedding is given)
+            sources: Source names (default: all)
+            workspace_id: Workspace to search
+            founder_id: Founder to search
+            since: Earliest document date
+            until: Latest document date
+            limit: Maximum results
+            query_embedding: Precomputed embedding of the query text
+
+        Yields:
+            Records with source, document_id, similarity, score and matches
+            (chunks of the document among the candidates)
+        """
+        search_sources = [get_search_source(name) for name in (sources or SEARCH_SOURCES)]
+        if query_embedding is None:
+            query_embedding = await self._embed_query(query)
+
+        candidates = max(self.candidates, limit)
+        start = time.perf_counter()
+        tasks = [
+            asyncio.create_task(self._query_source(source, query_embedding, candidates, workspace_id, founder_id, since, until))
+            for source in search_sources
+        ]
+
+        top = TopK(limit)
+        answered = 0
+        try:
+            for next_done in asyncio.as_completed(tasks, timeout=self.timeout_seconds):
+                try:
+                    results = await next_done
+                except asyncio.TimeoutError:
+                    raise
+                except Exception:
+                    continue
+
+                answered += 1
+                for result in results:
+                    if top.offer((result["source"], result["document_id"]), result["score"], result):
+                        yield result
+
+        except asyncio.TimeoutError:
+            pending = [source.name for source, task in zip(search_sources, tasks) if not task.done()]
+            self.logger.warning(f"Federated search returned without slow sources: {pending}")
+
+        finally:
+            for task in tasks:
+                task.cancel()
+            MetricsRecorder.record_vector_search(time.perf_counter() - start, answered > 0)
+
+    async def _query_source(
+        self,
+        source: SearchSource,
+        query_embedding: List[float],
+        candidates: int,
+        workspace_id: Optional[UUID],
+        founder_id: Optional[UUID],
+        since: Optional[datetime],
+        until: Optional[datetime]
+    ) -> List[Dict[str, Any]]:
+        """Nearest rows of one table, scored and collapsed to one result per document"""
+        filters, filter_params = source.filters(3, workspace_id, founder_id, since, until)
+        try:
+            rows = await fetch_vector_query(semantic_sql(source, filters), query_embedding, candidates, *filter_params)
+        except Exception as e:
+            self.logger.error(f"Federated search on {source.name} failed: {str(e)}")
+            raise
+
+        return self._score(source, rows)
+
+    def _score(self, source: SearchSource, rows) -> List[Dict[str, Any]]:
+        """Standardize similarities against the table's candidates and keep each document's best chunk above the floor"""
+        if not rows:
+            return []
+
+        similarities = [1 - row["distance"] for row in rows]
+        mean, stdev = self.FALLBACK_MEAN, self.FALLBACK_STDEV
+        if len(similarities) >= self.MIN_BACKGROUND_ROWS:
+            spread = statistics.pstdev(similarities)
+            if spread > 1e-6:
+                mean, stdev = statistics.fmean(similarities), spread
+
+        documents: Dict[Any, Dict[str, Any]] = {}
+        for row, similarity in zip(rows, similarities):
+            if similarity < self.min_similarity:
+                continue
+            document = documents.get(row["document_id"])
+            if document is not None:
+                document["matches"] += 1
+                continue
+
+            record = row["record"]
+            # asyncpg returns jsonb as text unless a codec is registered
+            result = json.loads(record) if isinstance(record, str) else dict(record)
+            result.update({
+                "source": source.name,
+                "document_id": row["document_id"],
+                "similarity": similarity,
+                "score": (similarity - mean) / stdev,
+                "matches": 1
+            })
+            documents[row["document_id"]] = result
+
+        return list(documents.values())
+
+    async def _embed_query(self, query: Optional[str]) -> List[float]:
+        """Embed the query text"""
+        if not query:
+            raise ValueError("Either query or query_embedding is required")
+        if self.embedding_backend is None:
+            self.embedding_backend = get_embedding_backend()
+        if self.embedding_backend is None:
+            raise ValueError("Semantic search requires an embedding backend; set OPENAI_API_KEY or EMBEDDING_BACKEND")
+        return (await self.embedding_backend.embed_batch([query]))[0]
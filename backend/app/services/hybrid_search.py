@@ -0,0 +1,171 @@
+"""
+Hybrid Search Service
+Full-text and vector retrieval over one table, fused with reciprocal rank fusion
+"""
+import asyncio
+import json
+import logging
+import time
+from datetime import datetime
+from functools import lru_cache
+from typing import Any, Dict, List, Optional
+from uuid import UUID
+
+from app.algorithms.rank_fusion import reciprocal_rank_fusion
+from app.config import get_settings
+from app.core.monitoring import MetricsRecorder
+from app.database import fetch_vector_query
+from app.llm.embeddings import EmbeddingBackend, get_embedding_backend
+from app.services.search_sources import SearchSource, get_search_source, semantic_sql
+
+
+logger = logging.getLogger(__name__)
+
+TEXT_SEARCH_CONFIG = "english"
+
+
+@lru_cache(maxsize=64)
+def _lexical_sql(source: SearchSource, filters: str) -> str:
+    """Full-text query: $1 search text, $2 limit, filters from $3"""
+    return f"""
+        SELECT {source.id_column} AS id,
+               {source.document_column} AS document_id,
+               {source.record_expression} AS record,
+               ts_rank_cd({source.tsv_column}, query) AS text_rank
+        FROM {source.from_clause},
+             websearch_to_tsquery('{TEXT_SEARCH_CONFIG}', $1) query
+        WHERE {source.tsv_column} @@ query
+        {filters}
+        ORDER BY text_rank DESC
+        LIMIT $2
+    """
+
+
+class HybridSearchService:
+    """
+    Finds rows by keywords and by meaning at once
+
+    Full-text search catches exact names, numbers and acronyms (deal
+    names, KPI names) that embeddings blur; vector search catches
+    paraphrases. Both queries run concurrently on separate pooled
+    connections with the same filters, and their rankings are merged
+    with reciprocal rank fusion.
+    """
+
+    def __init__(
+        self,
+        embedding_backend: Optional[EmbeddingBackend] = None,
+        candidates: Optional[int] = None,
+        rrf_k: Optional[int] = None
+    ):
+        """
+        Initialize hybrid search
+
+        Args:
+            embedding_backend: Backend embedding query text; must match the stored vectors
+                (default: configured backend)
+            candidates: Results taken from each retriever before fusion (default: settings)
+            rrf_k: Reciprocal rank fusion constant (default: settings)
+        """
+        settings = get_settings()
+        self.embedding_backend = embedding_backend
+        self.candidates = candidates or settings.hybrid_search_candidates
+        self.rrf_k = rrf_k or settings.hybrid_search_rrf_k
+        self.logger = logging.getLogger(f"{__name__}.{self.__class__.__name__}")
+
+    async def search(
+        self,
+        source: str,
+        query: str,
+        workspace_id: Optional[UUID] = None,
+        founder_id: Optional[UUID] = None,
+        since: Optional[datetime] = None,
+        until: Optional[datetime] = None,
+        limit: int = 10,
+        query_embedding: Optional[List[float]] = None
+    ) -> List[Dict[str, Any]]:
+        """
+        Search one source by keywords and meaning
+
+        Args:
+            source: Search source name (contacts, communications, transcript_chunks, media_chunks)
+            query: Search text
+            workspace_id: Workspace to search
+            founder_id: Founder to search
+            since: Earliest document date
+            until: Latest document date
+            limit: Maximum results
+            query_embedding: Precomputed embedding of the query text
+
+        Returns:
+            Records with fused score and the rank from each retriever
+        """
+        search_source = get_search_source(source)
+        filters, filter_params = search_source.filters(3, workspace_id, founder_id, since, until)
+        candidates = max(self.candidates, limit)
+
+        start = time.perf_counter()
+        try:
+            if query_embedding is None:
+                query_embedding = await self._embed_query(query)
+
+            retrievers = [fetch_vector_query(_lexical_sql(search_source, filters), query, candidates, *filter_params)]
+            if query_embedding is not None:
+                retrievers.append(
+                    fetch_vector_query(semantic_sql(search_source, filters), query_embedding, candidates, *filter_params)
+                )
+            lexical_rows, *semantic = await asyncio.gather(*retrievers)
+            semantic_rows = semantic[0] if semantic else []
+            MetricsRecorder.record_vector_search(time.perf_counter() - start, True)
+
+        except Exception as e:
+            MetricsRecorder.record_vector_search(time.perf_counter() - start, False)
+            self.logger.error(f"Hybrid search on {source} failed: {str(e)}")
+            raise
+
+        return self._fuse(search_source, lexical_rows, semantic_rows, limit)
+
+    def _fuse(self, source: SearchSource, lexical_rows, semantic_rows, limit: int) -> List[Dict[str, Any]]:
+        """Merge the two rankings into result records"""
+        rows: Dict[Any, Dict[str, Any]] = {}
+        for rank, row in enumerate(lexical_rows, start=1):
+            rows[row["id"]] = self._result(source, row, lexical_rank=rank)
+        for rank, row in enumerate(semantic_rows, start=1):
+            result = rows.setdefault(row["id"], self._result(source, row))
+            result["semantic_rank"] = rank
+            result["similarity"] = 1 - row["distance"]
+
+        fused = reciprocal_rank_fusion(
+            [[row["id"] for row in lexical_rows], [row["id"] for row in semantic_rows]],
+            k=self.rrf_k
+        )
+
+        results = []
+        for row_id, score in fused[:limit]:
+            result = rows[row_id]
+            result["score"] = score
+            results.append(result)
+        return results
+
+    def _result(self, source: SearchSource, row, lexical_rank: Optional[int] = None) -> Dict[str, Any]:
+        """Result record for a retrieved row"""
+        record = row["record"]
+        # asyncpg returns jsonb as text unless a codec is registered
+        result = json.loads(record) if isinstance(record, str) else dict(record)
+        result.update({
+            "source": source.name,
+            "document_id": row["document_id"],
+            "lexical_rank": lexical_rank,
+            "semantic_rank": None,
+            "similarity": None
+        })
+        return result
+
+    async def _embed_query(self, query: str) -> Optional[List[float]]:
+        """Embed the query text; None when embeddings are disabled and only keywords are searched"""
+        if self.embedding_backend is None:
+            self.embedding_backend = get_embedding_backend()
+        if self.embedding_backend is None:
+            self.logger.warning("No embedding backend configured, hybrid search is using keywords only")
+            return None
+        return (await self.embedding_backend.embed_batch([query]))[0]
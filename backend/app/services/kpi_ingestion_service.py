@@ -4,14 +4,17 @@ Handles ingestion of KPI data from Granola and other sources
 """
 import logging
 from datetime import datetime, timedelta
-from typing import Dict, Any, List, Optional
+from typing import Dict, Any, List, Optional, Tuple
 from uuid import UUID
 from sqlalchemy.orm import Session
 from sqlalchemy import text
 import json
+import numpy as np
 
+from app.algorithms.derived_metrics import DerivedMetricGraph, get_derived_metric_graph, to_day
 from app.connectors.granola_connector import GranolaConnector
 from app.connectors.base_connector import ConnectorStatus, ConnectorError
+from app.database import run_in_session
 from app.models.kpi_metric import (
     KPIMetricCreate,
     KPIMetricResponse,
@@ -23,6 +26,7 @@ from app.models.kpi_metric import (
     KPISnapshot,
     SyncStatus
 )
+from app.services.kpi_series_cache import KPISeries, KPISeriesCache, get_kpi_series_cache
 
 
 logger = logging.getLogger(__name__)
@@ -31,6 +35,9 @@ logger = logging.getLogger(__name__)
 class KPIIngestionService:
     """Service for ingesting KPI data from external sources"""
 
+    # Rows per multi-row INSERT (6 bind parameters each, well under Postgres' 65535)
+    BULK_INSERT_CHUNK_SIZE = 1000
+
     # Standard KPI definitions for Granola
     STANDARD_KPIS = {
         "mrr": {
@@ -101,18 +108,68 @@ class KPIIngestionService:
             "display_name": "LTV:CAC Ratio",
             "category": MetricCategory.FINANCIAL,
             "unit": MetricUnit.RATIO,
-            "description": "Ratio of lifetime value to customer acquisition cost"
+            "description": "Ratio of lifetime value to customer acquisition cost",
+            "calculation_formula": "ltv / cac"
+        }
+    }
+
+    # Derived KPIs, computed from other metrics during ingestion rather than
+    # synced. Formulas use metric names and the functions supported by
+    # app.algorithms.derived_metrics; windows are in days.
+    DERIVED_KPIS = {
+        "mrr_growth_rate": {
+            "name": "mrr_growth_rate",
+            "display_name": "MRR Growth Rate",
+            "category": MetricCategory.GROWTH,
+            "unit": MetricUnit.PERCENTAGE,
+            "description": "Month-over-month change in monthly recurring revenue",
+            "calculation_formula": "pct_change(mrr, 30)"
+        },
+        "active_user_growth_rate": {
+            "name": "active_user_growth_rate",
+            "display_name": "Active User Growth Rate",
+            "category": MetricCategory.GROWTH,
+            "unit": MetricUnit.PERCENTAGE,
+            "description": "Month-over-month change in active users",
+            "calculation_formula": "pct_change(active_users, 30)"
+        },
+        "burn_multiple": {
+            "name": "burn_multiple",
+            "display_name": "Burn Multiple",
+            "category": MetricCategory.FINANCIAL,
+            "unit": MetricUnit.RATIO,
+            "description": "Monthly cash burn per dollar of net new MRR",
+            "calculation_formula": "burn_rate / delta(mrr, 30)"
+        },
+        "trailing_burn_90d": {
+            "name": "trailing_burn_90d",
+            "display_name": "Trailing 90-Day Burn",
+            "category": MetricCategory.FINANCIAL,
+            "unit": MetricUnit.CURRENCY,
+            "description": "Cash burned over the trailing 90 days",
+            "calculation_formula": "rolling_sum(burn_rate, 90) / 30"
         }
     }
 
-    def __init__(self):
+    def __init__(self, anomaly_service=None, series_cache: Optional[KPISeriesCache] = None):
+        """
+        Initialize KPI ingestion service
+
+        Args:
+            anomaly_service: Optional AnomalyDetectionService used to score
+                each ingested data point as it is inserted
+            series_cache: KPI series cache (defaults to the shared instance)
+        """
         self.logger = logging.getLogger(__name__)
+        self.anomaly_service = anomaly_service
+        self.series_cache = series_cache or get_kpi_series_cache()
 
     async def initialize_standard_kpis(
         self,
         workspace_id: UUID,
         source_platform: str = "granola",
-        db: Optional[Session] = None
+        db: Optional[Session] = None,
+        include_derived: bool = False
     ) -> List[KPIMetricResponse]:
         """
         Initialize standard KPI definitions for a workspace
@@ -121,16 +178,33 @@ class KPIIngestionService:
             workspace_id: Workspace ID
             source_platform: Source platform name
             db: Database session
+            include_derived: Also create the DERIVED_KPIS definitions
 
         Returns:
             List of created KPI metrics
         """
+        if not db:
+            return []
+
+        return await run_in_session(
+            db, self._create_standard_kpis, workspace_id, source_platform, db, include_derived
+        )
+
+    def _create_standard_kpis(
+        self,
+        workspace_id: UUID,
+        source_platform: str,
+        db: Session,
+        include_derived: bool = False
+    ) -> List[KPIMetricResponse]:
+        """Create missing KPI definitions on the calling thread (see initialize_standard_kpis)"""
         created_metrics = []
 
-        if not db:
-            return created_metrics
+        definitions = dict(self.STANDARD_KPIS)
+        if include_derived:
+            definitions.update(self.DERIVED_KPIS)
 
-        for kpi_key, kpi_def in self.STANDARD_KPIS.items():
+        for kpi_key, kpi_def in definitions.items():
             try:
                 # Check if metric already exists
                 existing_query = text("""
@@ -202,8 +276,6 @@ class KPIIngestionService:
             SyncStatus with sync results
         """
         sync_start = datetime.utcnow()
-        metrics_synced = 0
-        errors = []
 
         if not db:
             return SyncStatus(
@@ -230,102 +302,252 @@ class KPIIngestionService:
 
                 kpis_data = kpi_response.data
 
-                # Ensure standard metrics exist
-                await self.initialize_standard_kpis(workspace_id, db=db)
+                # Ensure standard metrics exist and get their definitions
+                metric_map = await run_in_session(db, self._load_metric_map, workspace_id, db)
 
-                # Get metric definitions from database
-                metrics_query = text("""
-                    SELECT * FROM kpis.kpi_metrics
-                    WHERE workspace_id = :workspace_id
-                """)
-                metrics_result = db.execute(metrics_query, {"workspace_id": str(workspace_id)})
-                metric_rows = metrics_result.fetchall()
-                metric_map = {m["name"]: dict(m._mapping) for m in metric_rows}
-
-                # Process each KPI
-                for kpi_name, kpi_value in kpis_data.items():
-                    # Skip if not in metrics_to_sync filter
-                    if metrics_to_sync and kpi_name not in metrics_to_sync:
-                        continue
-
-                    # Skip if metric not defined
-                    if kpi_name not in metric_map:
-                        self.logger.warning(f"Metric {kpi_name} not found in database")
-                        continue
-
-                    try:
-                        metric = metric_map[kpi_name]
-
-                        # Extract value and timestamp
-                        if isinstance(kpi_value, dict):
-                            value = float(kpi_value.get("value", 0))
-                            timestamp = kpi_value.get("timestamp", datetime.utcnow().isoformat())
-                        else:
-                            value = float(kpi_value)
-                            timestamp = datetime.utcnow().isoformat()
-
-                        # Create data point
-                        data_point = KPIDataPointCreate(
-                            metric_id=UUID(metric["id"]),
-                            workspace_id=workspace_id,
-                            value=value,
-                            timestamp=datetime.fromisoformat(timestamp.replace("Z", "+00:00")),
-                            period=AggregationPeriod.DAILY,
-                            metadata={
-                                "source": "granola",
-                                "sync_time": sync_start.isoformat()
-                            }
-                        )
-
-                        # Insert data point
-                        insert_query = text("""
-                            INSERT INTO kpis.kpi_data_points
-                            (metric_id, workspace_id, value, timestamp, period, metadata)
-                            VALUES (:metric_id, :workspace_id, :value, :timestamp, :period, :metadata::jsonb)
-                            RETURNING *
-                        """)
-                        result = db.execute(insert_query, {
-                            "metric_id": str(data_point.metric_id),
-                            "workspace_id": str(data_point.workspace_id),
-                            "value": data_point.value,
-                            "timestamp": data_point.timestamp,
-                            "period": data_point.period.value,
-                            "metadata": json.dumps(data_point.metadata)
-                        })
-                        db.commit()
-
-                        row = result.fetchone()
-                        if row:
-                            metrics_synced += 1
-                            self.logger.info(f"Synced {kpi_name}: {value}")
-
-                    except Exception as e:
-                        error_msg = f"Error syncing {kpi_name}: {str(e)}"
-                        self.logger.error(error_msg)
-                        errors.append(error_msg)
-
-                # Calculate derived metrics
-                await self._calculate_derived_metrics(workspace_id, metric_map, db=db)
-
-                # Update sync status
-                sync_status = SyncStatus(
+            return await self.ingest_kpis(
+                workspace_id,
+                kpis_data,
+                metric_map,
+                metrics_to_sync=metrics_to_sync,
+                sync_start=sync_start,
+                db=db
+            )
+
+        except Exception as e:
+            self.logger.error(f"KPI sync failed: {str(e)}")
+            return SyncStatus(
+                workspace_id=workspace_id,
+                last_sync_at=sync_start,
+                status="error",
+                metrics_synced=0,
+                errors=[str(e)]
+            )
+
+    async def ingest_kpis(
+        self,
+        workspace_id: UUID,
+        kpis_data: Dict[str, Any],
+        metric_map: Dict[str, Dict[str, Any]],
+        metrics_to_sync: Optional[List[str]] = None,
+        sync_start: Optional[datetime] = None,
+        source: str = "granola",
+        db: Optional[Session] = None
+    ) -> SyncStatus:
+        """
+        Validate a batch of KPI values and write it in a single transaction
+
+        All values are validated up front, derived metrics are computed from
+        the batch itself, and the data points plus the sync status upsert go
+        to the database as one multi-row statement followed by one commit.
+
+        Args:
+            workspace_id: Workspace ID
+            kpis_data: Map of KPI name to a value or {"value", "timestamp"} dict
+            metric_map: Map of metric names to metric definitions
+            metrics_to_sync: Optional list of specific metrics to sync (default: all)
+            sync_start: Sync start time (default: now)
+            source: Source platform recorded in metadata
+            db: Database session
+
+        Returns:
+            SyncStatus with sync results
+        """
+        sync_start = sync_start or datetime.utcnow()
+        errors = []
+        data_points: List[KPIDataPointCreate] = []
+        batch_values: Dict[str, float] = {}
+
+        for kpi_name, kpi_value in kpis_data.items():
+            # Skip if not in metrics_to_sync filter
+            if metrics_to_sync and kpi_name not in metrics_to_sync:
+                continue
+
+            # Skip if metric not defined
+            if kpi_name not in metric_map:
+                self.logger.warning(f"Metric {kpi_name} not found in database")
+                continue
+
+            try:
+                metric = metric_map[kpi_name]
+
+                # Extract value and timestamp
+                if isinstance(kpi_value, dict):
+                    raw_value = kpi_value.get("value", 0)
+                    timestamp = kpi_value.get("timestamp") or sync_start.isoformat()
+                else:
+                    raw_value = kpi_value
+                    timestamp = sync_start.isoformat()
+
+                if isinstance(timestamp, str):
+                    timestamp = datetime.fromisoformat(timestamp.replace("Z", "+00:00"))
+
+                value = await self.validate_and_normalize_kpi(
+                    kpi_name, raw_value, MetricUnit(metric["unit"])
+                )
+
+                data_points.append(KPIDataPointCreate(
+                    metric_id=UUID(str(metric["id"])),
                     workspace_id=workspace_id,
-                    last_sync_at=sync_start,
-                    next_sync_at=sync_start + timedelta(hours=6),
-                    status="success" if not errors else "partial",
-                    metrics_synced=metrics_synced,
-                    errors=errors,
+                    value=value,
+                    timestamp=timestamp,
+                    period=AggregationPeriod.DAILY,
                     metadata={
-                        "duration_seconds": (datetime.utcnow() - sync_start).total_seconds(),
-                        "source": "granola"
+                        "source": source,
+                        "sync_time": sync_start.isoformat()
                     }
+                ))
+                batch_values[kpi_name] = value
+
+            except Exception as e:
+                error_msg = f"Error syncing {kpi_name}: {str(e)}"
+                self.logger.error(error_msg)
+                errors.append(error_msg)
+
+        metrics_synced = len(data_points)
+        sync_status = SyncStatus(
+            workspace_id=workspace_id,
+            last_sync_at=sync_start,
+            next_sync_at=sync_start + timedelta(hours=6),
+            status="success" if not errors else "partial",
+            metrics_synced=metrics_synced,
+            errors=errors,
+            metadata={
+                "duration_seconds": (datetime.utcnow() - sync_start).total_seconds(),
+                "source": source
+            }
+        )
+
+        try:
+            rows = await run_in_session(
+                db, self._commit_batch, workspace_id, metric_map, batch_values, data_points, sync_status, db
+            )
+        except Exception as e:
+            self.logger.error(f"KPI batch write failed: {str(e)}")
+            return SyncStatus(
+                workspace_id=workspace_id,
+                last_sync_at=sync_start,
+                status="error",
+                metrics_synced=0,
+                errors=errors + [str(e)]
+            )
+
+        # Cache and score only once the batch is committed
+        points_by_metric = {str(dp.metric_id): dp for dp in data_points}
+        for row in rows:
+            data_point = points_by_metric.get(str(row._mapping["metric_id"]))
+            if data_point is None:
+                continue
+
+            self._cache_data_point(row, data_point)
+            if self.anomaly_service and not data_point.metadata.get("derived"):
+                await self._score_data_point(row, data_point)
+
+        self.logger.info(f"Synced {metrics_synced} KPIs for workspace {workspace_id}")
+        return sync_status
+
+    def _load_metric_map(self, workspace_id: UUID, db: Session) -> Dict[str, Dict[str, Any]]:
+        """
+        Ensure the standard and derived metrics exist and load every metric definition of a workspace
+
+        Args:
+            workspace_id: Workspace ID
+            db: Database session
+
+        Returns:
+            Map of metric names to metric definitions
+        """
+        self._create_standard_kpis(workspace_id, "granola", db, include_derived=True)
+
+        metrics_query = text("""
+            SELECT * FROM kpis.kpi_metrics
+            WHERE workspace_id = :workspace_id
+        """)
+        metric_rows = db.execute(metrics_query, {"workspace_id": str(workspace_id)}).fetchall()
+        metrics = [dict(row._mapping) for row in metric_rows]
+        return {metric["name"]: metric for metric in metrics}
+
+    def _commit_batch(
+        self,
+        workspace_id: UUID,
+        metric_map: Dict[str, Dict[str, Any]],
+        values: Dict[str, float],
+        data_points: List[KPIDataPointCreate],
+        sync_status: SyncStatus,
+        db: Session
+    ) -> List[Any]:
+        """
+        Add derived metrics to a validated batch and write it in one transaction
+
+        Args:
+            workspace_id: Workspace ID
+            metric_map: Map of metric names to metric definitions
+            values: Validated values by metric name
+            data_points: Validated data points; derived points are appended
+            sync_status: Sync status upserted with the batch
+            db: Database session
+
+        Returns:
+            Inserted rows
+        """
+        data_points.extend(self._derive_metrics(workspace_id, metric_map, values, sync_status.last_sync_at, db=db))
+        try:
+            rows = self._write_batch(data_points, db, sync_status=sync_status)
+            db.commit()
+        except Exception:
+            db.rollback()
+            raise
+        return rows
+
+    def _write_batch(
+        self,
+        data_points: List[KPIDataPointCreate],
+        db: Session,
+        sync_status: Optional[SyncStatus] = None,
+        returning: bool = True
+    ) -> List[Any]:
+        """
+        Insert data points with multi-row INSERTs, upserting sync status in the same statement
+
+        Args:
+            data_points: Data points to insert
+            db: Database session (the caller commits)
+            sync_status: Optional sync status to upsert alongside the last chunk
+            returning: Whether to fetch the inserted rows
+
+        Returns:
+            Inserted rows (empty when returning is False)
+        """
+        rows = []
+        chunks = [
+            data_points[i:i + self.BULK_INSERT_CHUNK_SIZE]
+            for i in range(0, len(data_points), self.BULK_INSERT_CHUNK_SIZE)
+        ] or [[]]
+
+        for chunk_index, chunk in enumerate(chunks):
+            params: Dict[str, Any] = {}
+            values_sql = []
+            for i, dp in enumerate(chunk):
+                values_sql.append(
+                    f"(:metric_id_{i}, :workspace_id_{i}, :value_{i}, :timestamp_{i}, "
+                    f":period_{i}, CAST(:metadata_{i} AS jsonb))"
                 )
+                params.update({
+                    f"metric_id_{i}": str(dp.metric_id),
+                    f"workspace_id_{i}": str(dp.workspace_id),
+                    f"value_{i}": dp.value,
+                    f"timestamp_{i}": dp.timestamp,
+                    f"period_{i}": dp.period.value,
+                    f"metadata_{i}": json.dumps(dp.metadata)
+                })
 
-                # Store sync status
-                upsert_query = text("""
+            status_sql = ""
+            if sync_status and chunk_index == len(chunks) - 1:
+                status_sql = """
                     INSERT INTO kpis.kpi_sync_status
                     (workspace_id, last_sync_at, next_sync_at, status, metrics_synced, errors, metadata)
-                    VALUES (:workspace_id, :last_sync_at, :next_sync_at, :status, :metrics_synced, :errors::jsonb, :metadata::jsonb)
+                    VALUES (:sync_workspace_id, :last_sync_at, :next_sync_at, :status, :metrics_synced,
+                            CAST(:errors AS jsonb), CAST(:sync_metadata AS jsonb))
                     ON CONFLICT (workspace_id)
                     DO UPDATE SET
                         last_sync_at = EXCLUDED.last_sync_at,
@@ -334,106 +556,396 @@ class KPIIngestionService:
                         metrics_synced = EXCLUDED.metrics_synced,
                         errors = EXCLUDED.errors,
                         metadata = EXCLUDED.metadata
-                """)
-                db.execute(upsert_query, {
-                    "workspace_id": str(workspace_id),
+                """
+                params.update({
+                    "sync_workspace_id": str(sync_status.workspace_id),
                     "last_sync_at": sync_status.last_sync_at,
                     "next_sync_at": sync_status.next_sync_at,
                     "status": sync_status.status,
                     "metrics_synced": sync_status.metrics_synced,
                     "errors": json.dumps(sync_status.errors),
-                    "metadata": json.dumps(sync_status.metadata)
+                    "sync_metadata": json.dumps(sync_status.metadata)
                 })
-                db.commit()
 
-                return sync_status
+            if not chunk:
+                if status_sql:
+                    db.execute(text(status_sql), params)
+                continue
+
+            insert_sql = f"""
+                INSERT INTO kpis.kpi_data_points
+                (metric_id, workspace_id, value, timestamp, period, metadata)
+                VALUES {', '.join(values_sql)}
+                {'RETURNING *' if returning else ''}
+            """
+            if status_sql and returning:
+                query = text(f"""
+                    WITH inserted AS ({insert_sql}),
+                    sync_status AS ({status_sql})
+                    SELECT * FROM inserted
+                """)
+            elif status_sql:
+                query = text(f"""
+                    WITH inserted AS ({insert_sql}),
+                    sync_status AS ({status_sql})
+                    SELECT 1
+                """)
+            else:
+                query = text(insert_sql)
 
-        except Exception as e:
-            self.logger.error(f"KPI sync failed: {str(e)}")
-            return SyncStatus(
+            result = db.execute(query, params)
+            if returning:
+                rows.extend(result.fetchall())
+
+        return rows
+
+    def _derived_graph(self, metric_map: Dict[str, Any]) -> Optional[DerivedMetricGraph]:
+        """
+        Compiled formula graph for the derived metrics defined in a workspace
+
+        Declared formulas apply to metrics present in metric_map; a metric's
+        own calculation_formula (custom metrics) takes precedence.
+
+        Args:
+            metric_map: Map of metric names to metric definitions
+
+        Returns:
+            DerivedMetricGraph, or None if no derived metrics are defined
+        """
+        formulas = {}
+        for name, definition in {**self.STANDARD_KPIS, **self.DERIVED_KPIS}.items():
+            if name in metric_map and definition.get("calculation_formula"):
+                formulas[name] = definition["calculation_formula"]
+        for name, metric in metric_map.items():
+            if isinstance(metric, dict) and metric.get("calculation_formula"):
+                formulas[name] = metric["calculation_formula"]
+
+        if not formulas:
+            return None
+
+        try:
+            return get_derived_metric_graph(formulas)
+        except ValueError as e:
+            self.logger.error(f"Invalid derived metric formulas: {str(e)}")
+            return None
+
+    def _derive_metrics(
+        self,
+        workspace_id: UUID,
+        metric_map: Dict[str, Any],
+        values: Dict[str, float],
+        timestamp: datetime,
+        db: Optional[Session] = None
+    ) -> List[KPIDataPointCreate]:
+        """
+        Compute derived metrics affected by a batch of values
+
+        Only formulas downstream of the metrics in values are evaluated. The
+        history they need (inputs missing from the batch, windows for growth
+        rates and rolling sums) comes from the KPI series cache where it
+        covers the trailing window; the rest is read in one query bounded by
+        that window.
+
+        Args:
+            workspace_id: Workspace ID
+            metric_map: Map of metric names to metric definitions
+            values: Latest values by metric name
+            timestamp: Timestamp for the derived data points
+            db: Database session for history missing from the cache
+
+        Returns:
+            Derived data points to insert
+        """
+        graph = self._derived_graph(metric_map)
+        if graph is None:
+            return []
+
+        targets = [name for name in graph.affected(values) if name in metric_map]
+        if not targets:
+            return []
+
+        lookback = max(graph.lookback[name] for name in targets)
+        # One extra day so the window's first day is covered whatever the time of day
+        window_start = timestamp - timedelta(days=lookback + 1)
+        inputs = [name for name in graph.required_inputs(targets) if name in metric_map]
+
+        histories = {}
+        for name in inputs:
+            points = self._cached_history(workspace_id, metric_map[name], window_start)
+            if points is not None:
+                histories[name] = points
+
+        # Without windowed formulas a value in the batch is all the history it needs
+        missing = [
+            name for name in inputs
+            if name not in histories and (lookback > 0 or name not in values)
+        ]
+        if missing and db is not None:
+            histories.update(self._load_history(workspace_id, metric_map, missing, window_start, db))
+
+        for name, value in values.items():
+            if name in inputs:
+                histories.setdefault(name, []).append((timestamp, value))
+
+        results = graph.evaluate_latest(histories, values.keys(), timestamp)
+
+        return [
+            KPIDataPointCreate(
+                metric_id=UUID(str(metric_map[name]["id"])),
                 workspace_id=workspace_id,
-                last_sync_at=sync_start,
-                status="error",
-                metrics_synced=metrics_synced,
-                errors=[str(e)]
+                value=results[name],
+                timestamp=timestamp,
+                period=AggregationPeriod.DAILY,
+                metadata={
+                    "derived": True,
+                    "formula": graph.formulas[name].expression
+                }
             )
+            for name in targets
+            if name in results
+        ]
 
-    async def _calculate_derived_metrics(
+    def _cached_history(
+        self,
+        workspace_id: UUID,
+        metric: Dict[str, Any],
+        start: datetime
+    ) -> Optional[List[tuple]]:
+        """(timestamp, value) pairs of a metric from the KPI series cache, or None unless cached from start on"""
+        for period in (AggregationPeriod.DAILY, None):
+            series = self.series_cache.get(workspace_id, metric["id"], period)
+            if series is not None and series.covers(start):
+                return list(zip(series.timestamps, series.values))
+        return None
+
+    def _load_history(
         self,
         workspace_id: UUID,
         metric_map: Dict[str, Any],
-        db: Optional[Session] = None
-    ) -> None:
+        names: List[str],
+        start: datetime,
+        db: Session
+    ) -> Dict[str, List[tuple]]:
         """
-        Calculate derived metrics from base metrics
+        Read the stored daily history of several metrics from a start time on
+
+        Each metric's last point before start is included too, so its value
+        carries forward into the window.
 
         Args:
             workspace_id: Workspace ID
             metric_map: Map of metric names to metric definitions
+            names: Metrics to read
+            start: Earliest timestamp needed
             db: Database session
+
+        Returns:
+            Map of metric name to (timestamp, value) pairs, oldest first
         """
-        if not db:
-            return
+        names_by_id = {str(metric_map[name]["id"]): name for name in names}
+        history_query = text("""
+            SELECT metric_id, timestamp, value FROM kpis.kpi_data_points
+            WHERE workspace_id = :workspace_id AND metric_id = ANY(:metric_ids)
+                AND period = :period AND timestamp >= :start
+            UNION ALL
+            (
+                SELECT DISTINCT ON (metric_id) metric_id, timestamp, value FROM kpis.kpi_data_points
+                WHERE workspace_id = :workspace_id AND metric_id = ANY(:metric_ids)
+                    AND period = :period AND timestamp < :start
+                ORDER BY metric_id, timestamp DESC
+            )
+            ORDER BY timestamp
+        """)
 
+        histories: Dict[str, List[tuple]] = {name: [] for name in names}
         try:
-            # Calculate LTV:CAC ratio if both metrics exist
-            if "ltv" in metric_map and "cac" in metric_map:
-                ltv_metric = metric_map["ltv"]
-                cac_metric = metric_map["cac"]
-
-                # Get latest LTV value
-                ltv_query = text("""
-                    SELECT value FROM kpis.kpi_data_points
-                    WHERE metric_id = :metric_id
-                    ORDER BY timestamp DESC
-                    LIMIT 1
-                """)
-                ltv_result = db.execute(ltv_query, {"metric_id": ltv_metric["id"]})
-                ltv_row = ltv_result.fetchone()
-
-                # Get latest CAC value
-                cac_result = db.execute(ltv_query, {"metric_id": cac_metric["id"]})
-                cac_row = cac_result.fetchone()
-
-                if ltv_row and cac_row:
-                    ltv_value = ltv_row["value"]
-                    cac_value = cac_row["value"]
-
-                    if cac_value > 0:
-                        ratio = ltv_value / cac_value
-
-                        # Store ratio
-                        if "ltv_cac_ratio" in metric_map:
-                            ratio_metric = metric_map["ltv_cac_ratio"]
-                            data_point = KPIDataPointCreate(
-                                metric_id=UUID(ratio_metric["id"]),
-                                workspace_id=workspace_id,
-                                value=ratio,
-                                timestamp=datetime.utcnow(),
-                                period=AggregationPeriod.DAILY,
-                                metadata={
-                                    "derived": True,
-                                    "formula": "ltv / cac"
-                                }
-                            )
-
-                            insert_query = text("""
-                                INSERT INTO kpis.kpi_data_points
-                                (metric_id, workspace_id, value, timestamp, period, metadata)
-                                VALUES (:metric_id, :workspace_id, :value, :timestamp, :period, :metadata::jsonb)
-                            """)
-                            db.execute(insert_query, {
-                                "metric_id": str(data_point.metric_id),
-                                "workspace_id": str(data_point.workspace_id),
-                                "value": data_point.value,
-                                "timestamp": data_point.timestamp,
-                                "period": data_point.period.value,
-                                "metadata": json.dumps(data_point.metadata)
-                            })
-                            db.commit()
+            rows = db.execute(history_query, {
+                "workspace_id": str(workspace_id),
+                "metric_ids": list(names_by_id),
+                "period": AggregationPeriod.DAILY.value,
+                "start": start
+            }).fetchall()
+            for row in rows:
+                point = row._mapping
+                histories[names_by_id[str(point["metric_id"])]].append((point["timestamp"], float(point["value"])))
+        except Exception as e:
+            # Derived metrics without history are skipped rather than failing the sync
+            self.logger.error(f"Error loading derived metric history: {str(e)}")
+            return {}
+
+        return histories
+
+    def _cache_data_point(self, row: Any, data_point: KPIDataPointCreate) -> None:
+        """
+        Append a freshly inserted data point to any cached series of its metric
+
+        Args:
+            row: Inserted row returned by the database
+            data_point: Data point that was inserted
+        """
+        try:
+            self.series_cache.append(
+                data_point.workspace_id,
+                data_point.metric_id,
+                dict(row._mapping),
+                period=data_point.period
+            )
+        except Exception as e:
+            # A stale cache entry is dropped rather than failing the sync
+            self.logger.error(f"Error updating KPI series cache: {str(e)}")
+            self.series_cache.invalidate(data_point.workspace_id, data_point.metric_id)
+
+    async def _score_data_point(self, row: Any, data_point: KPIDataPointCreate) -> None:
+        """
+        Run streaming anomaly detection on a freshly inserted data point
+
+        Args:
+            row: Inserted row returned by the database
+            data_point: Data point that was inserted
+        """
+        try:
+            await self.anomaly_service.score_data_point(
+                metric_id=data_point.metric_id,
+                workspace_id=data_point.workspace_id,
+                data_point_id=UUID(str(dict(row._mapping)["id"])),
+                value=data_point.value,
+                timestamp=data_point.timestamp
+            )
+        except Exception as e:
+            # Detection must never fail the sync
+            self.logger.error(f"Streaming anomaly detection failed: {str(e)}")
+
+    async def backfill_derived_metrics(
+        self,
+        workspace_id: UUID,
+        metric_map: Optional[Dict[str, Any]] = None,
+        start_date: Optional[datetime] = None,
+        db: Optional[Session] = None
+    ) -> int:
+        """
+        Recompute derived metrics over the full stored history
 
+        Input series are loaded in one query and each formula is evaluated
+        as a single vectorized pass over daily-aligned arrays. Existing
+        derived points in the range are replaced by one point per day in
+        the same transaction. The database work runs off the event loop.
+
+        Args:
+            workspace_id: Workspace ID
+            metric_map: Map of metric names to metric definitions (default: loaded,
+                creating missing standard and derived metrics)
+            start_date: Only write derived points from this date (default: all history)
+            db: Database session
+
+        Returns:
+            Number of derived data points written
+        """
+        if not db:
+            return 0
+
+        try:
+            written, targets = await run_in_session(
+                db, self._backfill_derived_metrics, workspace_id, metric_map, start_date, db
+            )
         except Exception as e:
-            self.logger.error(f"Error calculating derived metrics: {str(e)}")
+            self.logger.error(f"Error backfilling derived metrics: {str(e)}")
+            return 0
+
+        for metric_id in targets:
+            self.series_cache.invalidate(workspace_id, metric_id)
+
+        if targets:
+            self.logger.info(f"Backfilled {written} derived data points for workspace {workspace_id}")
+        return written
+
+    def _backfill_derived_metrics(
+        self,
+        workspace_id: UUID,
+        metric_map: Optional[Dict[str, Any]],
+        start_date: Optional[datetime],
+        db: Session
+    ) -> Tuple[int, List[str]]:
+        """
+        Recompute and replace derived points on the calling thread (see backfill_derived_metrics)
+
+        Returns:
+            (points written, IDs of the derived metrics replaced)
+        """
+        if metric_map is None:
+            metric_map = self._load_metric_map(workspace_id, db)
+
+        graph = self._derived_graph(metric_map)
+        if graph is None:
+            return 0, []
+
+        targets = [name for name in graph.order if name in metric_map]
+        inputs = [name for name in graph.required_inputs(targets) if name in metric_map]
+        if not targets or not inputs:
+            return 0, []
+
+        series = self._load_workspace_series(
+            workspace_id,
+            [metric_map[name]["id"] for name in inputs],
+            AggregationPeriod.DAILY,
+            db
+        )
+        histories = {}
+        for name in inputs:
+            metric_series = series.get(str(metric_map[name]["id"]))
+            histories[name] = (
+                list(zip(metric_series.timestamps, metric_series.values)) if metric_series else []
+            )
+
+        days, results = graph.evaluate_history(histories, targets)
+
+        data_points = []
+        for name in targets:
+            keep = np.isfinite(results[name])
+            if start_date:
+                keep &= days >= to_day(start_date)
+            for day, value in zip(days[keep].astype("datetime64[s]").tolist(), results[name][keep]):
+                data_points.append(KPIDataPointCreate(
+                    metric_id=UUID(str(metric_map[name]["id"])),
+                    workspace_id=workspace_id,
+                    value=float(value),
+                    timestamp=day,
+                    period=AggregationPeriod.DAILY,
+                    metadata={
+                        "derived": True,
+                        "formula": graph.formulas[name].expression,
+                        "backfill": True
+                    }
+                ))
+
+        delete_conditions = [
+            "workspace_id = :workspace_id",
+            "metric_id = ANY(:metric_ids)",
+            "period = :period",
+            "(metadata->>'derived')::boolean IS TRUE"
+        ]
+        target_ids = [str(metric_map[name]["id"]) for name in targets]
+        params = {
+            "workspace_id": str(workspace_id),
+            "metric_ids": target_ids,
+            "period": AggregationPeriod.DAILY.value
+        }
+        if start_date:
+            delete_conditions.append("timestamp >= :start_date")
+            params["start_date"] = start_date
+
+        try:
+            db.execute(text(f"""
+                DELETE FROM kpis.kpi_data_points
+                WHERE {' AND '.join(delete_conditions)}
+            """), params)
+            if data_points:
+                self._write_batch(data_points, db, returning=False)
+            db.commit()
+        except Exception:
+            db.rollback()
+            raise
+
+        return len(data_points), target_ids
 
     async def get_current_snapshot(
         self,
@@ -533,6 +1045,18 @@ class KPIIngestionService:
             List of KPI data points
         """
         try:
+            # Serve from the cached series when it covers the requested range
+            if start_date is None and end_date is None:
+                series = await self.get_metric_series(metric_id, workspace_id, period, db=db)
+            else:
+                series = self.series_cache.get(workspace_id, metric_id, period)
+
+            if series is not None and series.covers(start_date):
+                return [
+                    KPIDataPointResponse(**row)
+                    for row in series.window(start_date, end_date, limit, descending=True)
+                ]
+
             if not db:
                 return []
 
@@ -573,6 +1097,115 @@ class KPIIngestionService:
             self.logger.error(f"Error getting metric history: {str(e)}")
             return []
 
+    async def get_metric_series(
+        self,
+        metric_id: UUID,
+        workspace_id: UUID,
+        period: AggregationPeriod = AggregationPeriod.DAILY,
+        db: Optional[Session] = None
+    ) -> Optional[KPISeries]:
+        """
+        Get the full cached series for a metric, loading it on a miss
+
+        Args:
+            metric_id: Metric ID
+            workspace_id: Workspace ID
+            period: Aggregation period
+            db: Database session
+
+        Returns:
+            KPISeries with rollups and statistics, or None if unavailable
+        """
+        series = self.series_cache.get(workspace_id, metric_id, period)
+        if series is not None or not db:
+            return series
+
+        try:
+            query = text("""
+                SELECT * FROM kpis.kpi_data_points
+                WHERE metric_id = :metric_id
+                    AND workspace_id = :workspace_id
+                    AND period = :period
+                ORDER BY timestamp DESC
+            """)
+            result = db.execute(query, {
+                "metric_id": str(metric_id),
+                "workspace_id": str(workspace_id),
+                "period": period.value
+            })
+            points = [dict(row._mapping) for row in reversed(result.fetchall())]
+
+            return self.series_cache.put(workspace_id, metric_id, points, period)
+
+        except Exception as e:
+            self.logger.error(f"Error loading metric series: {str(e)}")
+            return None
+
+    async def get_workspace_series(
+        self,
+        workspace_id: UUID,
+        metric_ids: List[Any],
+        period: Optional[AggregationPeriod] = None,
+        db: Optional[Session] = None
+    ) -> Dict[str, KPISeries]:
+        """
+        Get cached series for many metrics, loading all misses in one query
+
+        Args:
+            workspace_id: Workspace ID
+            metric_ids: Metric IDs
+            period: Optional aggregation period (default: all periods)
+            db: Database session
+
+        Returns:
+            Mapping of metric ID to KPISeries
+        """
+        return self._load_workspace_series(workspace_id, metric_ids, period, db)
+
+    def _load_workspace_series(
+        self,
+        workspace_id: UUID,
+        metric_ids: List[Any],
+        period: Optional[AggregationPeriod],
+        db: Optional[Session]
+    ) -> Dict[str, KPISeries]:
+        """Cached series for many metrics, reading misses on the calling thread (see get_workspace_series)"""
+        found = self.series_cache.get_many(workspace_id, metric_ids, period)
+        missing = [str(mid) for mid in metric_ids if str(mid) not in found]
+        if not missing or not db:
+            return found
+
+        try:
+            conditions = [
+                "workspace_id = :workspace_id",
+                "metric_id = ANY(:metric_ids)"
+            ]
+            params = {"workspace_id": str(workspace_id), "metric_ids": missing}
+
+            if period:
+                conditions.append("period = :period")
+                params["period"] = period.value
+
+            query = text(f"""
+                SELECT * FROM kpis.kpi_data_points
+                WHERE {' AND '.join(conditions)}
+                ORDER BY timestamp
+            """)
+            result = db.execute(query, params)
+
+            grouped: Dict[str, List[Dict[str, Any]]] = {mid: [] for mid in missing}
+            for row in result.fetchall():
+                point = dict(row._mapping)
+                grouped.setdefault(str(point["metric_id"]), []).append(point)
+
+            for mid, points in grouped.items():
+                found[mid] = self.series_cache.put(workspace_id, mid, points, period)
+
+        except Exception as e:
+            self.logger.error(f"Error loading workspace series: {str(e)}")
+
+        return found
+
     async def validate_and_normalize_kpi(
         self,
         kpi_name: str,
@@ -0,0 +1,538 @@
+"""
+KPI Series Cache
+Shared per-workspace cache of KPI time series with precomputed rollups and statistics
+"""
+import bisect
+import json
+import logging
+import time
+from collections import OrderedDict
+from datetime import datetime, timedelta, timezone
+from typing import Dict, Any, List, Optional, Tuple
+from uuid import UUID
+
+import numpy as np
+
+from app.config import get_settings
+
+try:
+    import redis
+except ImportError:  # pragma: no cover - redis is optional
+    redis = None
+
+ROLLUP_PERIODS = ("daily", "weekly", "monthly")
+
+SeriesKey = Tuple[str, str, Optional[str]]
+
+
+def _to_datetime(value: Any) -> datetime:
+    """Parse a timestamp into a naive UTC datetime"""
+    if isinstance(value, str):
+        value = datetime.fromisoformat(value.replace("Z", "+00:00"))
+    if value.tzinfo is not None:
+        value = value.astimezone(timezone.utc).replace(tzinfo=None)
+    return value
+
+
+def _bucket_start(timestamp: datetime, period: str) -> str:
+    """Start date of the rollup bucket containing a timestamp"""
+    day = timestamp.date()
+    if period == "weekly":
+        day = day - timedelta(days=day.weekday())
+    elif period == "monthly":
+        day = day.replace(day=1)
+    return day.isoformat()
+
+
+def summarize_values(values: List[float]) -> Dict[str, float]:
+    """
+    Summary statistics for a list of values
+
+    Args:
+        values: Metric values
+
+    Returns:
+        Dictionary with mean, median, min, max, std and count (empty when no values)
+    """
+    if not values:
+        return {}
+
+    arr = np.asarray(values, dtype=float)
+    return {
+        "mean": float(np.mean(arr)),
+        "median": float(np.median(arr)),
+        "min": float(np.min(arr)),
+        "max": float(np.max(arr)),
+        "std": float(np.std(arr)),
+        "count": float(arr.size)
+    }
+
+
+class KPISeries:
+    """
+    Cached time series for one (workspace, metric, period) key
+
+    Points are kept sorted by timestamp. Daily/weekly/monthly rollups are
+    updated incrementally on append and summary statistics are recomputed
+    on every mutation, so reads never aggregate.
+    """
+
+    def __init__(self, points: List[Dict[str, Any]], since: Optional[datetime] = None):
+        """
+        Build a series from stored data points
+
+        Args:
+            points: Data point rows ordered by timestamp ascending
+            since: Lower timestamp bound the points were loaded from
+                (None when the full history was loaded)
+        """
+        self.points: List[Dict[str, Any]] = []
+        self.timestamps: List[datetime] = []
+        self._ids = set()
+        self.since = _to_datetime(since) if since else None
+        self._buckets: Dict[str, Dict[str, Dict[str, Any]]] = {p: {} for p in ROLLUP_PERIODS}
+        self.statistics: Dict[str, float] = {}
+
+        for point in points:
+            row = self._normalize(point)
+            timestamp = _to_datetime(row["timestamp"])
+            self.points.append(row)
+            self.timestamps.append(timestamp)
+            if row.get("id") is not None:
+                self._ids.add(row["id"])
+            self._add_to_rollups(timestamp, row["value"])
+
+        self._refresh_statistics()
+
+    @staticmethod
+    def _normalize(point: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Copy a row into the JSON-safe shape Supabase returns
+
+        IDs become strings, timestamps naive-UTC ISO strings and the value a
+        float, so rows read through SQLAlchemy and Supabase are interchangeable.
+        """
+        row = {
+            key: value.isoformat() if isinstance(value, datetime)
+            else str(value) if isinstance(value, UUID)
+            else value
+            for key, value in point.items()
+        }
+        row["timestamp"] = _to_datetime(point["timestamp"]).isoformat()
+        row["value"] = float(row["value"])
+        return row
+
+    def __len__(self) -> int:
+        return len(self.points)
+
+    @property
+    def values(self) -> List[float]:
+        """Values in timestamp order"""
+        return [point["value"] for point in self.points]
+
+    @property
+    def latest(self) -> Optional[Dict[str, Any]]:
+        """Most recent data point"""
+        return self.points[-1] if self.points else None
+
+    def covers(self, start_date: Optional[datetime] = None) -> bool:
+        """Whether the cached points include everything from start_date on"""
+        if self.since is None:
+            return True
+        return start_date is not None and _to_datetime(start_date) >= self.since
+
+    def append(self, point: Dict[str, Any]) -> bool:
+        """
+        Insert a newly ingested data point
+
+        Args:
+            point: Data point row with at least value and timestamp
+
+        Returns:
+            True if the point was added, False if it was already cached
+        """
+        row = self._normalize(point)
+        if row.get("id") is not None:
+            if row["id"] in self._ids:
+                return False
+            self._ids.add(row["id"])
+
+        timestamp = _to_datetime(row["timestamp"])
+        index = bisect.bisect_right(self.timestamps, timestamp)
+        self.points.insert(index, row)
+        self.timestamps.insert(index, timestamp)
+
+        self._add_to_rollups(timestamp, row["value"])
+        self._refresh_statistics()
+        return True
+
+    def window(
+        self,
+        start_date: Optional[datetime] = None,
+        end_date: Optional[datetime] = None,
+        limit: Optional[int] = None,
+        descending: bool = False
+    ) -> List[Dict[str, Any]]:
+        """
+        Points within a time range
+
+        Args:
+            start_date: Inclusive lower bound
+            end_date: Inclusive upper bound
+            limit: Keep only the most recent points
+            descending: Return newest first
+
+        Returns:
+            List of data point rows
+        """
+        lo = bisect.bisect_left(self.timestamps, _to_datetime(start_date)) if start_date else 0
+        hi = bisect.bisect_right(self.timestamps, _to_datetime(end_date)) if end_date else len(self.points)
+        if limit is not None:
+            lo = max(lo, hi - limit)
+
+        points = self.points[lo:hi]
+        return points[::-1] if descending else points
+
+    def summary(
+        self,
+        start_date: Optional[datetime] = None,
+        end_date: Optional[datetime] = None,
+        limit: Optional[int] = None
+    ) -> Dict[str, float]:
+        """
+        Summary statistics for a window, precomputed when it spans the series
+
+        Args:
+            start_date: Inclusive lower bound
+            end_date: Inclusive upper bound
+            limit: Keep only the most recent points
+
+        Returns:
+            Dictionary with mean, median, min, max and std
+        """
+        points = self.window(start_date, end_date, limit)
+        if len(points) == len(self.points):
+            return self.statistics
+        return summarize_values([point["value"] for point in points])
+
+    def rollup(self, period: str = "daily") -> List[Dict[str, Any]]:
+        """
+        Aggregated buckets for a rollup period
+
+        Args:
+            period: daily, weekly or monthly
+
+        Returns:
+            Buckets ordered by period start with count, sum, mean, min, max and last
+        """
+        if period not in self._buckets:
+            raise ValueError(f"Unknown rollup period: {period}")
+
+        return [
+            {
+                "period_start": start,
+                "count": bucket["count"],
+                "sum": bucket["sum"],
+                "mean": bucket["sum"] / bucket["count"],
+                "min": bucket["min"],
+                "max": bucket["max"],
+                "last": bucket["last"]
+            }
+            for start, bucket in sorted(self._buckets[period].items())
+        ]
+
+    @property
+    def rollups(self) -> Dict[str, List[Dict[str, Any]]]:
+        """All rollup periods"""
+        return {period: self.rollup(period) for period in ROLLUP_PERIODS}
+
+    def _add_to_rollups(self, timestamp: datetime, value: float) -> None:
+        for period, buckets in self._buckets.items():
+            start = _bucket_start(timestamp, period)
+            bucket = buckets.get(start)
+            if bucket is None:
+                buckets[start] = {
+                    "count": 1, "sum": value, "min": value, "max": value,
+                    "last": value, "last_timestamp": timestamp
+                }
+                continue
+
+            bucket["count"] += 1
+            bucket["sum"] += value
+            bucket["min"] = min(bucket["min"], value)
+            bucket["max"] = max(bucket["max"], value)
+            if timestamp >= bucket["last_timestamp"]:
+                bucket["last"] = value
+                bucket["last_timestamp"] = timestamp
+
+    def _refresh_statistics(self) -> None:
+        self.statistics = summarize_values(self.values)
+
+    def to_json(self) -> str:
+        """Serialize for the shared store"""
+        return json.dumps({
+            "since": self.since.isoformat() if self.since else None,
+            "points": self.points
+        }, default=str)
+
+    @classmethod
+    def from_json(cls, payload: str) -> "KPISeries":
+        """Rebuild a series serialized with to_json"""
+        data = json.loads(payload)
+        return cls(data["points"], since=data.get("since"))
+
+
+class KPISeriesCache:
+    """
+    In-process LRU/TTL cache of KPI series with an optional Redis shared store
+
+    Keys are (workspace_id, metric_id, period). A period of None holds the
+    metric's data points regardless of their aggregation period. Reads
+    populate the cache, ingestion appends to any cached series for the
+    metric, and the shared store (when configured) lets every worker reuse
+    a series loaded by one of them.
+    """
+
+    def __init__(
+        self,
+        ttl_seconds: int = 300,
+        max_entries: int = 2048,
+        redis_url: Optional[str] = None
+    ):
+        """
+        Initialize the cache
+
+        Args:
+            ttl_seconds: Lifetime of cached series
+            max_entries: Maximum series held in process
+            redis_url: Optional Redis URL for the shared store
+        """
+        self.logger = logging.getLogger(__name__)
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[SeriesKey, Tuple[float, KPISeries]]" = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+        self.shared = None
+        if redis_url and redis is not None:
+            try:
+                self.shared = redis.Redis.from_url(redis_url)
+            except Exception as e:
+                self.logger.error(f"Error connecting KPI series shared store: {str(e)}")
+
+    @staticmethod
+    def _key(workspace_id: Any, metric_id: Any, period: Optional[Any] = None) -> SeriesKey:
+        period = getattr(period, "value", period)
+        return str(workspace_id), str(metric_id), period
+
+    @staticmethod
+    def _shared_key(key: SeriesKey) -> str:
+        workspace_id, metric_id, period = key
+        return f"kpi_series:{workspace_id}:{metric_id}:{period or 'all'}"
+
+    def get(
+        self,
+        workspace_id: Any,
+        metric_id: Any,
+        period: Optional[Any] = None
+    ) -> Optional[KPISeries]:
+        """
+        Look up a cached series
+
+        Args:
+            workspace_id: Workspace ID
+            metric_id: Metric ID
+            period: Aggregation period (None for all periods)
+
+        Returns:
+            Cached KPISeries or None on a miss
+        """
+        key = self._key(workspace_id, metric_id, period)
+        series = self._get_local(key)
+
+        if series is None and self.shared is not None:
+            try:
+                payload = self.shared.get(self._shared_key(key))
+                if payload:
+                    series = KPISeries.from_json(payload)
+                    self._set_local(key, series)
+            except Exception as e:
+                self.logger.error(f"Error reading KPI series shared store: {str(e)}")
+
+        if series is None:
+            self.misses += 1
+        else:
+            self.hits += 1
+        return series
+
+    def get_many(
+        self,
+        workspace_id: Any,
+        metric_ids: List[Any],
+        period: Optional[Any] = None
+    ) -> Dict[str, KPISeries]:
+        """
+        Look up several metrics of a workspace
+
+        Args:
+            workspace_id: Workspace ID
+            metric_ids: Metric IDs
+            period: Aggregation period (None for all periods)
+
+        Returns:
+            Mapping of metric ID to cached series (misses omitted)
+        """
+        found = {}
+        for metric_id in metric_ids:
+            series = self.get(workspace_id, metric_id, period)
+            if series is not None:
+                found[str(metric_id)] = series
+        return found
+
+    def put(
+        self,
+        workspace_id: Any,
+        metric_id: Any,
+        points: List[Dict[str, Any]],
+        period: Optional[Any] = None,
+        since: Optional[datetime] = None
+    ) -> KPISeries:
+        """
+        Cache a series loaded from the database
+
+        Args:
+            workspace_id: Workspace ID
+            metric_id: Metric ID
+            points: Data point rows ordered by timestamp ascending
+            period: Aggregation period (None for all periods)
+            since: Lower timestamp bound the points were loaded from
+
+        Returns:
+            The cached KPISeries
+        """
+        key = self._key(workspace_id, metric_id, period)
+        series = KPISeries(points, since=since)
+        self._set_local(key, series)
+        self._write_shared(key, series)
+        return series
+
+    def append(
+        self,
+        workspace_id: Any,
+        metric_id: Any,
+        point: Dict[str, Any],
+        period: Optional[Any] = None
+    ) -> None:
+        """
+        Add an ingested data point to every cached series it belongs to
+
+        Series that are not cached are left alone; the next read loads them.
+
+        Args:
+            workspace_id: Workspace ID
+            metric_id: Metric ID
+            point: Data point row with at least value and timestamp
+            period: Aggregation period of the data point
+        """
+        periods = {self._key(workspace_id, metric_id, period)[2], None}
+        for key_period in periods:
+            key = self._key(workspace_id, metric_id, key_period)
+            series = self._get_local(key)
+            if series is None and self.shared is not None:
+                series = self.get(workspace_id, metric_id, key_period)
+            if series is not None and series.append(point):
+                self._write_shared(key, series)
+
+    def invalidate(
+        self,
+        workspace_id: Any,
+        metric_id: Optional[Any] = None
+    ) -> None:
+        """
+        Drop cached series for a metric, or for the whole workspace
+
+        Args:
+            workspace_id: Workspace ID
+            metric_id: Optional metric ID
+        """
+        keys = [
+            key for key in self._entries
+            if key[0] == str(workspace_id) and (metric_id is None or key[1] == str(metric_id))
+        ]
+        for key in keys:
+            self._entries.pop(key, None)
+
+        if self.shared is not None:
+            try:
+                pattern = f"kpi_series:{workspace_id}:{metric_id if metric_id is not None else '*'}:*"
+                stale = list(self.shared.scan_iter(match=pattern))
+                if stale:
+                    self.shared.delete(*stale)
+            except Exception as e:
+                self.logger.error(f"Error invalidating KPI series shared store: {str(e)}")
+
+    def clear(self) -> None:
+        """Drop every in-process entry"""
+        self._entries.clear()
+        self.hits = 0
+        self.misses = 0
+
+    def stats(self) -> Dict[str, Any]:
+        """Cache size and hit ratio"""
+        lookups = self.hits + self.misses
+        return {
+            "entries": len(self._entries),
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_ratio": self.hits / lookups if lookups else 0.0,
+            "shared_store": self.shared is not None
+        }
+
+    def _get_local(self, key: SeriesKey) -> Optional[KPISeries]:
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+
+        expires_at, series = entry
+        if expires_at < time.monotonic():
+            del self._entries[key]
+            return None
+
+        self._entries.move_to_end(key)
+        return series
+
+    def _set_local(self, key: SeriesKey, series: KPISeries) -> None:
+        self._entries[key] = (time.monotonic() + self.ttl_seconds, series)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def _write_shared(self, key: SeriesKey, series: KPISeries) -> None:
+        if self.shared is None:
+            return
+        try:
+            self.shared.setex(self._shared_key(key), self.ttl_seconds, series.to_json())
+        except Exception as e:
+            self.logger.error(f"Error writing KPI series shared store: {str(e)}")
+
+
+_kpi_series_cache: Optional[KPISeriesCache] = None
+
+
+def get_kpi_series_cache() -> KPISeriesCache:
+    """
+    Get or create singleton KPI series cache
+
+    Returns:
+        KPISeriesCache instance configured from settings
+    """
+    global _kpi_series_cache
+    if _kpi_series_cache is None:
+        settings = get_settings()
+        _kpi_series_cache = KPISeriesCache(
+            ttl_seconds=settings.kpi_series_cache_ttl_seconds,
+            max_entries=settings.kpi_series_cache_max_entries,
+            redis_url=settings.kpi_series_cache_redis_url
+        )
+    return _kpi_series_cache
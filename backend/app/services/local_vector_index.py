@@ -0,0 +1,609 @@
+"""
+Local Vector Index
+Workspace-sharded in-process HNSW search on disk for offline deployments,
+and exact in-memory shards as a read-through cache in front of pgvector
+"""
+import asyncio
+import json
+import logging
+import os
+import re
+import shutil
+import threading
+import time
+from collections import Counter, OrderedDict
+from typing import Any, Awaitable, Callable, Dict, Iterable, List, Optional, Tuple, Union
+
+import numpy as np
+
+from app.algorithms.flat_index import FlatIndex
+from app.algorithms.hnsw import HNSWIndex
+from app.config import get_settings
+
+
+logger = logging.getLogger(__name__)
+
+SHARD_NAME_PART = re.compile(r"^[A-Za-z0-9_.-]+$")
+ALL_WORKSPACES = "_"
+
+# (table, embedding_column, workspace_id, limit) -> at most limit rows with "id" and the vector column
+RowLoader = Callable[[str, str, str, int], Awaitable[List[Dict[str, Any]]]]
+
+
+class _Shard:
+    """One workspace's index and the records its keys point at"""
+
+    RECORDS_FILE = "records.json"
+
+    def __init__(self, index: Union[HNSWIndex, FlatIndex], records: Optional[Dict[str, Dict[str, Any]]] = None):
+        self.index = index
+        self.records = records or {}
+        self.dirty = False
+
+
+class LocalVectorIndex:
+    """
+    HNSW shards keyed by table, vector column and workspace
+
+    Searching one workspace touches one small graph instead of a global
+    one filtered afterwards. Shards are opened on first use and kept in
+    an LRU of max_shards; with a root directory, each shard is a folder
+    of memory-mapped arrays, so reopening it after a restart costs a few
+    file maps rather than a rebuild. Without one, shards live only in
+    memory. Exact shards replace the graph with brute-force search, which
+    builds in one vectorized pass; they are kept in memory only.
+    """
+
+    def __init__(
+        self,
+        root_dir: Optional[str] = None,
+        dimension: int = 1536,
+        dtype: str = "float32",
+        m: int = 16,
+        ef_construction: int = 100,
+        ef_search: int = 64,
+        max_shards: int = 64,
+        exact: bool = False
+    ):
+        """
+        Initialize local vector index
+
+        Args:
+            root_dir: Directory holding shard folders (None keeps shards in memory only)
+            dimension: Vector dimension
+            dtype: Vector storage type, float32 or float16 (half the memory)
+            m: HNSW links per node
+            ef_construction: HNSW search width while inserting
+            ef_search: HNSW search width while querying
+            max_shards: Shards kept open
+            exact: Use brute-force shards instead of HNSW graphs (requires no root_dir)
+        """
+        if exact and root_dir:
+            raise ValueError("Exact shards are kept in memory only")
+
+        self.root_dir = root_dir
+        self.dimension = dimension
+        self.dtype = dtype
+        self.m = m
+        self.ef_construction = ef_construction
+        self.ef_search = ef_search
+        self.max_shards = max_shards
+        self.exact = exact
+        self._shards: "OrderedDict[Tuple[str, str, str], _Shard]" = OrderedDict()
+        # Shards are built and saved from worker threads as well as the event loop
+        self._lock = threading.RLock()
+        self.logger = logging.getLogger(f"{__name__}.{self.__class__.__name__}")
+
+    def upsert(
+        self,
+        table: str,
+        embedding_column: str,
+        workspace_id: Optional[Any],
+        key: str,
+        vector: Iterable[float],
+        record: Optional[Dict[str, Any]] = None
+    ) -> None:
+        """
+        Insert or replace one vector
+
+        Args:
+            table: Table the row belongs to
+            embedding_column: Vector column
+            workspace_id: Workspace the row belongs to
+            key: Row key
+            vector: Embedding
+            record: Row returned with search results
+        """
+        with self._lock:
+            shard = self._shard((table, embedding_column, self._workspace(workspace_id)), create=True)
+            shard.index.add(key, vector)
+            shard.records[key] = {**(record or {}), "id": (record or {}).get("id", key)}
+            shard.dirty = True
+
+    def delete(self, table: str, embedding_column: str, workspace_id: Optional[Any], key: str) -> bool:
+        """
+        Remove one vector
+
+        Args:
+            table: Table the row belongs to
+            embedding_column: Vector column
+            workspace_id: Workspace the row belongs to
+            key: Row key
+
+        Returns:
+            True if the key was indexed
+        """
+        with self._lock:
+            shard = self._shard((table, embedding_column, self._workspace(workspace_id)))
+            if shard is None or not shard.index.remove(key):
+                return False
+            shard.records.pop(key, None)
+            shard.dirty = True
+            return True
+
+    def replace_shard(
+        self,
+        table: str,
+        embedding_column: str,
+        workspace_id: Optional[Any],
+        items: Iterable[Tuple[str, Iterable[float], Dict[str, Any]]]
+    ) -> int:
+        """
+        Build a workspace's shard from scratch
+
+        Args:
+            table: Table the rows belong to
+            embedding_column: Vector column
+            workspace_id: Workspace the rows belong to
+            items: (key, vector, record) triples
+
+        Returns:
+            Number of vectors indexed
+        """
+        shard = _Shard(self._new_index())
+        if isinstance(shard.index, FlatIndex):
+            items = list(items)
+            shard.index.add_many([key for key, _, _ in items], [vector for _, vector, _ in items])
+            shard.records = {key: record for key, _, record in items}
+        else:
+            for key, vector, record in items:
+                shard.index.add(key, vector)
+                shard.records[key] = record
+        shard.dirty = True
+        with self._lock:
+            self._put((table, embedding_column, self._workspace(workspace_id)), shard)
+        return len(shard.index)
+
+    def sync_shard(
+        self,
+        table: str,
+        embedding_column: str,
+        workspace_id: Optional[Any],
+        items: Iterable[Tuple[str, Iterable[float], Dict[str, Any]]]
+    ) -> int:
+        """
+        Bring an open exact shard in line with a workspace's current rows
+
+        Only keys that are new, gone or whose vector changed touch the
+        index; a shard that is not open is built with replace_shard().
+
+        Args:
+            table: Table the rows belong to
+            embedding_column: Vector column
+            workspace_id: Workspace the rows belong to
+            items: (key, vector, record) triples for every current row
+
+        Returns:
+            Number of vectors added, replaced or removed
+        """
+        name = (table, embedding_column, self._workspace(workspace_id))
+        with self._lock:
+            shard = self._shards.get(name)
+        if shard is None or not isinstance(shard.index, FlatIndex):
+            items = list(items)
+            self.replace_shard(table, embedding_column, workspace_id, items)
+            return len(items)
+
+        items = list(items)
+        keys = [key for key, _, _ in items]
+        vectors = [vector for _, vector, _ in items]
+        with self._lock:
+            changed = shard.index.changed(keys, vectors)
+            removed = set(shard.records) - set(keys)
+            for key in removed:
+                shard.index.remove(key)
+            shard.index.add_many(
+                [key for key, flag in zip(keys, changed) if flag],
+                [vector for vector, flag in zip(vectors, changed) if flag]
+            )
+            shard.records = {key: record for key, _, record in items}
+            self._shards.move_to_end(name)
+        return sum(changed) + len(removed)
+
+    def drop_shard(self, table: str, embedding_column: str, workspace_id: Optional[Any]) -> None:
+        """
+        Forget a workspace's shard, in memory and on disk
+
+        Args:
+            table: Table name
+            embedding_column: Vector column
+            workspace_id: Workspace ID
+        """
+        name = (table, embedding_column, self._workspace(workspace_id))
+        with self._lock:
+            self._shards.pop(name, None)
+            path = self._path(name)
+            if path and os.path.isdir(path):
+                shutil.rmtree(path)
+
+    def search(
+        self,
+        table: str,
+        embedding_column: str,
+        query_embedding: List[float],
+        similarity_threshold: float = 0.7,
+        limit: int = 10,
+        workspace_id: Optional[Any] = None,
+        ef_search: Optional[int] = None
+    ) -> List[Dict[str, Any]]:
+        """
+        Nearest records by cosine similarity, shaped like vector_search results
+
+        Without a workspace, every shard of the table is searched and the
+        results merged.
+
+        Args:
+            table: Table name
+            embedding_column: Vector column
+            query_embedding: Query vector
+            similarity_threshold: Minimum similarity score (0-1)
+            limit: Maximum number of results
+            workspace_id: Workspace to search
+            ef_search: HNSW search width (default: index setting)
+
+        Returns:
+            Records with distance and similarity, most similar first
+        """
+        if workspace_id is not None:
+            names = [(table, embedding_column, self._workspace(workspace_id))]
+        else:
+            with self._lock:
+                names = self._shard_names(table, embedding_column)
+
+        results = []
+        with self._lock:
+            for name in names:
+                shard = self._shard(name)
+                if shard is None:
+                    continue
+                for key, similarity in shard.index.search(query_embedding, limit, ef_search):
+                    if similarity > similarity_threshold:
+                        record = shard.records.get(key, {"id": key})
+                        results.append({**record, "distance": 1 - similarity, "similarity": similarity})
+
+        results.sort(key=lambda result: result["similarity"], reverse=True)
+        return results[:limit]
+
+    def has_shard(self, table: str, embedding_column: str, workspace_id: Optional[Any]) -> bool:
+        """Whether a workspace's shard is open"""
+        return (table, embedding_column, self._workspace(workspace_id)) in self._shards
+
+    def save(self) -> int:
+        """
+        Write changed shards to disk
+
+        Returns:
+            Number of shards written
+        """
+        written = 0
+        with self._lock:
+            for name, shard in list(self._shards.items()):
+                if shard.dirty and self._save_shard(name, shard):
+                    written += 1
+        return written
+
+    def _new_index(self) -> Union[HNSWIndex, FlatIndex]:
+        if self.exact:
+            return FlatIndex(self.dimension, dtype=self.dtype)
+        return HNSWIndex(
+            self.dimension,
+            m=self.m,
+            ef_construction=self.ef_construction,
+            ef_search=self.ef_search,
+            dtype=self.dtype
+        )
+
+    @staticmethod
+    def _workspace(workspace_id: Optional[Any]) -> str:
+        return str(workspace_id) if workspace_id is not None else ALL_WORKSPACES
+
+    def _path(self, name: Tuple[str, str, str]) -> Optional[str]:
+        """Shard folder: <root>/<table>.<column>/<workspace>"""
+        if not self.root_dir:
+            return None
+        table, column, workspace = name
+        for part in name:
+            if not SHARD_NAME_PART.match(part):
+                raise ValueError(f"Invalid shard name part: {part}")
+        return os.path.join(self.root_dir, f"{table}.{column}", workspace)
+
+    def _shard_names(self, table: str, embedding_column: str) -> List[Tuple[str, str, str]]:
+        """Open and on-disk shards of a table"""
+        names = {name for name in self._shards if name[:2] == (table, embedding_column)}
+        if self.root_dir:
+            folder = os.path.join(self.root_dir, f"{table}.{embedding_column}")
+            if os.path.isdir(folder):
+                names.update((table, embedding_column, workspace) for workspace in os.listdir(folder))
+        return sorted(names)
+
+    def _shard(self, name: Tuple[str, str, str], create: bool = False) -> Optional[_Shard]:
+        """Open shard, loading it from disk or creating it as needed"""
+        shard = self._shards.get(name)
+        if shard is not None:
+            self._shards.move_to_end(name)
+            return shard
+
+        path = self._path(name)
+        if path and os.path.exists(os.path.join(path, HNSWIndex.META_FILE)):
+            try:
+                with open(os.path.join(path, _Shard.RECORDS_FILE)) as f:
+                    records = json.load(f)
+                shard = _Shard(HNSWIndex.load(path), records)
+            except Exception as e:
+                self.logger.error(f"Failed to open vector shard {path}: {str(e)}")
+
+        if shard is None and create:
+            shard = _Shard(self._new_index())
+        if shard is not None:
+            self._put(name, shard)
+        return shard
+
+    def _put(self, name: Tuple[str, str, str], shard: _Shard) -> None:
+        """Add a shard to the LRU, closing the least recently used"""
+        self._shards[name] = shard
+        self._shards.move_to_end(name)
+        while len(self._shards) > self.max_shards:
+            evicted_name, evicted = self._shards.popitem(last=False)
+            if evicted.dirty:
+                self._save_shard(evicted_name, evicted)
+
+    def _save_shard(self, name: Tuple[str, str, str], shard: _Shard) -> bool:
+        """Write one shard, rebuilding it first when mostly removed entries"""
+        path = self._path(name)
+        if path is None:
+            return False
+
+        try:
+            if shard.index.deleted_count > len(shard.index):
+                shard.index = shard.index.compact()
+            shard.index.save(path)
+            temporary = os.path.join(path, f".{_Shard.RECORDS_FILE}")
+            with open(temporary, "w") as f:
+                json.dump(shard.records, f, default=str)
+            os.replace(temporary, os.path.join(path, _Shard.RECORDS_FILE))
+            shard.dirty = False
+            return True
+
+        except Exception as e:
+            self.logger.error(f"Failed to save vector shard {path}: {str(e)}")
+            return False
+
+
+class VectorSearchCache:
+    """
+    Serves the most-queried workspaces from memory instead of pgvector
+
+    Each (table, column, workspace) search is counted. Once a workspace
+    has min_queries searches and ranks among the max_workspaces busiest,
+    its rows are loaded from Postgres into an exact in-memory shard in
+    the background; until then, and whenever the cache cannot answer, the
+    caller falls through to pgvector. Shards are refreshed after
+    ttl_seconds, applying only the rows that changed, which bounds how
+    stale cached results can be. Counts are halved periodically so the
+    cache follows recent traffic.
+    """
+
+    DECAY_EVERY = 10000
+
+    def __init__(
+        self,
+        index: LocalVectorIndex,
+        max_workspaces: int = 8,
+        ttl_seconds: float = 300,
+        min_queries: int = 20,
+        max_rows: int = 5000
+    ):
+        """
+        Initialize vector search cache
+
+        Args:
+            index: In-memory index holding cached shards (exact shards build fastest)
+            max_workspaces: Workspaces cached at once
+            ttl_seconds: Age after which a cached shard is refreshed
+            min_queries: Searches before a workspace is cached
+            max_rows: Largest workspace (in rows) worth caching
+        """
+        self.index = index
+        self.max_workspaces = max_workspaces
+        self.ttl_seconds = ttl_seconds
+        self.min_queries = min_queries
+        self.max_rows = max_rows
+        self._queries: Counter = Counter()
+        self._total = 0
+        self._warm: Dict[Tuple[str, str, str], float] = {}
+        self._loading: Dict[Tuple[str, str, str], asyncio.Task] = {}
+        self._too_large: set = set()
+        self.stats = {"hits": 0, "misses": 0, "loads": 0}
+        self.logger = logging.getLogger(f"{__name__}.{self.__class__.__name__}")
+
+    async def search(
+        self,
+        table: str,
+        embedding_column: str,
+        query_embedding: List[float],
+        similarity_threshold: float,
+        limit: int,
+        workspace_id: Any,
+        loader: RowLoader
+    ) -> Optional[List[Dict[str, Any]]]:
+        """
+        Answer a workspace search from memory if it is cached
+
+        Args:
+            table: Table name
+            embedding_column: Vector column
+            query_embedding: Query vector
+            similarity_threshold: Minimum similarity score (0-1)
+            limit: Maximum number of results
+            workspace_id: Workspace to search
+            loader: Reads a workspace's rows when it is admitted
+
+        Returns:
+            Results, or None when the caller should query pgvector
+        """
+        key = (table, embedding_column, str(workspace_id))
+        self._count(key)
+
+        loaded_at = self._warm.get(key)
+        if loaded_at is not None and time.monotonic() - loaded_at > self.ttl_seconds:
+            self._schedule(key, loader)
+        if loaded_at is not None and self.index.has_shard(*key):
+            self.stats["hits"] += 1
+            return self.index.search(
+                table, embedding_column, query_embedding, similarity_threshold, limit, workspace_id
+            )
+
+        self.stats["misses"] += 1
+        if self._should_admit(key):
+            self._schedule(key, loader)
+        return None
+
+    def invalidate(self, table: Optional[str] = None, workspace_id: Optional[Any] = None) -> None:
+        """
+        Drop cached shards so the next searches go to pgvector
+
+        Args:
+            table: Only shards of this table
+            workspace_id: Only shards of this workspace
+        """
+        for key in list(self._warm):
+            if (table is None or key[0] == table) and (workspace_id is None or key[2] == str(workspace_id)):
+                self._warm.pop(key)
+                self.index.drop_shard(*key)
+
+    def _count(self, key: Tuple[str, str, str]) -> None:
+        self._queries[key] += 1
+        self._total += 1
+        if self._total % self.DECAY_EVERY == 0:
+            for counted in list(self._queries):
+                self._queries[counted] //= 2
+                if not self._queries[counted]:
+                    del self._queries[counted]
+
+    def _should_admit(self, key: Tuple[str, str, str]) -> bool:
+        """Whether a workspace is busy enough to cache, evicting a colder one if needed"""
+        if key in self._loading or key in self._too_large or self._queries[key] < self.min_queries:
+            return False
+        if len(self._warm) + len(self._loading) < self.max_workspaces:
+            return True
+
+        if not self._warm:
+            return False
+        coldest = min(self._warm, key=lambda warm: self._queries[warm])
+        if self._queries[coldest] >= self._queries[key]:
+            return False
+        self._warm.pop(coldest)
+        self.index.drop_shard(*coldest)
+        return True
+
+    def _schedule(self, key: Tuple[str, str, str], loader: RowLoader) -> None:
+        if key not in self._loading:
+            self._loading[key] = asyncio.create_task(self._load(key, loader))
+
+    async def _load(self, key: Tuple[str, str, str], loader: RowLoader) -> None:
+        """Read a workspace's rows and build or refresh its shard off the event loop"""
+        table, embedding_column, workspace_id = key
+        try:
+            # One row past the limit is enough to tell the workspace is too large
+            rows = await loader(table, embedding_column, workspace_id, self.max_rows + 1)
+            if len(rows) > self.max_rows:
+                self._too_large.add(key)
+                self._warm.pop(key, None)
+                self.index.drop_shard(*key)
+                return
+
+            items = [
+                (str(row["id"]), _as_vector(row[embedding_column]),
+                 {name: value for name, value in row.items() if name != embedding_column})
+                for row in rows
+            ]
+            await asyncio.to_thread(self.index.sync_shard, table, embedding_column, workspace_id, items)
+            self._warm[key] = time.monotonic()
+            self.stats["loads"] += 1
+
+        except Exception as e:
+            self.logger.error(f"Failed to cache vectors for {table} workspace {workspace_id}: {str(e)}")
+
+        finally:
+            self._loading.pop(key, None)
+
+
+def _as_vector(value: Any) -> np.ndarray:
+    """Vector column value as an array (text when the pgvector codec is not registered)"""
+    if isinstance(value, str):
+        value = json.loads(value)
+    return np.asarray(value, dtype=np.float32)
+
+
+_local_vector_index: Optional[LocalVectorIndex] = None
+_vector_search_cache: Optional[VectorSearchCache] = None
+
+
+def get_local_vector_index() -> LocalVectorIndex:
+    """
+    Get or create the on-disk local vector index
+
+    Returns:
+        LocalVectorIndex
+    """
+    global _local_vector_index
+    if _local_vector_index is None:
+        settings = get_settings()
+        _local_vector_index = LocalVectorIndex(
+            root_dir=settings.local_vector_index_path,
+            dimension=settings.embedding_dimension,
+            dtype=settings.local_vector_index_dtype,
+            m=settings.local_vector_index_m,
+            ef_construction=settings.local_vector_index_ef_construction,
+            ef_search=settings.local_vector_index_ef_search
+        )
+    return _local_vector_index
+
+
+def get_vector_search_cache() -> Optional[VectorSearchCache]:
+    """
+    Get or create the pgvector read-through cache
+
+    Returns:
+        VectorSearchCache, or None when caching is disabled
+    """
+    global _vector_search_cache
+    settings = get_settings()
+    if settings.vector_search_cache_workspaces <= 0:
+        return None
+
+    if _vector_search_cache is None:
+        index = LocalVectorIndex(
+            dimension=settings.embedding_dimension,
+            dtype=settings.local_vector_index_dtype,
+            max_shards=settings.vector_search_cache_workspaces,
+            exact=True
+        )
+        _vector_search_cache = VectorSearchCache(
+            index,
+            max_workspaces=settings.vector_search_cache_workspaces,
+            ttl_seconds=settings.vector_search_cache_ttl_seconds,
+            min_queries=settings.vector_search_cache_min_queries,
+            max_rows=settings.vector_search_cache_max_rows
+        )
+    return _vector_search_cache
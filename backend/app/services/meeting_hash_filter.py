@@ -0,0 +1,155 @@
+"""
+Meeting Hash Filter
+In-process per-workspace Bloom filters of ingested meeting hashes
+"""
+import logging
+import time
+from collections import OrderedDict
+from datetime import datetime, timedelta, timezone
+from typing import Callable, List, Optional, Tuple
+from uuid import UUID
+
+from app.algorithms.bloom_filter import BloomFilter
+from app.config import get_settings
+
+
+logger = logging.getLogger(__name__)
+
+
+class MeetingHashFilter:
+    """
+    Answers "has this workspace possibly ingested this meeting" without a query
+
+    A workspace's filter is built from its stored duplicate hashes the first
+    time it is needed, and every meeting saved by this process is added as
+    it is inserted. After ttl_seconds only the hashes stored since the last
+    read (less a small overlap for clock skew between workers) are added;
+    the filter is rebuilt in full only once it outgrows its capacity. A
+    miss means the meeting is new as far as this process knows; meetings
+    inserted by other workers since the last refresh are still caught by
+    the unique index on insert, so the filter only saves lookups and never
+    decides correctness.
+    """
+
+    # Seconds each incremental refresh re-reads before the previous one started
+    REFRESH_OVERLAP_SECONDS = 60
+
+    def __init__(
+        self,
+        ttl_seconds: float = 300,
+        error_rate: float = 0.01,
+        min_capacity: int = 1024,
+        max_workspaces: int = 1024
+    ):
+        """
+        Initialize filter registry
+
+        Args:
+            ttl_seconds: Age after which a workspace filter picks up hashes stored since
+            error_rate: False positive rate (share of new meetings still looked up)
+            min_capacity: Smallest number of hashes a filter is sized for
+            max_workspaces: Workspace filters kept before the least recently used is dropped
+        """
+        self.ttl_seconds = ttl_seconds
+        self.error_rate = error_rate
+        self.min_capacity = min_capacity
+        self.max_workspaces = max_workspaces
+        self._filters: "OrderedDict[str, Tuple[BloomFilter, float, datetime]]" = OrderedDict()
+        self.skipped_lookups = 0
+
+    def might_contain(
+        self,
+        workspace_id: UUID,
+        duplicate_hash: str,
+        load: Callable[[UUID, Optional[datetime]], Optional[List[str]]]
+    ) -> bool:
+        """
+        Check whether a meeting hash may already be stored
+
+        Args:
+            workspace_id: Workspace UUID
+            duplicate_hash: Meeting deduplication hash
+            load: Returns a workspace's hashes stored since a time, or all of them
+                for None (None if they cannot be read)
+
+        Returns:
+            False only when the hash is certainly not stored as of the last refresh
+        """
+        bloom = self._filter(workspace_id, load)
+        if bloom is None:
+            return True
+        if duplicate_hash in bloom:
+            return True
+        self.skipped_lookups += 1
+        return False
+
+    def add(self, workspace_id: UUID, duplicate_hash: str) -> None:
+        """
+        Record a newly stored meeting hash
+
+        Args:
+            workspace_id: Workspace UUID
+            duplicate_hash: Meeting deduplication hash
+        """
+        entry = self._filters.get(str(workspace_id))
+        if entry:
+            entry[0].add(duplicate_hash)
+
+    def invalidate(self, workspace_id: Optional[UUID] = None) -> None:
+        """Drop one workspace's filter, or all filters"""
+        if workspace_id is None:
+            self._filters.clear()
+        else:
+            self._filters.pop(str(workspace_id), None)
+
+    def _filter(
+        self,
+        workspace_id: UUID,
+        load: Callable[[UUID, Optional[datetime]], Optional[List[str]]]
+    ) -> Optional[BloomFilter]:
+        key = str(workspace_id)
+        entry = self._filters.get(key)
+        now = time.monotonic()
+        if entry and now - entry[1] < self.ttl_seconds and not entry[0].saturated:
+            self._filters.move_to_end(key)
+            return entry[0]
+
+        read_at = datetime.now(timezone.utc)
+        incremental = entry is not None and not entry[0].saturated
+        since = entry[2] - timedelta(seconds=self.REFRESH_OVERLAP_SECONDS) if incremental else None
+        hashes = load(workspace_id, since)
+        if hashes is None:
+            self._filters.pop(key, None)
+            return None
+
+        if incremental:
+            bloom = entry[0]
+            for duplicate_hash in hashes:
+                bloom.add(duplicate_hash)
+        else:
+            bloom = BloomFilter.from_items(hashes, max(self.min_capacity, 2 * len(hashes)), self.error_rate)
+        self._filters[key] = (bloom, now, read_at)
+        self._filters.move_to_end(key)
+        while len(self._filters) > self.max_workspaces:
+            self._filters.popitem(last=False)
+        return bloom
+
+
+_meeting_hash_filter: Optional[MeetingHashFilter] = None
+
+
+def get_meeting_hash_filter() -> MeetingHashFilter:
+    """
+    Get or create singleton meeting hash filter
+
+    Returns:
+        MeetingHashFilter configured from settings
+    """
+    global _meeting_hash_filter
+    if _meeting_hash_filter is None:
+        settings = get_settings()
+        _meeting_hash_filter = MeetingHashFilter(
+            ttl_seconds=settings.meeting_dedup_filter_ttl_seconds,
+            error_rate=settings.meeting_dedup_filter_error_rate
+        )
+    return _meeting_hash_filter
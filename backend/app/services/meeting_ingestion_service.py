@@ -8,13 +8,18 @@ from datetime import datetime
 from typing import Dict, Any, List, Optional, Tuple
 from uuid import UUID
 
+from app.config import get_settings
 from app.connectors.zoom_connector import ZoomConnector
 from app.connectors.fireflies_connector import FirefliesConnector
 from app.connectors.otter_connector import OtterConnector
+from app.database import is_unique_violation
+from app.llm.transcript_chunker import TranscriptChunker
 from app.models.meeting import (
     Meeting, MeetingCreate, MeetingSource, MeetingStatus,
     TranscriptChunk, MeetingParticipant, MeetingMetadata
 )
+from app.services.embedding_pipeline import EmbeddingPipeline, get_embedding_pipeline
+from app.services.meeting_hash_filter import get_meeting_hash_filter
 
 logger = logging.getLogger(__name__)
 
@@ -25,21 +30,41 @@ class MeetingIngestionService:
 
     Features:
     - Multi-platform ingestion (Zoom, Fireflies, Otter)
-    - Deduplication across sources
+    - Deduplication across sources (unique hash index, Bloom filter fast path)
     - Participant extraction and matching
     - Transcript chunking for vector storage
     """
 
-    def __init__(self, supabase_client=None):
+    # Rows per request when loading a workspace's meeting hashes
+    HASH_PAGE_SIZE = 1000
+
+    def __init__(self, supabase_client=None, embedding_pipeline: Optional[EmbeddingPipeline] = None):
         """
         Initialize ingestion service
 
         Args:
             supabase_client: Supabase client for database operations
+            embedding_pipeline: Pipeline embedding transcript chunks of new meetings
+                (defaults to the shared pipeline when a client is configured,
+                resolved when the first new meeting is embedded)
         """
         self.supabase = supabase_client
+        self.hash_filter = get_meeting_hash_filter() if get_settings().meeting_dedup_filter_enabled else None
+        self._embedding_pipeline = embedding_pipeline
+        self._embedding_pipeline_resolved = embedding_pipeline is not None or supabase_client is None
         self.logger = logging.getLogger(f"{__name__}.{self.__class__.__name__}")
 
+    @property
+    def embedding_pipeline(self) -> Optional[EmbeddingPipeline]:
+        """Pipeline embedding new meetings' chunks, or None when embeddings are unavailable"""
+        if not self._embedding_pipeline_resolved:
+            self._embedding_pipeline_resolved = True
+            try:
+                self._embedding_pipeline = get_embedding_pipeline(self.supabase)
+            except Exception as e:
+                self.logger.error(f"Embedding pipeline unavailable: {str(e)}")
+        return self._embedding_pipeline
+
     async def ingest_from_zoom(
         self,
         workspace_id: UUID,
@@ -92,6 +117,7 @@ class MeetingIngestionService:
                     title=meeting_data.get("topic", "Untitled Meeting"),
                     source=MeetingSource.ZOOM,
                     status=MeetingStatus.INGESTING,
+                    duplicate_hash=duplicate_hash,
                     scheduled_at=self._parse_datetime(meeting_data.get("start_time")),
                     host_name=meeting_data.get("host_email", "").split("@")[0],
                     host_email=meeting_data.get("host_email"),
@@ -112,8 +138,10 @@ class MeetingIngestionService:
                     ingestion_started_at=datetime.utcnow()
                 )
 
-                # Save to database
-                meeting = await self._save_meeting(meeting)
+                # Save to database, unless a concurrent ingestion got there first
+                meeting, is_duplicate = await self._insert_or_get_existing(meeting)
+                if is_duplicate:
+                    return meeting, True
 
                 self.logger.info(f"Successfully ingested Zoom meeting: {meeting_id}")
                 return meeting, False
@@ -166,6 +194,7 @@ class MeetingIngestionService:
                     title=data.get("title", "Untitled Meeting"),
                     source=MeetingSource.FIREFLIES,
                     status=MeetingStatus.INGESTING,
+                    duplicate_hash=duplicate_hash,
                     scheduled_at=self._parse_datetime(data.get("date")),
                     host_name=data.get("host_name"),
                     host_email=data.get("host_email"),
@@ -187,8 +216,10 @@ class MeetingIngestionService:
                     ingestion_started_at=datetime.utcnow()
                 )
 
-                # Save to database
-                meeting = await self._save_meeting(meeting)
+                # Save to database, unless a concurrent ingestion got there first
+                meeting, is_duplicate = await self._insert_or_get_existing(meeting)
+                if is_duplicate:
+                    return meeting, True
 
                 self.logger.info(f"Successfully ingested Fireflies transcript: {transcript_id}")
                 return meeting, False
@@ -245,6 +276,7 @@ class MeetingIngestionService:
                     title=data.get("title", "Untitled Speech"),
                     source=MeetingSource.OTTER,
                     status=MeetingStatus.INGESTING,
+                    duplicate_hash=duplicate_hash,
                     scheduled_at=self._parse_datetime(data.get("created_at")),
                     host_name=data.get("creator", {}).get("name"),
                     host_email=data.get("creator", {}).get("email"),
@@ -263,8 +295,10 @@ class MeetingIngestionService:
                     ingestion_started_at=datetime.utcnow()
                 )
 
-                # Save to database
-                meeting = await self._save_meeting(meeting)
+                # Save to database, unless a concurrent ingestion got there first
+                meeting, is_duplicate = await self._insert_or_get_existing(meeting)
+                if is_duplicate:
+                    return meeting, True
 
                 self.logger.info(f"Successfully ingested Otter speech: {speech_id}")
                 return meeting, False
@@ -279,28 +313,53 @@ class MeetingIngestionService:
         return hashlib.sha256(hash_input.encode()).hexdigest()
 
     async def _find_by_hash(self, workspace_id: UUID, duplicate_hash: str) -> Optional[Meeting]:
-        """Find existing meeting by hash"""
+        """Find existing meeting by hash, skipping the query for hashes the workspace filter has never seen"""
         if not self.supabase:
             return None
 
+        if self.hash_filter and not self.hash_filter.might_contain(
+            workspace_id, duplicate_hash, self._load_workspace_hashes
+        ):
+            return None
+
+        return await self._fetch_by_hash(workspace_id, duplicate_hash)
+
+    async def _fetch_by_hash(self, workspace_id: UUID, duplicate_hash: str) -> Optional[Meeting]:
+        """Look up a meeting through the (workspace_id, duplicate_hash) unique index"""
         try:
-            # Query using jsonb path to search in metadata
             result = self.supabase.table("meetings").select("*").eq(
                 "workspace_id", str(workspace_id)
+            ).eq(
+                "duplicate_hash", duplicate_hash
             ).execute()
 
-            # Filter by duplicate_hash in metadata
-            for row in result.data:
-                metadata = row.get("metadata", {})
-                platform_data = metadata.get("platform_data", {})
-                if platform_data.get("duplicate_hash") == duplicate_hash:
-                    return Meeting(**row)
-
-            return None
+            return Meeting(**result.data[0]) if result.data else None
         except Exception as e:
             self.logger.error(f"Error finding meeting by hash: {str(e)}")
             return None
 
+    def _load_workspace_hashes(self, workspace_id: UUID, since: Optional[datetime] = None) -> Optional[List[str]]:
+        """Duplicate hashes stored for a workspace (since a time, if given), read a page at a time"""
+        try:
+            hashes = []
+            offset = 0
+            while True:
+                query = self.supabase.table("meetings").select("duplicate_hash").eq(
+                    "workspace_id", str(workspace_id)
+                )
+                if since is not None:
+                    query = query.gte("created_at", since.isoformat())
+                result = query.order("id").range(offset, offset + self.HASH_PAGE_SIZE - 1).execute()
+
+                rows = result.data or []
+                hashes.extend(row["duplicate_hash"] for row in rows if row.get("duplicate_hash"))
+                if len(rows) < self.HASH_PAGE_SIZE:
+                    return hashes
+                offset += self.HASH_PAGE_SIZE
+        except Exception as e:
+            self.logger.error(f"Failed to load meeting hashes for workspace {workspace_id}: {str(e)}")
+            return None
+
     async def _save_meeting(self, meeting: Meeting) -> Meeting:
         """Save meeting to database"""
         if not self.supabase:
@@ -317,6 +376,9 @@ class MeetingIngestionService:
             # Insert into database
             result = self.supabase.table("meetings").insert(meeting_dict).execute()
 
+            if self.hash_filter and meeting.duplicate_hash:
+                self.hash_filter.add(meeting.workspace_id, meeting.duplicate_hash)
+
             self.logger.info(f"Saved meeting to database: {meeting.id}")
             return meeting
 
@@ -324,13 +386,65 @@ class MeetingIngestionService:
             self.logger.error(f"Failed to save meeting: {str(e)}")
             raise
 
-    def _chunk_transcript(self, transcript: str, chunk_size: int = 500) -> List[TranscriptChunk]:
+    async def _insert_or_get_existing(self, meeting: Meeting) -> Tuple[Meeting, bool]:
+        """
+        Insert a meeting, or return the stored one if its hash was inserted concurrently
+
+        The unique (workspace_id, duplicate_hash) index makes the insert the
+        single point of truth for deduplication, so two webhook deliveries
+        racing past the lookup still produce one meeting.
+
+        Args:
+            meeting: Meeting to insert
+
+        Returns:
+            Tuple of (saved or existing Meeting, is_duplicate flag)
+        """
+        try:
+            saved = await self._save_meeting(meeting)
+        except Exception as e:
+            if not meeting.duplicate_hash or not is_unique_violation(e):
+                raise
+
+            existing = await self._fetch_by_hash(meeting.workspace_id, meeting.duplicate_hash)
+            if existing is None:
+                raise
+
+            if self.hash_filter:
+                self.hash_filter.add(meeting.workspace_id, meeting.duplicate_hash)
+            self.logger.info(f"Meeting {meeting.duplicate_hash[:12]} was ingested concurrently: {existing.id}")
+            return existing, True
+
+        await self._embed_chunks(saved)
+        return saved, False
+
+    async def _embed_chunks(self, meeting: Meeting) -> None:
+        """Embed a new meeting's transcript chunks; failures leave the meeting unembedded"""
+        if not self.embedding_pipeline or not meeting.transcript_chunks:
+            return
+
+        try:
+            count = await self.embedding_pipeline.embed_meeting_chunks(meeting)
+            self.logger.info(f"Embedded {count} transcript chunks for meeting {meeting.id}")
+        except Exception as e:
+            self.logger.error(f"Failed to embed transcript chunks for meeting {meeting.id}: {str(e)}")
+
+    def _chunk_transcript(
+        self,
+        transcript: str,
+        chunk_size: int = 500,
+        overlap: int = 0
+    ) -> List[TranscriptChunk]:
         """
         Chunk transcript into smaller pieces for vector embedding
 
+        Chunks follow sentence and speaker-turn boundaries and come from the
+        shared chunk plan cache, so re-ingesting a transcript does not re-split it.
+
         Args:
             transcript: Full transcript text
-            chunk_size: Approximate words per chunk
+            chunk_size: Maximum words per chunk
+            overlap: Words of trailing context repeated in the next chunk
 
         Returns:
             List of TranscriptChunk objects
@@ -338,17 +452,15 @@ class MeetingIngestionService:
         if not transcript:
             return []
 
-        words = transcript.split()
-        chunks = []
-
-        for i in range(0, len(words), chunk_size):
-            chunk_words = words[i:i + chunk_size]
-            chunks.append(TranscriptChunk(
-                text=" ".join(chunk_words),
-                chunk_index=len(chunks)
-            ))
-
-        return chunks
+        chunker = TranscriptChunker(max_tokens=chunk_size, overlap_tokens=overlap)
+        return [
+            TranscriptChunk(
+                text=chunk.text,
+                speaker_name=chunk.speaker,
+                chunk_index=chunk.index
+            )
+            for chunk in chunker.split(transcript)
+        ]
 
     def _extract_zoom_transcript(self, recording_data: Dict[str, Any]) -> Optional[str]:
         """Extract transcript from Zoom recording data"""
@@ -19,6 +19,7 @@ from app.models.recommendation import (
     ImpactLevel
 )
 from app.database import get_supabase_client
+from app.services.kpi_series_cache import get_kpi_series_cache
 
 
 logger = logging.getLogger(__name__)
@@ -31,6 +32,7 @@ class RecommendationService:
         self.supabase = get_supabase_client()
         self.logger = logging.getLogger(__name__)
         self.recommendation_chain = RecommendationChain()
+        self.series_cache = get_kpi_series_cache()
 
     async def generate_recommendations(
         self,
@@ -200,16 +202,25 @@ class RecommendationService:
 
             metrics = query.execute()
 
-            for metric in metrics.data:
-                # Get latest value
-                latest = self.supabase.table("kpi_data_points").select("value,timestamp").eq(
-                    "metric_id", metric["id"]
-                ).order("timestamp", desc=True).limit(1).execute()
+            # Latest values come from the KPI series cache when it holds the metric
+            metric_ids = [str(metric["id"]) for metric in metrics.data]
+            series_by_metric = self.series_cache.get_many(workspace_id, metric_ids)
 
-                if latest.data:
+            for metric in metrics.data:
+                series = series_by_metric.get(str(metric["id"]))
+                if series is not None:
+                    latest = series.latest
+                else:
+                    # Only the newest row is read; a partial read is never cached as history
+                    result = self.supabase.table("kpi_data_points").select("value,timestamp").eq(
+                        "metric_id", str(metric["id"])
+                    ).order("timestamp", desc=True).limit(1).execute()
+                    latest = result.data[0] if result.data else None
+
+                if latest:
                     kpi_data[metric["name"]] = {
-                        "value": latest.data[0]["value"],
-                        "timestamp": latest.data[0]["timestamp"]
+                        "value": latest["value"],
+                        "timestamp": latest["timestamp"]
                     }
 
         except Exception as e:
@@ -0,0 +1,143 @@
+"""
+Recurrence Service
+Detects action items and decisions that repeat ones from a workspace's earlier meetings
+"""
+import logging
+from datetime import datetime, timedelta
+from typing import Any, Callable, Dict, List, Optional, Sequence
+from uuid import UUID
+
+from app.algorithms.near_duplicates import Fingerprint, NearDuplicateIndex
+from app.config import get_settings
+
+
+logger = logging.getLogger(__name__)
+
+
+class RecurrenceService:
+    """
+    Links new items to the first occurrence of the same item in earlier meetings
+
+    Every item gets a MinHash signature and LSH band keys, persisted with
+    the row. Candidates from earlier meetings are fetched in one query on
+    band overlap (GIN-indexed text[] column), so the cost depends on the
+    number of near matches rather than the size of the workspace's history.
+    A matched item gets duplicate_of set to the earliest occurrence, which
+    task routing uses to avoid creating the same task every week.
+    """
+
+    def __init__(
+        self,
+        supabase_client=None,
+        threshold: Optional[float] = None,
+        lookback_days: Optional[int] = None
+    ):
+        """
+        Initialize recurrence service
+
+        Args:
+            supabase_client: Supabase client for database operations
+            threshold: Similarity a recurring item must exceed (default: settings)
+            lookback_days: Age of the oldest meeting searched (default: settings)
+        """
+        settings = get_settings()
+        self.supabase = supabase_client
+        self.threshold = settings.near_duplicate_threshold if threshold is None else threshold
+        self.lookback_days = settings.recurring_item_lookback_days if lookback_days is None else lookback_days
+        self.index = NearDuplicateIndex(threshold=self.threshold)
+        self.logger = logging.getLogger(f"{__name__}.{self.__class__.__name__}")
+
+    def sign(self, items: Sequence[Any], text_of: Callable[[Any], str]) -> List[Fingerprint]:
+        """
+        Fingerprint items and store signature and band keys on them
+
+        Args:
+            items: ActionItem or Decision models
+            text_of: Returns the text an item is compared by
+
+        Returns:
+            Fingerprints in item order
+        """
+        fingerprints = []
+        for item in items:
+            fingerprint = self.index.fingerprint(text_of(item))
+            item.minhash_signature = list(fingerprint.signature)
+            item.lsh_bands = [] if fingerprint.empty else self.index.band_keys(fingerprint.signature)
+            fingerprints.append(fingerprint)
+        return fingerprints
+
+    async def link_recurring(
+        self,
+        table: str,
+        workspace_id: UUID,
+        meeting_id: UUID,
+        items: Sequence[Any],
+        text_of: Callable[[Any], str]
+    ) -> int:
+        """
+        Sign items and point recurring ones at their first occurrence
+
+        Args:
+            table: Table the items are stored in (action_items or decisions)
+            workspace_id: Workspace UUID
+            meeting_id: Meeting the items were extracted from
+            items: ActionItem or Decision models (updated in place)
+            text_of: Returns the text an item is compared by
+
+        Returns:
+            Number of items linked to an earlier occurrence
+        """
+        fingerprints = self.sign(items, text_of)
+        bands = sorted({band for item in items for band in item.lsh_bands})
+        if not self.supabase or not bands:
+            return 0
+
+        rows = await self._find_candidates(table, workspace_id, meeting_id, bands)
+        if not rows:
+            return 0
+
+        index = NearDuplicateIndex(threshold=self.threshold, hasher=self.index.hasher)
+        first_occurrence: Dict[str, str] = {}
+        for row in rows:
+            if row.get("minhash_signature"):
+                index.add(row["id"], Fingerprint(tuple(row["minhash_signature"])))
+                first_occurrence[row["id"]] = row.get("duplicate_of") or row["id"]
+
+        linked = 0
+        for item, fingerprint in zip(items, fingerprints):
+            match = index.find(fingerprint)
+            if match:
+                item.duplicate_of = UUID(str(first_occurrence[match[0]]))
+                linked += 1
+
+        if linked:
+            self.logger.info(f"Linked {linked} of {len(items)} {table} to earlier meetings in workspace {workspace_id}")
+        return linked
+
+    async def _find_candidates(
+        self,
+        table: str,
+        workspace_id: UUID,
+        meeting_id: UUID,
+        bands: List[str]
+    ) -> List[Dict[str, Any]]:
+        """Fetch earlier rows sharing any band key with the new items"""
+        try:
+            since = datetime.utcnow() - timedelta(days=self.lookback_days)
+            result = self.supabase.table(table).select(
+                "id, meeting_id, minhash_signature, duplicate_of"
+            ).eq(
+                "workspace_id", str(workspace_id)
+            ).neq(
+                "meeting_id", str(meeting_id)
+            ).overlaps(
+                "lsh_bands", bands
+            ).gte(
+                "created_at", since.isoformat()
+            ).order("created_at").execute()
+
+            return list(result.data or [])
+
+        except Exception as e:
+            self.logger.error(f"Failed to fetch recurring {table} candidates: {str(e)}")
+            return []
@@ -0,0 +1,147 @@
+"""
+Search Sources
+Tables searchable by vector and full-text retrieval, and how to filter them
+"""
+from dataclasses import dataclass
+from datetime import datetime
+from functools import lru_cache
+from typing import Any, Dict, List, Optional, Tuple
+from uuid import UUID
+
+
+@dataclass(frozen=True)
+class SearchSource:
+    """
+    A searchable table
+
+    Expressions are trusted SQL fragments over the alias `t` (the table
+    holding the embedding and search_tsv columns) and any joined tables;
+    values always travel as bound parameters.
+    """
+    name: str
+    from_clause: str
+    document_column: str  # Rows sharing a document (meeting, video) collapse in merged results
+    date_column: str
+    workspace_column: str = "t.workspace_id"
+    founder_column: str = "t.founder_id"
+    id_column: str = "t.id"
+    embedding_column: str = "t.embedding"
+    tsv_column: str = "t.search_tsv"
+
+    @property
+    def record_expression(self) -> str:
+        """Row as JSON without the vector and text search columns"""
+        return "to_jsonb(t) - 'embedding' - 'search_tsv'"
+
+    def filters(
+        self,
+        first_param: int,
+        workspace_id: Optional[UUID] = None,
+        founder_id: Optional[UUID] = None,
+        since: Optional[datetime] = None,
+        until: Optional[datetime] = None
+    ) -> Tuple[str, List[Any]]:
+        """
+        Build the filter clause shared by every sub-query
+
+        Args:
+            first_param: Number of the first positional parameter to use
+            workspace_id: Workspace to search
+            founder_id: Founder to search
+            since: Earliest document date
+            until: Latest document date
+
+        Returns:
+            Tuple of ("AND ..." clause, parameter values)
+        """
+        conditions = [
+            (self.workspace_column, "=", workspace_id),
+            (self.founder_column, "=", founder_id),
+            (self.date_column, ">=", since),
+            (self.date_column, "<", until),
+        ]
+
+        clauses: List[str] = []
+        params: List[Any] = []
+        for column, operator, value in conditions:
+            if value is None:
+                continue
+            params.append(value)
+            clauses.append(f"AND {column} {operator} ${first_param + len(params) - 1}")
+
+        return " ".join(clauses), params
+
+
+SEARCH_SOURCES: Dict[str, SearchSource] = {
+    "contacts": SearchSource(
+        name="contacts",
+        from_clause="core.contacts t",
+        document_column="t.id",
+        date_column="t.last_contacted"
+    ),
+    "communications": SearchSource(
+        name="communications",
+        from_clause="comms.communications t",
+        document_column="coalesce(t.thread_id, t.id)",
+        date_column="t.received_at"
+    ),
+    "transcript_chunks": SearchSource(
+        name="transcript_chunks",
+        from_clause=(
+            "meetings.transcript_chunks t "
+            "LEFT JOIN meetings.transcripts tr ON tr.id = t.transcript_id "
+            "JOIN meetings.meetings m ON m.id = coalesce(t.meeting_id, tr.meeting_id)"
+        ),
+        document_column="m.id",
+        date_column="m.start_time",
+        workspace_column="m.workspace_id",
+        founder_column="m.founder_id"
+    ),
+    "media_chunks": SearchSource(
+        name="media_chunks",
+        from_clause=(
+            "media.media_chunks t "
+            "JOIN media.media_transcripts mt ON mt.id = t.media_transcript_id "
+            "JOIN media.media_assets ma ON ma.id = mt.media_id"
+        ),
+        document_column="ma.id",
+        date_column="ma.recorded_at",
+        workspace_column="ma.workspace_id",
+        founder_column="ma.founder_id"
+    ),
+}
+
+
+@lru_cache(maxsize=64)
+def semantic_sql(source: SearchSource, filters: str) -> str:
+    """Nearest-neighbour query: $1 query vector, $2 limit, filters from $3"""
+    return f"""
+        SELECT {source.id_column} AS id,
+               {source.document_column} AS document_id,
+               {source.record_expression} AS record,
+               {source.embedding_column} <=> $1 AS distance
+        FROM {source.from_clause}
+        WHERE {source.embedding_column} IS NOT NULL
+        {filters}
+        ORDER BY distance
+        LIMIT $2
+    """
+
+
+def get_search_source(name: str) -> SearchSource:
+    """
+    Look up a search source by name
+
+    Args:
+        name: Source name
+
+    Returns:
+        SearchSource
+
+    Raises:
+        ValueError: For unknown sources
+    """
+    try:
+        return SEARCH_SOURCES[name]
+    except KeyError:
+        raise ValueError(f"Unknown search source: {name}. Available: {sorted(SEARCH_SOURCES)}")
@@ -2,12 +2,25 @@
 Summarization Service
 Orchestrates meeting summarization using LLM providers and LangChain chains
 """
+import asyncio
 import logging
 from datetime import datetime
-from typing import Dict, Any, List, Optional
+from typing import Dict, Any, List, Optional, Callable, Awaitable, Tuple, AsyncIterator
 from uuid import UUID
 
-from app.llm.llm_provider import get_provider, select_best_provider, LLMConfig, LLMModelTier
+from app.config import get_settings
+from app.core.streaming import stream_callback_events
+from app.llm.llm_provider import (
+    get_provider,
+    bound_provider,
+    select_best_provider,
+    select_fallback_providers,
+    LLMConfig,
+    LLMModelTier
+)
+from app.llm.response_cache import cached_provider
+from app.llm.request_coalescing import coalesced_provider
+from app.llm.provider_router import route_providers
 from app.chains.summarization_chain import SummarizationChain
 from app.chains.action_item_chain import ActionItemChain
 from app.chains.decision_chain import DecisionChain
@@ -15,6 +28,7 @@ from app.chains.sentiment_chain import SentimentChain
 from app.models.meeting_summary import MeetingSummary, SummarizationMethod
 from app.models.action_item import ActionItem, ActionItemCreate
 from app.models.decision import Decision, DecisionCreate
+from app.services.recurrence_service import RecurrenceService
 
 
 logger = logging.getLogger(__name__)
@@ -26,10 +40,14 @@ class SummarizationService:
 
     Features:
     - Multi-stage summarization (extractive → abstractive)
+    - Concurrent stage execution with a shared deadline
     - Action item extraction with confidence scoring
     - Decision extraction
+    - Linking of action items and decisions that recur across meetings
     - Sentiment analysis
     - Cost tracking per summarization
+    - Response caching for repeated LLM requests
+    - Coalescing of concurrent identical LLM requests
     - Multiple LLM provider support
     """
 
@@ -37,7 +55,9 @@ class SummarizationService:
         self,
         supabase_client=None,
         default_provider: Optional[str] = None,
-        api_keys: Optional[Dict[str, str]] = None
+        api_keys: Optional[Dict[str, str]] = None,
+        parallel_stages: Optional[bool] = None,
+        stage_deadline_seconds: Optional[float] = None
     ):
         """
         Initialize summarization service
@@ -46,10 +66,21 @@ class SummarizationService:
             supabase_client: Supabase client for database operations
             default_provider: Default LLM provider (openai, anthropic, deepseek, ollama)
             api_keys: Dictionary of API keys for providers
+            parallel_stages: Run summarization stages concurrently (default: settings)
+            stage_deadline_seconds: Shared deadline for concurrent stages (default: settings)
         """
+        settings = get_settings()
         self.supabase = supabase_client
         self.api_keys = api_keys or {}
         self.default_provider = default_provider
+        self.parallel_stages = (
+            settings.summarization_parallel_stages if parallel_stages is None else parallel_stages
+        )
+        self.stage_deadline_seconds = (
+            settings.summarization_deadline_seconds if stage_deadline_seconds is None else stage_deadline_seconds
+        )
+        self.recurring_item_detection = settings.recurring_item_detection_enabled
+        self.recurrence = RecurrenceService(supabase_client)
         self.logger = logging.getLogger(f"{__name__}.{self.__class__.__name__}")
 
     async def summarize_meeting(
@@ -61,11 +92,21 @@ class SummarizationService:
         extract_action_items: bool = True,
         extract_decisions: bool = True,
         analyze_sentiment: bool = True,
-        llm_config: Optional[LLMConfig] = None
+        llm_config: Optional[LLMConfig] = None,
+        parallel: Optional[bool] = None,
+        on_event: Optional[Callable[[str, Any], Awaitable[None]]] = None,
+        method: SummarizationMethod = SummarizationMethod.MULTI_STAGE,
+        force_regenerate: bool = False
     ) -> Dict[str, Any]:
         """
         Comprehensive meeting summarization
 
+        The summary, topic, action item, decision and sentiment stages only
+        read the transcript. In parallel mode they run concurrently under
+        the provider's concurrency cap and a shared deadline; optional
+        stages still running at the deadline are dropped and listed in
+        metadata["timed_out_stages"].
+
         Args:
             meeting_id: Meeting UUID
             workspace_id: Workspace UUID
@@ -75,6 +116,14 @@ class SummarizationService:
             extract_decisions: Extract decisions
             analyze_sentiment: Analyze sentiment
             llm_config: Optional custom LLM config
+            parallel: Run stages concurrently (default: service setting)
+            on_event: Optional callback receiving (stage name, stage result) as
+                each stage finishes, and ("token", {"text": ...}) while the
+                final refinement streams
+            method: Summary stage method; hierarchical map-reduces long
+                transcripts chunk by chunk
+            force_regenerate: Ignore cached LLM responses and chunk summaries,
+                replacing them with the regenerated ones
 
         Returns:
             Dictionary with summary, action items, decisions, and sentiment
@@ -84,94 +133,121 @@ class SummarizationService:
             self.logger.info(f"Starting summarization for meeting {meeting_id}")
 
             # Select LLM provider
+            fallback_configs = []
             if not llm_config:
                 llm_config = select_best_provider(
                     task_type="summarization",
                     budget_tier=LLMModelTier.STANDARD,
                     api_keys=self.api_keys
                 )
+                if get_settings().llm_routing_enabled:
+                    fallback_configs = select_fallback_providers(
+                        llm_config,
+                        task_type="summarization",
+                        budget_tier=LLMModelTier.STANDARD,
+                        api_keys=self.api_keys
+                    )
 
-            # Get provider instance
-            llm_provider = get_provider(llm_config)
+            # Get provider instance, sharing the per-provider concurrency cap
+            # and routing across fallbacks; cached responses are served
+            # without taking a slot, and concurrent identical cache misses
+            # share one call
+            llm_provider = cached_provider(
+                coalesced_provider(
+                    route_providers(self._build_providers(llm_config, fallback_configs)),
+                    llm_config
+                ),
+                llm_config,
+                refresh=force_regenerate
+            )
 
             # Initialize chains
-            summary_chain = SummarizationChain(llm_provider)
+            summary_chain = SummarizationChain(llm_provider, refresh=force_regenerate)
             action_chain = ActionItemChain(llm_provider) if extract_action_items else None
             decision_chain = DecisionChain(llm_provider) if extract_decisions else None
             sentiment_chain = SentimentChain(llm_provider) if analyze_sentiment else None
 
-            # Run summarization
-            summary_result = await summary_chain.summarize(
-                transcript,
-                method="multi_stage"
-            )
-
-            # Extract topics
-            topics = await summary_chain.generate_topics(transcript)
+            summary_options = {}
+            if on_event:
+                summary_options["on_token"] = lambda text: on_event("token", {"text": text})
 
-            # Extract action items
-            action_items = []
+            # Every stage reads only the transcript
+            stages = {
+                "summary": lambda: summary_chain.summarize(transcript, method=method.value, **summary_options),
+                "topics": lambda: summary_chain.generate_topics(transcript)
+            }
             if action_chain:
-                self.logger.info("Extracting action items")
-                action_items_data = await action_chain.extract_action_items(
-                    transcript,
-                    use_hybrid=True
-                )
+                stages["action_items"] = lambda: action_chain.extract_action_items(transcript, use_hybrid=True)
+            if decision_chain:
+                stages["decisions"] = lambda: decision_chain.extract_decisions(transcript)
+            if sentiment_chain:
+                stages["sentiment"] = lambda: sentiment_chain.analyze_sentiment(transcript)
+            if on_event:
+                stages = {name: self._emitting_stage(name, stage, on_event) for name, stage in stages.items()}
 
-                # Convert to ActionItem models
-                for item_data in action_items_data:
-                    action_item = ActionItem(
-                        workspace_id=workspace_id,
-                        founder_id=founder_id,
-                        meeting_id=meeting_id,
-                        description=item_data.get("description", ""),
-                        context=item_data.get("context"),
-                        assignee_name=item_data.get("assignee_name"),
-                        assignee_email=item_data.get("assignee_email"),
-                        priority=item_data.get("priority"),
-                        due_date=item_data.get("due_date"),
-                        source=item_data.get("source"),
-                        confidence_score=item_data.get("confidence_score", 0.0)
-                    )
-                    action_items.append(action_item)
+            parallel = self.parallel_stages if parallel is None else parallel
+            if parallel:
+                stage_results, timed_out = await self._run_stages_concurrently(stages)
+            else:
+                stage_results, timed_out = await self._run_stages_sequentially(stages), []
 
-                    # Save to database
-                    if self.supabase:
-                        await self._save_action_item(action_item)
+            summary_result = stage_results["summary"]
+            topics = stage_results.get("topics", [])
+
+            # Convert action items
+            action_items = []
+            for item_data in stage_results.get("action_items", []):
+                action_item = ActionItem(
+                    workspace_id=workspace_id,
+                    founder_id=founder_id,
+                    meeting_id=meeting_id,
+                    description=item_data.get("description", ""),
+                    context=item_data.get("context"),
+                    assignee_name=item_data.get("assignee_name"),
+                    assignee_email=item_data.get("assignee_email"),
+                    priority=item_data.get("priority"),
+                    due_date=item_data.get("due_date"),
+                    source=item_data.get("source"),
+                    confidence_score=item_data.get("confidence_score", 0.0)
+                )
+                action_items.append(action_item)
 
-            # Extract decisions
+            # Convert decisions
             decisions = []
-            if decision_chain:
-                self.logger.info("Extracting decisions")
-                decisions_data = await decision_chain.extract_decisions(transcript)
-
-                # Convert to Decision models
-                for decision_data in decisions_data:
-                    decision = Decision(
-                        workspace_id=workspace_id,
-                        founder_id=founder_id,
-                        meeting_id=meeting_id,
-                        title=decision_data.get("title", ""),
-                        description=decision_data.get("description", ""),
-                        decision_type=decision_data.get("decision_type"),
-                        impact=decision_data.get("impact"),
-                        decision_maker=decision_data.get("decision_maker"),
-                        rationale=decision_data.get("rationale"),
-                        context=decision_data.get("context"),
-                        stakeholders=decision_data.get("stakeholders", []),
-                        confidence_score=decision_data.get("confidence_score", 0.0)
-                    )
-                    decisions.append(decision)
+            for decision_data in stage_results.get("decisions", []):
+                decision = Decision(
+                    workspace_id=workspace_id,
+                    founder_id=founder_id,
+                    meeting_id=meeting_id,
+                    title=decision_data.get("title", ""),
+                    description=decision_data.get("description", ""),
+                    decision_type=decision_data.get("decision_type"),
+                    impact=decision_data.get("impact"),
+                    decision_maker=decision_data.get("decision_maker"),
+                    rationale=decision_data.get("rationale"),
+                    context=decision_data.get("context"),
+                    stakeholders=decision_data.get("stakeholders", []),
+                    confidence_score=decision_data.get("confidence_score", 0.0)
+                )
+                decisions.append(decision)
 
-                    # Save to database
-                    if self.supabase:
-                        await self._save_decision(decision)
+            # Link items repeating ones from earlier meetings before saving them
+            if self.recurring_item_detection:
+                await self.recurrence.link_recurring(
+                    "action_items", workspace_id, meeting_id, action_items, lambda item: item.description
+                )
+                await self.recurrence.link_recurring(
+                    "decisions", workspace_id, meeting_id, decisions, lambda decision: decision.description
+                )
 
-            # Analyze sentiment
-            sentiment_analysis = {}
-            if sentiment_chain:
-                self.logger.info("Analyzing sentiment")
-                sentiment_analysis = await sentiment_chain.analyze_sentiment(transcript)
+            # Save to database
+            if self.supabase:
+                for action_item in action_items:
+                    await self._save_action_item(action_item)
+                for decision in decisions:
+                    await self._save_decision(decision)
+
+            sentiment_analysis = stage_results.get("sentiment", {})
 
             # Create meeting summary
             processing_time = int((datetime.utcnow() - start_time).total_seconds() * 1000)
@@ -188,7 +264,7 @@ class SummarizationService:
                 sentiment_details=sentiment_analysis,
                 action_items_count=len(action_items),
                 decisions_count=len(decisions),
-                summarization_method=SummarizationMethod.MULTI_STAGE,
+                summarization_method=SummarizationMethod(summary_result.get("method", method.value)),
                 llm_provider=llm_config.provider.value,
                 llm_model=llm_config.model_name,
                 processing_time_ms=processing_time,
@@ -221,7 +297,9 @@ class SummarizationService:
                 "metadata": {
                     "processing_time_ms": processing_time,
                     "cost_usd": meeting_summary.cost_usd,
-                    "tokens_used": meeting_summary.token_usage
+                    "tokens_used": meeting_summary.token_usage,
+                    "stage_execution": "parallel" if parallel else "sequential",
+                    "timed_out_stages": timed_out
                 }
             }
 
@@ -238,6 +316,148 @@ class SummarizationService:
 
             raise
 
+    async def stream_summarize_meeting(
+        self,
+        meeting_id: UUID,
+        workspace_id: UUID,
+        founder_id: UUID,
+        transcript: str,
+        **options: Any
+    ) -> AsyncIterator[Dict[str, Any]]:
+        """
+        Summarize a meeting, yielding results as each stage finishes
+
+        Yields {"event": name, "data": payload} for every stage ("summary",
+        "topics", "action_items", "decisions", "sentiment") as it completes,
+        "token" events while the final refinement streams, and a closing
+        "complete" event with the saved summary. Errors propagate to the
+        consumer; closing the iterator early cancels the run.
+
+        Args:
+            meeting_id: Meeting UUID
+            workspace_id: Workspace UUID
+            founder_id: Founder UUID
+            transcript: Meeting transcript text
+            **options: Other summarize_meeting arguments
+
+        Yields:
+            Event dicts
+        """
+        def complete(result: Dict[str, Any]) -> Dict[str, Any]:
+            return {
+                "summary_id": result["summary"].id,
+                "meeting_id": meeting_id,
+                "action_items_count": len(result["action_items"]),
+                "decisions_count": len(result["decisions"]),
+                **result["metadata"]
+            }
+
+        events = stream_callback_events(
+            lambda on_event: self.summarize_meeting(
+                meeting_id=meeting_id,
+                workspace_id=workspace_id,
+                founder_id=founder_id,
+                transcript=transcript,
+                on_event=on_event,
+                **options
+            ),
+            complete
+        )
+        async for item in events:
+            yield item
+
+    def _build_providers(self, llm_config: LLMConfig, fallback_configs: List[LLMConfig]) -> List[Any]:
+        """Bounded providers for the primary config and every fallback that can be created"""
+        providers = [bound_provider(get_provider(llm_config), llm_config)]
+        for config in fallback_configs:
+            try:
+                providers.append(bound_provider(get_provider(config), config))
+            except Exception as e:
+                self.logger.warning(f"Skipping fallback provider {config.provider.value}: {str(e)}")
+        return providers
+
+    def _emitting_stage(
+        self,
+        name: str,
+        stage: Callable[[], Awaitable[Any]],
+        on_event: Callable[[str, Any], Awaitable[None]]
+    ) -> Callable[[], Awaitable[Any]]:
+        """Wrap a stage so its result is emitted as soon as it finishes"""
+        async def run():
+            result = await stage()
+            if name == "summary":
+                payload = {
+                    "executive_summary": result.get("executive_summary", ""),
+                    "key_points": result.get("key_points", []),
+                    "detailed_summary": result.get("detailed_summary", "")
+                }
+            else:
+                payload = result
+            await on_event(name, payload)
+            return result
+        return run
+
+    async def _run_stages_sequentially(
+        self,
+        stages: Dict[str, Callable[[], Awaitable[Any]]]
+    ) -> Dict[str, Any]:
+        """Run stages one after another in declaration order"""
+        results = {}
+        for name, stage in stages.items():
+            self.logger.info(f"Running {name} stage")
+            results[name] = await stage()
+        return results
+
+    async def _run_stages_concurrently(
+        self,
+        stages: Dict[str, Callable[[], Awaitable[Any]]]
+    ) -> Tuple[Dict[str, Any], List[str]]:
+        """
+        Run stages concurrently under a shared deadline
+
+        The first failure cancels the remaining stages and the error of the
+        earliest declared failed stage is raised.
+        At the deadline, unfinished optional stages are cancelled and
+        reported; an unfinished summary stage raises TimeoutError.
+
+        Args:
+            stages: Map of stage name to a zero-argument coroutine factory
+
+        Returns:
+            Tuple of (results by stage name, names of stages that timed out)
+        """
+        tasks = {name: asyncio.create_task(stage()) for name, stage in stages.items()}
+        done, pending = await asyncio.wait(
+            tasks.values(),
+            timeout=self.stage_deadline_seconds,
+            return_when=asyncio.FIRST_EXCEPTION
+        )
+
+        # Retrieve every exception so none is reported as unhandled
+        errors = [
+            task.exception() for task in tasks.values()
+            if task in done and not task.cancelled() and task.exception()
+        ]
+
+        for task in pending:
+            task.cancel()
+        if pending:
+            await asyncio.gather(*pending, return_exceptions=True)
+
+        if errors:
+            raise errors[0]
+
+        timed_out = [name for name, task in tasks.items() if task in pending]
+        if "summary" in timed_out:
+            raise asyncio.TimeoutError(
+                f"Summary stage did not finish within {self.stage_deadline_seconds}s"
+            )
+        if timed_out:
+            self.logger.warning(f"Stages dropped at the summarization deadline: {', '.join(timed_out)}")
+
+        results = {name: task.result() for name, task in tasks.items() if task in done}
+        return results, timed_out
+
     async def batch_summarize(
         self,
         meeting_ids: List[UUID],
@@ -262,10 +262,11 @@ class TaskRoutingService:
             # Fetch action items for meeting
             action_items = await self._get_meeting_action_items(meeting_id)
 
-            # Filter by confidence
+            # Filter by confidence, skipping items recurring from an earlier meeting
+            # (their first occurrence already has a task)
             filtered_items = [
                 item for item in action_items
-                if item.confidence_score >= min_confidence
+                if item.confidence_score >= min_confidence and item.duplicate_of is None
             ]
 
             self.logger.info(
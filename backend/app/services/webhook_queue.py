@@ -0,0 +1,237 @@
+"""
+Webhook Queue
+Durable queue of webhook deliveries backed by mcp.webhook_events
+"""
+import logging
+import random
+from datetime import datetime, timedelta
+from typing import Any, Dict, List, Optional, Tuple
+
+from app.config import get_settings
+from app.core.monitoring import MetricsRecorder
+from app.database import is_unique_violation
+from app.models.webhook_event import WebhookEvent, WebhookEventStatus
+
+
+logger = logging.getLogger(__name__)
+
+
+class WebhookQueue:
+    """
+    Stores verified webhook deliveries and hands them out to workers
+
+    Enqueueing is a single insert, so webhook endpoints acknowledge the
+    platform as soon as the payload is durable. Redeliveries of the same
+    event share an idempotency key and are stored once. Workers claim
+    events with a lease; an event whose worker dies is claimed again when
+    the lease expires, so every event is processed at least once.
+    """
+
+    TABLE = "webhook_events"
+    DEPTH_VIEW = "webhook_queue_depth"
+
+    def __init__(
+        self,
+        supabase_client,
+        max_attempts: int = 5,
+        retry_base_seconds: float = 10.0,
+        retry_max_seconds: float = 900.0
+    ):
+        """
+        Initialize webhook queue
+
+        Args:
+            supabase_client: Supabase client
+            max_attempts: Processing attempts before an event is dead-lettered
+            retry_base_seconds: Delay before the first retry
+            retry_max_seconds: Upper bound on the retry delay
+        """
+        self.supabase = supabase_client
+        self.max_attempts = max_attempts
+        self.retry_base_seconds = retry_base_seconds
+        self.retry_max_seconds = retry_max_seconds
+        self.logger = logging.getLogger(f"{__name__}.{self.__class__.__name__}")
+
+    async def enqueue(
+        self,
+        platform: str,
+        event_type: str,
+        payload: Dict[str, Any],
+        idempotency_key: str,
+        workspace_key: Optional[str] = None,
+        signature: Optional[str] = None
+    ) -> Tuple[Optional[str], bool]:
+        """
+        Persist a webhook delivery for the worker pool
+
+        Args:
+            platform: Source platform (zoom, fireflies, otter)
+            event_type: Platform event name
+            payload: Event payload passed to the handler
+            idempotency_key: Identity of the event on the platform
+            workspace_key: Platform account used for per-workspace caps
+            signature: Signature header the delivery was verified with
+
+        Returns:
+            Tuple of (event ID or None for a redelivery, is_duplicate)
+        """
+        record = {
+            "platform": platform,
+            "event_type": event_type,
+            "payload": payload,
+            "idempotency_key": idempotency_key,
+            "workspace_key": workspace_key,
+            "signature": signature,
+            "verified": signature is not None,
+            "status": WebhookEventStatus.PENDING.value,
+            "max_attempts": self.max_attempts
+        }
+
+        try:
+            result = self.supabase.table(self.TABLE).insert(record).execute()
+        except Exception as e:
+            if is_unique_violation(e):
+                self.logger.info(f"Duplicate {platform} webhook {idempotency_key} ignored")
+                MetricsRecorder.record_webhook_event(platform, "duplicate")
+                return None, True
+            raise
+
+        MetricsRecorder.record_webhook_event(platform, "enqueued")
+        event_id = result.data[0]["id"] if result.data else None
+        return event_id, False
+
+    async def claim(
+        self,
+        worker_id: str,
+        limit: int,
+        lease_seconds: int,
+        workspace_limit: int
+    ) -> List[WebhookEvent]:
+        """
+        Lease ready events for a worker
+
+        Args:
+            worker_id: Identifier recorded on leased events
+            limit: Maximum events to lease
+            lease_seconds: How long the events stay reserved
+            workspace_limit: Maximum leased events per workspace key
+
+        Returns:
+            Leased events
+        """
+        if limit <= 0:
+            return []
+
+        result = self.supabase.rpc("claim_webhook_events", {
+            "p_worker": worker_id,
+            "p_limit": limit,
+            "p_lease_seconds": lease_seconds,
+            "p_workspace_limit": workspace_limit
+        }).execute()
+
+        return [WebhookEvent(**row) for row in result.data or []]
+
+    async def complete(self, event: WebhookEvent) -> None:
+        """
+        Mark an event processed
+
+        Args:
+            event: Leased event
+        """
+        self.supabase.table(self.TABLE).update({
+            "status": WebhookEventStatus.PROCESSED.value,
+            "processed": True,
+            "processed_at": datetime.utcnow().isoformat(),
+            "leased_until": None,
+            "error_message": None
+        }).eq("id", str(event.id)).execute()
+
+    async def fail(self, event: WebhookEvent, error: str) -> WebhookEventStatus:
+        """
+        Reschedule a failed event with backoff, or dead-letter it
+
+        Args:
+            event: Leased event (attempts includes the failed attempt)
+            error: Failure description
+
+        Returns:
+            The event's new status
+        """
+        if event.attempts >= event.max_attempts:
+            status = WebhookEventStatus.DEAD
+            update = {"status": status.value}
+        else:
+            status = WebhookEventStatus.PENDING
+            available_at = datetime.utcnow() + timedelta(seconds=self.retry_delay(event.attempts))
+            update = {"status": status.value, "available_at": available_at.isoformat()}
+
+        update.update({"leased_until": None, "error_message": error[:1000]})
+        self.supabase.table(self.TABLE).update(update).eq("id", str(event.id)).execute()
+        return status
+
+    def retry_delay(self, attempts: int) -> float:
+        """
+        Capped exponential backoff, jittered over the upper half
+
+        Args:
+            attempts: Attempts made so far
+
+        Returns:
+            Seconds to wait before the next attempt
+        """
+        ceiling = min(self.retry_max_seconds, self.retry_base_seconds * 2 ** max(attempts - 1, 0))
+        return random.uniform(ceiling / 2, ceiling)
+
+    async def depth(self) -> Dict[str, int]:
+        """
+        Count unfinished events by state and publish the queue depth gauges
+
+        Returns:
+            Mapping of status to event count
+        """
+        try:
+            result = self.supabase.table(self.DEPTH_VIEW).select("status, events").execute()
+            depth = {row["status"]: int(row["events"]) for row in result.data or []}
+            MetricsRecorder.update_webhook_queue_depth(depth)
+            return depth
+        except Exception as e:
+            self.logger.error(f"Failed to read webhook queue depth: {str(e)}")
+            return {}
+
+
+_webhook_queue: Optional[WebhookQueue] = None
+
+
+def init_webhook_queue(supabase_client) -> Optional[WebhookQueue]:
+    """
+    Initialize the global webhook queue
+
+    Args:
+        supabase_client: Supabase client
+
+    Returns:
+        The queue, or None when the queue is disabled
+    """
+    global _webhook_queue
+    settings = get_settings()
+    if not settings.webhook_queue_enabled or supabase_client is None:
+        _webhook_queue = None
+        return None
+
+    _webhook_queue = WebhookQueue(
+        supabase_client,
+        max_attempts=settings.webhook_max_attempts,
+        retry_base_seconds=settings.webhook_retry_base_seconds,
+        retry_max_seconds=settings.webhook_retry_max_seconds
+    )
+    return _webhook_queue
+
+
+def get_webhook_queue() -> Optional[WebhookQueue]:
+    """
+    Get the global webhook queue
+
+    Returns:
+        WebhookQueue, or None when it has not been initialized
+    """
+    return _webhook_queue
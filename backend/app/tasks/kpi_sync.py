@@ -1,14 +1,29 @@
 """
 KPI Sync Background Job
-Scheduled job to sync KPI data from Granola every 6 hours
+Scheduled job to sync KPI data from Granola every 6 hours, fanning out
+across workspaces with bounded concurrency and per-integration rate limits
+
+Backfill derived KPIs with:
+python -m app.tasks.kpi_sync backfill-derived [--workspace ID ...] [--since YYYY-MM-DD]
 """
+import argparse
+import asyncio
 import logging
+import sys
+import time
+import zlib
 from datetime import datetime
+from typing import Any, Callable, Dict, List, Optional
 from apscheduler.schedulers.asyncio import AsyncIOScheduler
 from apscheduler.triggers.interval import IntervalTrigger
+from sqlalchemy.orm import Session
 
 from app.services.kpi_ingestion_service import KPIIngestionService
-from app.database import get_supabase_client
+from app.services.anomaly_detection_service import AnomalyDetectionService
+from app.database import get_supabase_client, db_manager, run_in_session
+from app.config import get_settings
+from app.core.monitoring import MetricsRecorder
+from app.core.rate_limit import TokenBucketRegistry
 
 
 logger = logging.getLogger(__name__)
@@ -17,14 +32,42 @@ logger = logging.getLogger(__name__)
 class KPISyncJob:
     """Background job for syncing KPI data"""
 
-    def __init__(self):
+    SOURCE = "granola"
+
+    def __init__(self, session_factory: Optional[Callable[[], Session]] = None):
+        """
+        Initialize KPI sync job
+
+        Args:
+            session_factory: Factory for per-workspace database sessions
+                (defaults to the application session factory)
+        """
         self.logger = logging.getLogger(__name__)
-        self.kpi_service = KPIIngestionService()
+        self.settings = get_settings()
+        anomaly_service = (
+            AnomalyDetectionService()
+            if self.settings.enable_streaming_anomaly_detection else None
+        )
+        self.kpi_service = KPIIngestionService(anomaly_service=anomaly_service)
         self.supabase = get_supabase_client()
         self.scheduler = AsyncIOScheduler()
+        self.session_factory = session_factory
+
+        # One token bucket per integration platform paces API calls across workspaces
+        self.rate_limits = TokenBucketRegistry(
+            rate=self.settings.kpi_sync_rate_per_second,
+            capacity=self.settings.kpi_sync_burst
+        )
+        self._progress = {"pending": 0, "running": 0, "completed": 0}
 
-    async def sync_all_workspaces(self):
-        """Sync KPIs for all active workspaces"""
+    async def sync_all_workspaces(self, spread_seconds: float = 0.0):
+        """
+        Sync KPIs for all active workspaces with bounded concurrency
+
+        Args:
+            spread_seconds: Window over which workspace start times are spread
+                (0 starts every workspace as soon as a worker is free)
+        """
         self.logger.info("Starting KPI sync for all workspaces")
 
         try:
@@ -35,41 +78,174 @@ class KPISyncJob:
 
             workspaces = result.data or []
 
-            for workspace in workspaces:
+            semaphore = asyncio.Semaphore(self.settings.kpi_sync_max_concurrency)
+            self._progress = {"pending": len(workspaces), "running": 0, "completed": 0}
+            self._update_progress()
+
+            await asyncio.gather(*[
+                self._sync_workspace(
+                    workspace,
+                    semaphore,
+                    delay=self._start_offset(workspace.get("workspace_id"), spread_seconds)
+                )
+                for workspace in workspaces
+            ])
+
+            self.logger.info(f"Completed KPI sync for {len(workspaces)} workspaces")
+
+        except Exception as e:
+            self.logger.error(f"Error in KPI sync job: {str(e)}")
+
+    def _start_offset(self, workspace_id: Any, spread_seconds: float) -> float:
+        """
+        Jittered start offset for a workspace within the spread window
+
+        The offset is derived from the workspace ID, so each workspace keeps
+        the same slot from run to run and is synced once per interval.
+        """
+        if spread_seconds <= 0:
+            return 0.0
+        fraction = zlib.crc32(str(workspace_id).encode()) / 0xFFFFFFFF
+        return fraction * spread_seconds
+
+    async def _sync_workspace(
+        self,
+        workspace: Dict[str, Any],
+        semaphore: asyncio.Semaphore,
+        delay: float = 0.0
+    ) -> None:
+        """
+        Sync one workspace: wait for its slot, a worker and a rate-limit token
+
+        Args:
+            workspace: Integration row with workspace_id and credentials
+            semaphore: Bounds concurrent workspace syncs
+            delay: Seconds to wait before starting
+        """
+        workspace_id = workspace.get("workspace_id")
+        status = "error"
+        waited = 0.0
+        started = None
+
+        try:
+            if delay > 0:
+                await asyncio.sleep(delay)
+
+            async with semaphore:
+                waited = await self.rate_limits.get(self.SOURCE).acquire()
+                self._update_progress(pending=-1, running=1)
+                started = time.monotonic()
+
+                self.logger.info(f"Syncing KPIs for workspace {workspace_id}")
+
+                db = self._open_session()
                 try:
-                    workspace_id = workspace["workspace_id"]
-                    credentials = workspace["credentials"]
+                    sync_status = await asyncio.wait_for(
+                        self.kpi_service.sync_kpis_from_granola(
+                            workspace_id=workspace_id,
+                            credentials=workspace["credentials"],
+                            db=db
+                        ),
+                        timeout=self.settings.kpi_sync_timeout_seconds
+                    )
+                finally:
+                    # Waits for database work a timed-out sync left running in its thread
+                    if db is not None:
+                        await run_in_session(db, db.close)
 
-                    self.logger.info(f"Syncing KPIs for workspace {workspace_id}")
+                status = sync_status.status
 
-                    # Sync KPIs
-                    sync_status = await self.kpi_service.sync_kpis_from_granola(
-                        workspace_id=workspace_id,
-                        credentials=credentials
+                # Log sync result
+                if sync_status.status == "success":
+                    self.logger.info(
+                        f"Successfully synced {sync_status.metrics_synced} metrics "
+                        f"for workspace {workspace_id}"
+                    )
+                else:
+                    self.logger.warning(
+                        f"Sync completed with errors for workspace {workspace_id}: "
+                        f"{sync_status.errors}"
                     )
 
-                    # Log sync result
-                    if sync_status.status == "success":
-                        self.logger.info(
-                            f"Successfully synced {sync_status.metrics_synced} metrics "
-                            f"for workspace {workspace_id}"
-                        )
-                    else:
-                        self.logger.warning(
-                            f"Sync completed with errors for workspace {workspace_id}: "
-                            f"{sync_status.errors}"
-                        )
+                # Log event
+                await self._log_sync_event(workspace_id, sync_status)
 
-                    # Log event
-                    await self._log_sync_event(workspace_id, sync_status)
+        except asyncio.TimeoutError:
+            status = "timeout"
+            self.logger.error(
+                f"KPI sync for workspace {workspace_id} timed out after "
+                f"{self.settings.kpi_sync_timeout_seconds} seconds"
+            )
+        except Exception as e:
+            self.logger.error(f"Error syncing workspace {workspace_id}: {str(e)}")
 
-                except Exception as e:
-                    self.logger.error(f"Error syncing workspace {workspace.get('workspace_id')}: {str(e)}")
+        finally:
+            if started is None:
+                self._update_progress(pending=-1, completed=1)
+            else:
+                self._update_progress(running=-1, completed=1)
+            MetricsRecorder.record_kpi_sync(
+                source=self.SOURCE,
+                status=status,
+                duration=time.monotonic() - started if started is not None else 0.0,
+                rate_limit_wait=waited
+            )
 
-            self.logger.info(f"Completed KPI sync for {len(workspaces)} workspaces")
+    async def backfill_derived_metrics(
+        self,
+        workspace_ids: Optional[List[str]] = None,
+        start_date: Optional[datetime] = None
+    ) -> int:
+        """
+        Recompute stored derived KPIs, one workspace at a time
 
+        Args:
+            workspace_ids: Workspaces to backfill (default: every active Granola workspace)
+            start_date: Only replace derived points from this date (default: all history)
+
+        Returns:
+            Number of derived data points written
+        """
+        if workspace_ids is None:
+            try:
+                result = self.supabase.table("integrations").select(
+                    "workspace_id"
+                ).eq("platform", "granola").eq("status", "active").execute()
+                workspace_ids = [row["workspace_id"] for row in result.data or []]
+            except Exception as e:
+                self.logger.error(f"Error listing workspaces for derived KPI backfill: {str(e)}")
+                return 0
+
+        written = 0
+        for workspace_id in workspace_ids:
+            db = self._open_session()
+            if db is None:
+                continue
+            try:
+                written += await self.kpi_service.backfill_derived_metrics(
+                    workspace_id, start_date=start_date, db=db
+                )
+            finally:
+                await run_in_session(db, db.close)
+
+        self.logger.info(f"Backfilled {written} derived data points across {len(workspace_ids)} workspaces")
+        return written
+
+    def _open_session(self) -> Optional[Session]:
+        """Open a database session for one workspace sync"""
+        try:
+            factory = self.session_factory or db_manager.session_factory
+            return factory()
         except Exception as e:
-            self.logger.error(f"Error in KPI sync job: {str(e)}")
+            self.logger.error(f"Error opening database session: {str(e)}")
+            return None
+
+    def _update_progress(self, pending: int = 0, running: int = 0, completed: int = 0) -> None:
+        """Adjust run progress and export it as gauges"""
+        self._progress["pending"] += pending
+        self._progress["running"] += running
+        self._progress["completed"] += completed
+        MetricsRecorder.update_kpi_sync_progress(**self._progress)
 
     async def _log_sync_event(self, workspace_id, sync_status):
         """Log sync event to ops.events table"""
@@ -92,13 +268,15 @@ class KPISyncJob:
 
     def start(self):
         """Start the scheduler"""
-        # Run every 6 hours
+        # Run every interval, spreading workspace start times across the window
         self.scheduler.add_job(
             self.sync_all_workspaces,
-            trigger=IntervalTrigger(hours=6),
+            trigger=IntervalTrigger(hours=self.settings.kpi_sync_interval_hours),
+            kwargs={"spread_seconds": self.settings.kpi_sync_spread_minutes * 60},
             id="kpi_sync",
             name="Sync KPIs from Granola",
-            replace_existing=True
+            replace_existing=True,
+            max_instances=1  # Prevent overlapping runs
         )
 
         # Run immediately on startup
@@ -109,7 +287,7 @@ class KPISyncJob:
         )
 
         self.scheduler.start()
-        self.logger.info("KPI sync job scheduled (every 6 hours)")
+        self.logger.info(f"KPI sync job scheduled (every {self.settings.kpi_sync_interval_hours} hours)")
 
     def stop(self):
         """Stop the scheduler"""
@@ -119,3 +297,31 @@ class KPISyncJob:
 
 # Global instance
 kpi_sync_job = KPISyncJob()
+
+
+async def main(argv: Optional[List[str]] = None) -> int:
+    """
+    KPI maintenance command entrypoint
+
+    Args:
+        argv: Command line arguments (default: sys.argv)
+
+    Returns:
+        Process exit code
+    """
+    parser = argparse.ArgumentParser(prog="python -m app.tasks.kpi_sync")
+    commands = parser.add_subparsers(dest="command", required=True)
+    backfill = commands.add_parser("backfill-derived", help="Recompute stored derived KPIs")
+    backfill.add_argument("--workspace", action="append", dest="workspaces", help="Workspace ID (repeatable)")
+    backfill.add_argument("--since", type=datetime.fromisoformat, help="Only replace points from this date")
+    args = parser.parse_args(argv)
+
+    settings = get_settings()
+    logging.basicConfig(level=getattr(logging, settings.log_level), format=settings.log_format)
+
+    await kpi_sync_job.backfill_derived_metrics(args.workspaces, start_date=args.since)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(asyncio.run(main()))
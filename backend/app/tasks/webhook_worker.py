@@ -0,0 +1,267 @@
+"""
+Webhook Worker Pool
+Processes queued webhook events outside the API process with bounded
+concurrency, per-workspace caps and retry with backoff
+
+Run a worker process with: python -m app.tasks.webhook_worker
+"""
+import asyncio
+import logging
+import os
+import signal
+import socket
+import sys
+import time
+from collections import defaultdict
+from typing import Any, Awaitable, Callable, Dict, Optional, Set, Tuple
+
+from app.config import get_settings
+from app.core.monitoring import MetricsRecorder
+from app.database import get_supabase_client
+from app.models.webhook_event import WebhookEvent, WebhookEventStatus
+from app.services.webhook_queue import WebhookQueue, init_webhook_queue
+
+
+logger = logging.getLogger(__name__)
+
+WebhookHandler = Callable[[Dict[str, Any]], Awaitable[Dict[str, Any]]]
+
+
+class WebhookWorkerPool:
+    """
+    Claims webhook events from the queue and runs their handlers
+
+    At most `concurrency` events run at once, and at most `workspace_limit`
+    per workspace key; the claim query enforces the same cap across worker
+    processes. Claims are sized to the free slots, so a slow platform backs
+    up in the queue (visible as queue depth) rather than in memory.
+    """
+
+    def __init__(
+        self,
+        queue: WebhookQueue,
+        handlers: Dict[Tuple[str, str], WebhookHandler],
+        concurrency: int = 8,
+        workspace_limit: int = 2,
+        lease_seconds: int = 300,
+        poll_interval: float = 1.0,
+        worker_id: Optional[str] = None
+    ):
+        """
+        Initialize worker pool
+
+        Args:
+            queue: Webhook queue to claim events from
+            handlers: Handler per (platform, event_type)
+            concurrency: Events processed at once
+            workspace_limit: Events processed at once per workspace key
+            lease_seconds: Lease length; handlers running longer are cancelled
+            poll_interval: Idle wait between claims
+            worker_id: Identifier recorded on leased events
+        """
+        self.queue = queue
+        self.handlers = handlers
+        self.concurrency = concurrency
+        self.workspace_limit = workspace_limit
+        self.lease_seconds = lease_seconds
+        self.poll_interval = poll_interval
+        self.worker_id = worker_id or f"{socket.gethostname()}:{os.getpid()}"
+        self.logger = logging.getLogger(f"{__name__}.{self.__class__.__name__}")
+
+        self._running: Set[asyncio.Task] = set()
+        self._workspace_running: Dict[str, int] = defaultdict(int)
+        self._stopping = asyncio.Event()
+
+    @property
+    def free_slots(self) -> int:
+        """Events that can be started now"""
+        return max(self.concurrency - len(self._running), 0)
+
+    async def run(self) -> None:
+        """Claim and process events until stopped"""
+        self.logger.info(f"Webhook worker {self.worker_id} started (concurrency {self.concurrency})")
+        while not self._stopping.is_set():
+            try:
+                started = await self.run_once()
+            except Exception as e:
+                self.logger.error(f"Webhook claim failed: {str(e)}")
+                started = 0
+
+            if started == 0:
+                await self._wait(self.poll_interval)
+            elif self.free_slots == 0:
+                await asyncio.wait(self._running, return_when=asyncio.FIRST_COMPLETED)
+
+        await self.shutdown()
+
+    async def run_once(self) -> int:
+        """
+        Claim events for the free slots and start processing them
+
+        Returns:
+            Number of events started
+        """
+        slots = self.free_slots
+        if slots == 0:
+            return 0
+
+        events = await self.queue.claim(
+            self.worker_id,
+            limit=slots,
+            lease_seconds=self.lease_seconds,
+            workspace_limit=self.workspace_limit
+        )
+
+        for event in events:
+            key = event.workspace_key
+            if key is not None:
+                self._workspace_running[key] += 1
+            task = asyncio.create_task(self._process(event))
+            self._running.add(task)
+            task.add_done_callback(lambda t, key=key: self._release(t, key))
+
+        return len(events)
+
+    def stop(self) -> None:
+        """Stop claiming new events"""
+        self._stopping.set()
+
+    async def shutdown(self) -> None:
+        """Wait for in-flight events; unfinished ones are reclaimed after their lease"""
+        if self._running:
+            await asyncio.wait(self._running, timeout=self.lease_seconds)
+        self.logger.info(f"Webhook worker {self.worker_id} stopped")
+
+    async def _process(self, event: WebhookEvent) -> None:
+        """Run the handler for one event and record the outcome"""
+        start = time.perf_counter()
+        handler = self.handlers.get((event.platform, event.event_type))
+
+        try:
+            if handler is None:
+                raise ValueError(f"No handler for {event.platform} event {event.event_type}")
+
+            result = await asyncio.wait_for(handler(event.payload), timeout=self.lease_seconds)
+            if isinstance(result, dict) and result.get("status") == "error":
+                raise RuntimeError(result.get("error") or "Handler reported an error")
+
+            await self.queue.complete(event)
+            MetricsRecorder.record_webhook_event(event.platform, "processed", time.perf_counter() - start)
+
+        except Exception as e:
+            error = str(e) or e.__class__.__name__
+            self.logger.error(f"Webhook event {event.id} attempt {event.attempts} failed: {error}")
+            try:
+                status = await self.queue.fail(event, error)
+            except Exception as fail_error:
+                # The lease expires and the event is claimed again
+                self.logger.error(f"Failed to reschedule webhook event {event.id}: {str(fail_error)}")
+                status = WebhookEventStatus.LEASED
+
+            outcome = "dead" if status == WebhookEventStatus.DEAD else "retried"
+            MetricsRecorder.record_webhook_event(event.platform, outcome, time.perf_counter() - start)
+
+    def _release(self, task: asyncio.Task, workspace_key: Optional[str]) -> None:
+        """Free the slots held by a finished event"""
+        self._running.discard(task)
+        if workspace_key is not None:
+            self._workspace_running[workspace_key] -= 1
+            if self._workspace_running[workspace_key] <= 0:
+                del self._workspace_running[workspace_key]
+
+    async def _wait(self, seconds: float) -> None:
+        """Sleep, waking early when stopped"""
+        try:
+            await asyncio.wait_for(self._stopping.wait(), timeout=seconds)
+        except asyncio.TimeoutError:
+            pass
+
+
+def build_webhook_handlers(supabase_client=None) -> Dict[Tuple[str, str], WebhookHandler]:
+    """
+    Map queued event types to the platform webhook handlers
+
+    Signatures are verified by the webhook endpoints before enqueueing,
+    so the handlers here are built without secrets.
+
+    Args:
+        supabase_client: Supabase client
+
+    Returns:
+        Handler per (platform, event_type)
+    """
+    from app.api.webhooks.fireflies_webhook import FirefliesWebhookHandler
+    from app.api.webhooks.otter_webhook import OtterWebhookHandler
+    from app.api.webhooks.zoom_webhook import ZoomWebhookHandler
+
+    zoom = ZoomWebhookHandler("", supabase_client)
+    fireflies = FirefliesWebhookHandler("", supabase_client)
+    otter = OtterWebhookHandler("", supabase_client)
+
+    return {
+        ("zoom", "recording.completed"): zoom.handle_recording_completed,
+        ("fireflies", "transcript.ready"): fireflies.handle_transcript_ready,
+        ("otter", "speech.created"): otter.handle_speech_created,
+        ("otter", "speech.updated"): otter.handle_speech_created,
+    }
+
+
+async def run_webhook_workers(queue: WebhookQueue, supabase_client=None, handle_signals: bool = False) -> None:
+    """
+    Run a webhook worker pool configured from settings until stopped
+
+    Args:
+        queue: Webhook queue
+        supabase_client: Supabase client for the handlers
+        handle_signals: Stop claiming on SIGTERM/SIGINT and drain in-flight events
+    """
+    settings = get_settings()
+    pool = WebhookWorkerPool(
+        queue,
+        build_webhook_handlers(supabase_client),
+        concurrency=settings.webhook_worker_concurrency,
+        workspace_limit=settings.webhook_worker_workspace_limit,
+        lease_seconds=settings.webhook_lease_seconds,
+        poll_interval=settings.webhook_poll_interval_seconds
+    )
+
+    if handle_signals:
+        loop = asyncio.get_running_loop()
+        for signum in (signal.SIGTERM, signal.SIGINT):
+            loop.add_signal_handler(signum, pool.stop)
+
+    async def report_depth():
+        while True:
+            await queue.depth()
+            await asyncio.sleep(30)
+
+    reporter = asyncio.create_task(report_depth())
+    try:
+        await pool.run()
+    finally:
+        pool.stop()
+        reporter.cancel()
+
+
+async def main() -> int:
+    """
+    Webhook worker process entrypoint
+
+    Returns:
+        Process exit code
+    """
+    settings = get_settings()
+    logging.basicConfig(level=getattr(logging, settings.log_level), format=settings.log_format)
+
+    supabase_client = get_supabase_client()
+    queue = init_webhook_queue(supabase_client)
+    if queue is None:
+        logger.error("Webhook queue is disabled or has no database client; nothing to process")
+        return 1
+
+    await run_webhook_workers(queue, supabase_client, handle_signals=True)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(asyncio.run(main()))
@@ -0,0 +1,187 @@
+#!/usr/bin/env python3
+"""
+Benchmark row-at-a-time vs bulk KPI ingestion against a local Postgres
+
+Ingests N workspaces x M metrics once with one INSERT and one commit per
+value (the previous sync_kpis_from_granola loop) and once through
+KPIIngestionService.ingest_kpis (one multi-row statement and one commit per
+workspace), and reports rows/sec for each.
+
+Creates the kpis schema tables if they do not exist. Use a scratch database.
+
+Usage:
+    DATABASE_URL=postgresql://localhost/founderhouse_bench \\
+        python scripts/benchmark_kpi_ingestion.py [--workspaces 50] [--metrics 20]
+"""
+
+import argparse
+import asyncio
+import json
+import logging
+import os
+import sys
+import time
+from datetime import datetime, timedelta
+from pathlib import Path
+from uuid import uuid4
+
+from sqlalchemy import create_engine, text
+from sqlalchemy.orm import sessionmaker
+
+# Add project root to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from app.services.kpi_ingestion_service import KPIIngestionService  # noqa: E402
+from app.services.kpi_series_cache import KPISeriesCache  # noqa: E402
+
+
+SCHEMA = """
+CREATE SCHEMA IF NOT EXISTS kpis;
+
+CREATE TABLE IF NOT EXISTS kpis.kpi_metrics (
+    id UUID PRIMARY KEY DEFAULT gen_random_uuid(),
+    workspace_id UUID NOT NULL,
+    name TEXT NOT NULL,
+    display_name TEXT,
+    category TEXT,
+    unit TEXT,
+    description TEXT,
+    source_platform TEXT,
+    is_active BOOLEAN DEFAULT true,
+    created_at TIMESTAMPTZ DEFAULT now()
+);
+
+CREATE TABLE IF NOT EXISTS kpis.kpi_data_points (
+    id UUID PRIMARY KEY DEFAULT gen_random_uuid(),
+    metric_id UUID NOT NULL,
+    workspace_id UUID NOT NULL,
+    value DOUBLE PRECISION NOT NULL,
+    timestamp TIMESTAMPTZ NOT NULL,
+    period TEXT NOT NULL,
+    metadata JSONB DEFAULT '{}'::jsonb,
+    source_id TEXT,
+    created_at TIMESTAMPTZ DEFAULT now()
+);
+
+CREATE TABLE IF NOT EXISTS kpis.kpi_sync_status (
+    workspace_id UUID PRIMARY KEY,
+    last_sync_at TIMESTAMPTZ,
+    next_sync_at TIMESTAMPTZ,
+    status TEXT,
+    metrics_synced INTEGER,
+    errors JSONB,
+    metadata JSONB
+);
+"""
+
+
+def setup_workspaces(db, workspaces: int, metrics: int):
+    """Create metric definitions and return {workspace_id: metric_map}"""
+    result = {}
+    for _ in range(workspaces):
+        workspace_id = uuid4()
+        metric_map = {}
+        for j in range(metrics):
+            row = db.execute(text("""
+                INSERT INTO kpis.kpi_metrics (workspace_id, name, display_name, category, unit, source_platform)
+                VALUES (:workspace_id, :name, :name, 'operational', 'count', 'benchmark')
+                RETURNING *
+            """), {"workspace_id": str(workspace_id), "name": f"bench_metric_{j}"}).fetchone()
+            metric_map[row._mapping["name"]] = dict(row._mapping)
+        result[workspace_id] = metric_map
+    db.commit()
+    return result
+
+
+def make_batch(metric_map, timestamp: datetime):
+    """One value per metric"""
+    return {
+        name: {"value": float(i * 10), "timestamp": timestamp.isoformat()}
+        for i, name in enumerate(metric_map)
+    }
+
+
+def run_row_at_a_time(db, workspaces, timestamp):
+    """One INSERT ... RETURNING and one commit per value"""
+    insert_query = text("""
+        INSERT INTO kpis.kpi_data_points
+        (metric_id, workspace_id, value, timestamp, period, metadata)
+        VALUES (:metric_id, :workspace_id, :value, :timestamp, :period, CAST(:metadata AS jsonb))
+        RETURNING *
+    """)
+    rows = 0
+    for workspace_id, metric_map in workspaces.items():
+        for name, kpi in make_batch(metric_map, timestamp).items():
+            db.execute(insert_query, {
+                "metric_id": str(metric_map[name]["id"]),
+                "workspace_id": str(workspace_id),
+                "value": kpi["value"],
+                "timestamp": timestamp,
+                "period": "daily",
+                "metadata": json.dumps({"source": "benchmark"})
+            }).fetchone()
+            db.commit()
+            rows += 1
+    return rows
+
+
+def run_bulk(db, workspaces, timestamp):
+    """ingest_kpis per workspace"""
+    service = KPIIngestionService(series_cache=KPISeriesCache())
+    rows = 0
+
+    async def ingest():
+        nonlocal rows
+        for workspace_id, metric_map in workspaces.items():
+            status = await service.ingest_kpis(
+                workspace_id, make_batch(metric_map, timestamp), metric_map, source="benchmark", db=db
+            )
+            if status.status == "error":
+                raise RuntimeError(status.errors)
+            rows += status.metrics_synced
+
+    asyncio.run(ingest())
+    return rows
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[1])
+    parser.add_argument("--database-url", default=os.getenv("DATABASE_URL"))
+    parser.add_argument("--workspaces", type=int, default=50)
+    parser.add_argument("--metrics", type=int, default=20)
+    parser.add_argument("--repeats", type=int, default=3)
+    args = parser.parse_args()
+
+    if not args.database_url:
+        print("ERROR: pass --database-url or set DATABASE_URL")
+        return 1
+
+    logging.disable(logging.CRITICAL)
+
+    engine = create_engine(args.database_url)
+    with engine.begin() as conn:
+        conn.execute(text(SCHEMA))
+
+    db = sessionmaker(bind=engine)()
+    try:
+        workspaces = setup_workspaces(db, args.workspaces, args.metrics)
+        base = datetime(2025, 1, 1)
+
+        print(f"{args.workspaces} workspaces x {args.metrics} metrics")
+        print(f"{'path':>14} {'rows':>8} {'best (s)':>10} {'rows/sec':>10}")
+        for label, fn in (("row-at-a-time", run_row_at_a_time), ("bulk", run_bulk)):
+            best, rows = None, 0
+            for repeat in range(args.repeats):
+                start = time.perf_counter()
+                rows = fn(db, workspaces, base + timedelta(days=repeat))
+                elapsed = time.perf_counter() - start
+                best = elapsed if best is None else min(best, elapsed)
+            print(f"{label:>14} {rows:>8} {best:>10.4f} {rows / best:>10.0f}")
+    finally:
+        db.close()
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
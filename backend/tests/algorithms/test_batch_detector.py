@@ -0,0 +1,162 @@
+"""
+Tests for Batch (Vectorized) Anomaly Detection
+Checks parity with the per-series detectors across ragged batches
+"""
+import pytest
+import numpy as np
+from datetime import datetime, timedelta
+
+from app.algorithms.batch_detector import BatchAnomalyDetector, SeriesBatch
+from app.algorithms.zscore_detector import ZScoreDetector
+from app.algorithms.iqr_detector import IQRDetector
+from app.algorithms.trend_analyzer import TrendAnalyzer
+from app.algorithms.seasonal_decomposition import SeasonalDecomposer
+from app.models.anomaly import DetectionMethod
+
+
+def _ragged_series(count=25, seed=7):
+    """Series of varying length with injected spikes and drops"""
+    rng = np.random.default_rng(seed)
+    base = datetime(2025, 1, 1)
+    values, timestamps = [], []
+    for i in range(count):
+        length = int(rng.integers(3, 60))
+        series = rng.normal(100 + i, 5 + i % 4, length)
+        series += 10 * np.sin(np.arange(length) * 2 * np.pi / 7)
+        if length > 15:
+            series[length // 2] += 80
+            series[length // 3] -= 60
+        values.append(series.tolist())
+        timestamps.append([base + timedelta(days=d) for d in range(length)])
+    return values, timestamps
+
+
+@pytest.fixture
+def detector():
+    return BatchAnomalyDetector()
+
+
+class TestSeriesBatch:
+    """Test suite for packing series into a padded matrix"""
+
+    def test_pack_ragged(self):
+        """Rows are left-aligned and padding is masked"""
+        batch = SeriesBatch.from_series([[1, 2, 3], [4], []])
+
+        assert batch.values.shape == (3, 3)
+        assert batch.lengths.tolist() == [3, 1, 0]
+        assert batch.mask.tolist() == [[True, True, True], [True, False, False], [False, False, False]]
+        assert batch.values[1, 0] == 4
+        assert batch.last(batch.values).tolist() == [3, 4, 0]
+
+    def test_offsets_from_timestamps(self):
+        """Offsets are days since each series' first timestamp"""
+        base = datetime(2025, 1, 1)
+        batch = SeriesBatch.from_series(
+            [[1, 2], [3, 4, 5]],
+            [[base, base + timedelta(hours=12)], [base, base + timedelta(days=2), base + timedelta(days=5)]]
+        )
+
+        assert batch.offsets[0, :2].tolist() == [0.0, 0.5]
+        assert batch.offsets[1].tolist() == [0.0, 2.0, 5.0]
+
+
+class TestBatchAnomalyDetector:
+    """Test suite for vectorized detection parity"""
+
+    def test_quantiles_match_percentile(self, detector):
+        """Row quantiles match np.percentile"""
+        values, _ = _ragged_series()
+        batch = SeriesBatch.from_series(values)
+        quartiles = detector.quantiles(batch, [0.25, 0.5, 0.75])
+
+        for i, series in enumerate(values):
+            assert quartiles[i] == pytest.approx(np.percentile(series, [25, 50, 75]))
+
+    def test_statistics_match_zscore_detector(self, detector):
+        """Row statistics match ZScoreDetector.get_statistics"""
+        values, _ = _ragged_series()
+        stats = detector.statistics(SeriesBatch.from_series(values))
+
+        for i, series in enumerate(values):
+            expected = ZScoreDetector().get_statistics(series)
+            for key in expected:
+                assert stats[i][key] == pytest.approx(expected[key])
+
+    def test_zscore_and_iqr_match_per_series(self, detector):
+        """Flagged points and scores match the per-series detectors"""
+        values, timestamps = _ragged_series()
+        results = detector.detect(SeriesBatch.from_series(values, timestamps))
+        zscore, iqr = ZScoreDetector(), IQRDetector()
+
+        for i, series in enumerate(values):
+            expected = {}
+            for idx, score, anomaly_type, severity in zscore.detect(series):
+                expected[idx] = (DetectionMethod.ZSCORE, score, anomaly_type, severity)
+            for idx, score, anomaly_type, severity in iqr.detect(series):
+                expected.setdefault(idx, (DetectionMethod.IQR, score, anomaly_type, severity))
+
+            actual = {
+                d["index"]: (d["method"], d["score"], d["anomaly_type"], d["severity"])
+                for d in results[i]
+            }
+            assert actual.keys() == expected.keys()
+            for idx, (method, score, anomaly_type, severity) in expected.items():
+                assert actual[idx][0] == method
+                assert actual[idx][1] == pytest.approx(score)
+                assert actual[idx][2:] == (anomaly_type, severity)
+
+    def test_decompose_matches_seasonal_decomposer(self, detector):
+        """Trend, seasonal and residual components match SeasonalDecomposer"""
+        values, _ = _ragged_series()
+        batch = SeriesBatch.from_series(values)
+        components = detector.decompose(batch)
+
+        for i, series in enumerate(values):
+            if len(series) < 14:
+                continue
+            expected = SeasonalDecomposer().decompose(series)
+            n = len(series)
+            for key in ("trend", "seasonal", "residual"):
+                assert components[key][i, :n] == pytest.approx(np.array(expected[key]))
+
+    def test_seasonal_anomalies_match(self, detector):
+        """Seasonal residual outliers match detect_seasonal_anomalies"""
+        values, _ = _ragged_series()
+        results = detector.detect(
+            SeriesBatch.from_series(values),
+            [DetectionMethod.SEASONAL_DECOMPOSITION]
+        )
+
+        for i, series in enumerate(values):
+            expected = SeasonalDecomposer().detect_seasonal_anomalies(series, threshold=2.0)
+            assert [d["index"] for d in results[i]] == [idx for idx, _ in expected]
+            for d, (_, residual) in zip(results[i], expected):
+                assert d["score"] == pytest.approx(residual)
+
+    def test_trends_match_trend_analyzer(self, detector):
+        """Period changes and confidence match TrendAnalyzer.analyze_trend"""
+        values, timestamps = _ragged_series()
+        results = detector.analyze_trends(SeriesBatch.from_series(values, timestamps), ["WoW", "MoM"])
+        analyzer = TrendAnalyzer()
+
+        for i, series in enumerate(values):
+            expected = []
+            for period in ("WoW", "MoM"):
+                analysis = analyzer.analyze_trend(series, timestamps[i], period)
+                if analysis["is_significant"]:
+                    expected.append((period, analysis))
+
+            assert [t["period"] for t in results[i]] == [p for p, _ in expected]
+            for trend, (_, analysis) in zip(results[i], expected):
+                assert trend["direction"] == analysis["direction"]
+                assert trend["percentage_change"] == pytest.approx(analysis["percentage_change"])
+                assert trend["absolute_change"] == pytest.approx(analysis["absolute_change"])
+                assert trend["confidence_score"] == pytest.approx(analysis["confidence_score"])
+
+    def test_empty_batch(self, detector):
+        """Empty input produces no detections"""
+        batch = SeriesBatch.from_series([])
+
+        assert detector.detect(batch) == []
+        assert detector.analyze_trends(batch) == []
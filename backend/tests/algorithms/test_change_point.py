@@ -0,0 +1,123 @@
+"""
+Tests for Change-Point Detection
+Covers prefix-sum slope reversals, CUSUM, PELT and the streaming variant
+"""
+import json
+import pytest
+import numpy as np
+from datetime import datetime, timedelta
+
+from app.algorithms.change_point import ChangePointDetector, ChangePointState
+from app.algorithms.trend_analyzer import TrendAnalyzer
+
+
+def _timestamps(n):
+    return [datetime(2025, 1, 1) + timedelta(days=i) for i in range(n)]
+
+
+def _reference_reversals(values, timestamps, window_size):
+    """Refit both windows at every index, as the original implementation did"""
+    analyzer = TrendAnalyzer()
+    indices = []
+    for i in range(window_size, len(values) - window_size):
+        prev_slope, _ = analyzer._calculate_linear_trend(values[i - window_size:i], timestamps[i - window_size:i])
+        next_slope, _ = analyzer._calculate_linear_trend(values[i:i + window_size], timestamps[i:i + window_size])
+        if prev_slope * next_slope < 0:
+            indices.append(i)
+    return indices
+
+
+@pytest.fixture
+def random_walk():
+    values = np.cumsum(np.random.default_rng(21).normal(0, 1, 150)).tolist()
+    return values, _timestamps(len(values))
+
+
+@pytest.fixture
+def level_shifts():
+    rng = np.random.default_rng(22)
+    return np.concatenate([
+        rng.normal(100, 2, 50),
+        rng.normal(130, 2, 50),
+        rng.normal(90, 2, 50)
+    ]).tolist()
+
+
+class TestSlopeReversals:
+    """Test suite for prefix-sum slope reversal detection"""
+
+    @pytest.mark.parametrize("window_size", [5, 14])
+    def test_matches_window_refits(self, random_walk, window_size):
+        """Change points equal the per-index polyfit implementation"""
+        values, timestamps = random_walk
+        changes = ChangePointDetector(window_size=window_size).detect(values, timestamps)
+
+        assert [c["index"] for c in changes] == _reference_reversals(values, timestamps, window_size)
+        assert all(c["change_type"] == "reversal" for c in changes)
+
+    def test_trend_analyzer_delegates(self, random_walk):
+        """TrendAnalyzer.detect_trend_changes keeps its output format"""
+        values, timestamps = random_walk
+        changes = TrendAnalyzer().detect_trend_changes(values, timestamps, window_size=7)
+
+        assert changes
+        assert set(changes[0]) == {"index", "timestamp", "value", "previous_slope", "next_slope", "change_type"}
+        assert changes[0]["timestamp"] == timestamps[changes[0]["index"]]
+
+    def test_short_series(self):
+        """Series shorter than two windows have no change points"""
+        assert ChangePointDetector(window_size=14).detect(list(range(20))) == []
+
+    def test_streaming_matches_batch(self, random_walk):
+        """Streaming updates report the same reversals as batch detection"""
+        values, timestamps = random_walk
+        detector = ChangePointDetector(window_size=7)
+        state = detector.new_state()
+
+        streamed = [detector.update(state, v, t) for v, t in zip(values, timestamps)]
+
+        assert [c["index"] for c in streamed if c] == [c["index"] for c in detector.detect(values, timestamps)]
+        assert len(state.buffer_values) == 15
+
+
+class TestLevelShifts:
+    """Test suite for CUSUM and PELT level-shift detection"""
+
+    def test_pelt_finds_shifts(self, level_shifts):
+        """PELT recovers both shift locations and directions"""
+        changes = ChangePointDetector(method="pelt").detect(level_shifts)
+
+        assert [c["index"] for c in changes] == [50, 100]
+        assert [c["direction"] for c in changes] == ["up", "down"]
+        assert changes[0]["previous_mean"] == pytest.approx(100, abs=1)
+        assert changes[0]["next_mean"] == pytest.approx(130, abs=1)
+
+    def test_pelt_no_change_on_flat_series(self):
+        """Stationary noise produces no segmentation"""
+        values = np.random.default_rng(23).normal(50, 1, 200).tolist()
+        assert ChangePointDetector(method="pelt").detect(values) == []
+
+    def test_cusum_finds_shifts(self, level_shifts):
+        """CUSUM alarms shortly after each shift"""
+        changes = ChangePointDetector(method="cusum").detect(level_shifts)
+
+        assert [c["direction"] for c in changes] == ["up", "down"]
+        assert 50 <= changes[0]["index"] <= 53
+        assert 100 <= changes[1]["index"] <= 103
+
+    def test_cusum_state_round_trip(self, level_shifts):
+        """Streaming state survives JSON serialization mid-series"""
+        detector = ChangePointDetector(method="cusum")
+        state = detector.fit(detector.new_state(), level_shifts[:75])
+        restored = ChangePointState.from_dict(json.loads(json.dumps(state.to_dict())))
+
+        original = [detector.update(state, v) for v in level_shifts[75:]]
+        resumed = [detector.update(restored, v) for v in level_shifts[75:]]
+
+        assert original == resumed
+        assert any(c and c["direction"] == "down" for c in resumed)
+
+    def test_unknown_method(self):
+        """Unknown methods are rejected"""
+        with pytest.raises(ValueError):
+            ChangePointDetector(method="magic")
@@ -0,0 +1,143 @@
+"""
+Tests for Derived Metrics
+Covers formula compilation, DAG ordering, incremental evaluation and backfill
+"""
+import pytest
+import numpy as np
+from datetime import datetime, timedelta
+
+from app.algorithms.derived_metrics import (
+    DerivedMetricGraph,
+    align_daily,
+    compile_formula,
+    get_derived_metric_graph
+)
+
+
+def _daily(values, start=datetime(2025, 1, 1)):
+    return [(start + timedelta(days=i), float(v)) for i, v in enumerate(values)]
+
+
+def test_compile_formula_inputs_and_window():
+    """Inputs are collected in order and nested windows add up"""
+    formula = compile_formula("x", "lag(rolling_sum(mrr, 7), 30) / cac + mrr")
+
+    assert formula.inputs == ("mrr", "cac")
+    assert formula.window == 36
+
+
+@pytest.mark.parametrize("expression", [
+    "mrr +",
+    "__import__('os')",
+    "mrr.real",
+    "lag(mrr, 0)",
+    "lag(mrr, days)",
+    "unknown(mrr)",
+    "42",
+])
+def test_compile_formula_rejects_invalid(expression):
+    """Only arithmetic over metric names and known functions compiles"""
+    with pytest.raises(ValueError):
+        compile_formula("x", expression)
+
+
+def test_graph_orders_dependencies_and_detects_cycles():
+    """Derived inputs are evaluated first; cycles are rejected"""
+    graph = DerivedMetricGraph({"doubled": "ratio * 2", "ratio": "ltv / cac"})
+
+    assert graph.order == ["ratio", "doubled"]
+    assert graph.inputs == ["ltv", "cac"]
+    assert graph.affected(["cac"]) == ["ratio", "doubled"]
+    assert graph.affected(["mrr"]) == []
+
+    with pytest.raises(ValueError, match="cycle"):
+        DerivedMetricGraph({"a": "b + 1", "b": "a * 2"})
+
+
+def test_evaluate_window_functions_match_numpy():
+    """Vectorized window functions agree with direct computation"""
+    values = np.arange(1.0, 41.0)
+    graph = DerivedMetricGraph({
+        "growth": "pct_change(mrr, 30)",
+        "net_new": "delta(mrr, 30)",
+        "trailing": "rolling_sum(mrr, 7)",
+        "average": "rolling_mean(mrr, 7)",
+    })
+
+    results = graph.evaluate({"mrr": values})
+
+    assert np.isnan(results["growth"][29])
+    assert results["growth"][35] == pytest.approx((36 - 6) / 6 * 100)
+    assert results["net_new"][39] == pytest.approx(30.0)
+    assert np.isnan(results["trailing"][5])
+    assert results["trailing"][10] == pytest.approx(values[4:11].sum())
+    assert results["average"][10] == pytest.approx(values[4:11].mean())
+
+
+def test_division_by_zero_is_undefined():
+    """Zero denominators yield NaN rather than inf"""
+    graph = DerivedMetricGraph({"ratio": "ltv / cac"})
+
+    results = graph.evaluate({"ltv": np.array([100.0, 100.0]), "cac": np.array([20.0, 0.0])})
+
+    assert results["ratio"][0] == pytest.approx(5.0)
+    assert np.isnan(results["ratio"][1])
+
+
+def test_align_daily_carries_values_forward():
+    """Last value per day wins and is carried until the next observation"""
+    histories = {
+        "mrr": [(datetime(2025, 1, 1, 9), 1.0), (datetime(2025, 1, 1, 18), 2.0), ("2025-01-03T00:00:00Z", 3.0)],
+        "cac": [(datetime(2024, 12, 1), 7.0)],
+    }
+
+    days, aligned = align_daily(histories, start="2025-01-01", end="2025-01-04")
+
+    assert len(days) == 4
+    assert aligned["mrr"].tolist() == [2.0, 2.0, 3.0, 3.0]
+    assert aligned["cac"].tolist() == [7.0] * 4
+
+
+def test_evaluate_latest_recomputes_only_affected_nodes():
+    """Only formulas downstream of changed inputs are returned"""
+    graph = DerivedMetricGraph({"ratio": "ltv / cac", "growth": "pct_change(mrr, 30)"})
+    histories = {
+        "ltv": [(datetime(2025, 2, 15), 1000.0)],
+        "cac": [(datetime(2025, 1, 1), 250.0)],
+        "mrr": _daily(range(100, 160)),
+    }
+
+    latest = graph.evaluate_latest(histories, ["ltv"], datetime(2025, 2, 15, 12))
+
+    assert latest == {"ratio": pytest.approx(4.0)}
+
+
+def test_incremental_matches_backfill():
+    """The last backfilled value equals the incrementally computed value"""
+    graph = DerivedMetricGraph({
+        "growth": "pct_change(mrr, 30)",
+        "burn_multiple": "burn_rate / delta(mrr, 30)",
+        "trailing_burn": "rolling_sum(burn_rate, 90) / 30",
+    })
+    rng = np.random.default_rng(7)
+    histories = {
+        "mrr": _daily(np.cumsum(rng.uniform(50, 150, 120)) + 10000),
+        "burn_rate": _daily(rng.uniform(20000, 30000, 120)),
+    }
+    at = datetime(2025, 1, 1) + timedelta(days=119)
+
+    days, backfilled = graph.evaluate_history(histories)
+    latest = graph.evaluate_latest(histories, ["mrr", "burn_rate"], at)
+
+    assert days[-1] == np.datetime64(at, "D")
+    for name, value in latest.items():
+        assert value == pytest.approx(backfilled[name][-1])
+    assert set(latest) == {"growth", "burn_multiple", "trailing_burn"}
+
+
+def test_get_derived_metric_graph_is_cached():
+    """Identical formula sets reuse one compiled graph"""
+    first = get_derived_metric_graph({"ratio": "ltv / cac", "arr": "mrr * 12"})
+    second = get_derived_metric_graph({"arr": "mrr * 12", "ratio": "ltv / cac"})
+
+    assert first is second
@@ -0,0 +1,204 @@
+"""
+Tests for the HNSW and flat indexes and their workspace-sharded wrapper
+Covers recall against exact search, removal, memory-mapped persistence
+and the pgvector read-through cache
+"""
+import asyncio
+
+import numpy as np
+import pytest
+
+from app.algorithms.flat_index import FlatIndex
+from app.algorithms.hnsw import HNSWIndex
+from app.services.local_vector_index import LocalVectorIndex, VectorSearchCache
+
+
+DIMENSION = 32
+
+
+@pytest.fixture
+def vectors():
+    return np.random.default_rng(7).normal(size=(600, DIMENSION)).astype(np.float32)
+
+
+def _exact(vectors, query, k):
+    unit = vectors / np.linalg.norm(vectors, axis=1, keepdims=True)
+    return [str(i) for i in np.argsort(-(unit @ (query / np.linalg.norm(query))))[:k]]
+
+
+def _build(vectors, **kwargs):
+    index = HNSWIndex(DIMENSION, m=8, ef_construction=64, capacity=16, **kwargs)
+    for i, vector in enumerate(vectors):
+        index.add(str(i), vector)
+    return index
+
+
+class TestHNSWIndex:
+    """Test suite for HNSWIndex"""
+
+    def test_recall_matches_exact_search(self, vectors):
+        """Top-10 results agree with brute force for nearly every query"""
+        index = _build(vectors)
+        queries = np.random.default_rng(8).normal(size=(30, DIMENSION))
+
+        found = sum(
+            len(set(_exact(vectors, query, 10)) & {key for key, _ in index.search(query, 10)})
+            for query in queries
+        )
+
+        assert found / 300 >= 0.9
+        key, similarity = index.search(vectors[5], 1)[0]
+        assert key == "5" and similarity == pytest.approx(1.0, abs=1e-5)
+
+    def test_removed_and_replaced_keys(self, vectors):
+        """Removed keys are never returned and re-adding a key moves it"""
+        index = _build(vectors[:100])
+
+        assert index.remove("3")
+        assert not index.remove("3")
+        assert "3" not in {key for key, _ in index.search(vectors[3], 10)}
+
+        index.add("4", vectors[50])
+        assert {key for key, _ in index.search(vectors[50], 2)} == {"4", "50"}
+        assert len(index) == 99
+
+        compacted = index.compact()
+        assert len(compacted) == 99 and compacted.deleted_count == 0
+
+    def test_save_and_memory_mapped_load(self, vectors, tmp_path):
+        """A reloaded index maps its arrays, answers identically and still accepts writes"""
+        index = _build(vectors[:200], dtype="float16")
+        index.remove("10")
+        index.save(str(tmp_path))
+
+        loaded = HNSWIndex.load(str(tmp_path))
+
+        assert isinstance(loaded._vectors, np.memmap)
+        assert loaded._vectors.dtype == np.float16
+        assert loaded.search(vectors[20], 5) == index.search(vectors[20], 5)
+        assert "10" not in loaded
+
+        loaded.add("new", vectors[300])
+        assert loaded.search(vectors[300], 1)[0][0] == "new"
+        assert HNSWIndex.load(str(tmp_path)).search(vectors[300], 1)[0][0] != "new"
+
+
+class TestFlatIndex:
+    """Test suite for FlatIndex"""
+
+    def test_bulk_build_matches_exact_search(self, vectors):
+        """A bulk-built index returns exactly the brute-force neighbours"""
+        index = FlatIndex(DIMENSION, capacity=16)
+        index.add_many([str(i) for i in range(len(vectors))], vectors)
+
+        query = np.random.default_rng(8).normal(size=DIMENSION)
+        assert [key for key, _ in index.search(query, 10)] == _exact(vectors, query, 10)
+        assert len(index) == len(vectors)
+
+    def test_remove_replace_and_changed(self, vectors):
+        """Removal keeps the matrix dense and changed() flags only new or moved vectors"""
+        index = FlatIndex(DIMENSION)
+        index.add_many([str(i) for i in range(10)], vectors[:10])
+
+        assert index.remove("3")
+        assert not index.remove("3")
+        assert len(index) == 9 and index.deleted_count == 0
+        assert index.search(vectors[9], 1)[0][0] == "9"
+
+        index.add("4", vectors[50])
+        assert index.search(vectors[50], 1)[0][0] == "4"
+        assert index.changed(["4", "5", "3"], [vectors[50], vectors[6], vectors[3]]) == [False, True, True]
+
+
+class TestLocalVectorIndex:
+    """Test suite for workspace-sharded search"""
+
+    def test_workspaces_are_isolated_and_persisted(self, vectors, tmp_path):
+        """Searches stay within a workspace and shards reopen from disk"""
+        index = LocalVectorIndex(str(tmp_path), dimension=DIMENSION)
+        for i in range(20):
+            index.upsert("transcript_chunks", "embedding", "ws-a" if i % 2 else "ws-b", f"row-{i}", vectors[i], {"text": str(i)})
+        assert index.save() == 2
+
+        reopened = LocalVectorIndex(str(tmp_path), dimension=DIMENSION)
+        results = reopened.search("transcript_chunks", "embedding", vectors[3], 0.5, 5, "ws-a")
+
+        assert results[0]["id"] == "row-3" and results[0]["text"] == "3"
+        assert results[0]["similarity"] == pytest.approx(1.0, abs=1e-5)
+        assert all(int(result["text"]) % 2 for result in results)
+        assert reopened.search("transcript_chunks", "embedding", vectors[4], 0.99, 5)[0]["id"] == "row-4"
+
+        assert reopened.delete("transcript_chunks", "embedding", "ws-a", "row-3")
+        assert reopened.search("transcript_chunks", "embedding", vectors[3], 0.99, 5, "ws-a") == []
+
+    def test_sync_shard_applies_only_changed_rows(self, vectors):
+        """Refreshing an exact shard touches new, moved and removed rows only"""
+        index = LocalVectorIndex(dimension=DIMENSION, exact=True)
+        items = [(str(i), vectors[i], {"id": i}) for i in range(20)]
+        assert index.sync_shard("contacts", "embedding", "ws-1", items) == 20
+
+        items = items[1:] + [("20", vectors[20], {"id": 20})]
+        items[0] = ("1", vectors[40], {"id": 1, "title": "moved"})
+
+        assert index.sync_shard("contacts", "embedding", "ws-1", items) == 3
+        result = index.search("contacts", "embedding", vectors[40], 0.99, 1, "ws-1")[0]
+        assert result["title"] == "moved"
+        assert index.search("contacts", "embedding", vectors[0], 0.99, 1, "ws-1") == []
+
+    def test_exact_shards_are_memory_only(self, tmp_path):
+        """Exact shards cannot be persisted"""
+        with pytest.raises(ValueError):
+            LocalVectorIndex(str(tmp_path), dimension=DIMENSION, exact=True)
+
+
+@pytest.mark.asyncio
+async def test_cache_serves_busy_workspaces_from_memory(vectors):
+    """After enough searches a workspace is loaded once and answered without pgvector"""
+    rows = [{"id": i, "embedding": vectors[i], "title": f"row {i}"} for i in range(50)]
+    loads = []
+
+    async def loader(table, column, workspace_id, limit):
+        loads.append(workspace_id)
+        return rows[:limit]
+
+    cache = VectorSearchCache(LocalVectorIndex(dimension=DIMENSION, exact=True), max_workspaces=1, min_queries=2)
+
+    def search(workspace):
+        return cache.search("contacts", "embedding", vectors[7], 0.5, 3, workspace, loader)
+
+    assert await search("ws-1") is None
+    assert await search("ws-1") is None
+    await asyncio.gather(*cache._loading.values())
+
+    results = await search("ws-1")
+    assert results[0]["id"] == 7 and results[0]["title"] == "row 7"
+    assert "embedding" not in results[0]
+    assert loads == ["ws-1"]
+
+    # A quieter workspace does not displace the busy one
+    assert await search("ws-2") is None
+    assert await search("ws-2") is None
+    assert not cache._loading
+
+
+@pytest.mark.asyncio
+async def test_cache_reads_one_row_past_max_rows(vectors):
+    """An oversized workspace is recognized from a bounded load and not loaded again"""
+    rows = [{"id": i, "embedding": vectors[i]} for i in range(50)]
+    limits = []
+
+    async def loader(table, column, workspace_id, limit):
+        limits.append(limit)
+        return rows[:limit]
+
+    cache = VectorSearchCache(LocalVectorIndex(dimension=DIMENSION, exact=True), max_workspaces=1, min_queries=1, max_rows=10)
+
+    def search():
+        return cache.search("contacts", "embedding", vectors[7], 0.5, 3, "ws-1", loader)
+
+    assert await search() is None
+    await asyncio.gather(*cache._loading.values())
+
+    assert await search() is None
+    assert not cache._loading
+    assert limits == [11]
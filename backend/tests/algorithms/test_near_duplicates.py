@@ -0,0 +1,171 @@
+"""
+Tests for Near-Duplicate Detection
+Covers MinHash estimates, LSH candidate lookup and action item merging
+"""
+import random
+from unittest.mock import MagicMock, patch
+from uuid import uuid4
+
+import pytest
+
+from app.algorithms.near_duplicates import (
+    Fingerprint,
+    MinHasher,
+    NearDuplicateIndex,
+    jaccard,
+    tokenize
+)
+from app.chains.action_item_chain import ActionItemChain
+from app.models.action_item import ActionItem, ActionItemSource
+from app.services.recurrence_service import RecurrenceService
+
+
+WORDS = (
+    "send review update draft board investor deck pricing hiring plan budget launch "
+    "customer demo contract renewal roadmap metrics onboarding partner campaign"
+).split()
+
+
+@pytest.fixture
+def index():
+    return NearDuplicateIndex(threshold=0.8)
+
+
+class TestMinHash:
+    """Test suite for MinHash signatures"""
+
+    def test_signature_is_deterministic(self):
+        """Signatures are stable across hasher instances (they are persisted)"""
+        text = "Send the investor update to the board"
+        assert MinHasher().signature(tokenize(text)) == MinHasher().signature(tokenize(text))
+        assert all(0 <= value < 2 ** 31 for value in MinHasher().signature(tokenize(text)))
+
+    def test_estimate_tracks_jaccard(self):
+        """Signature agreement approximates the exact word-set similarity"""
+        rng = random.Random(7)
+        hasher = MinHasher()
+        errors = []
+        for _ in range(50):
+            first = set(rng.sample(WORDS, 10))
+            second = set(rng.sample(sorted(first), 6)) | set(rng.sample(WORDS, 4))
+            exact = jaccard(frozenset(first), frozenset(second))
+            estimate = Fingerprint(hasher.signature(first)).similarity(Fingerprint(hasher.signature(second)))
+            errors.append(abs(estimate - exact))
+
+        assert sum(errors) / len(errors) < 0.06
+
+    def test_empty_text_matches_nothing(self, index):
+        """Texts without words are never duplicates"""
+        empty = index.fingerprint("...")
+        index.add("a", empty)
+
+        assert empty.empty
+        assert index.find(index.fingerprint("...")) is None
+
+
+class TestFingerprintSimilarity:
+    """Test suite for fingerprint similarity of action item texts"""
+
+    def test_identical(self, index):
+        """Identical texts are fully similar"""
+        text = "implement oauth authentication"
+        assert index.fingerprint(text).similarity(index.fingerprint(text)) == 1.0
+
+    def test_similar(self, index):
+        """Texts sharing most words overlap without being identical"""
+        similarity = index.fingerprint("implement oauth authentication").similarity(
+            index.fingerprint("implement oauth authorization")
+        )
+        assert 0.4 <= similarity < 1.0
+
+    def test_different(self, index):
+        """Unrelated texts barely overlap"""
+        similarity = index.fingerprint("implement oauth").similarity(index.fingerprint("update documentation"))
+        assert similarity < 0.3
+
+    def test_empty(self, index):
+        """Empty texts are similar to nothing"""
+        assert index.fingerprint("").similarity(index.fingerprint("test")) == 0.0
+        assert index.fingerprint("test").similarity(index.fingerprint("")) == 0.0
+        assert index.fingerprint("").similarity(index.fingerprint("")) == 0.0
+
+
+class TestNearDuplicateIndex:
+    """Test suite for LSH lookups"""
+
+    def test_finds_near_duplicate(self, index):
+        """Rewordings above the threshold are found, unrelated texts are not"""
+        index.add("deck", index.fingerprint("Send the Q4 investor deck to the board by Friday"))
+        index.add("docs", index.fingerprint("Update the onboarding documentation"))
+
+        match = index.find(index.fingerprint("send the q4 investor deck to the board by friday."))
+        assert match == ("deck", 1.0)
+        assert index.find(index.fingerprint("Renew the customer contract")) is None
+
+    def test_matches_pairwise_scan(self, index):
+        """add_unique keeps the same items as comparing every pair"""
+        rng = random.Random(11)
+        texts = [" ".join(rng.sample(WORDS, rng.randint(4, 8))) for _ in range(200)]
+        texts += [" ".join(text.split()[:-1]) for text in texts[:60] if len(text.split()) > 5]
+
+        kept = []
+        for i, text in enumerate(texts):
+            if index.add_unique(i, index.fingerprint(text)) is None:
+                kept.append(text)
+
+        expected = []
+        for text in texts:
+            if not any(jaccard(tokenize(text), tokenize(other)) > 0.8 for other in expected):
+                expected.append(text)
+
+        assert kept == expected
+
+    def test_rejects_uneven_bands(self):
+        """Bands must divide the signature length"""
+        with pytest.raises(ValueError):
+            NearDuplicateIndex(num_bands=7)
+
+
+def test_merge_action_items_drops_reworded_regex_item():
+    """Regex items repeating an LLM item with different punctuation are merged"""
+    chain = ActionItemChain(MagicMock(), prefilter=False)
+    llm_items = [{"description": "Send the pricing deck to the board", "source": ActionItemSource.LLM}]
+    regex_items = [
+        {"description": "send the pricing deck to the board.", "source": ActionItemSource.REGEX},
+        {"description": "book the customer demo", "source": ActionItemSource.REGEX},
+        {"description": "Book the customer demo!", "source": ActionItemSource.REGEX},
+    ]
+
+    result = chain._merge_action_items(regex_items, llm_items)
+
+    assert [item["description"] for item in result] == [
+        "Send the pricing deck to the board",
+        "book the customer demo"
+    ]
+
+
+@pytest.mark.asyncio
+async def test_recurrence_links_first_occurrence():
+    """Items repeating an earlier meeting's item point at its first occurrence"""
+    workspace_id, meeting_id = uuid4(), uuid4()
+    first_id, repeat_id = str(uuid4()), str(uuid4())
+    service = RecurrenceService(MagicMock(), threshold=0.8)
+    earlier = service.index.fingerprint("Send the weekly metrics update to investors")
+    rows = [
+        {"id": first_id, "meeting_id": str(uuid4()), "minhash_signature": list(earlier.signature), "duplicate_of": None},
+        {"id": repeat_id, "meeting_id": str(uuid4()), "minhash_signature": list(earlier.signature),
+         "duplicate_of": first_id},
+    ]
+
+    def item(description):
+        return ActionItem(workspace_id=workspace_id, founder_id=uuid4(), meeting_id=meeting_id, description=description)
+
+    items = [item("Send the weekly metrics update to investors."), item("Draft the hiring plan")]
+    with patch.object(service, "_find_candidates", return_value=rows) as find:
+        linked = await service.link_recurring("action_items", workspace_id, meeting_id, items, lambda i: i.description)
+
+    assert linked == 1
+    assert str(items[0].duplicate_of) == first_id
+    assert items[1].duplicate_of is None
+    assert len(items[1].minhash_signature) == 64 and len(items[1].lsh_bands) == 16
+    assert set(find.call_args.args[3]) == set(items[0].lsh_bands) | set(items[1].lsh_bands)
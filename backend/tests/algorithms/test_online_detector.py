@@ -0,0 +1,191 @@
+"""
+Tests for Online (Streaming) Anomaly Detection
+Covers running stats, quantile sketch, state persistence and streaming scoring
+"""
+import json
+import pytest
+import numpy as np
+from datetime import datetime, timedelta
+
+from app.algorithms.online_detector import (
+    RunningStats,
+    QuantileSketch,
+    OnlineMetricState,
+    OnlineAnomalyDetector
+)
+from app.models.anomaly import AnomalyType, DetectionMethod
+
+
+# ==================== RUNNING STATS TESTS ====================
+
+class TestRunningStats:
+    """Test suite for Welford running statistics"""
+
+    def test_matches_numpy(self):
+        """Running mean/std match numpy population statistics"""
+        values = np.random.default_rng(1).normal(100, 15, 500)
+        stats = RunningStats()
+        for v in values:
+            stats.update(v)
+
+        assert stats.count == 500
+        assert stats.mean == pytest.approx(np.mean(values))
+        assert stats.std == pytest.approx(np.std(values))
+
+    def test_merge_equals_sequential(self):
+        """Merging partitions gives the same result as one pass"""
+        values = list(np.random.default_rng(2).normal(0, 1, 200))
+        left, right, full = RunningStats(), RunningStats(), RunningStats()
+        for v in values[:70]:
+            left.update(v)
+        for v in values[70:]:
+            right.update(v)
+        for v in values:
+            full.update(v)
+
+        left.merge(right)
+
+        assert left.count == full.count
+        assert left.mean == pytest.approx(full.mean)
+        assert left.variance == pytest.approx(full.variance)
+
+    def test_empty(self):
+        """Empty stats have zero variance"""
+        assert RunningStats().std == 0.0
+
+
+# ==================== QUANTILE SKETCH TESTS ====================
+
+class TestQuantileSketch:
+    """Test suite for the mergeable quantile sketch"""
+
+    def test_quantiles_within_relative_accuracy(self):
+        """Quartiles are within the configured relative error"""
+        values = np.random.default_rng(3).lognormal(5, 1, 5000)
+        sketch = QuantileSketch(relative_accuracy=0.01)
+        for v in values:
+            sketch.add(v)
+
+        for q in (0.25, 0.5, 0.75):
+            expected = np.quantile(values, q)
+            assert sketch.quantile(q) == pytest.approx(expected, rel=0.03)
+
+    def test_handles_negative_and_zero(self):
+        """Negative values and zeros are ordered correctly"""
+        sketch = QuantileSketch()
+        for v in [-10, -5, 0, 0, 5, 10]:
+            sketch.add(v)
+
+        assert sketch.quantile(0.0) == -10
+        assert sketch.quantile(1.0) == 10
+        assert sketch.quantile(0.5) == 0.0
+        assert sketch.quantile(0.1) < 0
+
+    def test_merge(self):
+        """Merged sketch matches a sketch built from all values"""
+        rng = np.random.default_rng(4)
+        a_values, b_values = rng.normal(50, 5, 300), rng.normal(80, 5, 300)
+        a, b, full = QuantileSketch(), QuantileSketch(), QuantileSketch()
+        for v in a_values:
+            a.add(v)
+            full.add(v)
+        for v in b_values:
+            b.add(v)
+            full.add(v)
+
+        a.merge(b)
+
+        assert a.count == 600
+        assert a.quantile(0.5) == pytest.approx(full.quantile(0.5))
+
+    def test_bounded_bins(self):
+        """Bucket count never exceeds max_bins"""
+        sketch = QuantileSketch(relative_accuracy=0.01, max_bins=64)
+        for v in np.logspace(-3, 9, 5000):
+            sketch.add(v)
+
+        assert len(sketch.positive) <= 64
+        assert sketch.quantile(1.0) == pytest.approx(1e9)
+
+    def test_empty(self):
+        """Empty sketch returns None"""
+        assert QuantileSketch().quantile(0.5) is None
+
+
+# ==================== ONLINE DETECTOR TESTS ====================
+
+class TestOnlineAnomalyDetector:
+    """Test suite for streaming anomaly detection"""
+
+    @pytest.fixture
+    def detector(self):
+        return OnlineAnomalyDetector(min_samples=10)
+
+    @pytest.fixture
+    def baseline(self):
+        return [50, 52, 48, 51, 49, 53, 47, 50, 52, 48, 51, 49, 50, 52, 48]
+
+    def test_no_scoring_before_min_samples(self, detector):
+        """Nothing is flagged until enough history exists"""
+        state = detector.new_state()
+        for v in [1, 1000, 1, 1000, 1]:
+            assert detector.update(state, v) == []
+
+    def test_detects_spike(self, detector, baseline):
+        """A spike after a stable baseline is flagged by z-score first"""
+        state = detector.fit(detector.new_state(), baseline)
+        detections = detector.update(state, 200)
+
+        assert detections
+        assert detections[0]["method"] == DetectionMethod.ZSCORE
+        assert detections[0]["anomaly_type"] == AnomalyType.SPIKE
+        assert any(d["method"] == DetectionMethod.IQR for d in detections)
+
+    def test_detects_drop(self, detector, baseline):
+        """A drop after a stable baseline is flagged"""
+        state = detector.fit(detector.new_state(), baseline)
+        detections = detector.update(state, 0)
+
+        assert detections
+        assert detections[0]["anomaly_type"] == AnomalyType.DROP
+
+    def test_normal_value_not_flagged(self, detector, baseline):
+        """Values within the normal range are not flagged"""
+        state = detector.fit(detector.new_state(), baseline)
+        assert detector.update(state, 50) == []
+
+    def test_seasonal_deviation(self):
+        """A value off its weekly pattern is flagged by the residual stats"""
+        detector = OnlineAnomalyDetector(seasonal_period=7, min_samples=10)
+        pattern = [100, 120, 140, 160, 140, 120, 100]
+        state = detector.fit(detector.new_state(), pattern * 8)
+
+        # Phase 0 expects ~100; 160 is in-range overall but off-season
+        detections = detector.update(state, 160)
+
+        methods = [d["method"] for d in detections]
+        assert DetectionMethod.SEASONAL_DECOMPOSITION in methods
+        assert DetectionMethod.ZSCORE not in methods
+
+    def test_state_round_trip_is_resumable(self, detector, baseline):
+        """State survives JSON serialization and resumes identically"""
+        timestamps = [datetime(2025, 1, 1) + timedelta(days=i) for i in range(len(baseline))]
+        state = detector.fit(detector.new_state(), baseline, timestamps)
+
+        restored = OnlineMetricState.from_dict(json.loads(json.dumps(state.to_dict())))
+
+        assert restored.observations == state.observations
+        assert restored.last_timestamp == timestamps[-1]
+        assert detector.update(restored, 200) == detector.update(state, 200)
+
+    def test_update_is_constant_memory(self, detector):
+        """State size does not grow with the number of observations"""
+        state = detector.new_state()
+        for v in np.random.default_rng(5).normal(100, 10, 2000):
+            detector.update(state, v)
+        size_small = len(json.dumps(state.to_dict()))
+
+        for v in np.random.default_rng(6).normal(100, 10, 20000):
+            detector.update(state, v)
+
+        assert len(json.dumps(state.to_dict())) < size_small * 2
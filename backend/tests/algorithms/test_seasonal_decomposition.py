@@ -0,0 +1,109 @@
+"""
+Tests for Seasonal Decomposition
+Covers the vectorized engine, multiple seasonal periods and batched input
+"""
+import pytest
+import numpy as np
+
+from app.algorithms.seasonal_decomposition import SeasonalDecomposer
+
+
+def _reference_decompose(values, period):
+    """Straightforward loop implementation of the moving-average decomposition"""
+    data = np.array(values, dtype=float)
+    n = len(data)
+    trend = np.array([
+        np.mean(data[max(0, i - period // 2):min(n, i + period // 2 + 1)])
+        for i in range(n)
+    ])
+    detrended = data - trend
+    averages = np.array([np.mean(detrended[i::period]) for i in range(period)])
+    averages -= averages.mean()
+    seasonal = np.array([averages[i % period] for i in range(n)])
+    return trend, seasonal, data - trend - seasonal
+
+
+@pytest.fixture
+def weekly_series():
+    rng = np.random.default_rng(11)
+    days = np.arange(60)
+    return (100 + 0.5 * days + 20 * np.sin(2 * np.pi * days / 7) + rng.normal(0, 2, 60)).tolist()
+
+
+class TestSeasonalDecomposer:
+    """Test suite for seasonal decomposition"""
+
+    @pytest.mark.parametrize("length", [14, 15, 20, 60, 61])
+    def test_matches_reference(self, length, weekly_series):
+        """Vectorized components equal the loop implementation"""
+        values = weekly_series[:length]
+        result = SeasonalDecomposer(seasonal_period=7).decompose(values)
+        trend, seasonal, residual = _reference_decompose(values, 7)
+
+        assert result["trend"] == pytest.approx(trend)
+        assert result["seasonal"] == pytest.approx(seasonal)
+        assert result["residual"] == pytest.approx(residual)
+        assert "seasonals" not in result
+
+    def test_insufficient_samples(self):
+        """Short series return an error result"""
+        result = SeasonalDecomposer().decompose([1, 2, 3])
+        assert result["error"] == "Insufficient samples"
+
+    def test_batch_matches_single(self, weekly_series):
+        """decompose_batch returns the same result as decompose per series"""
+        decomposer = SeasonalDecomposer(seasonal_period=7)
+        series = [weekly_series, weekly_series[:20], weekly_series[:5], [v * 2 for v in weekly_series[:33]]]
+
+        results = decomposer.decompose_batch(series)
+
+        for values, result in zip(series, results):
+            expected = decomposer.decompose(values)
+            assert result.keys() == expected.keys()
+            for key in ("trend", "seasonal", "residual"):
+                assert result[key] == pytest.approx(expected[key])
+
+    def test_multiple_periods(self):
+        """Daily and weekly cycles in hourly data are separated"""
+        hours = np.arange(24 * 7 * 8)
+        daily = 10 * np.sin(2 * np.pi * hours / 24)
+        weekly = 30 * np.sin(2 * np.pi * hours / 168)
+        values = (500 + daily + weekly).tolist()
+
+        decomposer = SeasonalDecomposer(seasonal_periods=[168, 24], min_samples=336)
+        result = decomposer.decompose(values)
+
+        assert decomposer.seasonal_period == 24
+        assert set(result["seasonals"]) == {24, 168}
+        interior = slice(168, -168)
+        assert np.corrcoef(result["seasonals"][24][interior], daily[interior])[0, 1] > 0.95
+        assert np.corrcoef(result["seasonals"][168][interior], weekly[interior])[0, 1] > 0.95
+        assert result["seasonal"] == pytest.approx(
+            np.add(result["seasonals"][24], result["seasonals"][168])
+        )
+
+    def test_year_of_hourly_points(self):
+        """A year of hourly data decomposes with all components aligned"""
+        rng = np.random.default_rng(12)
+        values = (1000 + rng.normal(0, 10, 24 * 365)).tolist()
+        result = SeasonalDecomposer(seasonal_periods=[24, 168]).decompose(values)
+
+        assert len(result["trend"]) == len(values)
+        assert len(result["seasonals"][168]) == len(values)
+
+    def test_predict_uses_all_periods(self):
+        """Predictions continue the summed seasonal pattern"""
+        hours = np.arange(24 * 7 * 4)
+        values = (100 + 10 * np.sin(2 * np.pi * hours / 24) + 20 * np.sin(2 * np.pi * hours / 168)).tolist()
+        decomposer = SeasonalDecomposer(seasonal_periods=[24, 168], min_samples=336)
+
+        predictions = decomposer.predict_seasonal_pattern(values, periods_ahead=24)
+        decomposition = decomposer.decompose(values)
+        expected = (
+            decomposition["trend"][-1]
+            + decomposition["seasonals"][24][-24]
+            + decomposition["seasonals"][168][-168]
+        )
+
+        assert len(predictions) == 24
+        assert predictions[0] == pytest.approx(expected)
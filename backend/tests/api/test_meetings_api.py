@@ -520,3 +520,77 @@ class TestGetMeetingStatus:
 
         # Assert
         assert response.status_code == status.HTTP_404_NOT_FOUND
+
+
+class TestStreamSummary:
+    """Tests for POST /meetings/{meeting_id}/summarize/stream endpoint"""
+
+    @pytest.fixture
+    def meeting_db(self):
+        """Supabase client returning one meeting, injected through dependency overrides"""
+        from app.main import app
+        from app.api.v1.meetings import get_supabase_client
+
+        db = MagicMock()
+        db.table.return_value.select.return_value.eq.return_value.execute.return_value.data = [{
+            "id": str(uuid4()),
+            "workspace_id": str(uuid4()),
+            "founder_id": str(uuid4()),
+            "transcript": "This is a test transcript"
+        }]
+        app.dependency_overrides[get_supabase_client] = lambda: db
+        yield db
+        app.dependency_overrides.pop(get_supabase_client, None)
+
+    @staticmethod
+    def _events(*events, error=None):
+        async def stream(**kwargs):
+            for event in events:
+                yield event
+            if error:
+                raise error
+        return stream
+
+    def test_stream_summary_sse(self, client, mock_summarization_service, meeting_db):
+        """Stage results are framed as server-sent events"""
+        mock_summarization_service.stream_summarize_meeting = self._events(
+            {"event": "token", "data": {"text": "Exec"}},
+            {"event": "summary", "data": {"executive_summary": "Exec", "key_points": ["a"]}},
+            {"event": "complete", "data": {"summary_id": uuid4()}}
+        )
+
+        response = client.post(f"/api/v1/meetings/{uuid4()}/summarize/stream")
+
+        assert response.status_code == status.HTTP_200_OK
+        assert response.headers["content-type"].startswith("text/event-stream")
+        frames = response.text.strip().split("\n\n")
+        assert [frame.split("\n")[0] for frame in frames] == [
+            "event: token", "event: summary", "event: complete"
+        ]
+        assert frames[1].split("\n")[1] == 'data: {"executive_summary": "Exec", "key_points": ["a"]}'
+
+    def test_stream_summary_ndjson_reports_errors_in_band(self, client, mock_summarization_service, meeting_db):
+        """NDJSON streams one JSON object per line and end with an error event on failure"""
+        import json
+
+        mock_summarization_service.stream_summarize_meeting = self._events(
+            {"event": "topics", "data": ["pricing"]},
+            error=RuntimeError("provider down")
+        )
+
+        response = client.post(f"/api/v1/meetings/{uuid4()}/summarize/stream?format=ndjson")
+
+        assert response.headers["content-type"].startswith("application/x-ndjson")
+        lines = [json.loads(line) for line in response.text.strip().split("\n")]
+        assert lines == [
+            {"event": "topics", "data": ["pricing"]},
+            {"event": "error", "data": {"detail": "provider down"}}
+        ]
+
+    def test_stream_summary_not_found(self, client, mock_summarization_service, meeting_db):
+        """Missing meetings fail before the stream starts"""
+        meeting_db.table.return_value.select.return_value.eq.return_value.execute.return_value.data = []
+
+        response = client.post(f"/api/v1/meetings/{uuid4()}/summarize/stream")
+
+        assert response.status_code == status.HTTP_404_NOT_FOUND
@@ -160,6 +160,30 @@ async def test_extract_with_long_transcript(action_chain, mock_llm_provider):
     assert mock_llm_provider.complete.call_count >= 1
 
 
+@pytest.mark.asyncio
+async def test_long_transcript_chunks_extracted_concurrently(action_chain, mock_llm_provider):
+    """Chunk calls overlap and results keep transcript order"""
+    import asyncio
+
+    long_transcript = " ".join(["alpha"] * 3000 + ["omega"] * 3000)
+    in_flight = {"now": 0, "max": 0}
+
+    async def complete(prompt, **kwargs):
+        in_flight["now"] += 1
+        in_flight["max"] = max(in_flight["max"], in_flight["now"])
+        await asyncio.sleep(0.01)
+        in_flight["now"] -= 1
+        label = "first" if "alpha" in prompt else "second"
+        return LLMResponse(content=f"ITEM: {label} chunk task\n---", provider=LLMProviderType.OPENAI, model="gpt-4")
+
+    mock_llm_provider.complete.side_effect = complete
+
+    items = await action_chain._llm_extraction(long_transcript)
+
+    assert in_flight["max"] == 2
+    assert [item["description"] for item in items] == ["first chunk task", "second chunk task"]
+
+
 @pytest.mark.asyncio
 async def test_extract_with_complex_items(action_chain, mock_llm_provider, complex_transcript):
     """Test extraction with urgency markers and @mentions"""
@@ -566,44 +590,6 @@ def test_chunk_transcript(action_chain):
         assert word_count <= 2100  # Small margin
 
 
-def test_similarity_identical(action_chain):
-    """Test similarity calculation for identical strings"""
-    text1 = "implement oauth authentication"
-    text2 = "implement oauth authentication"
-
-    similarity = action_chain._similarity(text1, text2)
-
-    assert similarity == 1.0
-
-
-def test_similarity_similar(action_chain):
-    """Test similarity calculation for similar strings"""
-    text1 = "implement oauth authentication"
-    text2 = "implement oauth authorization"
-
-    similarity = action_chain._similarity(text1, text2)
-
-    # Should have some overlap (oauth, implement) but not identical
-    assert 0.4 <= similarity < 1.0
-
-
-def test_similarity_different(action_chain):
-    """Test similarity calculation for different strings"""
-    text1 = "implement oauth"
-    text2 = "update documentation"
-
-    similarity = action_chain._similarity(text1, text2)
-
-    assert similarity < 0.3
-
-
-def test_similarity_empty(action_chain):
-    """Test similarity with empty strings"""
-    assert action_chain._similarity("", "test") == 0.0
-    assert action_chain._similarity("test", "") == 0.0
-    assert action_chain._similarity("", "") == 0.0
-
-
 # ===== Error Handling Tests =====
 
 @pytest.mark.asyncio
@@ -0,0 +1,122 @@
+"""
+Tests for the candidate-window extraction pre-filter
+"""
+import pytest
+from unittest.mock import AsyncMock, Mock
+
+from app.chains.action_item_chain import ActionItemChain
+from app.chains.candidate_windows import WINDOW_SEPARATOR, CandidateWindowFilter
+from app.chains.decision_chain import DecisionChain
+from app.llm.llm_provider import LLMProvider, LLMProviderType, LLMResponse
+
+
+CHATTER = [
+    "Alice: The churn numbers look similar to last quarter's figures overall.",
+    "Bob: Most of the feedback came from the onboarding survey we ran.",
+    "Carol: Customers mentioned the dashboard loads slowly on mobile devices.",
+    "Alice: That matches what the support team has been hearing recently.",
+    "Bob: The enterprise pilot users seem happy with the reporting module.",
+]
+
+
+@pytest.fixture
+def long_meeting():
+    """An hour of discussion with a few commitments and decisions"""
+    lines = []
+    for i in range(120):
+        lines.append(CHATTER[i % len(CHATTER)])
+        if i == 30:
+            lines.append("Carol: I'll send the mobile performance report by Friday.")
+        if i == 70:
+            lines.append("Alice: We agreed to delay the pricing change until Q3.")
+        if i == 100:
+            lines.append("Bob: Dave, can you follow up with the pilot customers?")
+    return "\n".join(lines)
+
+
+@pytest.fixture
+def provider():
+    provider = Mock(spec=LLMProvider)
+    provider.provider_type = LLMProviderType.OPENAI
+    provider.complete = AsyncMock(return_value=LLMResponse(
+        content="", provider=LLMProviderType.OPENAI, model="gpt-4"
+    ))
+    return provider
+
+
+def test_windows_include_context_and_speaker():
+    """Hits keep neighbouring sentences from the same turn and the speaker label"""
+    transcript = (
+        "Alice: Revenue grew. We spoke to three banks. Bob will draft the memo. It goes to the board. "
+        "Then lunch. Weather was nice.\n"
+        "Carol: Unrelated update here."
+    )
+    window_filter = CandidateWindowFilter(("action",), context_sentences=1, max_coverage=1.0)
+
+    excerpt = window_filter.render(transcript)
+
+    assert excerpt == "Alice: We spoke to three banks. Bob will draft the memo. It goes to the board."
+
+
+def test_adjacent_windows_merge():
+    """Windows that touch or overlap become one"""
+    transcript = "Alice: A will go. B is here. C will go. D is here. E is here. F is here. G is here. H will go."
+    window_filter = CandidateWindowFilter(("action",), context_sentences=1, max_coverage=1.0)
+
+    windows = window_filter.find(transcript)
+
+    assert [window.hits for window in windows] == [2, 1]
+    assert transcript[windows[0].start:windows[0].end] == "Alice: A will go. B is here. C will go. D is here."
+
+
+def test_no_hits_or_full_coverage_falls_back():
+    """Nothing matched, or nearly everything matched, means use the full transcript"""
+    window_filter = CandidateWindowFilter(("action",), max_coverage=0.6)
+
+    assert window_filter.render("Alice: Nothing to see. Just chatting.") is None
+    assert window_filter.render("Alice: I will do it. You will too. They will as well.") is None
+
+
+async def test_action_items_send_only_candidate_windows(provider, long_meeting):
+    """An hour-long meeting shrinks to the commitment windows"""
+    chain = ActionItemChain(provider, prefilter=True)
+
+    await chain._llm_extraction(long_meeting)
+
+    prompt = provider.complete.call_args.args[0]
+    assert provider.complete.call_count == 1
+    assert "I'll send the mobile performance report by Friday." in prompt
+    assert "Dave, can you follow up with the pilot customers?" in prompt
+    assert prompt.count(WINDOW_SEPARATOR.strip()) >= 1
+    assert len(prompt) * 5 < len(long_meeting)
+
+
+async def test_decisions_send_only_candidate_windows(provider, long_meeting):
+    """Decision extraction sees the decision and not the surrounding chatter"""
+    chain = DecisionChain(provider, prefilter=True)
+
+    await chain.extract_decisions(long_meeting)
+
+    prompt = provider.complete.call_args.args[0]
+    assert "We agreed to delay the pricing change until Q3." in prompt
+    assert "onboarding survey" not in prompt
+
+
+async def test_prefilter_falls_back_to_full_transcript(provider):
+    """With no candidates the whole transcript is still extracted"""
+    transcript = "\n".join(CHATTER)
+    chain = ActionItemChain(provider, prefilter=True)
+
+    await chain._llm_extraction(transcript)
+
+    assert transcript in provider.complete.call_args.args[0]
+
+
+async def test_prefilter_disabled(provider, long_meeting):
+    """prefilter=False sends the full transcript"""
+    chain = ActionItemChain(provider, prefilter=False)
+
+    await chain._llm_extraction(long_meeting)
+
+    prompts = " ".join(call.args[0] for call in provider.complete.call_args_list)
+    assert "onboarding survey" in prompts
@@ -0,0 +1,87 @@
+"""
+Tests for the single-pass phrase scanner
+"""
+import re
+
+from app.chains.phrase_scanner import CUE_PATTERNS, PhraseScanner, find_name_pairs, get_phrase_scanner
+
+
+TRANSCRIPT = (
+    "Alice: We'll go with vendor B. @tom to migrate the billing tables by Friday.\n"
+    "Bob: That's urgent, the deadline is the 15th. We decided to drop the beta.\n"
+    "Carol: I need to review 3/14 numbers before Q3 planning.\n"
+    "Dave: Nothing else from me."
+)
+
+
+def _reference(scanner, text):
+    """Every kind's pattern tried separately at every word start"""
+    found = set()
+    for kind, pattern in scanner._kind_patterns.items():
+        for start in re.finditer(r"(?<![\w@])(?=[\w@])", text):
+            match = pattern.match(text, start.start())
+            if match:
+                found.add((kind, start.start(), match.end()))
+    return found
+
+
+def test_single_pass_matches_per_pattern_scans():
+    """The combined automaton finds exactly what separate scans find, overlaps included"""
+    scanner = PhraseScanner()
+
+    scan = scanner.scan(TRANSCRIPT)
+
+    assert {(m.kind, m.start, m.end) for m in scan.matches} == _reference(scanner, TRANSCRIPT)
+    starts = [m.start for m in scan.matches]
+    assert starts == sorted(starts)
+
+
+def test_overlapping_kinds_reported_at_same_position():
+    """ "We'll go with" is both a commitment and a decision cue"""
+    scan = PhraseScanner().scan("We'll go with the cheaper plan.")
+
+    kinds = {m.kind for m in scan.matches if m.start == 0}
+    assert {"commitment", "choice"} <= kinds
+
+
+def test_cue_kinds_found():
+    """Commitments, assignees, decisions, priorities and dates are all detected"""
+    scan = PhraseScanner().scan(TRANSCRIPT)
+
+    texts = {kind: [TRANSCRIPT[m.start:m.end] for m in scan.of(kind)] for kind in CUE_PATTERNS}
+    assert "@tom to " in texts["action"]
+    assert "@tom" in texts["assignee"]
+    assert "decided" in texts["decision"]
+    assert "urgent" in texts["priority"]
+    assert {"Friday", "deadline", "the 15th", "3/14", "Q3"} <= set(texts["due_date"])
+    assert not scan.has("nonexistent")
+
+
+def test_cues_start_at_word_boundaries():
+    """Words that merely contain a cue are not matches"""
+    scan = PhraseScanner().scan("Goodwill is undecided; email bob@example.com about the willow.")
+
+    assert not scan.has("action")
+    assert not scan.has("decision")
+    assert not scan.has("assignee")
+
+
+def test_scans_are_shared():
+    """Scanning the same text again returns the memoized scan"""
+    scanner = get_phrase_scanner()
+
+    assert scanner.scan(TRANSCRIPT) is scanner.scan(TRANSCRIPT)
+    assert scanner.scan(TRANSCRIPT).lowered == TRANSCRIPT.lower()
+
+
+def test_find_name_pairs():
+    """Capitalized pairs are names unless they start with a stopword (tokens keep punctuation)"""
+    pairs = find_name_pairs("John Smith met Alice Johnson. The Board and This Quarter.")
+
+    assert pairs == ["John Smith", "Alice Johnson.", "Johnson. The"]
+
+
+def test_find_name_pairs_non_ascii_capitals():
+    """Capitals outside ASCII count, as they did with str.isupper()"""
+    assert find_name_pairs("ÉCOLE Paris Office") == ["ÉCOLE Paris", "Paris Office"]
+    assert find_name_pairs("Zoë Øster and élan Été") == ["Zoë Øster"]
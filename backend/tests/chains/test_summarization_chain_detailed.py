@@ -2,11 +2,12 @@
 Comprehensive tests for SummarizationChain
 Tests multi-stage summarization, chunking, and all summarization methods
 """
+import hashlib
 import pytest
-from unittest.mock import Mock, AsyncMock
+from unittest.mock import Mock, AsyncMock, patch
 from uuid import uuid4
 
-from app.chains.summarization_chain import SummarizationChain
+from app.chains.summarization_chain import PartialSummaryCache, SummarizationChain
 from app.llm.llm_provider import LLMProvider, LLMResponse, LLMProviderType
 from app.models.meeting_summary import SummarizationMethod
 
@@ -283,6 +284,101 @@ def test_chunk_transcript_small(summarization_chain):
     assert len(chunks) >= 1
 
 
+# ===== Hierarchical Summarization Tests =====
+
+def _echo_response(prompt, **kwargs):
+    """30-word response unique to the prompt"""
+    word = hashlib.md5(prompt.encode()).hexdigest()[:8]
+    return LLMResponse(content=" ".join([word] * 30), provider=LLMProviderType.OPENAI, model="gpt-4")
+
+
+@pytest.fixture
+def small_budget():
+    """Shrink transcript chunks to 50 tokens so short transcripts map-reduce"""
+    with patch("app.llm.transcript_chunker.get_settings") as mock_settings:
+        mock_settings.return_value.transcript_chunk_max_tokens = 50
+        mock_settings.return_value.transcript_chunk_overlap_tokens = 0
+        mock_settings.return_value.transcript_chunk_cache_size = 256
+        yield
+
+
+@pytest.fixture
+def board_meeting():
+    return "\n".join(f"Speaker{i % 3}: Item {i} was reviewed and the board agreed on next steps." for i in range(40))
+
+
+@pytest.mark.asyncio
+async def test_hierarchical_summarization_merges_in_tree(mock_llm_provider, small_budget, board_meeting):
+    """Partial summaries are merged level by level until they fit the budget"""
+    mock_llm_provider.complete.side_effect = _echo_response
+    chain = SummarizationChain(mock_llm_provider, summary_cache=PartialSummaryCache())
+
+    result = await chain.summarize(board_meeting, method="hierarchical")
+    prompts = [call.args[0] for call in mock_llm_provider.complete.call_args_list]
+    chunk_count = result["metadata"]["chunk_count"]
+
+    assert result["method"] == "hierarchical"
+    assert chunk_count == 10
+    assert result["metadata"]["reduce_levels"] == 3
+    assert sum(p.startswith("Extract") for p in prompts) == chunk_count
+    assert sum(p.startswith("Combine") for p in prompts) == 5 + 2 + 1
+    assert len(prompts) == chunk_count + 8 + 2
+
+
+@pytest.mark.asyncio
+async def test_hierarchical_rerun_redoes_only_changed_chunks(mock_llm_provider, small_budget, board_meeting):
+    """Cached chunk and merge summaries are reused; only the changed path is recomputed"""
+    mock_llm_provider.complete.side_effect = _echo_response
+    chain = SummarizationChain(mock_llm_provider, summary_cache=PartialSummaryCache())
+    await chain.summarize(board_meeting, method="hierarchical")
+
+    mock_llm_provider.complete.reset_mock()
+    edited = board_meeting.replace("Item 39 was reviewed", "Item 39 was postponed")
+    result = await chain.summarize(edited, method="hierarchical")
+    prompts = [call.args[0] for call in mock_llm_provider.complete.call_args_list]
+
+    assert result["metadata"]["cached_chunks"] == result["metadata"]["chunk_count"] - 1
+    assert sum(p.startswith("Extract") for p in prompts) == 1
+    assert sum(p.startswith("Combine") for p in prompts) == 3
+
+
+@pytest.mark.asyncio
+async def test_hierarchical_refresh_ignores_cached_summaries(mock_llm_provider, small_budget, board_meeting):
+    """A refreshing chain recomputes every chunk and merge and stores the new summaries"""
+    mock_llm_provider.complete.side_effect = _echo_response
+    cache = PartialSummaryCache()
+    await SummarizationChain(mock_llm_provider, summary_cache=cache).summarize(board_meeting, method="hierarchical")
+    first_calls = mock_llm_provider.complete.call_count
+
+    mock_llm_provider.complete.reset_mock()
+    chain = SummarizationChain(mock_llm_provider, summary_cache=cache, refresh=True)
+    result = await chain.summarize(board_meeting, method="hierarchical")
+
+    assert result["metadata"]["cached_chunks"] == 0
+    assert mock_llm_provider.complete.call_count == first_calls
+    assert len(cache._summaries) == result["metadata"]["chunk_count"] + 8
+
+
+@pytest.mark.asyncio
+async def test_multi_stage_reduces_overflowing_key_points(mock_llm_provider, small_budget, board_meeting):
+    """Multi-stage merges chunk key points before the abstractive prompt"""
+    mock_llm_provider.complete.side_effect = _echo_response
+    chain = SummarizationChain(mock_llm_provider, summary_cache=PartialSummaryCache())
+
+    await chain.summarize(board_meeting, method="multi_stage")
+    abstractive = [c.args[0] for c in mock_llm_provider.complete.call_args_list if c.args[0].startswith("Based on")]
+
+    assert len(abstractive) == 1
+    assert len(abstractive[0].split("Key Points:")[1].split()) < 100
+
+
+def test_group_partials_pairs_oversized_summaries():
+    """Groups hold at least two partials and a lone trailing partial joins the last group"""
+    groups = SummarizationChain._group_partials(list("abcde"), [30] * 5, budget=50)
+
+    assert groups == [["a", "b"], ["c", "d", "e"]]
+
+
 # ===== Summary Parsing Tests =====
 
 def test_parse_summary_sections_with_paragraphs(summarization_chain):
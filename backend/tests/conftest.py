@@ -23,6 +23,9 @@ os.environ.setdefault("ZERODB_PASSWORD", os.getenv("ZERODB_PASSWORD", "test-pass
 os.environ.setdefault("ZERODB_API_KEY", os.getenv("ZERODB_API_KEY", "test-api-key"))
 os.environ.setdefault("ZERODB_PROJECT_ID", os.getenv("ZERODB_PROJECT_ID", "test-project-id"))
 os.environ.setdefault("SECRET_KEY", os.getenv("SECRET_KEY", "test-secret-key-for-testing-only-minimum-32-chars"))
+# Tests reuse prompts with different mocked responses; keep the shared LLM response cache off
+os.environ.setdefault("LLM_RESPONSE_CACHE_ENABLED", "false")
+os.environ.setdefault("EMBEDDING_BACKEND", "hashing")
 
 # Now safe to import app modules
 import pytest
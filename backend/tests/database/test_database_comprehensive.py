@@ -35,6 +35,7 @@ from app.database import (
     vector_search,
     execute_rpc,
     get_supabase_client,
+    _init_connection,
 )
 
 
@@ -220,7 +221,8 @@ class TestAsyncConnectionPoolManagement:
                     user=mock_settings.zerodb_user,
                     password=mock_settings.zerodb_password,
                     min_size=1,
-                    max_size=mock_settings.db_pool_size
+                    max_size=mock_settings.db_pool_size,
+                    init=_init_connection
                 )
 
     @pytest.mark.asyncio
@@ -847,16 +849,34 @@ class TestExecuteQuery:
                 assert "Query failed" in str(exc_info.value)
 
 
+def _vector_pool(rows=None, error=None):
+    """Mock async pool whose connection returns rows from fetch"""
+    mock_conn = AsyncMock()
+    mock_conn.fetch = AsyncMock(return_value=rows or [], side_effect=error)
+    mock_conn.transaction = MagicMock(return_value=AsyncMock(
+        __aenter__=AsyncMock(),
+        __aexit__=AsyncMock(return_value=False)
+    ))
+    mock_pool = AsyncMock()
+    mock_pool.acquire = MagicMock(return_value=AsyncMock(
+        __aenter__=AsyncMock(return_value=mock_conn),
+        __aexit__=AsyncMock(return_value=False)
+    ))
+    return mock_pool, mock_conn
+
+
 class TestVectorSearch:
     """Test vector_search utility function"""
 
     @pytest.mark.asyncio
     async def test_vector_search_basic(self, clean_database_manager, mock_settings):
         """Test basic vector search"""
-        with patch('app.database.execute_query', new_callable=AsyncMock) as mock_execute:
-            mock_row1 = {"id": 1, "content": "test1", "similarity": 0.9}
-            mock_row2 = {"id": 2, "content": "test2", "similarity": 0.85}
-            mock_execute.return_value = [mock_row1, mock_row2]
+        mock_row1 = {"id": 1, "content": "test1", "similarity": 0.9}
+        mock_row2 = {"id": 2, "content": "test2", "similarity": 0.85}
+        mock_pool, mock_conn = _vector_pool([mock_row1, mock_row2])
+
+        with patch('app.database.db_manager') as mock_manager:
+            mock_manager._get_async_pool = AsyncMock(return_value=mock_pool)
 
             embedding = [0.1, 0.2, 0.3]
             result = await vector_search(
@@ -867,15 +887,23 @@ class TestVectorSearch:
                 limit=10
             )
 
-            assert len(result) == 2
-            assert result[0]["similarity"] == 0.9
-            assert result[1]["similarity"] == 0.85
+        assert len(result) == 2
+        assert result[0]["similarity"] == 0.9
+        assert result[1]["similarity"] == 0.85
+
+        # The vector is a bound parameter, not part of the SQL text
+        query, *args = mock_conn.fetch.call_args[0]
+        assert args[0] == embedding
+        assert "0.1" not in query
+        assert '"documents"' in query
 
     @pytest.mark.asyncio
     async def test_vector_search_with_workspace(self, clean_database_manager, mock_settings):
         """Test vector search with workspace filter"""
-        with patch('app.database.execute_query', new_callable=AsyncMock) as mock_execute:
-            mock_execute.return_value = []
+        mock_pool, mock_conn = _vector_pool()
+
+        with patch('app.database.db_manager') as mock_manager:
+            mock_manager._get_async_pool = AsyncMock(return_value=mock_pool)
 
             embedding = [0.1, 0.2, 0.3]
             await vector_search(
@@ -885,17 +913,20 @@ class TestVectorSearch:
                 workspace_id="workspace-123"
             )
 
-            # Verify query contains workspace filter
-            call_args = mock_execute.call_args[0]
-            query = call_args[0]
-            assert "workspace_id" in query
-            assert "workspace-123" in query
+        # Verify query filters on workspace with a bound parameter
+        query, *args = mock_conn.fetch.call_args[0]
+        assert "workspace_id = $4" in query
+        assert "workspace-123" not in query
+        assert args[3] == "workspace-123"
+        assert query.count("WHERE") == 2
 
     @pytest.mark.asyncio
     async def test_vector_search_empty_results(self, clean_database_manager, mock_settings):
         """Test vector search with no results"""
-        with patch('app.database.execute_query', new_callable=AsyncMock) as mock_execute:
-            mock_execute.return_value = []
+        mock_pool, _ = _vector_pool()
+
+        with patch('app.database.db_manager') as mock_manager:
+            mock_manager._get_async_pool = AsyncMock(return_value=mock_pool)
 
             embedding = [0.1, 0.2, 0.3]
             result = await vector_search(
@@ -904,13 +935,15 @@ class TestVectorSearch:
                 query_embedding=embedding
             )
 
-            assert result == []
+        assert result == []
 
     @pytest.mark.asyncio
     async def test_vector_search_error(self, clean_database_manager, mock_settings):
         """Test vector search error handling"""
-        with patch('app.database.execute_query', new_callable=AsyncMock) as mock_execute:
-            mock_execute.side_effect = Exception("Vector search failed")
+        mock_pool, _ = _vector_pool(error=Exception("Vector search failed"))
+
+        with patch('app.database.db_manager') as mock_manager:
+            mock_manager._get_async_pool = AsyncMock(return_value=mock_pool)
 
             embedding = [0.1, 0.2, 0.3]
             with pytest.raises(Exception) as exc_info:
@@ -920,13 +953,15 @@ class TestVectorSearch:
                     query_embedding=embedding
                 )
 
-            assert "Vector search failed" in str(exc_info.value)
+        assert "Vector search failed" in str(exc_info.value)
 
     @pytest.mark.asyncio
     async def test_vector_search_custom_threshold(self, clean_database_manager, mock_settings):
         """Test vector search with custom similarity threshold"""
-        with patch('app.database.execute_query', new_callable=AsyncMock) as mock_execute:
-            mock_execute.return_value = []
+        mock_pool, mock_conn = _vector_pool()
+
+        with patch('app.database.db_manager') as mock_manager:
+            mock_manager._get_async_pool = AsyncMock(return_value=mock_pool)
 
             embedding = [0.1, 0.2, 0.3]
             await vector_search(
@@ -937,10 +972,41 @@ class TestVectorSearch:
                 limit=5
             )
 
-            call_args = mock_execute.call_args[0]
-            query = call_args[0]
-            assert "0.9" in query
-            assert "LIMIT 5" in query
+        query, *args = mock_conn.fetch.call_args[0]
+        assert args[1] == 5
+        assert args[2] == pytest.approx(0.1)
+        assert "LIMIT $2" in query
+
+    @pytest.mark.asyncio
+    async def test_vector_search_tuning_is_transaction_local(self, clean_database_manager, mock_settings):
+        """Test ef_search and probes are set for the query's transaction only"""
+        mock_pool, mock_conn = _vector_pool()
+
+        with patch('app.database.db_manager') as mock_manager:
+            mock_manager._get_async_pool = AsyncMock(return_value=mock_pool)
+
+            await vector_search(
+                table="meetings.transcript_chunks",
+                embedding_column="embedding",
+                query_embedding=[0.1, 0.2, 0.3],
+                ef_search=80,
+                probes=10
+            )
+
+        mock_conn.transaction.assert_called_once()
+        settings_calls = [c.args for c in mock_conn.execute.call_args_list]
+        assert ("SELECT set_config('hnsw.ef_search', $1, true)", "80") in settings_calls
+        assert ("SELECT set_config('ivfflat.probes', $1, true)", "10") in settings_calls
+
+    @pytest.mark.asyncio
+    async def test_vector_search_rejects_unsafe_identifiers(self, clean_database_manager, mock_settings):
+        """Test table and column names cannot inject SQL"""
+        with pytest.raises(ValueError):
+            await vector_search(
+                table="documents; DROP TABLE documents",
+                embedding_column="embedding",
+                query_embedding=[0.1, 0.2, 0.3]
+            )
 
 
 class TestExecuteRPC:
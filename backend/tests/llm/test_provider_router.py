@@ -0,0 +1,216 @@
+"""
+Tests for the latency-aware LLM provider router
+"""
+import asyncio
+
+import httpx
+import pytest
+
+from app.llm.llm_provider import (
+    LLMConfig,
+    LLMModelTier,
+    LLMProviderType,
+    LLMResponse,
+    select_fallback_providers
+)
+from app.llm.ollama_provider import OllamaProvider
+from app.llm.provider_router import ProviderHealth, ProviderHealthRegistry, RoutingLLMProvider
+
+
+class FakeLocalProvider:
+    """Local provider with injected latency and failures"""
+
+    def __init__(self, name, latency=0.0, fail=False):
+        self.config = LLMConfig(provider=LLMProviderType.OLLAMA, model_name=name)
+        self.latency = latency
+        self.fail = fail
+        self.calls = 0
+        self.cancelled = 0
+
+    async def complete(self, prompt, system_prompt=None, **kwargs):
+        self.calls += 1
+        try:
+            await asyncio.sleep(self.latency)
+        except asyncio.CancelledError:
+            self.cancelled += 1
+            raise
+        if self.fail:
+            raise RuntimeError(f"{self.config.model_name} unavailable")
+        return LLMResponse(content=f"{self.config.model_name}: {prompt}",
+                           provider=LLMProviderType.OLLAMA, model=self.config.model_name)
+
+    async def stream_complete(self, prompt, system_prompt=None, **kwargs):
+        if self.fail:
+            raise RuntimeError(f"{self.config.model_name} unavailable")
+        for word in ("streamed", "by", self.config.model_name):
+            yield word
+
+
+def ollama_with(handler):
+    """OllamaProvider whose HTTP calls go to an in-process handler"""
+    provider = OllamaProvider(LLMConfig(provider=LLMProviderType.OLLAMA, model_name="llama2"))
+    provider.client = httpx.AsyncClient(base_url=provider.base_url, transport=httpx.MockTransport(handler))
+    return provider
+
+
+@pytest.fixture
+def health():
+    return ProviderHealthRegistry(window=20, failure_threshold=3, cooldown_seconds=30)
+
+
+async def test_fails_over_from_unreachable_ollama(health):
+    """A connection error on the primary is retried on the next provider"""
+    def refuse(request):
+        raise httpx.ConnectError("connection refused", request=request)
+
+    backup = FakeLocalProvider("mistral")
+    router = RoutingLLMProvider([ollama_with(refuse), backup], health=health)
+
+    response = await router.complete("hello")
+
+    assert response.content == "mistral: hello"
+    assert response.metadata["routed_to"] == "ollama:mistral"
+    assert router.stats()["ollama:llama2"]["error_rate"] == 1.0
+
+
+async def test_hedged_request_beats_slow_ollama(health):
+    """A hedge to the next provider wins when the primary exceeds the threshold"""
+    async def slow(request):
+        await asyncio.sleep(1.0)
+        return httpx.Response(200, json={"response": "late"})
+
+    fast = FakeLocalProvider("mistral", latency=0.01)
+    router = RoutingLLMProvider([ollama_with(slow), fast], health=health, hedge_after_ms=50)
+
+    response = await asyncio.wait_for(router.complete("hello"), timeout=0.5)
+
+    assert response.content == "mistral: hello"
+    assert response.metadata["hedged"] is True
+    # The losing request was cancelled, not counted as a failure
+    assert health.get("ollama:llama2").consecutive_failures == 0
+
+
+async def test_no_hedge_when_primary_is_fast(health):
+    """The hedge only fires after the latency threshold"""
+    async def ok(request):
+        return httpx.Response(200, json={"response": "from llama"})
+
+    backup = FakeLocalProvider("mistral")
+    router = RoutingLLMProvider([ollama_with(ok), backup], health=health, hedge_after_ms=200)
+
+    response = await router.complete("hello")
+
+    assert response.content == "from llama"
+    assert backup.calls == 0
+    assert health.get("ollama:llama2").p50 is not None
+
+
+async def test_routes_to_lowest_latency_provider(health):
+    """Once latencies are known, the faster provider is tried first"""
+    slow = FakeLocalProvider("llama2", latency=0.05)
+    fast = FakeLocalProvider("mistral", latency=0.0)
+    for provider in (slow, fast):
+        await RoutingLLMProvider([provider], health=health).complete("warmup")
+
+    router = RoutingLLMProvider([slow, fast], health=health)
+    assert router.ranked_providers() == [fast, slow]
+
+    response = await router.complete("hello")
+    assert response.content == "mistral: hello"
+
+
+async def test_circuit_opens_and_half_opens(health, monkeypatch):
+    """Consecutive failures open the circuit; after the cooldown one trial is allowed"""
+    flaky = FakeLocalProvider("llama2", fail=True)
+    backup = FakeLocalProvider("mistral")
+    router = RoutingLLMProvider([flaky, backup], health=health)
+
+    for _ in range(3):
+        with pytest.raises(RuntimeError):
+            await RoutingLLMProvider([flaky], health=health).complete("hello")
+    assert router.stats()["ollama:llama2"]["state"] == "open"
+
+    response = await router.complete("hello")
+    assert response.content == "mistral: hello"
+    assert flaky.calls == 3
+
+    now = [1000.0]
+    monkeypatch.setattr("app.llm.provider_router.time.monotonic", lambda: now[0])
+    health.get("ollama:llama2").opened_at = now[0] - 31
+    assert router.stats()["ollama:llama2"]["state"] == "half_open"
+
+    flaky.fail = False
+    response = await router.complete("hello")
+    assert response.content == "llama2: hello"
+    assert router.stats()["ollama:llama2"]["state"] == "closed"
+
+
+async def test_all_failures_raise_last_error(health):
+    """The last error propagates when every provider fails, then circuits block calls"""
+    router = RoutingLLMProvider(
+        [FakeLocalProvider("llama2", fail=True), FakeLocalProvider("mistral", fail=True)],
+        health=health
+    )
+
+    for _ in range(3):
+        with pytest.raises(RuntimeError, match="mistral unavailable"):
+            await router.complete("hello")
+
+    with pytest.raises(RuntimeError, match="all circuits are open"):
+        await router.complete("hello")
+
+
+async def test_stream_fails_over_before_first_token(health):
+    """A stream that fails to start moves to the next provider"""
+    router = RoutingLLMProvider(
+        [FakeLocalProvider("llama2", fail=True), FakeLocalProvider("mistral")],
+        health=health
+    )
+
+    pieces = [text async for text in router.stream_complete("hello")]
+
+    assert pieces == ["streamed", "by", "mistral"]
+
+
+async def test_closing_stream_early_releases_half_open_trial(health):
+    """A consumer that stops reading mid-stream frees the half-open trial slot"""
+    provider = FakeLocalProvider("llama2")
+    router = RoutingLLMProvider([provider], health=health)
+    provider_health = health.get("ollama:llama2")
+    provider_health.cooldown_seconds = 0
+    for _ in range(3):
+        provider_health.record_failure()
+    assert provider_health.state == "half_open"
+
+    stream = router.stream_complete("hello")
+    assert await stream.__anext__() == "streamed"
+    assert not provider_health.available()
+    await stream.aclose()
+
+    assert provider_health.available()
+
+
+def test_failed_half_open_trial_reopens_circuit():
+    """One failure during the half-open trial re-opens the circuit"""
+    health = ProviderHealth(failure_threshold=3, cooldown_seconds=0)
+    for _ in range(3):
+        health.record_failure()
+
+    assert health.state == "half_open"
+    health.begin()
+    assert not health.available()
+    health.record_failure()
+    assert health.opened_at is not None and health.consecutive_failures == 4
+
+
+def test_select_fallback_providers_excludes_primary():
+    """Fallbacks cover every other keyed hosted provider"""
+    primary = LLMConfig(provider=LLMProviderType.OPENAI, model_name="gpt-3.5-turbo", api_key="o")
+    keys = {"openai": "o", "anthropic": "a", "deepseek": "d"}
+
+    fallbacks = select_fallback_providers(primary, budget_tier=LLMModelTier.STANDARD, api_keys=keys)
+
+    assert [(c.provider, c.model_name) for c in fallbacks] == [
+        (LLMProviderType.ANTHROPIC, "claude-3-haiku-20240307"),
+        (LLMProviderType.DEEPSEEK, "deepseek-chat")
+    ]
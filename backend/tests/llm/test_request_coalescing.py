@@ -0,0 +1,143 @@
+"""
+Tests for single-flight LLM request coalescing
+"""
+import asyncio
+
+import pytest
+
+from app.llm.llm_provider import LLMConfig, LLMProviderType, LLMResponse
+from app.llm.request_coalescing import CoalescingLLMProvider, SingleFlight
+from app.llm.response_cache import CachedLLMProvider, LLMResponseCache
+
+
+class SlowProvider:
+    """Provider that holds each request open until released"""
+
+    def __init__(self):
+        self.calls = 0
+        self.release = asyncio.Event()
+
+    async def complete(self, prompt, system_prompt=None, **kwargs):
+        self.calls += 1
+        await self.release.wait()
+        return LLMResponse(content=f"answer to {prompt}", provider=LLMProviderType.OPENAI,
+                           model="gpt-3.5-turbo", cost_usd=0.02)
+
+
+@pytest.fixture
+def config():
+    return LLMConfig(provider=LLMProviderType.OPENAI, model_name="gpt-3.5-turbo", api_key="k")
+
+
+async def _settle():
+    for _ in range(3):
+        await asyncio.sleep(0)
+
+
+async def test_concurrent_identical_requests_share_one_call(config):
+    """Identical in-flight prompts are sent once and fanned out"""
+    provider = SlowProvider()
+    flights = SingleFlight()
+    coalescing = CoalescingLLMProvider(provider, config, flights)
+
+    callers = [asyncio.create_task(coalescing.complete("same prompt")) for _ in range(5)]
+    await _settle()
+    assert flights.in_flight() == 1
+
+    provider.release.set()
+    responses = await asyncio.gather(*callers)
+
+    assert provider.calls == 1
+    assert {r.content for r in responses} == {"answer to same prompt"}
+    assert sum(1 for r in responses if r.metadata.get("coalesced")) == 4
+    assert sum(r.cost_usd for r in responses) == pytest.approx(0.02)
+    assert flights.stats()["joined"] == 4 and flights.in_flight() == 0
+
+
+async def test_different_requests_are_not_joined(config):
+    """Prompts, system prompts and parameters all separate flights"""
+    provider = SlowProvider()
+    coalescing = CoalescingLLMProvider(provider, config, SingleFlight())
+
+    callers = [
+        asyncio.create_task(coalescing.complete("a")),
+        asyncio.create_task(coalescing.complete("b")),
+        asyncio.create_task(coalescing.complete("a", system_prompt="s")),
+        asyncio.create_task(coalescing.complete("a", temperature=0.0))
+    ]
+    await _settle()
+    provider.release.set()
+    await asyncio.gather(*callers)
+
+    assert provider.calls == 4
+
+
+async def test_finished_requests_are_not_reused(config):
+    """Coalescing only joins requests in flight; it is not a cache"""
+    provider = SlowProvider()
+    provider.release.set()
+    coalescing = CoalescingLLMProvider(provider, config, SingleFlight())
+
+    await coalescing.complete("prompt")
+    await coalescing.complete("prompt")
+
+    assert provider.calls == 2
+
+
+async def test_cancelled_caller_does_not_cancel_others(config):
+    """A waiter can leave freely; if the running caller leaves, a waiter takes over"""
+    provider = SlowProvider()
+    flights = SingleFlight()
+    coalescing = CoalescingLLMProvider(provider, config, flights)
+
+    leader = asyncio.create_task(coalescing.complete("prompt"))
+    waiter = asyncio.create_task(coalescing.complete("prompt"))
+    other = asyncio.create_task(coalescing.complete("prompt"))
+    await _settle()
+
+    waiter.cancel()
+    await _settle()
+    assert provider.calls == 1 and not leader.done()
+
+    leader.cancel()
+    await _settle()
+    assert provider.calls == 2
+
+    provider.release.set()
+    assert (await other).content == "answer to prompt"
+    assert flights.in_flight() == 0
+
+
+async def test_errors_reach_every_joined_caller(config):
+    """A failed shared call raises in each waiting caller"""
+    class FailingProvider:
+        calls = 0
+
+        async def complete(self, prompt, **kwargs):
+            self.calls += 1
+            await asyncio.sleep(0.01)
+            raise RuntimeError("provider down")
+
+    provider = FailingProvider()
+    coalescing = CoalescingLLMProvider(provider, config, SingleFlight())
+
+    results = await asyncio.gather(*[coalescing.complete("p") for _ in range(3)], return_exceptions=True)
+
+    assert provider.calls == 1
+    assert all(isinstance(r, RuntimeError) for r in results)
+
+
+async def test_cache_misses_coalesce_beneath_response_cache(config):
+    """Concurrent cache misses share one call, and later requests hit the cache"""
+    provider = SlowProvider()
+    cache = LLMResponseCache()
+    wrapped = CachedLLMProvider(CoalescingLLMProvider(provider, config, SingleFlight()), config, cache)
+
+    callers = [asyncio.create_task(wrapped.complete("prompt")) for _ in range(3)]
+    await _settle()
+    provider.release.set()
+    await asyncio.gather(*callers)
+    later = await wrapped.complete("prompt")
+
+    assert provider.calls == 1
+    assert later.metadata["cache_hit"] is True
@@ -0,0 +1,138 @@
+"""
+Tests for the LLM response cache
+"""
+import pytest
+from unittest.mock import AsyncMock, patch
+
+from app.core.monitoring import cache_hits_total, cache_misses_total
+from app.llm.llm_provider import LLMConfig, LLMProviderType, LLMResponse
+from app.llm.response_cache import (
+    CachedLLMProvider,
+    LLMResponseCache,
+    cached_provider,
+    response_cache_key
+)
+
+
+@pytest.fixture
+def config():
+    return LLMConfig(provider=LLMProviderType.OPENAI, model_name="gpt-3.5-turbo", temperature=0.2, api_key="k")
+
+
+@pytest.fixture
+def provider():
+    provider = AsyncMock()
+    provider.complete = AsyncMock(side_effect=lambda prompt, **kwargs: LLMResponse(
+        content=f"answer to {prompt}",
+        provider=LLMProviderType.OPENAI,
+        model="gpt-3.5-turbo",
+        total_tokens=42,
+        cost_usd=0.01
+    ))
+    return provider
+
+
+def _response(content="cached"):
+    return LLMResponse(content=content, provider=LLMProviderType.OPENAI, model="gpt-3.5-turbo")
+
+
+def test_cache_key_covers_request_fields():
+    """Any field that changes the output changes the key"""
+    base = dict(provider="openai", model="gpt-3.5-turbo", temperature=0.2, prompt="p", system_prompt="s")
+
+    assert response_cache_key(**base) == response_cache_key(**base)
+    for field, value in (("provider", "anthropic"), ("model", "gpt-4"), ("temperature", 0.3),
+                         ("prompt", "q"), ("system_prompt", None)):
+        assert response_cache_key(**{**base, field: value}) != response_cache_key(**base)
+    assert response_cache_key(**base, max_tokens=10) != response_cache_key(**base, max_tokens=20)
+
+
+def test_cache_ttl_and_lru():
+    """Entries expire after the TTL and the least recently used is evicted"""
+    cache = LLMResponseCache(ttl_seconds=60, max_entries=2)
+    cache.put("a", _response("a"))
+    cache.put("b", _response("b"))
+    cache.get("a")
+    cache.put("c", _response("c"))
+
+    assert cache.get("b") is None
+    assert cache.get("a").content == "a"
+
+    with patch("app.llm.response_cache.time.monotonic", return_value=1e12):
+        assert cache.get("a") is None
+
+    assert cache.stats()["hits"] == 2
+    assert cache.stats()["misses"] == 2
+
+
+def test_sqlite_store_survives_restart(tmp_path):
+    """A response written by one process is served from disk to the next"""
+    path = str(tmp_path / "llm_cache.sqlite")
+    LLMResponseCache(sqlite_path=path).put("key", _response("persisted"))
+
+    restarted = LLMResponseCache(sqlite_path=path)
+    assert restarted.get("key").content == "persisted"
+    assert restarted.stats()["entries"] == 1
+
+    with patch("app.llm.response_cache.time.time", return_value=1e12):
+        assert LLMResponseCache(sqlite_path=path).get("key") is None
+
+
+@pytest.mark.asyncio
+async def test_cached_provider_serves_repeats_for_free(provider, config):
+    """Identical requests hit the provider once; hits cost nothing and feed the metrics"""
+    hits = cache_hits_total.labels(cache_type="llm_response")._value.get()
+    misses = cache_misses_total.labels(cache_type="llm_response")._value.get()
+    cached = CachedLLMProvider(provider, config, LLMResponseCache())
+
+    first = await cached.complete("summarize", system_prompt="be brief")
+    second = await cached.complete("summarize", system_prompt="be brief")
+    other = await cached.complete("summarize", system_prompt="be verbose")
+
+    assert provider.complete.await_count == 2
+    assert second.content == first.content
+    assert second.cost_usd == 0.0
+    assert second.metadata["cache_hit"] is True
+    assert "cache_hit" not in other.metadata
+    assert cache_hits_total.labels(cache_type="llm_response")._value.get() == hits + 1
+    assert cache_misses_total.labels(cache_type="llm_response")._value.get() == misses + 2
+
+
+@pytest.mark.asyncio
+async def test_cached_provider_bypass(provider, config):
+    """use_cache=False always calls the provider and stores nothing"""
+    cache = LLMResponseCache()
+    cached = CachedLLMProvider(provider, config, cache)
+
+    await cached.complete("brainstorm", use_cache=False)
+    await cached.complete("brainstorm", use_cache=False)
+
+    assert provider.complete.await_count == 2
+    assert "use_cache" not in provider.complete.call_args.kwargs
+    assert cache.stats()["entries"] == 0
+
+
+@pytest.mark.asyncio
+async def test_cached_provider_refresh_replaces_entries(provider, config):
+    """A refreshing provider skips cached responses and stores the new ones for later requests"""
+    cache = LLMResponseCache()
+    await CachedLLMProvider(provider, config, cache).complete("summarize")
+
+    refreshed = await CachedLLMProvider(provider, config, cache, refresh=True).complete("summarize")
+    later = await CachedLLMProvider(provider, config, cache).complete("summarize")
+
+    assert provider.complete.await_count == 2
+    assert "cache_hit" not in refreshed.metadata
+    assert later.metadata["cache_hit"] is True
+    assert cache.stats()["entries"] == 1
+
+
+def test_cached_provider_disabled_by_setting(provider, config):
+    """With caching disabled the provider is returned unwrapped"""
+    with patch("app.llm.response_cache.get_settings") as mock_settings:
+        mock_settings.return_value.llm_response_cache_enabled = False
+        assert cached_provider(provider, config) is provider
+
+        mock_settings.return_value.llm_response_cache_enabled = True
+        with patch("app.llm.response_cache.get_llm_response_cache", return_value=LLMResponseCache()):
+            assert isinstance(cached_provider(provider, config), CachedLLMProvider)
@@ -0,0 +1,112 @@
+"""
+Tests for the shared transcript chunker
+"""
+import pytest
+from unittest.mock import MagicMock
+
+from app.llm.transcript_chunker import (
+    ChunkPlanCache,
+    TranscriptChunker,
+    chunk_token_budget,
+    count_words
+)
+
+
+TRANSCRIPT = "\n".join([
+    "Alice: We closed the seed round. Investors want monthly updates.",
+    "Bob: Great news. I will draft the first update by Friday.",
+    "Alice: Hiring is next. We need two engineers this quarter.",
+    "Carol: I can run the interview loop. Let's start next week.",
+])
+
+
+def _chunker(max_tokens, overlap_tokens=0, counter=count_words):
+    return TranscriptChunker(max_tokens, overlap_tokens, count_tokens_batch=counter, cache=ChunkPlanCache())
+
+
+def test_chunks_respect_budget_and_sentence_boundaries():
+    """No chunk exceeds the budget and every chunk ends on a sentence"""
+    chunks = _chunker(12).split(TRANSCRIPT)
+
+    assert len(chunks) > 1
+    assert all(chunk.token_count <= 12 for chunk in chunks)
+    assert all(len(chunk.text.split()) == chunk.token_count for chunk in chunks)
+    assert all(chunk.text.rstrip().endswith((".", "!", "?")) for chunk in chunks)
+    assert [chunk.index for chunk in chunks] == list(range(len(chunks)))
+    assert all(TRANSCRIPT[c.start_char:c.end_char] == c.text for c in chunks)
+
+
+def test_turns_move_whole_to_next_chunk():
+    """A turn that doesn't fit starts a new chunk labelled with its speaker"""
+    chunks = _chunker(22).split(TRANSCRIPT)
+
+    assert [chunk.speaker for chunk in chunks] == ["Alice", "Alice"]
+    assert chunks[0].text.endswith("Friday.")
+    assert chunks[1].text.startswith("Alice: Hiring")
+
+
+def test_overlap_repeats_trailing_sentences():
+    """Each chunk starts with up to overlap_tokens of the previous chunk's sentences"""
+    chunks = _chunker(20, overlap_tokens=8).split(TRANSCRIPT)
+
+    for previous, current in zip(chunks, chunks[1:]):
+        assert current.start_char < previous.end_char
+        assert previous.text.endswith(TRANSCRIPT[current.start_char:previous.end_char])
+
+
+def test_oversized_sentences_split_on_words():
+    """Text without sentence breaks is split into full-budget word windows"""
+    transcript = " ".join(f"w{i}" for i in range(1000))
+
+    chunks = _chunker(300).split(transcript)
+
+    assert [len(chunk.text.split()) for chunk in chunks] == [300, 300, 300, 100]
+    assert " ".join(chunk.text for chunk in chunks) == transcript
+
+
+def test_uses_provider_batch_tokenizer_and_shares_plan():
+    """Token counts come from one batch call and repeated splits reuse the plan"""
+    provider = MagicMock()
+    provider.count_tokens_batch = MagicMock(side_effect=lambda texts: [len(t) // 4 for t in texts])
+    provider.context_window = 4096
+    provider.config.max_tokens = 2000
+    cache = ChunkPlanCache()
+
+    chunker = TranscriptChunker.for_provider(provider, max_tokens=20, overlap_tokens=0)
+    chunker.cache = cache
+    first = chunker.split(TRANSCRIPT)
+    calls = provider.count_tokens_batch.call_count
+    second = chunker.split(TRANSCRIPT)
+
+    assert first == second
+    assert all(chunk.token_count <= 20 for chunk in first)
+    assert provider.count_tokens_batch.call_count == calls
+    assert cache.hits == 1
+
+
+def test_budget_fits_context_window():
+    """The budget leaves room for the completion and prompt template"""
+    provider = MagicMock()
+    provider.context_window = 8192
+    provider.config.max_tokens = 2000
+
+    assert chunk_token_budget(provider) == 3000
+
+    provider.context_window = 4096
+    assert chunk_token_budget(provider) == 4096 - 2000 - 1000
+
+    assert chunk_token_budget(object()) == 3000
+
+
+def test_mock_provider_falls_back_to_words():
+    """Providers without a real tokenizer are chunked by word count"""
+    chunker = TranscriptChunker.for_provider(MagicMock(), max_tokens=100)
+
+    assert chunker.tokenizer_key == "words"
+    assert chunker.split("") == []
+
+
+def test_invalid_budget():
+    """Overlap must be smaller than the budget"""
+    with pytest.raises(ValueError):
+        TranscriptChunker(10, overlap_tokens=10)
@@ -0,0 +1,172 @@
+"""
+Tests for vectorized multi-metric analysis in AnomalyDetectionService
+"""
+import pytest
+from uuid import UUID, uuid4
+from unittest.mock import Mock, patch
+from datetime import datetime, timedelta
+
+from app.services.anomaly_detection_service import AnomalyDetectionService
+from app.models.anomaly import DetectionMethod
+
+
+def _metric(name):
+    return {"id": str(uuid4()), "name": name, "display_name": name.title()}
+
+
+def _points(metric_id, values):
+    base = datetime.utcnow() - timedelta(days=len(values))
+    return [
+        {
+            "id": str(uuid4()),
+            "metric_id": metric_id,
+            "value": v,
+            "timestamp": (base + timedelta(days=i)).isoformat()
+        }
+        for i, v in enumerate(values)
+    ]
+
+
+@pytest.fixture
+def workspace():
+    """Three metrics: one with a spike, one flat, one without enough data"""
+    spiky, flat, sparse = _metric("mrr"), _metric("churn"), _metric("nps")
+    points = (
+        _points(spiky["id"], [50, 52, 48, 51, 49, 53, 47, 50, 52, 48, 51, 49, 500])
+        + _points(flat["id"], [10.0] * 13)
+        + _points(sparse["id"], [1.0])
+    )
+    return [spiky, flat, sparse], points
+
+
+@pytest.fixture
+def service(workspace):
+    """Service whose supabase client serves the workspace fixture"""
+    metrics, points = workspace
+    with patch('app.services.anomaly_detection_service.get_supabase_client', return_value=Mock()):
+        service = AnomalyDetectionService()
+
+    tables = {}
+
+    def table(name):
+        if name not in tables:
+            query = Mock()
+            for method in ("select", "eq", "in_", "gte", "order", "range"):
+                getattr(query, method).return_value = query
+            data = {"kpi_metrics": metrics, "kpi_data_points": points}.get(name)
+            query.execute.return_value = Mock(data=data)
+            query.insert.return_value.execute.side_effect = lambda: Mock(data=None)
+            tables[name] = query
+        return tables[name]
+
+    service.supabase.table.side_effect = table
+    service.tables = tables
+    return service
+
+
+@pytest.mark.asyncio
+async def test_analyze_metrics_batch_single_round_trip_per_table(service, workspace):
+    """Metrics and data points are loaded with one query each"""
+    metrics, _ = workspace
+    analyses = await service.analyze_metrics_batch(uuid4(), auto_save=False)
+
+    assert [str(a.metric_id) for a in analyses] == [m["id"] for m in metrics]
+    assert service.tables["kpi_metrics"].execute.call_count == 1
+    assert service.tables["kpi_data_points"].execute.call_count == 1
+
+
+@pytest.mark.asyncio
+async def test_analyze_metrics_batch_results(service):
+    """Spike is detected, flat and sparse metrics produce no anomalies"""
+    spiky, flat, sparse = await service.analyze_metrics_batch(uuid4(), auto_save=False)
+
+    assert len(spiky.anomalies) == 1
+    assert spiky.anomalies[0].actual_value == 500
+    assert spiky.anomalies[0].detection_method == DetectionMethod.ZSCORE
+    assert spiky.change["direction"] == "up"
+    assert flat.anomalies == []
+    assert sparse.insights == ["Insufficient data for analysis"]
+
+
+@pytest.mark.asyncio
+async def test_analyze_metrics_batch_bulk_inserts(service):
+    """Anomalies and trends are written with one insert per table"""
+    await service.analyze_metrics_batch(uuid4())
+
+    anomaly_insert = service.tables["anomalies"].insert
+    anomaly_insert.assert_called_once()
+    assert isinstance(anomaly_insert.call_args[0][0], list)
+
+    trend_insert = service.tables["trends"].insert
+    trend_insert.assert_called_once()
+    assert len(trend_insert.call_args[0][0]) >= 1
+
+
+@pytest.mark.asyncio
+async def test_analyze_metrics_batch_matches_per_metric(service, workspace):
+    """Batch detection agrees with detect_anomalies for each metric"""
+    metrics, points = workspace
+    analyses = await service.analyze_metrics_batch(uuid4(), auto_save=False)
+
+    for metric, analysis in zip(metrics, analyses):
+        series = [p for p in points if p["metric_id"] == metric["id"]]
+        if len(series) < 2:
+            continue
+        expected = await service.detect_anomalies(
+            metric_id=analysis.metric_id,
+            workspace_id=uuid4(),
+            values=[p["value"] for p in series],
+            timestamps=[datetime.fromisoformat(p["timestamp"]) for p in series],
+            data_point_ids=[UUID(p["id"]) for p in series],
+            auto_save=False
+        )
+        assert [a.data_point_id for a in analysis.anomalies] == [a.data_point_id for a in expected]
+
+
+@pytest.mark.asyncio
+async def test_analyze_metrics_batch_no_metrics(service):
+    """Empty workspace returns no analyses"""
+    service.supabase.table.side_effect = None
+    service.supabase.table.return_value.select.return_value.eq.return_value.eq.return_value.execute.return_value = Mock(data=[])
+
+    assert await service.analyze_metrics_batch(uuid4()) == []
+
+
+@pytest.mark.asyncio
+async def test_analyze_metrics_batch_pages_data_points(service, workspace):
+    """Data points beyond one response page are read before the series is cached"""
+    metrics, points = workspace
+    service.DATA_PAGE_SIZE = 10
+    service.tables.clear()
+    pages = [points[i:i + 10] for i in range(0, len(points), 10)]
+    data_points = service.supabase.table("kpi_data_points")
+    data_points.execute.side_effect = [Mock(data=page) for page in pages]
+
+    spiky, flat, sparse = await service.analyze_metrics_batch(uuid4(), auto_save=False)
+
+    assert data_points.execute.call_count == len(pages)
+    assert [call.args for call in data_points.range.call_args_list] == [(0, 9), (10, 19), (20, 29)]
+    assert spiky.anomalies[0].actual_value == 500
+    assert flat.current_value == 10.0
+
+
+@pytest.mark.asyncio
+async def test_analyze_metrics_batch_isolates_failed_metrics(service, workspace):
+    """A metric whose data cannot be loaded is reported without failing the others"""
+    metrics, _ = workspace
+    service.METRICS_PER_QUERY = 1
+    data_points = service.supabase.table("kpi_data_points")
+    rows = data_points.execute.return_value.data
+    data_points.execute.side_effect = [
+        Mock(data=[p for p in rows if p["metric_id"] == metrics[0]["id"]]),
+        RuntimeError("statement timeout"),
+        Mock(data=[p for p in rows if p["metric_id"] == metrics[2]["id"]]),
+    ]
+    workspace_id, errors = uuid4(), []
+
+    analyses = await service.analyze_metrics_batch(workspace_id, auto_save=False, errors=errors)
+
+    assert [str(a.metric_id) for a in analyses] == [metrics[0]["id"], metrics[2]["id"]]
+    assert len(errors) == 1 and metrics[1]["id"] in errors[0]
+    assert service.series_cache.get(workspace_id, metrics[1]["id"]) is None
+    assert service.series_cache.get(workspace_id, metrics[0]["id"]) is not None
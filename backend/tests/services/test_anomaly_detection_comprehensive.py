@@ -28,11 +28,13 @@ def service():
         from app.algorithms.iqr_detector import IQRDetector
         from app.algorithms.trend_analyzer import TrendAnalyzer
         from app.algorithms.seasonal_decomposition import SeasonalDecomposer
+        from app.services.kpi_series_cache import KPISeriesCache
 
         service.zscore_detector = ZScoreDetector(threshold=3.0)
         service.iqr_detector = IQRDetector(multiplier=1.5)
         service.trend_analyzer = TrendAnalyzer(significance_threshold=0.10)
         service.seasonal_decomposer = SeasonalDecomposer(seasonal_period=7)
+        service.series_cache = KPISeriesCache()
         return service
 
 
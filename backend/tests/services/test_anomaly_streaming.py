@@ -0,0 +1,194 @@
+"""
+Tests for streaming anomaly detection in AnomalyDetectionService and KPI ingestion
+"""
+import pytest
+from uuid import uuid4
+from unittest.mock import Mock, AsyncMock, patch
+from datetime import datetime, timedelta
+
+from app.services.anomaly_detection_service import AnomalyDetectionService
+from app.services.kpi_ingestion_service import KPIIngestionService
+from app.algorithms.online_detector import OnlineAnomalyDetector
+from app.models.anomaly import DetectionMethod, AnomalyType
+from app.models.kpi_metric import KPIDataPointCreate, AggregationPeriod
+
+
+@pytest.fixture
+def service():
+    """Create service with mocked Supabase client"""
+    with patch('app.services.anomaly_detection_service.get_supabase_client', return_value=Mock()):
+        service = AnomalyDetectionService()
+    service.supabase.table.return_value.select.return_value.eq.return_value.eq.return_value.execute.return_value = Mock(data=[])
+    return service
+
+
+def _history(values):
+    base = datetime(2025, 1, 1)
+    return [
+        {"id": str(uuid4()), "value": v, "timestamp": (base + timedelta(days=i)).isoformat()}
+        for i, v in enumerate(values)
+    ]
+
+
+@pytest.mark.asyncio
+async def test_score_data_point_bootstraps_once(service):
+    """History is read only when no state exists, then state is reused"""
+    metric_id, workspace_id = uuid4(), uuid4()
+    baseline = [50, 52, 48, 51, 49, 53, 47, 50, 52, 48, 51, 49]
+
+    with patch.object(service, '_get_metric_data', new_callable=AsyncMock) as mock_get_data, \
+         patch.object(service, '_create_anomaly', new_callable=AsyncMock) as mock_create:
+        mock_get_data.return_value = _history(baseline)
+
+        result = await service.score_data_point(
+            metric_id, workspace_id, uuid4(), 50.0, datetime(2025, 2, 1)
+        )
+        assert result is None
+
+        await service.score_data_point(
+            metric_id, workspace_id, uuid4(), 500.0, datetime(2025, 2, 2)
+        )
+
+    assert mock_get_data.await_count == 1
+    mock_create.assert_awaited_once()
+    kwargs = mock_create.await_args.kwargs
+    assert kwargs["detection_method"] == DetectionMethod.ZSCORE
+    assert kwargs["anomaly_type"] == AnomalyType.SPIKE
+    assert kwargs["actual_value"] == 500.0
+
+
+@pytest.mark.asyncio
+async def test_score_data_point_excludes_new_point_from_bootstrap(service):
+    """The freshly inserted row is not folded into the bootstrap history"""
+    metric_id, workspace_id = uuid4(), uuid4()
+    history = _history([50] * 12)
+    new_point = history[-1]
+
+    with patch.object(service, '_get_metric_data', new_callable=AsyncMock, return_value=history):
+        await service.score_data_point(
+            metric_id, workspace_id, new_point["id"], 50.0, datetime(2025, 2, 1)
+        )
+
+    state = service._online_states[(str(workspace_id), str(metric_id))]
+    assert state.observations == 12
+
+
+@pytest.mark.asyncio
+async def test_score_data_point_resumes_persisted_state(service):
+    """Persisted state is loaded instead of rescanning history"""
+    metric_id, workspace_id = uuid4(), uuid4()
+    detector = OnlineAnomalyDetector()
+    state = detector.fit(detector.new_state(), [100, 101, 99, 100, 102, 98, 100, 101, 99, 100])
+
+    service.supabase.table.return_value.select.return_value.eq.return_value.eq.return_value.execute.return_value = Mock(
+        data=[{"state": state.to_dict()}]
+    )
+
+    with patch.object(service, '_get_metric_data', new_callable=AsyncMock) as mock_get_data, \
+         patch.object(service, '_create_anomaly', new_callable=AsyncMock) as mock_create:
+        await service.score_data_point(metric_id, workspace_id, uuid4(), 10.0, datetime.utcnow())
+
+    mock_get_data.assert_not_awaited()
+    mock_create.assert_awaited_once()
+
+    upsert_payload = service.supabase.table.return_value.upsert.call_args[0][0]
+    assert upsert_payload["metric_id"] == str(metric_id)
+    assert upsert_payload["observations"] == 11
+
+
+@pytest.mark.asyncio
+async def test_score_data_point_without_store():
+    """Scoring works in-process when no database client is configured"""
+    with patch('app.services.anomaly_detection_service.get_supabase_client', return_value=None):
+        service = AnomalyDetectionService()
+
+    with patch.object(service, '_get_metric_data', new_callable=AsyncMock, return_value=[]):
+        result = await service.score_data_point(uuid4(), uuid4(), uuid4(), 1.0, datetime.utcnow())
+
+    assert result is None
+
+
+@pytest.mark.asyncio
+async def test_kpi_ingestion_scores_inserted_point():
+    """KPI ingestion forwards inserted data points to the anomaly service"""
+    anomaly_service = Mock()
+    anomaly_service.score_data_point = AsyncMock(return_value=None)
+    kpi_service = KPIIngestionService(anomaly_service=anomaly_service)
+
+    row_id = uuid4()
+    row = Mock()
+    row._mapping = {"id": str(row_id)}
+    data_point = KPIDataPointCreate(
+        metric_id=uuid4(),
+        workspace_id=uuid4(),
+        value=42.0,
+        timestamp=datetime(2025, 1, 1),
+        period=AggregationPeriod.DAILY
+    )
+
+    await kpi_service._score_data_point(row, data_point)
+
+    kwargs = anomaly_service.score_data_point.await_args.kwargs
+    assert kwargs["data_point_id"] == row_id
+    assert kwargs["value"] == 42.0
+
+
+@pytest.mark.asyncio
+async def test_kpi_ingestion_scoring_errors_do_not_propagate():
+    """Detection failures never fail the sync"""
+    anomaly_service = Mock()
+    anomaly_service.score_data_point = AsyncMock(side_effect=RuntimeError("boom"))
+    kpi_service = KPIIngestionService(anomaly_service=anomaly_service)
+
+    row = Mock()
+    row._mapping = {"id": str(uuid4())}
+    data_point = KPIDataPointCreate(
+        metric_id=uuid4(),
+        workspace_id=uuid4(),
+        value=1.0,
+        timestamp=datetime(2025, 1, 1),
+        period=AggregationPeriod.DAILY
+    )
+
+    await kpi_service._score_data_point(row, data_point)
+
+
+@pytest.mark.asyncio
+async def test_score_data_point_reports_level_shift(service):
+    """A sustained level shift is reported as a trend change"""
+    import numpy as np
+
+    metric_id, workspace_id = uuid4(), uuid4()
+    rng = np.random.default_rng(8)
+    history = _history(rng.normal(100, 10, 30).round(2).tolist())
+
+    results = []
+    with patch.object(service, '_get_metric_data', new_callable=AsyncMock, return_value=history), \
+         patch.object(service, '_create_anomaly', new_callable=AsyncMock) as mock_create:
+        for i, value in enumerate(rng.normal(125, 10, 10)):
+            await service.score_data_point(
+                metric_id, workspace_id, uuid4(), float(value), datetime(2025, 3, 1) + timedelta(days=i)
+            )
+        results = [c.kwargs for c in mock_create.await_args_list]
+
+    trend_changes = [r for r in results if r["detection_method"] == DetectionMethod.CHANGE_POINT]
+    assert trend_changes
+    assert trend_changes[0]["anomaly_type"] == AnomalyType.TREND_CHANGE
+    assert trend_changes[0]["expected_value"] == pytest.approx(100, abs=5)
+
+    state = service._online_states[(str(workspace_id), str(metric_id))]
+    assert state.changes.observations == 40
+
+
+@pytest.mark.asyncio
+async def test_online_states_are_bounded(service):
+    """Least recently scored metrics are evicted from memory"""
+    service.MAX_ONLINE_STATES = 2
+    workspace_id = uuid4()
+    metrics = [uuid4(), uuid4(), uuid4()]
+
+    with patch.object(service, '_get_metric_data', new_callable=AsyncMock, return_value=_history([50] * 12)):
+        for metric_id in (metrics[0], metrics[1], metrics[0], metrics[2]):
+            await service.score_data_point(metric_id, workspace_id, uuid4(), 50.0, datetime(2025, 2, 1))
+
+    assert list(service._online_states) == [(str(workspace_id), str(metrics[0])), (str(workspace_id), str(metrics[2]))]
@@ -1695,5 +1695,40 @@ class TestParameterValidation:
         assert len(result["highlights"]) == 5
 
 
+class TestStreamBriefing:
+    """Tests for streaming briefing generation"""
+
+    @pytest.mark.asyncio
+    async def test_stream_emits_summary_and_sections_before_saving(
+        self, briefing_service, workspace_id, founder_id, founder_data
+    ):
+        """Sections are streamed as soon as content is assembled; unsaved briefings end in an error"""
+        briefing_service._get_founder = AsyncMock(return_value=founder_data)
+        briefing_service._generate_evening_wrap = AsyncMock(return_value={
+            "summary": "Today you had 2 meetings and completed 3 tasks.",
+            "highlights": ["Closed pilot"],
+            "meetings": [],
+            "tasks_completed": [],
+            "tasks_pending": []
+        })
+
+        events = []
+        with pytest.raises(ValueError, match="Failed to generate briefing"):
+            async for event in briefing_service.stream_briefing(
+                workspace_id=workspace_id,
+                founder_id=founder_id,
+                briefing_type=BriefingType.EVENING
+            ):
+                events.append(event)
+
+        sections = briefing_service._create_evening_sections(
+            briefing_service._generate_evening_wrap.return_value
+        )
+        assert events[0]["event"] == "summary"
+        assert events[0]["data"]["key_highlights"] == ["Closed pilot"]
+        assert [event["data"] for event in events[1:]] == sections
+        assert all(event["event"] == "section" for event in events[1:])
+
+
 if __name__ == "__main__":
     pytest.main([__file__, "-v"])
@@ -0,0 +1,162 @@
+"""
+Tests for the batched embedding pipeline
+Covers the hashing backend, batching, content-hash reuse and chunk writes
+"""
+import asyncio
+from unittest.mock import Mock, patch
+from uuid import uuid4
+
+import numpy as np
+import pytest
+
+from app.config import get_settings
+from app.llm.embeddings import HashingEmbeddingBackend, OpenAIEmbeddingBackend, get_embedding_backend
+from app.models.meeting import Meeting, MeetingSource, TranscriptChunk
+from app.services import embedding_pipeline
+from app.services.embedding_pipeline import EmbeddingPipeline, content_hash
+from app.services.meeting_ingestion_service import MeetingIngestionService
+
+
+class RecordingBackend(HashingEmbeddingBackend):
+    """Hashing backend that records each batch it is asked to embed"""
+
+    def __init__(self, dimension=64):
+        super().__init__(dimension)
+        self.batches = []
+
+    async def embed_batch(self, texts):
+        self.batches.append(list(texts))
+        return await super().embed_batch(texts)
+
+
+def _settings(**update):
+    return get_settings().model_copy(update=update)
+
+
+def _cache_client(rows=None):
+    supabase = Mock()
+    supabase.table.return_value.select.return_value.eq.return_value.in_.return_value.execute.return_value = Mock(
+        data=rows or []
+    )
+    return supabase
+
+
+def test_hashing_backend_is_deterministic_and_normalized():
+    """Equal text gives equal unit vectors and related text scores higher than unrelated text"""
+    backend = HashingEmbeddingBackend(dimension=256)
+    a = np.array(backend.embed_text("Ship the pricing page by Friday"))
+    b = np.array(backend.embed_text("ship the pricing page by friday"))
+    related = np.array(backend.embed_text("Pricing page ships Friday"))
+    unrelated = np.array(backend.embed_text("Quarterly hiring plan for engineering"))
+
+    assert np.allclose(a, b)
+    assert np.isclose(np.linalg.norm(a), 1.0)
+    assert a @ related > a @ unrelated
+    assert not any(backend.embed_text("  "))
+
+
+@pytest.mark.asyncio
+async def test_concurrent_callers_share_batches():
+    """Texts from concurrent callers are embedded together, each distinct text once"""
+    backend = RecordingBackend()
+    pipeline = EmbeddingPipeline(backend, batch_size=4, batch_wait_seconds=0.01)
+
+    first, second = await asyncio.gather(
+        pipeline.embed(["alpha", "beta", "alpha"]),
+        pipeline.embed(["gamma", "beta", "delta", "epsilon"])
+    )
+
+    assert first[0] == first[2] == backend.embed_text("alpha")
+    assert second[1] == first[1]
+    assert sorted(len(batch) for batch in backend.batches) == [1, 4]
+    assert sorted(text for batch in backend.batches for text in batch) == ["alpha", "beta", "delta", "epsilon", "gamma"]
+
+
+@pytest.mark.asyncio
+async def test_cached_vectors_are_not_recomputed():
+    """Text found in the embedding cache skips the backend and new vectors are stored"""
+    backend = RecordingBackend()
+    cached = [0.5] * backend.dimension
+    supabase = _cache_client([{"content_hash": content_hash("Known  chunk"), "embedding": str(cached)}])
+    pipeline = EmbeddingPipeline(backend, supabase, batch_wait_seconds=0)
+
+    vectors = await pipeline.embed(["Known chunk", "new chunk"])
+
+    assert vectors[0] == cached
+    assert backend.batches == [["new chunk"]]
+    stored = supabase.table.return_value.upsert.call_args.args[0]
+    assert [row["content_hash"] for row in stored] == [content_hash("new chunk")]
+    assert pipeline.stats["cached"] == 1
+
+
+@pytest.mark.asyncio
+async def test_backend_failure_reaches_every_caller():
+    """A failed batch raises for its callers and does not poison later requests"""
+    backend = RecordingBackend()
+    pipeline = EmbeddingPipeline(backend, batch_wait_seconds=0)
+
+    original = backend.embed_batch
+    backend.embed_batch = Mock(side_effect=RuntimeError("rate limited"))
+    with pytest.raises(RuntimeError, match="rate limited"):
+        await pipeline.embed(["alpha"])
+
+    backend.embed_batch = original
+    assert await pipeline.embed(["alpha"]) == [backend.embed_text("alpha")]
+
+
+@pytest.mark.asyncio
+async def test_meeting_chunks_are_bulk_written():
+    """A meeting's chunks are written in one upsert keyed by meeting and chunk index"""
+    supabase = _cache_client()
+    pipeline = EmbeddingPipeline(RecordingBackend(), supabase, batch_wait_seconds=0)
+    meeting = Meeting(
+        workspace_id=uuid4(),
+        founder_id=uuid4(),
+        title="Weekly sync",
+        source=MeetingSource.FIREFLIES,
+        transcript_chunks=[
+            TranscriptChunk(text="We agreed to ship Friday", speaker_name="Alice", start_time=1.5, chunk_index=0),
+            TranscriptChunk(text=" ", chunk_index=1),
+            TranscriptChunk(text="Bob owns the launch email", speaker_name="Bob", chunk_index=2)
+        ]
+    )
+
+    assert await pipeline.embed_meeting_chunks(meeting) == 2
+
+    supabase.table.assert_any_call("transcript_chunks")
+    upserts = supabase.table.return_value.upsert.call_args_list
+    rows, kwargs = upserts[-1].args[0], upserts[-1].kwargs
+    assert kwargs == {"on_conflict": "meeting_id,chunk_index"}
+    assert [row["chunk_index"] for row in rows] == [0, 2]
+    assert rows[0]["meeting_id"] == str(meeting.id)
+    assert rows[0]["start_sec"] == 1
+    assert len(rows[0]["embedding"]) == 64
+
+
+@pytest.mark.parametrize("backend, key, expected", [
+    ("auto", None, None),
+    ("auto", "sk-settings", OpenAIEmbeddingBackend),
+    ("openai", "sk-settings", OpenAIEmbeddingBackend),
+    ("hashing", "sk-settings", HashingEmbeddingBackend),
+])
+def test_backend_uses_settings_key_and_hashes_only_when_configured(backend, key, expected):
+    """The OpenAI key is read from settings, and auto without one disables embeddings"""
+    with patch("app.llm.embeddings.get_settings", return_value=_settings(embedding_backend=backend, openai_api_key=key)):
+        result = get_embedding_backend()
+
+    assert result is None if expected is None else isinstance(result, expected)
+
+
+def test_openai_backend_without_key_fails_on_first_ingestion_not_at_construction(monkeypatch):
+    """A misconfigured backend leaves ingestion running without embeddings"""
+    monkeypatch.setattr(embedding_pipeline, "_embedding_pipeline", None)
+    settings = _settings(embedding_backend="openai", openai_api_key=None)
+
+    with patch("app.llm.embeddings.get_settings", return_value=settings), \
+            patch("app.services.embedding_pipeline.get_settings", return_value=settings):
+        service = MeetingIngestionService(Mock())
+        assert service.embedding_pipeline is None
+        assert service.embedding_pipeline is None
+
+    # Constructed without a client, there is nothing to embed into
+    assert MeetingIngestionService().embedding_pipeline is None
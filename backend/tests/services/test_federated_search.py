@@ -0,0 +1,153 @@
+"""
+Tests for federated semantic search
+Covers the deduplicating top-k, per-table score standardization, streaming and slow or failing tables
+"""
+import asyncio
+import statistics
+from unittest.mock import AsyncMock, patch
+
+import pytest
+
+from app.services.federated_search import FederatedSearchService, TopK
+
+
+def _row(row_id, document_id, distance):
+    return {"id": row_id, "document_id": document_id, "record": {"id": row_id}, "distance": distance}
+
+
+def _fetch(responses, delays=None):
+    """fetch_vector_query stand-in answering each source (by its FROM clause) after a delay"""
+    async def fetch(query, *args):
+        for table, rows in responses.items():
+            if table in query:
+                await asyncio.sleep((delays or {}).get(table, 0))
+                if isinstance(rows, Exception):
+                    raise rows
+                return rows
+        return []
+    return AsyncMock(side_effect=fetch)
+
+
+def test_top_k_keeps_best_item_per_key():
+    """Only the k best keys survive and a better item replaces its key's earlier one"""
+    top = TopK(2)
+    assert top.offer("a", 0.5, "a1")
+    assert top.offer("b", 0.4, "b1")
+    assert not top.offer("c", 0.3, "c1")
+    assert top.offer("b", 0.9, "b2")
+    assert not top.offer("b", 0.1, "b3")
+    assert top.offer("c", 0.6, "c2")
+
+    assert top.items() == ["b2", "c2"]
+    assert "a" not in top
+
+
+def _z(similarity, similarities):
+    return (similarity - statistics.fmean(similarities)) / statistics.pstdev(similarities)
+
+
+@pytest.mark.asyncio
+async def test_chunks_collapse_and_scores_are_standardized_per_table():
+    """Chunks of one meeting become one result and each table is scored against its own background"""
+    fetch = _fetch({
+        "meetings.transcript_chunks": [
+            _row("c1", "meeting-1", 0.10), _row("c2", "meeting-1", 0.12), _row("c3", "meeting-2", 0.15)
+        ],
+        "core.contacts": [_row("p1", "p1", 0.40), _row("p2", "p2", 0.70), _row("p3", "p3", 0.90)],
+    })
+    service = FederatedSearchService(candidates=3, timeout_seconds=1)
+
+    with patch("app.services.federated_search.fetch_vector_query", fetch):
+        results = await service.search(sources=["transcript_chunks", "contacts"], limit=3, query_embedding=[0.1])
+
+    # Tightly bunched chunks score below a contact that stands out from the other contacts
+    assert [(result["source"], result["document_id"]) for result in results] == [
+        ("contacts", "p1"), ("transcript_chunks", "meeting-1"), ("contacts", "p2")
+    ]
+    assert results[0]["score"] == pytest.approx(_z(0.6, [0.6, 0.3, 0.1]))
+    assert results[1]["matches"] == 2 and results[1]["id"] == "c1"
+    assert results[1]["similarity"] == pytest.approx(0.9)
+    assert results[1]["score"] == pytest.approx(_z(0.9, [0.9, 0.88, 0.85]))
+    assert fetch.await_count == 2
+
+
+@pytest.mark.asyncio
+async def test_full_and_short_tables_are_scored_alike():
+    """A table that ran out of rows is standardized like one that filled its candidates"""
+    fetch = _fetch({
+        "core.contacts": [_row(f"p{i}", f"p{i}", d) for i, d in enumerate((0.2, 0.4, 0.6, 0.8))],
+        "comms.communications": [_row(f"e{i}", f"e{i}", d) for i, d in enumerate((0.2, 0.4, 0.6))],
+        "media.media_chunks": [_row("v1", "video-1", 0.3)],
+    })
+    service = FederatedSearchService(candidates=4, timeout_seconds=1)
+
+    with patch("app.services.federated_search.fetch_vector_query", fetch):
+        results = await service.search(
+            sources=["contacts", "communications", "media_chunks"], limit=10, query_embedding=[0.1]
+        )
+    scores = {result["document_id"]: result["score"] for result in results}
+
+    assert scores["p0"] == pytest.approx(_z(0.8, [0.8, 0.6, 0.4, 0.2]))
+    assert scores["e0"] == pytest.approx(_z(0.8, [0.8, 0.6, 0.4]))
+    # A single row has no background of its own and is scored against the fixed one
+    assert scores["video-1"] == pytest.approx(
+        (0.7 - FederatedSearchService.FALLBACK_MEAN) / FederatedSearchService.FALLBACK_STDEV
+    )
+
+
+@pytest.mark.asyncio
+async def test_table_with_only_weak_matches_contributes_nothing():
+    """A weak table's standout row would outrank real matches; the similarity floor keeps it out"""
+    fetch = _fetch({
+        "core.contacts": [_row("p1", "p1", 0.30), _row("p2", "p2", 0.45), _row("p3", "p3", 0.50)],
+        "comms.communications": [_row("e1", "e1", 0.75), _row("e2", "e2", 0.88), _row("e3", "e3", 0.90)],
+    })
+
+    with patch("app.services.federated_search.fetch_vector_query", fetch):
+        unfloored = await FederatedSearchService(candidates=3, timeout_seconds=1, min_similarity=0).search(
+            sources=["contacts", "communications"], limit=3, query_embedding=[0.1]
+        )
+        floored = await FederatedSearchService(candidates=3, timeout_seconds=1, min_similarity=0.3).search(
+            sources=["contacts", "communications"], limit=3, query_embedding=[0.1]
+        )
+
+    assert "e1" in [result["document_id"] for result in unfloored]
+    assert [result["document_id"] for result in floored] == ["p1", "p2", "p3"]
+    # Weak rows still set their table's background
+    assert floored[0]["score"] == pytest.approx(_z(0.7, [0.7, 0.55, 0.5]))
+
+
+@pytest.mark.asyncio
+async def test_stream_yields_fast_tables_first_and_skips_failed_or_slow_ones():
+    """Results arrive in table completion order; errors and timeouts drop only their table"""
+    fetch = _fetch(
+        {
+            "comms.communications": [_row("e1", "thread-1", 0.2)],
+            "core.contacts": [_row("p1", "p1", 0.1)],
+            "media.media_chunks": RuntimeError("statement timeout"),
+            "meetings.transcript_chunks": [_row("c1", "meeting-1", 0.0)],
+        },
+        delays={"core.contacts": 0.02, "meetings.transcript_chunks": 1}
+    )
+    service = FederatedSearchService(candidates=5, timeout_seconds=0.2)
+
+    with patch("app.services.federated_search.fetch_vector_query", fetch):
+        streamed = [result async for result in service.stream(limit=5, query_embedding=[0.1])]
+
+    assert [result["document_id"] for result in streamed] == ["thread-1", "p1"]
+    assert streamed[0]["similarity"] == pytest.approx(0.8)
+
+
+@pytest.mark.asyncio
+async def test_query_text_is_embedded_once():
+    """Without a precomputed vector the query is embedded once for every table"""
+    backend = AsyncMock()
+    backend.embed_batch.return_value = [[0.3, 0.4]]
+    fetch = _fetch({})
+
+    with patch("app.services.federated_search.fetch_vector_query", fetch):
+        assert await FederatedSearchService(backend).search("series A") == []
+
+    backend.embed_batch.assert_awaited_once_with(["series A"])
+    assert fetch.await_count == 4
+    assert all(call.args[1] == [0.3, 0.4] for call in fetch.await_args_list)
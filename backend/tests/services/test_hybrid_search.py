@@ -0,0 +1,107 @@
+"""
+Tests for hybrid full-text and vector retrieval
+"""
+import json
+from datetime import datetime
+from unittest.mock import AsyncMock, patch
+from uuid import uuid4
+
+import pytest
+
+from app.algorithms.rank_fusion import reciprocal_rank_fusion
+from app.services.hybrid_search import HybridSearchService
+from app.services.search_sources import get_search_source
+
+
+def _row(row_id, distance=None):
+    row = {"id": row_id, "document_id": f"doc-{row_id}", "record": json.dumps({"id": row_id, "text": f"chunk {row_id}"})}
+    if distance is not None:
+        row["distance"] = distance
+    return row
+
+
+def test_reciprocal_rank_fusion_rewards_agreement():
+    """Items ranked by both retrievers beat items ranked highly by one"""
+    fused = reciprocal_rank_fusion([["a", "b", "c"], ["c", "d", "a"]], k=60)
+    order = [item for item, _ in fused]
+
+    assert order[:2] == ["a", "c"]
+    assert set(order) == {"a", "b", "c", "d"}
+    assert fused[0][1] == pytest.approx(1 / 61 + 1 / 63)
+
+    with pytest.raises(ValueError):
+        reciprocal_rank_fusion([["a"]], weights=[1.0, 2.0])
+
+
+def test_filters_are_bound_parameters():
+    """Workspace, founder and date filters become numbered parameters"""
+    source = get_search_source("transcript_chunks")
+    workspace_id, since = uuid4(), datetime(2025, 1, 1)
+
+    clause, params = source.filters(3, workspace_id=workspace_id, since=since)
+
+    assert clause == "AND m.workspace_id = $3 AND m.start_time >= $4"
+    assert params == [workspace_id, since]
+    with pytest.raises(ValueError, match="Unknown search source"):
+        get_search_source("kpis")
+
+
+@pytest.mark.asyncio
+async def test_search_runs_both_retrievers_and_fuses():
+    """Both queries share filters and results carry the rank from each retriever"""
+    workspace_id = uuid4()
+    lexical = [_row(1), _row(2)]
+    semantic = [_row(3, distance=0.1), _row(1, distance=0.2)]
+
+    async def fetch(query, *args, **kwargs):
+        return lexical if "websearch_to_tsquery" in query else semantic
+
+    service = HybridSearchService(candidates=20, rrf_k=60)
+    with patch("app.services.hybrid_search.fetch_vector_query", AsyncMock(side_effect=fetch)) as mock_fetch:
+        results = await service.search(
+            "communications",
+            "Series A term sheet",
+            workspace_id=workspace_id,
+            limit=2,
+            query_embedding=[0.1, 0.2]
+        )
+
+    assert [result["id"] for result in results] == [1, 3]
+    assert results[0]["lexical_rank"] == 1 and results[0]["semantic_rank"] == 2
+    assert results[0]["similarity"] == pytest.approx(0.8)
+    assert results[1]["lexical_rank"] is None
+    assert results[0]["source"] == "communications"
+
+    calls = {("lexical" if "websearch_to_tsquery" in c.args[0] else "semantic"): c.args for c in mock_fetch.call_args_list}
+    assert calls["lexical"][1:] == ("Series A term sheet", 20, workspace_id)
+    assert calls["semantic"][1:] == ([0.1, 0.2], 20, workspace_id)
+    assert "t.workspace_id = $3" in calls["semantic"][0]
+
+
+@pytest.mark.asyncio
+async def test_search_embeds_query_when_no_embedding_given():
+    """Query text is embedded with the configured backend"""
+    backend = AsyncMock()
+    backend.embed_batch = AsyncMock(return_value=[[0.5, 0.5]])
+    service = HybridSearchService(embedding_backend=backend)
+
+    with patch("app.services.hybrid_search.fetch_vector_query", AsyncMock(return_value=[])) as mock_fetch:
+        assert await service.search("contacts", "Acme Ventures") == []
+
+    backend.embed_batch.assert_awaited_once_with(["Acme Ventures"])
+    assert any(c.args[1] == [0.5, 0.5] for c in mock_fetch.call_args_list)
+
+
+@pytest.mark.asyncio
+async def test_search_uses_keywords_only_without_embedding_backend():
+    """With embeddings disabled only the lexical retriever runs"""
+    service = HybridSearchService()
+
+    with patch("app.services.hybrid_search.get_embedding_backend", return_value=None), \
+            patch("app.services.hybrid_search.fetch_vector_query", AsyncMock(return_value=[_row(1)])) as mock_fetch:
+        results = await service.search("contacts", "Acme Ventures")
+
+    assert [result["id"] for result in results] == [1]
+    assert results[0]["semantic_rank"] is None
+    assert mock_fetch.await_count == 1
+    assert "websearch_to_tsquery" in mock_fetch.call_args.args[0]
@@ -0,0 +1,328 @@
+"""
+Tests for bulk, single-transaction KPI ingestion
+"""
+import pytest
+from uuid import uuid4
+from unittest.mock import Mock, AsyncMock, patch
+from datetime import datetime
+
+from app.connectors.base_connector import ConnectorStatus
+from app.services.kpi_ingestion_service import KPIIngestionService
+from app.services.kpi_series_cache import KPISeriesCache
+from app.models.kpi_metric import AggregationPeriod
+
+
+UNITS = {
+    "mrr": "currency",
+    "ltv": "currency",
+    "cac": "currency",
+    "ltv_cac_ratio": "ratio",
+    "churn_rate": "percentage",
+}
+
+
+@pytest.fixture
+def service():
+    return KPIIngestionService(series_cache=KPISeriesCache())
+
+
+@pytest.fixture
+def workspace_id():
+    return uuid4()
+
+
+@pytest.fixture
+def metric_map():
+    return {name: {"id": str(uuid4()), "name": name, "unit": unit} for name, unit in UNITS.items()}
+
+
+def _returning_db(history=None):
+    """Session mock whose INSERT ... RETURNING echoes the bound rows and history reads return `history`"""
+    db = Mock()
+
+    def execute(query, params=None):
+        result = Mock()
+        if "DISTINCT ON" in str(query):
+            result.fetchall.return_value = [Mock(_mapping=row) for row in history or []]
+            return result
+        rows = []
+        i = 0
+        while f"metric_id_{i}" in (params or {}):
+            rows.append(Mock(_mapping={
+                "id": str(uuid4()),
+                "metric_id": params[f"metric_id_{i}"],
+                "workspace_id": params[f"workspace_id_{i}"],
+                "value": params[f"value_{i}"],
+                "timestamp": params[f"timestamp_{i}"],
+                "period": params[f"period_{i}"],
+                "metadata": {},
+                "created_at": datetime.utcnow()
+            }))
+            i += 1
+        result.fetchall.return_value = rows
+        return result
+
+    db.execute.side_effect = execute
+    return db
+
+
+@pytest.mark.asyncio
+async def test_ingest_writes_batch_and_status_in_one_statement(service, workspace_id, metric_map):
+    """Values, derived metrics and sync status go out in one execute and one commit"""
+    db = _returning_db()
+    kpis = {
+        "mrr": 50000,
+        "ltv": {"value": "1200", "timestamp": "2025-01-01T00:00:00Z"},
+        "cac": 300,
+    }
+
+    status = await service.ingest_kpis(workspace_id, kpis, metric_map, db=db)
+
+    assert status.status == "success"
+    assert status.metrics_synced == 3
+    assert db.execute.call_count == 1
+    db.commit.assert_called_once()
+
+    query, params = db.execute.call_args[0]
+    assert "kpis.kpi_sync_status" in str(query)
+    assert params["metrics_synced"] == 3
+
+    # LTV:CAC derived from the batch, not re-read from the table
+    ratio_ids = [k for k, v in params.items() if v == metric_map["ltv_cac_ratio"]["id"]]
+    assert len(ratio_ids) == 1
+    assert params[ratio_ids[0].replace("metric_id", "value")] == pytest.approx(4.0)
+
+
+@pytest.mark.asyncio
+async def test_ingest_collects_validation_errors(service, workspace_id, metric_map):
+    """Invalid values are reported without blocking the rest of the batch"""
+    db = _returning_db()
+
+    status = await service.ingest_kpis(
+        workspace_id, {"mrr": 100, "churn_rate": 150, "unknown": 1}, metric_map, db=db
+    )
+
+    assert status.status == "partial"
+    assert status.metrics_synced == 1
+    assert len(status.errors) == 1
+    assert "churn_rate" in status.errors[0]
+
+
+@pytest.mark.asyncio
+async def test_ingest_empty_batch_only_upserts_status(service, workspace_id, metric_map):
+    """A sync with nothing to write still records its status"""
+    db = _returning_db()
+
+    status = await service.ingest_kpis(workspace_id, {}, metric_map, db=db)
+
+    assert status.metrics_synced == 0
+    query = str(db.execute.call_args[0][0])
+    assert "kpi_sync_status" in query
+    assert "kpi_data_points" not in query
+
+
+@pytest.mark.asyncio
+async def test_ingest_rolls_back_on_write_failure(service, workspace_id, metric_map):
+    """A failed write leaves nothing behind and reports an error"""
+    db = Mock()
+    db.execute.side_effect = Exception("connection reset")
+
+    status = await service.ingest_kpis(workspace_id, {"mrr": 100}, metric_map, db=db)
+
+    assert status.status == "error"
+    assert status.metrics_synced == 0
+    db.rollback.assert_called_once()
+    db.commit.assert_not_called()
+
+
+@pytest.mark.asyncio
+async def test_ingest_uses_cached_input_for_derived_metric(service, workspace_id, metric_map):
+    """A derived input missing from the batch comes from the series cache"""
+    service.series_cache.put(
+        workspace_id,
+        metric_map["cac"]["id"],
+        [{"id": str(uuid4()), "value": 200.0, "timestamp": "2025-01-01T00:00:00"}],
+        period=AggregationPeriod.DAILY
+    )
+    db = _returning_db()
+
+    await service.ingest_kpis(workspace_id, {"ltv": 1000}, metric_map, db=db)
+
+    params = db.execute.call_args[0][1]
+    assert params["value_1"] == pytest.approx(5.0)
+
+
+@pytest.mark.asyncio
+async def test_ingest_scores_and_caches_after_commit(workspace_id, metric_map):
+    """Inserted base rows are scored and appended to cached series"""
+    anomaly_service = Mock()
+    anomaly_service.score_data_point = AsyncMock(return_value=None)
+    cache = KPISeriesCache()
+    service = KPIIngestionService(anomaly_service=anomaly_service, series_cache=cache)
+    cache.put(workspace_id, metric_map["mrr"]["id"], [], period=AggregationPeriod.DAILY)
+
+    await service.ingest_kpis(workspace_id, {"mrr": 10, "ltv": 100, "cac": 10}, metric_map, db=_returning_db())
+
+    # The derived ratio is written but not scored
+    assert anomaly_service.score_data_point.await_count == 3
+    assert cache.get(workspace_id, metric_map["mrr"]["id"], AggregationPeriod.DAILY).latest["value"] == 10.0
+
+
+def test_write_batch_chunks_large_batches(service, workspace_id, metric_map):
+    """Batches larger than the chunk size are split across statements"""
+    from app.models.kpi_metric import KPIDataPointCreate
+
+    points = [
+        KPIDataPointCreate(
+            metric_id=uuid4(), workspace_id=workspace_id, value=float(i),
+            timestamp=datetime(2025, 1, 1), period=AggregationPeriod.DAILY
+        )
+        for i in range(5)
+    ]
+    db = _returning_db()
+
+    with patch.object(KPIIngestionService, "BULK_INSERT_CHUNK_SIZE", 2):
+        rows = service._write_batch(points, db)
+
+    assert db.execute.call_count == 3
+    assert len(rows) == 5
+
+
+@pytest.mark.asyncio
+async def test_ingest_derives_growth_from_cached_history(workspace_id):
+    """Windowed formulas read their history from the series cache"""
+    cache = KPISeriesCache()
+    service = KPIIngestionService(series_cache=cache)
+    metric_map = {
+        name: {"id": str(uuid4()), "name": name, "unit": unit}
+        for name, unit in (("mrr", "currency"), ("mrr_growth_rate", "percentage"), ("ltv_cac_ratio", "ratio"))
+    }
+    sync_start = datetime(2025, 3, 1)
+    cache.put(
+        workspace_id,
+        metric_map["mrr"]["id"],
+        [{"id": str(uuid4()), "value": 1000.0, "timestamp": "2025-01-15T00:00:00"}],
+        period=AggregationPeriod.DAILY
+    )
+    db = _returning_db()
+
+    await service.ingest_kpis(workspace_id, {"mrr": 1200}, metric_map, sync_start=sync_start, db=db)
+
+    params = db.execute.call_args[0][1]
+    assert params["metric_id_1"] == metric_map["mrr_growth_rate"]["id"]
+    assert params["value_1"] == pytest.approx(20.0)
+    # LTV:CAC has no changed inputs and is not recomputed
+    assert "metric_id_2" not in params
+
+
+@pytest.mark.asyncio
+async def test_ingest_reads_uncached_history_in_one_query(workspace_id):
+    """Without cached history, windowed and partial-batch formulas read their inputs in one bounded query"""
+    service = KPIIngestionService(series_cache=KPISeriesCache())
+    metric_map = {
+        name: {"id": str(uuid4()), "name": name, "unit": unit}
+        for name, unit in (
+            ("mrr", "currency"), ("mrr_growth_rate", "percentage"),
+            ("ltv", "currency"), ("cac", "currency"), ("ltv_cac_ratio", "ratio")
+        )
+    }
+    sync_start = datetime(2025, 3, 1)
+    db = _returning_db(history=[
+        {"metric_id": metric_map["cac"]["id"], "timestamp": datetime(2024, 12, 1), "value": 50.0},
+        {"metric_id": metric_map["mrr"]["id"], "timestamp": datetime(2025, 1, 15), "value": 1000.0},
+    ])
+
+    await service.ingest_kpis(workspace_id, {"mrr": 1200, "ltv": 500}, metric_map, sync_start=sync_start, db=db)
+
+    history_calls = [c for c in db.execute.call_args_list if "DISTINCT ON" in str(c[0][0])]
+    assert len(history_calls) == 1
+    history_params = history_calls[0][0][1]
+    assert sorted(history_params["metric_ids"]) == sorted(metric_map[name]["id"] for name in ("mrr", "ltv", "cac"))
+    assert history_params["start"] == datetime(2025, 1, 29)
+
+    params = db.execute.call_args[0][1]
+    derived = {
+        params[key]: params[key.replace("metric_id", "value")]
+        for key in params if key.startswith("metric_id_")
+    }
+    assert derived[metric_map["mrr_growth_rate"]["id"]] == pytest.approx(20.0)
+    # CAC from before the window carries forward into the ratio
+    assert derived[metric_map["ltv_cac_ratio"]["id"]] == pytest.approx(10.0)
+
+
+@pytest.mark.asyncio
+async def test_backfill_derived_metrics_replaces_history(service, workspace_id, metric_map):
+    """Backfill evaluates every day in one pass and replaces derived rows"""
+    for name, values in (("ltv", [100.0, 120.0, 150.0]), ("cac", [20.0, 0.0, 30.0])):
+        service.series_cache.put(
+            workspace_id,
+            metric_map[name]["id"],
+            [
+                {"id": str(uuid4()), "value": v, "timestamp": f"2025-01-0{i + 1}T00:00:00"}
+                for i, v in enumerate(values)
+            ],
+            period=AggregationPeriod.DAILY
+        )
+    db = _returning_db()
+
+    written = await service.backfill_derived_metrics(workspace_id, metric_map, db=db)
+
+    assert written == 2
+    delete_query, delete_params = db.execute.call_args_list[0][0]
+    assert "DELETE FROM kpis.kpi_data_points" in str(delete_query)
+    assert delete_params["metric_ids"] == [metric_map["ltv_cac_ratio"]["id"]]
+
+    insert_params = db.execute.call_args_list[1][0][1]
+    assert [insert_params["value_0"], insert_params["value_1"]] == [pytest.approx(5.0), pytest.approx(5.0)]
+    assert insert_params["timestamp_1"] == datetime(2025, 1, 3)
+    db.commit.assert_called_once()
+
+
+@pytest.mark.asyncio
+async def test_sync_provisions_and_writes_derived_metrics(service, workspace_id):
+    """A full Granola sync creates the derived KPI definitions and writes their values"""
+    metrics = {}
+    db = _returning_db()
+    echo = db.execute.side_effect
+
+    def execute(query, params=None):
+        sql = str(query)
+        result = Mock()
+        if "INSERT INTO kpis.kpi_metrics" in sql:
+            metrics[params["name"]] = {"id": str(uuid4()), **params}
+            result.fetchone.return_value = None
+        elif "FROM kpis.kpi_metrics" in sql and "name = :name" in sql:
+            result.fetchone.return_value = None
+        elif "FROM kpis.kpi_metrics" in sql:
+            result.fetchall.return_value = [Mock(_mapping=metric) for metric in metrics.values()]
+        elif "DISTINCT ON" in sql:
+            # Burn has been flat since before the 90-day window
+            result.fetchall.return_value = [Mock(_mapping={
+                "metric_id": metrics["burn_rate"]["id"], "timestamp": datetime(2024, 10, 1), "value": 30000.0
+            })]
+        else:
+            return echo(query, params)
+        return result
+
+    db.execute.side_effect = execute
+    connector = AsyncMock()
+    connector.__aenter__.return_value = connector
+    connector.test_connection.return_value = Mock(status=ConnectorStatus.SUCCESS)
+    connector.get_kpis.return_value = Mock(
+        status=ConnectorStatus.SUCCESS,
+        data={"burn_rate": 30000, "ltv": 1200, "cac": 300}
+    )
+
+    with patch("app.services.kpi_ingestion_service.GranolaConnector", return_value=connector):
+        status = await service.sync_kpis_from_granola(workspace_id, {"api_key": "test"}, db=db)
+
+    assert status.status == "success"
+    assert set(KPIIngestionService.DERIVED_KPIS) <= set(metrics)
+
+    params = db.execute.call_args[0][1]
+    written = {
+        params[key]: params[key.replace("metric_id", "value")]
+        for key in params if key.startswith("metric_id_")
+    }
+    assert written[metrics["ltv_cac_ratio"]["id"]] == pytest.approx(4.0)
+    assert written[metrics["trailing_burn_90d"]["id"]] == pytest.approx(90000.0)
@@ -6,7 +6,6 @@ Tests cover:
 - Standard KPI initialization and existing metric handling
 - Granola sync with multiple scenarios (success, errors, filtering)
 - Data point ingestion and aggregation
-- Derived metrics calculation
 - Current snapshot retrieval
 - Metric history with date filtering
 - Value validation and normalization
@@ -772,132 +771,6 @@ async def test_get_current_snapshot_error_handling(service, workspace_id, mock_d
     assert "error" in result.metadata
 
 
-# ==================== DERIVED METRICS TESTS ====================
-
-@pytest.mark.asyncio
-async def test_calculate_derived_metrics_ltv_cac_ratio(service, workspace_id, mock_db):
-    """Test LTV:CAC ratio calculation"""
-    # Setup
-    ltv_metric = mock_metric_row(name="ltv")
-    cac_metric = mock_metric_row(name="cac")
-    ratio_metric = mock_metric_row(name="ltv_cac_ratio")
-
-    # Create proper metric map with id field
-    metric_map = {
-        "ltv": {"id": "ltv_id", **ltv_metric._mapping},
-        "cac": {"id": "cac_id", **cac_metric._mapping},
-        "ltv_cac_ratio": {"id": "ratio_id", **ratio_metric._mapping}
-    }
-
-    ltv_row = Mock()
-    ltv_row.__getitem__ = Mock(side_effect=lambda key: 100.0 if key == "value" else None)
-    ltv_row.value = 100.0
-
-    cac_row = Mock()
-    cac_row.__getitem__ = Mock(side_effect=lambda key: 20.0 if key == "value" else None)
-    cac_row.value = 20.0
-
-    call_count = [0]
-    def db_execute_side_effect(query, params=None):
-        call_count[0] += 1
-        mock_result = Mock()
-
-        if call_count[0] == 1:
-            mock_result.fetchone.return_value = ltv_row
-        elif call_count[0] == 2:
-            mock_result.fetchone.return_value = cac_row
-        else:
-            mock_result.fetchone.return_value = None
-
-        return mock_result
-
-    mock_db.execute.side_effect = db_execute_side_effect
-
-    # Act
-    await service._calculate_derived_metrics(workspace_id, metric_map, db=mock_db)
-
-    # Assert
-    assert mock_db.execute.call_count >= 3
-    assert mock_db.commit.called
-
-
-@pytest.mark.asyncio
-async def test_calculate_derived_metrics_missing_ltv(service, workspace_id, mock_db):
-    """Test derived metrics when LTV metric is missing"""
-    # Setup
-    cac_metric = mock_metric_row(name="cac")
-    metric_map = {
-        "cac": {**cac_metric._mapping, "id": "cac_id"},
-        # LTV not present
-    }
-
-    # Act
-    await service._calculate_derived_metrics(workspace_id, metric_map, db=mock_db)
-
-    # Assert
-    assert mock_db.commit.call_count == 0
-
-
-@pytest.mark.asyncio
-async def test_calculate_derived_metrics_zero_cac(service, workspace_id, mock_db):
-    """Test derived metrics when CAC is zero"""
-    # Setup
-    metric_map = {
-        "ltv": {"id": "ltv_id"},
-        "cac": {"id": "cac_id"},
-        "ltv_cac_ratio": {"id": "ratio_id"}
-    }
-
-    ltv_row = Mock(value=100.0)
-    cac_row = Mock(value=0.0)
-
-    call_count = [0]
-    def db_execute_side_effect(query, params=None):
-        call_count[0] += 1
-        mock_result = Mock()
-
-        if call_count[0] == 1:
-            mock_result.fetchone.return_value = ltv_row
-        else:
-            mock_result.fetchone.return_value = cac_row
-
-        return mock_result
-
-    mock_db.execute.side_effect = db_execute_side_effect
-
-    # Act
-    await service._calculate_derived_metrics(workspace_id, metric_map, db=mock_db)
-
-    # Assert - should not calculate ratio when CAC is 0
-    assert mock_db.commit.call_count == 0
-
-
-@pytest.mark.asyncio
-async def test_calculate_derived_metrics_no_database(service, workspace_id):
-    """Test derived metrics calculation without database"""
-    # Setup
-    metric_map = {"ltv": {}, "cac": {}}
-
-    # Act - should return without error
-    await service._calculate_derived_metrics(workspace_id, metric_map, db=None)
-
-
-@pytest.mark.asyncio
-async def test_calculate_derived_metrics_error_handling(service, workspace_id, mock_db):
-    """Test error handling during derived metrics calculation"""
-    # Setup
-    metric_map = {
-        "ltv": {"id": "ltv_id"},
-        "cac": {"id": "cac_id"},
-        "ltv_cac_ratio": {"id": "ratio_id"}
-    }
-
-    mock_db.execute.side_effect = Exception("Database error")
-
-    # Act - should handle error gracefully
-    await service._calculate_derived_metrics(workspace_id, metric_map, db=mock_db)
-
-
 # ==================== VALUE VALIDATION TESTS ====================
 
 @pytest.mark.asyncio
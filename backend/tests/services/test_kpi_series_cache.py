@@ -0,0 +1,235 @@
+"""
+Tests for the shared KPI series cache
+"""
+import fnmatch
+import pytest
+import numpy as np
+from uuid import uuid4
+from unittest.mock import Mock, patch
+from datetime import datetime, timedelta
+
+from app.services.kpi_series_cache import KPISeries, KPISeriesCache, summarize_values
+from app.services.kpi_ingestion_service import KPIIngestionService
+from app.services.anomaly_detection_service import AnomalyDetectionService
+from app.models.kpi_metric import AggregationPeriod
+
+
+def _points(values, start=datetime(2025, 1, 1)):
+    return [
+        {"id": str(uuid4()), "value": v, "timestamp": (start + timedelta(days=i)).isoformat()}
+        for i, v in enumerate(values)
+    ]
+
+
+def _row(metric_id, workspace_id, value, timestamp):
+    return Mock(_mapping={
+        "id": uuid4(),
+        "metric_id": metric_id,
+        "workspace_id": workspace_id,
+        "value": value,
+        "timestamp": timestamp,
+        "period": "daily",
+        "metadata": {},
+        "created_at": timestamp
+    })
+
+
+class FakeSharedStore:
+    """Dict-backed stand-in for the Redis commands the cache uses"""
+
+    def __init__(self):
+        self.data = {}
+
+    def get(self, key):
+        return self.data.get(key)
+
+    def setex(self, key, ttl, value):
+        self.data[key] = value
+
+    def scan_iter(self, match):
+        return [key for key in self.data if fnmatch.fnmatch(key, match)]
+
+    def delete(self, *keys):
+        for key in keys:
+            self.data.pop(key, None)
+
+
+def test_series_statistics_match_numpy():
+    """Precomputed statistics equal a direct numpy computation"""
+    values = [10.0, 12.0, 9.0, 15.0, 11.0]
+    series = KPISeries(_points(values))
+
+    assert series.statistics["mean"] == pytest.approx(np.mean(values))
+    assert series.statistics["median"] == pytest.approx(np.median(values))
+    assert series.statistics["std"] == pytest.approx(np.std(values))
+    assert series.statistics["count"] == 5
+    assert summarize_values([]) == {}
+
+
+def test_series_window_and_summary():
+    """Windows honour bounds and limit; partial windows are summarized on demand"""
+    series = KPISeries(_points([1, 2, 3, 4, 5]))
+
+    assert [p["value"] for p in series.window(limit=2, descending=True)] == [5.0, 4.0]
+    assert [p["value"] for p in series.window(datetime(2025, 1, 2), datetime(2025, 1, 4))] == [2.0, 3.0, 4.0]
+    assert series.summary() is series.statistics
+    assert series.summary(limit=2)["mean"] == pytest.approx(4.5)
+
+
+def test_series_rollups():
+    """Daily, weekly and monthly buckets aggregate the points they contain"""
+    # 2025-01-27 is a Monday; 14 days span two weeks and two months
+    series = KPISeries(_points(list(range(14)), start=datetime(2025, 1, 27)))
+
+    weekly = series.rollup("weekly")
+    assert [b["period_start"] for b in weekly] == ["2025-01-27", "2025-02-03"]
+    assert weekly[0]["count"] == 7
+    assert weekly[0]["mean"] == pytest.approx(3.0)
+    assert weekly[1]["last"] == 13.0
+
+    monthly = series.rollup("monthly")
+    assert [b["count"] for b in monthly] == [5, 9]
+    assert len(series.rollup("daily")) == 14
+
+    with pytest.raises(ValueError):
+        series.rollup("yearly")
+
+
+def test_series_append_updates_rollups_and_statistics():
+    """Appending keeps order, skips duplicates and refreshes aggregates"""
+    points = _points([10, 20, 30])
+    series = KPISeries(points)
+
+    late = {"id": str(uuid4()), "value": 40, "timestamp": "2025-01-02T12:00:00Z"}
+    assert series.append(late) is True
+    assert series.append(late) is False
+    assert series.append(points[0]) is False
+
+    assert series.values == [10.0, 20.0, 40.0, 30.0]
+    assert series.statistics["mean"] == pytest.approx(25.0)
+    assert series.rollup("monthly")[0]["sum"] == pytest.approx(100.0)
+    assert series.latest["value"] == 30.0
+
+
+def test_series_covers():
+    """Partial series only answer queries starting at or after their bound"""
+    assert KPISeries([]).covers(None)
+    partial = KPISeries([], since=datetime(2025, 1, 10))
+    assert partial.covers(datetime(2025, 1, 15))
+    assert not partial.covers(datetime(2025, 1, 1))
+    assert not partial.covers(None)
+
+
+def test_cache_ttl_and_lru():
+    """Entries expire after the TTL and the least recently used is evicted"""
+    cache = KPISeriesCache(ttl_seconds=60, max_entries=2)
+    workspace_id = uuid4()
+
+    cache.put(workspace_id, "a", _points([1]))
+    cache.put(workspace_id, "b", _points([2]))
+    cache.get(workspace_id, "a")
+    cache.put(workspace_id, "c", _points([3]))
+
+    assert cache.get(workspace_id, "b") is None
+    assert cache.get(workspace_id, "a") is not None
+
+    with patch("app.services.kpi_series_cache.time.monotonic", return_value=1e12):
+        assert cache.get(workspace_id, "a") is None
+
+    assert cache.stats()["misses"] == 2
+
+
+def test_cache_append_targets_period_and_all_periods():
+    """Ingested points reach both the period series and the unfiltered series"""
+    cache = KPISeriesCache()
+    workspace_id, metric_id = uuid4(), uuid4()
+    cache.put(workspace_id, metric_id, _points([1, 2]), period=AggregationPeriod.DAILY)
+    cache.put(workspace_id, metric_id, _points([1, 2]))
+    cache.put(workspace_id, metric_id, _points([5]), period=AggregationPeriod.MONTHLY)
+
+    point = {"id": str(uuid4()), "value": 3, "timestamp": "2025-01-03T00:00:00"}
+    cache.append(workspace_id, metric_id, point, period=AggregationPeriod.DAILY)
+
+    assert len(cache.get(workspace_id, metric_id, AggregationPeriod.DAILY)) == 3
+    assert len(cache.get(workspace_id, metric_id)) == 3
+    assert len(cache.get(workspace_id, metric_id, AggregationPeriod.MONTHLY)) == 1
+
+    cache.invalidate(workspace_id, metric_id)
+    assert cache.get(workspace_id, metric_id) is None
+
+
+def test_cache_shared_store_round_trip():
+    """A series loaded by one worker is reused by another through the shared store"""
+    shared = FakeSharedStore()
+    first, second = KPISeriesCache(), KPISeriesCache()
+    first.shared = second.shared = shared
+    workspace_id, metric_id = uuid4(), uuid4()
+
+    first.put(workspace_id, metric_id, _points([1, 2, 3]))
+    series = second.get(workspace_id, metric_id)
+    assert series.values == [1.0, 2.0, 3.0]
+
+    first.append(workspace_id, metric_id, {"id": str(uuid4()), "value": 4, "timestamp": "2025-01-04"})
+    third = KPISeriesCache()
+    third.shared = shared
+    assert third.get(workspace_id, metric_id).values == [1.0, 2.0, 3.0, 4.0]
+
+    first.invalidate(workspace_id)
+    assert shared.data == {}
+
+
+@pytest.mark.asyncio
+async def test_metric_history_served_from_cache():
+    """Repeated history reads touch the database once"""
+    cache = KPISeriesCache()
+    service = KPIIngestionService(series_cache=cache)
+    metric_id, workspace_id = uuid4(), uuid4()
+    base = datetime(2025, 1, 1)
+    rows = [_row(metric_id, workspace_id, float(i), base + timedelta(days=i)) for i in range(5)]
+
+    db = Mock()
+    db.execute.return_value.fetchall.return_value = list(reversed(rows))
+
+    first = await service.get_metric_history(metric_id, workspace_id, limit=3, db=db)
+    second = await service.get_metric_history(
+        metric_id, workspace_id, start_date=base + timedelta(days=1), end_date=base + timedelta(days=2), db=db
+    )
+
+    assert [dp.value for dp in first] == [4.0, 3.0, 2.0]
+    assert [dp.value for dp in second] == [2.0, 1.0]
+    assert db.execute.call_count == 1
+
+
+@pytest.mark.asyncio
+async def test_ingestion_appends_to_cached_series():
+    """Inserted rows are appended to the cached series instead of invalidating it"""
+    cache = KPISeriesCache()
+    service = KPIIngestionService(series_cache=cache)
+    metric_id, workspace_id = uuid4(), uuid4()
+    cache.put(workspace_id, metric_id, _points([1, 2]), period=AggregationPeriod.DAILY)
+
+    data_point = Mock(metric_id=metric_id, workspace_id=workspace_id, period=AggregationPeriod.DAILY)
+    service._cache_data_point(_row(metric_id, workspace_id, 7.0, datetime(2025, 1, 3)), data_point)
+
+    series = cache.get(workspace_id, metric_id, AggregationPeriod.DAILY)
+    assert series.latest["value"] == 7.0
+    assert series.statistics["max"] == 7.0
+
+
+@pytest.mark.asyncio
+async def test_anomaly_metric_data_uses_cache():
+    """Metric data within the cached range is not re-queried"""
+    with patch('app.services.anomaly_detection_service.get_supabase_client', return_value=Mock()):
+        service = AnomalyDetectionService()
+    service.series_cache = KPISeriesCache()
+    metric_id, workspace_id = uuid4(), uuid4()
+
+    query = service.supabase.table.return_value.select.return_value.eq.return_value.eq.return_value.gte.return_value.order.return_value
+    query.execute.return_value = Mock(data=_points([1, 2, 3, 4]))
+
+    loaded = await service._get_metric_data(metric_id, workspace_id, datetime(2025, 1, 1))
+    narrowed = await service._get_metric_data(metric_id, workspace_id, datetime(2025, 1, 3))
+
+    assert len(loaded) == 4
+    assert [dp["value"] for dp in narrowed] == [3.0, 4.0]
+    assert query.execute.call_count == 1
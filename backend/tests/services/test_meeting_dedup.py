@@ -0,0 +1,130 @@
+"""
+Tests for indexed meeting deduplication
+Covers the Bloom filter, per-workspace hash filters and insert-or-return-existing
+"""
+from datetime import datetime, timezone
+from unittest.mock import AsyncMock, Mock, patch
+from uuid import uuid4
+
+import pytest
+
+from app.algorithms.bloom_filter import BloomFilter
+from app.models.meeting import Meeting, MeetingSource, MeetingStatus
+from app.services.meeting_hash_filter import MeetingHashFilter
+from app.services.meeting_ingestion_service import MeetingIngestionService
+
+
+class UniqueViolation(Exception):
+    code = "23505"
+
+
+@pytest.fixture
+def service():
+    service = MeetingIngestionService(supabase_client=Mock())
+    service.hash_filter = MeetingHashFilter(min_capacity=64)
+    return service
+
+
+def _meeting(workspace_id, duplicate_hash="hash-1"):
+    return Meeting(
+        workspace_id=workspace_id,
+        founder_id=uuid4(),
+        title="Weekly sync",
+        source=MeetingSource.ZOOM,
+        status=MeetingStatus.INGESTING,
+        duplicate_hash=duplicate_hash
+    )
+
+
+def test_bloom_filter_has_no_false_negatives():
+    """Added items are always found and unseen items rarely are"""
+    bloom = BloomFilter.from_items((f"seen-{i}" for i in range(2000)), capacity=2000, error_rate=0.01)
+
+    assert all(f"seen-{i}" in bloom for i in range(2000))
+    false_positives = sum(f"unseen-{i}" in bloom for i in range(10000))
+    assert false_positives < 300
+    assert not bloom.saturated
+
+
+def test_hash_filter_loads_workspace_once():
+    """Each workspace's hashes are read once and additions are visible without reloading"""
+    workspace_id = uuid4()
+    load = Mock(return_value=["hash-1", "hash-2"])
+    hash_filter = MeetingHashFilter()
+
+    assert hash_filter.might_contain(workspace_id, "hash-1", load)
+    assert not hash_filter.might_contain(workspace_id, "hash-3", load)
+    hash_filter.add(workspace_id, "hash-3")
+    assert hash_filter.might_contain(workspace_id, "hash-3", load)
+
+    load.assert_called_once_with(workspace_id, None)
+    assert hash_filter.skipped_lookups == 1
+
+
+def test_hash_filter_refreshes_incrementally_when_stale_or_unreadable():
+    """Expired filters read only newer hashes, and unreadable hashes mean every lookup goes to the database"""
+    workspace_id = uuid4()
+    hash_filter = MeetingHashFilter(ttl_seconds=0)
+    load = Mock(side_effect=[["hash-1"], ["hash-2"], None, ["hash-1"]])
+
+    assert not hash_filter.might_contain(workspace_id, "hash-2", load)
+    assert hash_filter.might_contain(workspace_id, "hash-2", load)
+    assert hash_filter.might_contain(workspace_id, "anything", load)
+    assert hash_filter.might_contain(workspace_id, "hash-1", load)
+
+    since = [c.args[1] for c in load.call_args_list]
+    assert since[0] is None
+    assert since[1] is not None and since[1] < datetime.now(timezone.utc)
+    # A dropped filter is rebuilt from the full hash set
+    assert since[3] is None
+
+
+def test_saturated_hash_filter_is_rebuilt():
+    """A filter past its capacity is rebuilt in full rather than extended"""
+    workspace_id = uuid4()
+    hash_filter = MeetingHashFilter(min_capacity=2)
+    load = Mock(return_value=["hash-1"])
+
+    hash_filter.might_contain(workspace_id, "hash-1", load)
+    for i in range(3):
+        hash_filter.add(workspace_id, f"new-{i}")
+    hash_filter.might_contain(workspace_id, "hash-1", load)
+
+    assert [c.args[1] for c in load.call_args_list] == [None, None]
+
+
+@pytest.mark.asyncio
+async def test_find_by_hash_skips_query_for_new_meeting(service):
+    """A hash the workspace filter has never seen is not looked up"""
+    workspace_id = uuid4()
+    with patch.object(service, "_load_workspace_hashes", return_value=["hash-1"]), \
+            patch.object(service, "_fetch_by_hash", AsyncMock(return_value=None)) as fetch:
+        assert await service._find_by_hash(workspace_id, "hash-2") is None
+        await service._find_by_hash(workspace_id, "hash-1")
+
+    fetch.assert_awaited_once_with(workspace_id, "hash-1")
+
+
+@pytest.mark.asyncio
+async def test_concurrent_insert_returns_existing(service):
+    """A unique violation on insert returns the meeting stored by the other ingestion"""
+    workspace_id = uuid4()
+    existing = _meeting(workspace_id)
+    service.supabase.table.return_value.insert.return_value.execute.side_effect = UniqueViolation(
+        "duplicate key value violates unique constraint"
+    )
+
+    with patch.object(service, "_fetch_by_hash", AsyncMock(return_value=existing)):
+        meeting, is_duplicate = await service._insert_or_get_existing(_meeting(workspace_id))
+
+    assert meeting is existing
+    assert is_duplicate is True
+
+
+@pytest.mark.asyncio
+async def test_other_insert_errors_propagate(service):
+    """Errors other than a unique violation are raised"""
+    service.supabase.table.return_value.insert.return_value.execute.side_effect = Exception("Insert failed")
+
+    with pytest.raises(Exception, match="Insert failed"):
+        await service._insert_or_get_existing(_meeting(uuid4()))
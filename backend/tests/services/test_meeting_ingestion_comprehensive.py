@@ -537,6 +537,7 @@ async def test_find_by_hash_with_supabase(service_with_db, workspace_id, founder
         "title": "Test Meeting",
         "source": "zoom",
         "status": "completed",
+        "duplicate_hash": "test_hash",
         "metadata": {
             "platform_data": {
                 "duplicate_hash": "test_hash"
@@ -544,9 +545,8 @@ async def test_find_by_hash_with_supabase(service_with_db, workspace_id, founder
         }
     }
 
-    service_with_db.supabase.table.return_value.select.return_value.eq.return_value.execute.return_value = Mock(
-        data=[meeting_data]
-    )
+    query = service_with_db.supabase.table.return_value.select.return_value.eq.return_value
+    query.eq.return_value.execute.return_value = Mock(data=[meeting_data])
 
     result = await service_with_db._find_by_hash(workspace_id, "test_hash")
     assert result is not None
@@ -9,6 +9,7 @@ from unittest.mock import Mock, AsyncMock, patch, MagicMock
 from datetime import datetime, timedelta
 
 from app.services.recommendation_service import RecommendationService
+from app.services.kpi_series_cache import KPISeriesCache
 from app.models.recommendation import (
     GenerateRecommendationRequest,
     RecommendationType,
@@ -30,6 +31,7 @@ def service():
         service.supabase = mock_supabase
         service.logger = Mock()
         service.recommendation_chain = Mock()
+        service.series_cache = KPISeriesCache()
         return service
 
 
@@ -504,6 +506,31 @@ async def test_get_kpi_data_error_handling(service, workspace_id):
     assert result == {}
 
 
+@pytest.mark.asyncio
+async def test_get_kpi_data_reads_latest_row_on_cache_miss(service, workspace_id):
+    """Uncached metrics read only their newest row and nothing partial is cached"""
+    cached_id, uncached_id = str(uuid4()), str(uuid4())
+    service.series_cache.put(workspace_id, cached_id, [{"value": 5, "timestamp": "2025-01-10T00:00:00Z"}])
+
+    metrics = Mock()
+    metrics.select.return_value.eq.return_value.eq.return_value.execute.return_value = Mock(data=[
+        {"id": cached_id, "name": "MRR"}, {"id": uncached_id, "name": "CAC"}
+    ])
+    points = Mock()
+    latest_query = points.select.return_value.eq.return_value.order.return_value.limit.return_value
+    latest_query.execute.return_value = Mock(data=[{"value": 250, "timestamp": "2025-01-15T00:00:00Z"}])
+    service.supabase.table.side_effect = lambda name: metrics if name == "kpi_metrics" else points
+
+    result = await service._get_kpi_data(workspace_id)
+
+    assert result["MRR"]["value"] == 5
+    assert result["CAC"] == {"value": 250, "timestamp": "2025-01-15T00:00:00Z"}
+    points.select.return_value.eq.assert_called_once_with("metric_id", uncached_id)
+    points.select.return_value.eq.return_value.order.assert_called_once_with("timestamp", desc=True)
+    latest_query.execute.assert_called_once()
+    assert service.series_cache.get(workspace_id, uncached_id) is None
+
+
 @pytest.mark.asyncio
 async def test_get_anomalies_success(service, workspace_id):
     """Test successful anomaly fetching"""
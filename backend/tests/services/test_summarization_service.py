@@ -202,3 +202,196 @@ async def test_cost_tracking(mock_llm_provider, sample_transcript):
 
 if __name__ == "__main__":
     pytest.main([__file__, "-v"])
+
+
+class _SlowProvider:
+    """Provider whose completions take `delay` seconds and track concurrency"""
+
+    def __init__(self, delay=0.05, slow_prompts=()):
+        self.delay = delay
+        self.slow_prompts = slow_prompts
+        self.in_flight = 0
+        self.max_in_flight = 0
+
+    async def complete(self, prompt, **kwargs):
+        import asyncio
+        self.in_flight += 1
+        self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        try:
+            slow = any(marker in prompt for marker in self.slow_prompts)
+            await asyncio.sleep(10 if slow else self.delay)
+        finally:
+            self.in_flight -= 1
+        return LLMResponse(
+            content="- point one\n- point two",
+            provider=LLMProviderType.OPENAI,
+            model="gpt-3.5-turbo",
+            total_tokens=10,
+            cost_usd=0.0001
+        )
+
+
+def _openai_config():
+    return LLMConfig(provider=LLMProviderType.OPENAI, model_name="gpt-3.5-turbo", api_key="test_key")
+
+
+@pytest.mark.asyncio
+async def test_parallel_stages_overlap_under_provider_cap(sample_transcript):
+    """Independent stages run concurrently but never exceed the provider cap"""
+    from app.core.rate_limit import ConcurrencyLimiterRegistry
+
+    provider = _SlowProvider()
+    with patch('app.services.summarization_service.get_provider', return_value=provider), \
+         patch('app.llm.llm_provider._concurrency_limits', ConcurrencyLimiterRegistry(2)):
+        service = SummarizationService(parallel_stages=True)
+        result = await service.summarize_meeting(
+            meeting_id=uuid4(),
+            workspace_id=uuid4(),
+            founder_id=uuid4(),
+            transcript=sample_transcript,
+            llm_config=_openai_config()
+        )
+
+    assert provider.max_in_flight == 2
+    assert result["metadata"]["stage_execution"] == "parallel"
+    assert result["metadata"]["timed_out_stages"] == []
+
+
+@pytest.mark.asyncio
+async def test_sequential_mode_runs_one_call_at_a_time(sample_transcript):
+    """Sequential mode keeps the original one-stage-at-a-time behaviour"""
+    provider = _SlowProvider(delay=0)
+    with patch('app.services.summarization_service.get_provider', return_value=provider):
+        service = SummarizationService()
+        result = await service.summarize_meeting(
+            meeting_id=uuid4(),
+            workspace_id=uuid4(),
+            founder_id=uuid4(),
+            transcript=sample_transcript,
+            llm_config=_openai_config(),
+            parallel=False
+        )
+
+    assert provider.max_in_flight == 1
+    assert result["metadata"]["stage_execution"] == "sequential"
+
+
+@pytest.mark.asyncio
+async def test_deadline_drops_unfinished_optional_stages(sample_transcript):
+    """Optional stages still running at the deadline are cancelled and reported"""
+    provider = _SlowProvider(delay=0, slow_prompts=("sentiment",))
+    with patch('app.services.summarization_service.get_provider', return_value=provider):
+        service = SummarizationService(parallel_stages=True, stage_deadline_seconds=0.5)
+        result = await service.summarize_meeting(
+            meeting_id=uuid4(),
+            workspace_id=uuid4(),
+            founder_id=uuid4(),
+            transcript=sample_transcript,
+            llm_config=_openai_config()
+        )
+
+    assert result["metadata"]["timed_out_stages"] == ["sentiment"]
+    assert result["sentiment"] == {}
+    assert result["summary"].status == "completed"
+
+
+class _StreamingProvider(_SlowProvider):
+    """Provider that also streams refinement output in small pieces"""
+
+    config = _openai_config()
+
+    async def stream_complete(self, prompt, **kwargs):
+        for piece in ("Executive ", "summary.\n\n", "Details."):
+            yield piece
+
+    def count_tokens(self, text):
+        return len(text) // 4
+
+    def calculate_cost(self, prompt_tokens, completion_tokens):
+        return 0.0
+
+
+@pytest.mark.asyncio
+async def test_stream_summarize_meeting_emits_stages_and_tokens(sample_transcript):
+    """Stage results and refinement tokens stream before the closing complete event"""
+    provider = _StreamingProvider(delay=0)
+    with patch('app.services.summarization_service.get_provider', return_value=provider):
+        service = SummarizationService(parallel_stages=True)
+        events = [
+            event async for event in service.stream_summarize_meeting(
+                meeting_id=uuid4(),
+                workspace_id=uuid4(),
+                founder_id=uuid4(),
+                transcript=sample_transcript,
+                llm_config=_openai_config()
+            )
+        ]
+
+    names = [event["event"] for event in events]
+    tokens = [event["data"]["text"] for event in events if event["event"] == "token"]
+    summary = next(event["data"] for event in events if event["event"] == "summary")
+
+    assert "".join(tokens) == "Executive summary.\n\nDetails."
+    assert names.index("token") < names.index("summary")
+    assert {"topics", "action_items", "decisions", "sentiment"} <= set(names)
+    assert summary["executive_summary"] == "Executive summary."
+    assert names[-1] == "complete"
+    assert events[-1]["data"]["stage_execution"] == "parallel"
+
+
+@pytest.mark.asyncio
+async def test_summarize_meeting_uses_requested_method(sample_transcript):
+    """The requested method runs in the summary stage and is recorded on the summary"""
+    from app.models.meeting_summary import SummarizationMethod
+
+    with patch('app.services.summarization_service.get_provider', return_value=_SlowProvider(delay=0)):
+        service = SummarizationService()
+        result = await service.summarize_meeting(
+            meeting_id=uuid4(),
+            workspace_id=uuid4(),
+            founder_id=uuid4(),
+            transcript=sample_transcript,
+            llm_config=_openai_config(),
+            method=SummarizationMethod.HIERARCHICAL
+        )
+
+    assert result["summary"].summarization_method == SummarizationMethod.HIERARCHICAL
+
+
+@pytest.mark.asyncio
+async def test_force_regenerate_bypasses_cached_responses(sample_transcript):
+    """A forced regeneration calls the provider again instead of replaying cached output"""
+    from app.config import get_settings
+    from app.llm.response_cache import LLMResponseCache
+
+    settings = get_settings().model_copy(update={"llm_response_cache_enabled": True})
+    provider = _SlowProvider(delay=0)
+    calls = []
+    provider.complete = AsyncMock(side_effect=lambda prompt, **kwargs: calls.append(prompt) or LLMResponse(
+        content="- point one", provider=LLMProviderType.OPENAI, model="gpt-3.5-turbo", total_tokens=10
+    ))
+
+    with patch('app.services.summarization_service.get_provider', return_value=provider), \
+         patch('app.llm.response_cache.get_settings', return_value=settings), \
+         patch('app.llm.response_cache.get_llm_response_cache', return_value=LLMResponseCache()):
+        service = SummarizationService()
+
+        async def run(**options):
+            calls.clear()
+            await service.summarize_meeting(
+                meeting_id=uuid4(),
+                workspace_id=uuid4(),
+                founder_id=uuid4(),
+                transcript=sample_transcript,
+                llm_config=_openai_config(),
+                **options
+            )
+            return len(calls)
+
+        first = await run()
+        cached = await run()
+        forced = await run(force_regenerate=True)
+
+    assert first > 0
+    assert cached == 0
+    assert forced == first
@@ -317,3 +317,169 @@ async def test_sync_zero_metrics_synced(sync_job, mock_workspaces):
 
     # Should still complete successfully
     sync_job.kpi_service.sync_kpis_from_granola.assert_called_once()
+
+
+# ==================== Concurrency & Rate Limiting Tests ====================
+
+@pytest.mark.asyncio
+async def test_sync_respects_max_concurrency(sync_job):
+    """No more than the configured number of workspaces sync at once"""
+    import asyncio
+
+    workspaces = [
+        {"workspace_id": str(uuid4()), "credentials": {"api_key": f"key_{i}"}}
+        for i in range(6)
+    ]
+    sync_job.supabase.execute.return_value = Mock(data=workspaces)
+    sync_job.settings = sync_job.settings.model_copy(update={"kpi_sync_max_concurrency": 2})
+
+    running, peak = 0, 0
+
+    async def slow_sync(**kwargs):
+        nonlocal running, peak
+        running += 1
+        peak = max(peak, running)
+        await asyncio.sleep(0.01)
+        running -= 1
+        return Mock(status="success", metrics_synced=1, errors=[])
+
+    sync_job.kpi_service.sync_kpis_from_granola.side_effect = slow_sync
+
+    await sync_job.sync_all_workspaces()
+
+    assert sync_job.kpi_service.sync_kpis_from_granola.call_count == 6
+    assert peak == 2
+
+
+@pytest.mark.asyncio
+async def test_sync_slow_workspace_times_out(sync_job, mock_workspaces):
+    """One hung workspace is cut off without stalling the others"""
+    import asyncio
+
+    sync_job.supabase.execute.return_value = Mock(data=mock_workspaces)
+    sync_job.settings = sync_job.settings.model_copy(update={"kpi_sync_timeout_seconds": 0.05})
+    hung_workspace = mock_workspaces[0]["workspace_id"]
+
+    async def sync(workspace_id, **kwargs):
+        if workspace_id == hung_workspace:
+            await asyncio.sleep(10)
+        return Mock(status="success", metrics_synced=1, errors=[])
+
+    sync_job.kpi_service.sync_kpis_from_granola.side_effect = sync
+
+    await asyncio.wait_for(sync_job.sync_all_workspaces(), timeout=2)
+
+    assert sync_job._progress == {"pending": 0, "running": 0, "completed": 2}
+    # Only the healthy workspace logs a sync event
+    assert sync_job.supabase.insert.call_count == 1
+
+
+@pytest.mark.asyncio
+async def test_sync_passes_session_per_workspace(mock_supabase, mock_kpi_service, mock_workspaces):
+    """Each workspace sync gets its own database session, closed afterwards"""
+    sessions = []
+
+    def session_factory():
+        sessions.append(Mock())
+        return sessions[-1]
+
+    with patch('app.tasks.kpi_sync.get_supabase_client', return_value=mock_supabase), \
+         patch('app.tasks.kpi_sync.KPIIngestionService', return_value=mock_kpi_service):
+        job = KPISyncJob(session_factory=session_factory)
+
+    job.supabase.execute.return_value = Mock(data=mock_workspaces)
+    await job.sync_all_workspaces()
+
+    passed = [c.kwargs["db"] for c in mock_kpi_service.sync_kpis_from_granola.call_args_list]
+    assert passed == sessions
+    assert all(s.close.called for s in sessions)
+
+
+@pytest.mark.asyncio
+async def test_blocking_database_work_times_out_and_closes_after(mock_supabase, mock_kpi_service, mock_workspaces):
+    """Blocking session work runs off the event loop; the session closes only once it finishes"""
+    import asyncio
+    import time
+    from app.database import run_in_session
+
+    events = []
+    session = Mock()
+    session.close.side_effect = lambda: events.append("close")
+
+    def blocking_query():
+        time.sleep(0.2)
+        events.append("query")
+
+    async def sync(workspace_id, db, **kwargs):
+        await run_in_session(db, blocking_query)
+        return Mock(status="success", metrics_synced=1, errors=[])
+
+    mock_kpi_service.sync_kpis_from_granola.side_effect = sync
+    with patch('app.tasks.kpi_sync.get_supabase_client', return_value=mock_supabase), \
+         patch('app.tasks.kpi_sync.KPIIngestionService', return_value=mock_kpi_service):
+        job = KPISyncJob(session_factory=lambda: session)
+
+    job.settings = job.settings.model_copy(update={"kpi_sync_timeout_seconds": 0.05})
+    started = time.monotonic()
+
+    await job._sync_workspace(mock_workspaces[0], asyncio.Semaphore(1))
+
+    # The timeout fired while the query blocked, so no sync event was logged
+    assert job.supabase.insert.call_count == 0
+    assert events == ["query", "close"]
+    assert time.monotonic() - started >= 0.2
+
+
+@pytest.mark.asyncio
+async def test_backfill_derived_metrics_per_workspace(mock_supabase, mock_kpi_service, mock_workspaces):
+    """Derived KPI backfill runs for every active workspace on its own session"""
+    sessions = []
+
+    def session_factory():
+        sessions.append(Mock())
+        return sessions[-1]
+
+    mock_kpi_service.backfill_derived_metrics = AsyncMock(return_value=3)
+    with patch('app.tasks.kpi_sync.get_supabase_client', return_value=mock_supabase), \
+         patch('app.tasks.kpi_sync.KPIIngestionService', return_value=mock_kpi_service):
+        job = KPISyncJob(session_factory=session_factory)
+
+    job.supabase.execute.return_value = Mock(data=mock_workspaces)
+    start = datetime(2025, 1, 1)
+
+    written = await job.backfill_derived_metrics(start_date=start)
+
+    assert written == 6
+    calls = mock_kpi_service.backfill_derived_metrics.call_args_list
+    assert [c.args[0] for c in calls] == [w["workspace_id"] for w in mock_workspaces]
+    assert [c.kwargs["db"] for c in calls] == sessions
+    assert all(c.kwargs["start_date"] == start for c in calls)
+    assert all(s.close.called for s in sessions)
+
+
+def test_start_offsets_are_stable_and_spread(sync_job):
+    """Start offsets are deterministic per workspace and fall inside the window"""
+    ids = [str(uuid4()) for _ in range(50)]
+    offsets = [sync_job._start_offset(wid, 3600) for wid in ids]
+
+    assert offsets == [sync_job._start_offset(wid, 3600) for wid in ids]
+    assert all(0 <= o <= 3600 for o in offsets)
+    assert max(offsets) - min(offsets) > 1800
+    assert sync_job._start_offset(ids[0], 0) == 0.0
+
+
+@pytest.mark.asyncio
+async def test_token_bucket_paces_acquires():
+    """Acquires beyond the burst wait for refill"""
+    from app.core.rate_limit import TokenBucket
+
+    bucket = TokenBucket(rate=100.0, capacity=2)
+
+    assert await bucket.acquire() == 0.0
+    assert await bucket.acquire() == 0.0
+    waited = await bucket.acquire()
+
+    assert waited == pytest.approx(0.01, abs=0.005)
+
+    with pytest.raises(ValueError):
+        await bucket.acquire(5)
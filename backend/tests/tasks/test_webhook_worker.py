@@ -0,0 +1,214 @@
+"""
+Tests for the durable webhook queue and worker pool
+"""
+import asyncio
+from unittest.mock import AsyncMock, Mock, patch
+from uuid import uuid4
+
+import pytest
+
+from app.api.webhooks.queueing import dispatch_webhook
+from app.config import get_settings
+from app.models.webhook_event import WebhookEvent, WebhookEventStatus
+from app.services import webhook_queue
+from app.services.webhook_queue import WebhookQueue, init_webhook_queue
+from app.tasks import webhook_worker
+from app.tasks.webhook_worker import WebhookWorkerPool
+
+
+class UniqueViolation(Exception):
+    code = "23505"
+
+
+class FakeQueue:
+    """In-memory queue that enforces the per-workspace claim cap"""
+
+    def __init__(self, events):
+        self.pending = list(events)
+        self.leased = {}
+        self.completed = []
+        self.failed = []
+
+    async def claim(self, worker_id, limit, lease_seconds, workspace_limit):
+        claimed = []
+        for event in list(self.pending):
+            if len(claimed) >= limit:
+                break
+            in_flight = sum(1 for e in self.leased.values() if e.workspace_key == event.workspace_key)
+            if event.workspace_key and in_flight >= workspace_limit:
+                continue
+            self.pending.remove(event)
+            event.attempts += 1
+            self.leased[event.id] = event
+            claimed.append(event)
+        return claimed
+
+    async def complete(self, event):
+        self.leased.pop(event.id)
+        self.completed.append(event)
+
+    async def fail(self, event, error):
+        self.leased.pop(event.id)
+        self.failed.append((event, error))
+        return WebhookEventStatus.DEAD if event.attempts >= event.max_attempts else WebhookEventStatus.PENDING
+
+
+def _event(workspace_key="acct-1", event_type="recording.completed", attempts=0):
+    return WebhookEvent(
+        id=uuid4(),
+        platform="zoom",
+        event_type=event_type,
+        payload={"object": {"id": 1}},
+        idempotency_key=f"{event_type}:{uuid4()}",
+        workspace_key=workspace_key,
+        attempts=attempts
+    )
+
+
+@pytest.mark.asyncio
+async def test_workspace_cap_limits_concurrent_events():
+    """No more than workspace_limit events of one workspace run at once"""
+    running = {"acct-1": 0, "acct-2": 0}
+    peak = {"acct-1": 0, "acct-2": 0}
+    release = asyncio.Event()
+    queue = FakeQueue([_event("acct-1") for _ in range(4)] + [_event("acct-2")])
+
+    pool = WebhookWorkerPool(queue, {}, concurrency=8, workspace_limit=2)
+
+    async def tracked(event):
+        running[event.workspace_key] += 1
+        peak[event.workspace_key] = max(peak[event.workspace_key], running[event.workspace_key])
+        await release.wait()
+        running[event.workspace_key] -= 1
+        await queue.complete(event)
+
+    pool._process = tracked
+    assert await pool.run_once() == 3
+    await asyncio.sleep(0)
+    release.set()
+    await asyncio.gather(*pool._running)
+    assert await pool.run_once() == 2
+    await asyncio.gather(*pool._running)
+
+    assert peak == {"acct-1": 2, "acct-2": 1}
+    assert len(queue.completed) == 5
+
+
+@pytest.mark.asyncio
+async def test_successful_event_is_completed():
+    """Handler results other than an error complete the event"""
+    event = _event()
+    queue = FakeQueue([event])
+    handler = AsyncMock(return_value={"status": "success"})
+    pool = WebhookWorkerPool(queue, {("zoom", "recording.completed"): handler})
+
+    await pool.run_once()
+    await asyncio.gather(*pool._running)
+
+    handler.assert_awaited_once_with(event.payload)
+    assert queue.completed == [event]
+    assert pool.free_slots == pool.concurrency
+
+
+@pytest.mark.asyncio
+async def test_error_result_and_missing_handler_are_retried():
+    """Handlers reporting an error, and events with no handler, go back for retry"""
+    errored = _event()
+    unknown = _event(event_type="meeting.started")
+    queue = FakeQueue([errored, unknown])
+    handler = AsyncMock(return_value={"status": "error", "error": "Zoom API unavailable"})
+    pool = WebhookWorkerPool(queue, {("zoom", "recording.completed"): handler})
+
+    await pool.run_once()
+    await asyncio.gather(*pool._running)
+
+    errors = {event.id: error for event, error in queue.failed}
+    assert errors[errored.id] == "Zoom API unavailable"
+    assert "No handler" in errors[unknown.id]
+    assert queue.completed == []
+
+
+@pytest.mark.asyncio
+async def test_fail_backs_off_then_dead_letters():
+    """Failed events are rescheduled with growing delays until max_attempts"""
+    supabase = Mock()
+    queue = WebhookQueue(supabase, retry_base_seconds=10, retry_max_seconds=60)
+
+    delays = [queue.retry_delay(attempts) for attempts in range(1, 6)]
+    assert 5 <= delays[0] <= 10
+    assert 20 <= delays[2] <= 40
+    assert 30 <= delays[4] <= 60
+
+    assert await queue.fail(_event(attempts=1), "boom") == WebhookEventStatus.PENDING
+    update = supabase.table.return_value.update.call_args.args[0]
+    assert update["status"] == "pending"
+    assert "available_at" in update
+
+    assert await queue.fail(_event(attempts=5), "boom") == WebhookEventStatus.DEAD
+    update = supabase.table.return_value.update.call_args.args[0]
+    assert update["status"] == "dead"
+    assert "available_at" not in update
+
+
+@pytest.mark.asyncio
+async def test_enqueue_ignores_redelivery():
+    """A redelivered event with the same idempotency key is stored once"""
+    supabase = Mock()
+    insert = supabase.table.return_value.insert.return_value
+    insert.execute.return_value = Mock(data=[{"id": "event-1"}])
+    queue = WebhookQueue(supabase)
+
+    assert await queue.enqueue("zoom", "recording.completed", {}, "recording.completed:abc") == ("event-1", False)
+
+    insert.execute.side_effect = UniqueViolation("duplicate key value violates unique constraint")
+    assert await queue.enqueue("zoom", "recording.completed", {}, "recording.completed:abc") == (None, True)
+
+    insert.execute.side_effect = Exception("connection reset")
+    with pytest.raises(Exception, match="connection reset"):
+        await queue.enqueue("zoom", "recording.completed", {}, "recording.completed:abc")
+
+
+@pytest.mark.asyncio
+async def test_endpoints_enqueue_once_queue_is_initialized(monkeypatch):
+    """Deliveries run in-process until startup initializes the queue, then are persisted for the workers"""
+    monkeypatch.setattr(webhook_queue, "_webhook_queue", None)
+    supabase = Mock()
+    supabase.table.return_value.insert.return_value.execute.return_value = Mock(data=[{"id": "event-1"}])
+    handler = AsyncMock()
+    background_tasks = Mock()
+
+    def dispatch():
+        return dispatch_webhook(
+            "zoom", "recording.completed", {"object": {"id": 1}}, "recording.completed:1", handler, background_tasks
+        )
+
+    assert await dispatch() == {"status": "processing"}
+    background_tasks.add_task.assert_called_once_with(handler, {"object": {"id": 1}})
+
+    enabled = get_settings().model_copy(update={"webhook_queue_enabled": True})
+    with patch.object(webhook_queue, "get_settings", return_value=enabled):
+        assert init_webhook_queue(supabase) is not None
+    assert await dispatch() == {"status": "queued", "event_id": "event-1"}
+    assert background_tasks.add_task.call_count == 1
+    assert supabase.table.return_value.insert.call_args.args[0]["idempotency_key"] == "recording.completed:1"
+
+
+def test_queue_is_off_unless_enabled(monkeypatch):
+    """Without a deployed worker opting in, deliveries keep being processed in the API process"""
+    monkeypatch.setattr(webhook_queue, "_webhook_queue", None)
+    disabled = get_settings().model_copy(update={"webhook_queue_enabled": False})
+
+    with patch.object(webhook_queue, "get_settings", return_value=disabled):
+        assert init_webhook_queue(Mock()) is None
+
+
+@pytest.mark.asyncio
+async def test_worker_process_exits_without_a_queue(monkeypatch):
+    """The worker entrypoint refuses to start when there is no queue to claim from"""
+    monkeypatch.setattr(webhook_queue, "_webhook_queue", None)
+
+    with patch.object(webhook_worker, "get_supabase_client", return_value=None), \
+            patch.object(webhook_worker, "run_webhook_workers", AsyncMock()) as run:
+        assert await webhook_worker.main() == 1
+
+    run.assert_not_awaited()
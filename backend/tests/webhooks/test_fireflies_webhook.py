@@ -282,6 +282,28 @@ class TestFirefliesWebhookEvents:
         data = response.json()
         assert data["status"] == "processing"
 
+    @patch('app.api.webhooks.fireflies_webhook.dispatch_webhook', new_callable=AsyncMock)
+    @patch('app.api.webhooks.fireflies_webhook._webhook_handler')
+    def test_transcript_ready_passes_host_as_workspace_key(
+        self, mock_handler, mock_dispatch, webhook_client, fireflies_transcript_payload
+    ):
+        """Test the host email keys the per-workspace queue cap"""
+        # Arrange
+        mock_handler.verify_signature = MagicMock(return_value=True)
+        mock_dispatch.return_value = {"status": "processing"}
+        fireflies_transcript_payload["data"]["host_email"] = "host@example.com"
+
+        # Act
+        response = webhook_client.post(
+            "/api/webhooks/fireflies",
+            json=fireflies_transcript_payload,
+            headers={"x-fireflies-signature": "sig"}
+        )
+
+        # Assert
+        assert response.status_code == status.HTTP_200_OK
+        assert mock_dispatch.call_args.kwargs["workspace_key"] == "host@example.com"
+
     @patch('app.api.webhooks.fireflies_webhook._webhook_handler')
     def test_unsupported_event_type(
         self, mock_handler, webhook_client, fireflies_secret
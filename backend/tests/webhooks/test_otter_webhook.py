@@ -320,6 +320,28 @@ class TestOtterWebhookEvents:
         data = response.json()
         assert data["status"] == "processing"
 
+    @patch('app.api.webhooks.otter_webhook.dispatch_webhook', new_callable=AsyncMock)
+    @patch('app.api.webhooks.otter_webhook._webhook_handler')
+    def test_speech_created_passes_owner_as_workspace_key(
+        self, mock_handler, mock_dispatch, webhook_client, otter_speech_created_payload
+    ):
+        """Test the owner email keys the per-workspace queue cap"""
+        # Arrange
+        mock_handler.verify_signature = MagicMock(return_value=True)
+        mock_dispatch.return_value = {"status": "processing"}
+        otter_speech_created_payload["data"]["owner_email"] = "owner@example.com"
+
+        # Act
+        response = webhook_client.post(
+            "/api/webhooks/otter",
+            json=otter_speech_created_payload,
+            headers={"x-otter-signature": "sig"}
+        )
+
+        # Assert
+        assert response.status_code == status.HTTP_200_OK
+        assert mock_dispatch.call_args.kwargs["workspace_key"] == "owner@example.com"
+
     @patch('app.api.webhooks.otter_webhook._webhook_handler')
     def test_speech_updated_event(
         self, mock_handler, webhook_client, otter_speech_updated_payload, otter_secret
@@ -1,6 +1,12 @@
 #!/bin/sh
 set -e
 
+# "webhook-worker" runs the webhook queue worker instead of the API
+if [ "$1" = "webhook-worker" ]; then
+    echo "Starting webhook worker"
+    exec python -m app.tasks.webhook_worker
+fi
+
 # Use PORT environment variable if set, otherwise default to 8000
 PORT=${PORT:-8000}
 
@@ -0,0 +1,66 @@
+-- ========================================================================================
+-- Migration: 008_streaming_kpi_detection.sql
+-- Description: AI Chief of Staff - Persisted state for streaming KPI anomaly detection
+-- Author: System Architect
+-- Date: 2025-11-14
+-- Sprint: 7 - Analytics Performance
+--
+-- This migration creates storage for per-metric online detector state
+-- (running mean/variance, quantile sketch, seasonal residual stats) so that
+-- KPI syncs can score each new data point in O(1) and restarted workers can
+-- resume without rescanning history.
+--
+-- Dependencies:
+-- - 001_initial_schema.sql
+-- - 002_rls_policies.sql
+-- - 005_insights_briefings.sql
+-- ========================================================================================
+
+-- ========================================================================================
+-- PART 1: DETECTOR STATE TABLE
+-- ========================================================================================
+
+CREATE TABLE IF NOT EXISTS intel.kpi_detector_state (
+  workspace_id      uuid NOT NULL REFERENCES core.workspaces(id) ON DELETE CASCADE,
+  metric_id         uuid NOT NULL,
+
+  -- Serialized OnlineMetricState (see app/algorithms/online_detector.py)
+  state             jsonb NOT NULL DEFAULT '{}'::jsonb,
+  observations      bigint NOT NULL DEFAULT 0,
+
+  updated_at        timestamptz NOT NULL DEFAULT now(),
+
+  PRIMARY KEY (workspace_id, metric_id)
+);
+
+CREATE INDEX IF NOT EXISTS idx_kpi_detector_state_metric
+  ON intel.kpi_detector_state(metric_id);
+
+COMMENT ON TABLE intel.kpi_detector_state IS 'Resumable per-metric state for streaming anomaly detection';
+COMMENT ON COLUMN intel.kpi_detector_state.state IS 'Welford stats, quantile sketch and seasonal residual stats';
+
+-- ========================================================================================
+-- PART 2: ROW LEVEL SECURITY
+-- ========================================================================================
+
+ALTER TABLE intel.kpi_detector_state ENABLE ROW LEVEL SECURITY;
+
+-- Detector state is maintained by backend services; members may read it
+CREATE POLICY kpi_detector_state_select_policy ON intel.kpi_detector_state
+  FOR SELECT
+  TO authenticated
+  USING (
+    workspace_id IN (SELECT auth.user_workspaces())
+  );
+
+-- ========================================================================================
+-- PART 3: MIGRATION METADATA
+-- ========================================================================================
+
+INSERT INTO public.schema_migrations (version, description)
+VALUES ('008', 'Streaming KPI anomaly detection state')
+ON CONFLICT (version) DO NOTHING;
+
+-- ========================================================================================
+-- END OF MIGRATION 008_streaming_kpi_detection.sql
+-- ========================================================================================
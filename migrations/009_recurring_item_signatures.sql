@@ -0,0 +1,64 @@
+-- ========================================================================================
+-- Migration: 009_recurring_item_signatures.sql
+-- Description: AI Chief of Staff - MinHash signatures for recurring action items and decisions
+-- Author: System Architect
+-- Date: 2025-11-14
+-- Sprint: 7 - Meeting Intelligence Performance
+--
+-- This migration stores a MinHash signature and its LSH band keys on every
+-- action item and decision so that an item extracted from a new meeting can
+-- be matched against the workspace's earlier meetings with one indexed
+-- array-overlap lookup, and links recurring items to the first occurrence
+-- instead of creating duplicate tasks.
+--
+-- Dependencies:
+-- - 004_meeting_intelligence.sql
+-- ========================================================================================
+
+-- ========================================================================================
+-- PART 1: ACTION ITEMS
+-- ========================================================================================
+
+ALTER TABLE meetings.action_items
+  ADD COLUMN IF NOT EXISTS minhash_signature integer[],
+  ADD COLUMN IF NOT EXISTS lsh_bands text[] NOT NULL DEFAULT '{}',
+  ADD COLUMN IF NOT EXISTS duplicate_of uuid REFERENCES meetings.action_items(id) ON DELETE SET NULL;
+
+CREATE INDEX IF NOT EXISTS idx_action_items_lsh_bands
+  ON meetings.action_items USING GIN(lsh_bands);
+
+CREATE INDEX IF NOT EXISTS idx_action_items_duplicate_of
+  ON meetings.action_items(duplicate_of)
+  WHERE duplicate_of IS NOT NULL;
+
+COMMENT ON COLUMN meetings.action_items.minhash_signature IS 'MinHash signature of the description word set (see app/algorithms/near_duplicates.py)';
+COMMENT ON COLUMN meetings.action_items.lsh_bands IS 'LSH band keys of the signature, matched with && to find candidate duplicates';
+COMMENT ON COLUMN meetings.action_items.duplicate_of IS 'First occurrence of this action item in an earlier meeting';
+
+-- ========================================================================================
+-- PART 2: DECISIONS
+-- ========================================================================================
+
+ALTER TABLE meetings.decisions
+  ADD COLUMN IF NOT EXISTS minhash_signature integer[],
+  ADD COLUMN IF NOT EXISTS lsh_bands text[] NOT NULL DEFAULT '{}',
+  ADD COLUMN IF NOT EXISTS duplicate_of uuid REFERENCES meetings.decisions(id) ON DELETE SET NULL;
+
+CREATE INDEX IF NOT EXISTS idx_decisions_lsh_bands
+  ON meetings.decisions USING GIN(lsh_bands);
+
+COMMENT ON COLUMN meetings.decisions.minhash_signature IS 'MinHash signature of the description word set';
+COMMENT ON COLUMN meetings.decisions.lsh_bands IS 'LSH band keys of the signature, matched with && to find candidate duplicates';
+COMMENT ON COLUMN meetings.decisions.duplicate_of IS 'First occurrence of this decision in an earlier meeting';
+
+-- ========================================================================================
+-- PART 3: MIGRATION METADATA
+-- ========================================================================================
+
+INSERT INTO public.schema_migrations (version, description)
+VALUES ('009', 'Recurring action item and decision signatures')
+ON CONFLICT (version) DO NOTHING;
+
+-- ========================================================================================
+-- END OF MIGRATION 009_recurring_item_signatures.sql
+-- ========================================================================================
@@ -0,0 +1,59 @@
+-- ========================================================================================
+-- Migration: 010_meeting_dedup_index.sql
+-- Description: AI Chief of Staff - Indexed meeting deduplication hash
+-- Author: System Architect
+-- Date: 2025-11-14
+-- Sprint: 7 - Meeting Intelligence Performance
+--
+-- Meeting ingestion deduplicates on sha256(source:platform_id), which used to
+-- live only in metadata.platform_data.duplicate_hash and was matched by
+-- reading every meeting in the workspace. This migration promotes the hash
+-- to its own column with a unique index per workspace, so the duplicate
+-- check is one index probe and concurrent webhook deliveries of the same
+-- meeting cannot both insert.
+--
+-- Dependencies:
+-- - 001_initial_schema.sql
+-- ========================================================================================
+
+-- ========================================================================================
+-- PART 1: DUPLICATE HASH COLUMN
+-- ========================================================================================
+
+ALTER TABLE meetings.meetings
+  ADD COLUMN IF NOT EXISTS duplicate_hash text;
+
+-- Backfill from the metadata written by earlier ingestions
+UPDATE meetings.meetings
+SET duplicate_hash = metadata -> 'platform_data' ->> 'duplicate_hash'
+WHERE duplicate_hash IS NULL
+  AND metadata -> 'platform_data' ? 'duplicate_hash';
+
+-- Keep the oldest row when earlier races stored the same meeting twice
+UPDATE meetings.meetings m
+SET duplicate_hash = NULL
+WHERE duplicate_hash IS NOT NULL
+  AND EXISTS (
+    SELECT 1 FROM meetings.meetings older
+    WHERE older.workspace_id = m.workspace_id
+      AND older.duplicate_hash = m.duplicate_hash
+      AND (older.created_at, older.id) < (m.created_at, m.id)
+  );
+
+CREATE UNIQUE INDEX IF NOT EXISTS idx_meetings_workspace_duplicate_hash
+  ON meetings.meetings(workspace_id, duplicate_hash)
+  WHERE duplicate_hash IS NOT NULL;
+
+COMMENT ON COLUMN meetings.meetings.duplicate_hash IS 'sha256 of source and platform meeting ID; unique per workspace';
+
+-- ========================================================================================
+-- PART 2: MIGRATION METADATA
+-- ========================================================================================
+
+INSERT INTO public.schema_migrations (version, description)
+VALUES ('010', 'Indexed meeting deduplication hash')
+ON CONFLICT (version) DO NOTHING;
+
+-- ========================================================================================
+-- END OF MIGRATION 010_meeting_dedup_index.sql
+-- ========================================================================================
@@ -0,0 +1,163 @@
+-- ========================================================================================
+-- Migration: 011_webhook_queue.sql
+-- Description: AI Chief of Staff - Durable webhook ingestion queue
+-- Author: System Architect
+-- Date: 2025-11-14
+-- Sprint: 7 - Meeting Intelligence Performance
+--
+-- Turns mcp.webhook_events into a work queue. Webhook endpoints persist each
+-- verified delivery (deduplicated by an idempotency key) and return; the
+-- webhook worker pool claims events with a time-limited lease, processes
+-- them and marks them processed, or reschedules them with backoff. Events
+-- whose worker died are reclaimed once the lease expires (at-least-once).
+--
+-- Dependencies:
+-- - 003_mcp_extensions.sql
+-- ========================================================================================
+
+-- ========================================================================================
+-- PART 1: QUEUE COLUMNS
+-- ========================================================================================
+
+-- Webhooks arrive before the owning integration is resolved
+ALTER TABLE mcp.webhook_events
+  ALTER COLUMN integration_id DROP NOT NULL;
+
+ALTER TABLE mcp.webhook_events
+  ADD COLUMN IF NOT EXISTS platform text,
+  ADD COLUMN IF NOT EXISTS idempotency_key text,
+  ADD COLUMN IF NOT EXISTS workspace_key text,
+  ADD COLUMN IF NOT EXISTS status text NOT NULL DEFAULT 'pending',
+  ADD COLUMN IF NOT EXISTS attempts int NOT NULL DEFAULT 0,
+  ADD COLUMN IF NOT EXISTS max_attempts int NOT NULL DEFAULT 5,
+  ADD COLUMN IF NOT EXISTS available_at timestamptz NOT NULL DEFAULT now(),
+  ADD COLUMN IF NOT EXISTS leased_until timestamptz,
+  ADD COLUMN IF NOT EXISTS leased_by text;
+
+-- Events stored before this migration were handled in-process
+UPDATE mcp.webhook_events SET status = 'processed' WHERE processed = true AND status = 'pending';
+
+DO $$
+BEGIN
+  IF NOT EXISTS (
+    SELECT 1 FROM pg_constraint
+    WHERE conname = 'webhook_events_status_check'
+      AND conrelid = 'mcp.webhook_events'::regclass
+  ) THEN
+    ALTER TABLE mcp.webhook_events
+      ADD CONSTRAINT webhook_events_status_check
+      CHECK (status IN ('pending', 'leased', 'processed', 'dead'));
+  END IF;
+END $$;
+
+CREATE UNIQUE INDEX IF NOT EXISTS idx_webhook_events_idempotency
+  ON mcp.webhook_events(platform, idempotency_key)
+  WHERE idempotency_key IS NOT NULL;
+
+CREATE INDEX IF NOT EXISTS idx_webhook_events_ready
+  ON mcp.webhook_events(available_at)
+  WHERE status = 'pending';
+
+CREATE INDEX IF NOT EXISTS idx_webhook_events_leased
+  ON mcp.webhook_events(leased_until, workspace_key)
+  WHERE status = 'leased';
+
+COMMENT ON COLUMN mcp.webhook_events.idempotency_key IS 'Platform event identity; redeliveries of the same event are stored once';
+COMMENT ON COLUMN mcp.webhook_events.workspace_key IS 'Platform account the event belongs to, used for per-workspace concurrency caps';
+COMMENT ON COLUMN mcp.webhook_events.status IS 'pending, leased (claimed by a worker until leased_until), processed or dead';
+COMMENT ON COLUMN mcp.webhook_events.available_at IS 'Earliest time the event may be claimed (retry backoff)';
+
+-- ========================================================================================
+-- PART 2: CLAIMING
+-- ========================================================================================
+
+-- Lease up to p_limit ready events, at most p_workspace_limit in flight per workspace_key.
+-- The cap is applied to every ready event before the limit, so a workspace with a deep
+-- backlog cannot crowd the others out of a claim. Claims are serialized so concurrent
+-- workers see each other's leases when counting a workspace's events in flight.
+CREATE OR REPLACE FUNCTION mcp.claim_webhook_events(
+  p_worker text,
+  p_limit int DEFAULT 10,
+  p_lease_seconds int DEFAULT 300,
+  p_workspace_limit int DEFAULT 2
+)
+RETURNS SETOF mcp.webhook_events AS $$
+BEGIN
+  PERFORM pg_advisory_xact_lock(hashtext('mcp.claim_webhook_events'));
+
+  -- Expired leases that already used every attempt are given up on
+  UPDATE mcp.webhook_events
+  SET status = 'dead',
+      error_message = coalesce(error_message, 'Lease expired on final attempt')
+  WHERE status = 'leased'
+    AND leased_until <= now()
+    AND attempts >= max_attempts;
+
+  RETURN QUERY
+  WITH in_flight AS (
+    SELECT workspace_key, count(*) AS leased
+    FROM mcp.webhook_events
+    WHERE status = 'leased' AND leased_until > now() AND workspace_key IS NOT NULL
+    GROUP BY workspace_key
+  ),
+  ready AS (
+    SELECT e.id,
+           e.workspace_key,
+           e.available_at,
+           row_number() OVER (PARTITION BY e.workspace_key ORDER BY e.available_at, e.received_at) AS position
+    FROM mcp.webhook_events e
+    WHERE (e.status = 'pending' AND e.available_at <= now())
+       OR (e.status = 'leased' AND e.leased_until <= now())
+  ),
+  eligible AS (
+    SELECT r.id, r.available_at
+    FROM ready r
+    LEFT JOIN in_flight f ON f.workspace_key = r.workspace_key
+    WHERE r.workspace_key IS NULL OR coalesce(f.leased, 0) + r.position <= p_workspace_limit
+  ),
+  chosen AS (
+    SELECT e.id
+    FROM mcp.webhook_events e
+    JOIN eligible el ON el.id = e.id
+    ORDER BY el.available_at
+    LIMIT p_limit
+    FOR UPDATE OF e SKIP LOCKED
+  )
+  UPDATE mcp.webhook_events e
+  SET status = 'leased',
+      leased_by = p_worker,
+      leased_until = now() + make_interval(secs => p_lease_seconds),
+      attempts = e.attempts + 1
+  FROM chosen
+  WHERE e.id = chosen.id
+  RETURNING e.*;
+END;
+$$ LANGUAGE plpgsql;
+
+COMMENT ON FUNCTION mcp.claim_webhook_events(text, int, int, int) IS 'Lease ready webhook events for a worker with a per-workspace in-flight cap';
+
+-- ========================================================================================
+-- PART 3: QUEUE DEPTH
+-- ========================================================================================
+
+CREATE OR REPLACE VIEW mcp.webhook_queue_depth AS
+SELECT status,
+       count(*) AS events,
+       min(received_at) AS oldest_received_at
+FROM mcp.webhook_events
+WHERE status IN ('pending', 'leased', 'dead')
+GROUP BY status;
+
+COMMENT ON VIEW mcp.webhook_queue_depth IS 'Unfinished webhook events by queue state';
+
+-- ========================================================================================
+-- PART 4: MIGRATION METADATA
+-- ========================================================================================
+
+INSERT INTO public.schema_migrations (version, description)
+VALUES ('011', 'Durable webhook ingestion queue')
+ON CONFLICT (version) DO NOTHING;
+
+-- ========================================================================================
+-- END OF MIGRATION 011_webhook_queue.sql
+-- ========================================================================================
@@ -0,0 +1,156 @@
+-- ========================================================================================
+-- Migration: 012_embedding_pipeline.sql
+-- Description: AI Chief of Staff - Batched chunk embedding pipeline
+-- Author: System Architect
+-- Date: 2025-11-14
+-- Sprint: 7 - Meeting Intelligence Performance
+--
+-- The embedding pipeline embeds transcript and media chunks in batches and
+-- reuses vectors for chunk text it has embedded before. This migration adds
+-- the shared embedding cache keyed by model and content hash, records each
+-- chunk's content hash, and lets transcript chunks hang off a meeting
+-- directly, since webhook ingestion chunks a meeting before any provider
+-- transcript row exists.
+--
+-- Dependencies:
+-- - 001_initial_schema.sql
+-- - 002_rls_policies.sql
+-- ========================================================================================
+
+-- ========================================================================================
+-- PART 1: EMBEDDING CACHE
+-- ========================================================================================
+
+CREATE TABLE IF NOT EXISTS core.embedding_cache (
+  model         text NOT NULL,
+  content_hash  text NOT NULL,  -- sha256 of whitespace-normalized chunk text
+  embedding     vector(1536) NOT NULL,
+  created_at    timestamptz NOT NULL DEFAULT now(),
+
+  PRIMARY KEY (model, content_hash)
+);
+
+COMMENT ON TABLE core.embedding_cache IS 'Embeddings by model and chunk text hash, reused instead of re-embedding identical text';
+
+-- ========================================================================================
+-- PART 2: CHUNK CONTENT HASHES
+-- ========================================================================================
+
+ALTER TABLE meetings.transcript_chunks
+  ADD COLUMN IF NOT EXISTS meeting_id uuid REFERENCES meetings.meetings(id) ON DELETE CASCADE,
+  ADD COLUMN IF NOT EXISTS content_hash text;
+
+ALTER TABLE meetings.transcript_chunks
+  ALTER COLUMN transcript_id DROP NOT NULL;
+
+DO $$
+BEGIN
+  IF NOT EXISTS (
+    SELECT 1 FROM pg_constraint
+    WHERE conname = 'chunks_has_owner'
+      AND conrelid = 'meetings.transcript_chunks'::regclass
+  ) THEN
+    ALTER TABLE meetings.transcript_chunks
+      ADD CONSTRAINT chunks_has_owner CHECK (transcript_id IS NOT NULL OR meeting_id IS NOT NULL);
+  END IF;
+END $$;
+
+-- Not partial, so chunk upserts can target it; NULL meeting_ids never conflict
+CREATE UNIQUE INDEX IF NOT EXISTS idx_chunks_meeting_index
+  ON meetings.transcript_chunks(meeting_id, chunk_index);
+
+CREATE INDEX IF NOT EXISTS idx_chunks_content_hash
+  ON meetings.transcript_chunks(content_hash);
+
+ALTER TABLE media.media_chunks
+  ADD COLUMN IF NOT EXISTS content_hash text;
+
+CREATE INDEX IF NOT EXISTS idx_media_chunks_content_hash
+  ON media.media_chunks(content_hash);
+
+COMMENT ON COLUMN meetings.transcript_chunks.meeting_id IS 'Meeting the chunk was ingested with (set when there is no provider transcript row)';
+COMMENT ON COLUMN meetings.transcript_chunks.content_hash IS 'sha256 of whitespace-normalized text; key into core.embedding_cache';
+COMMENT ON COLUMN media.media_chunks.content_hash IS 'sha256 of whitespace-normalized text; key into core.embedding_cache';
+
+-- ========================================================================================
+-- PART 3: ROW LEVEL SECURITY
+-- ========================================================================================
+
+-- Chunks without a transcript row are scoped through their meeting instead
+DROP POLICY IF EXISTS transcript_chunks_select_policy ON meetings.transcript_chunks;
+CREATE POLICY transcript_chunks_select_policy ON meetings.transcript_chunks
+  FOR SELECT TO authenticated
+  USING (
+    transcript_id IN (
+      SELECT id FROM meetings.transcripts
+      WHERE workspace_id IN (SELECT auth.user_workspaces())
+    )
+    OR meeting_id IN (
+      SELECT id FROM meetings.meetings
+      WHERE workspace_id IN (SELECT auth.user_workspaces())
+    )
+  );
+
+DROP POLICY IF EXISTS transcript_chunks_insert_policy ON meetings.transcript_chunks;
+CREATE POLICY transcript_chunks_insert_policy ON meetings.transcript_chunks
+  FOR INSERT TO authenticated
+  WITH CHECK (
+    transcript_id IN (
+      SELECT id FROM meetings.transcripts
+      WHERE workspace_id IN (SELECT auth.user_workspaces())
+    )
+    OR meeting_id IN (
+      SELECT id FROM meetings.meetings
+      WHERE workspace_id IN (SELECT auth.user_workspaces())
+    )
+  );
+
+DROP POLICY IF EXISTS transcript_chunks_update_policy ON meetings.transcript_chunks;
+CREATE POLICY transcript_chunks_update_policy ON meetings.transcript_chunks
+  FOR UPDATE TO authenticated
+  USING (
+    transcript_id IN (
+      SELECT id FROM meetings.transcripts
+      WHERE workspace_id IN (SELECT auth.user_workspaces())
+    )
+    OR meeting_id IN (
+      SELECT id FROM meetings.meetings
+      WHERE workspace_id IN (SELECT auth.user_workspaces())
+    )
+  );
+
+DROP POLICY IF EXISTS transcript_chunks_delete_policy ON meetings.transcript_chunks;
+CREATE POLICY transcript_chunks_delete_policy ON meetings.transcript_chunks
+  FOR DELETE TO authenticated
+  USING (
+    transcript_id IN (
+      SELECT id FROM meetings.transcripts
+      WHERE workspace_id IN (SELECT auth.user_workspaces())
+    )
+    OR meeting_id IN (
+      SELECT id FROM meetings.meetings
+      WHERE workspace_id IN (SELECT auth.user_workspaces())
+    )
+  );
+
+-- The cache is keyed by text hash and shared across workspaces, so only
+-- backend services may read or write it
+ALTER TABLE core.embedding_cache ENABLE ROW LEVEL SECURITY;
+
+DROP POLICY IF EXISTS embedding_cache_service_policy ON core.embedding_cache;
+CREATE POLICY embedding_cache_service_policy ON core.embedding_cache
+  FOR ALL TO service_role
+  USING (true)
+  WITH CHECK (true);
+
+-- ========================================================================================
+-- PART 4: MIGRATION METADATA
+-- ========================================================================================
+
+INSERT INTO public.schema_migrations (version, description)
+VALUES ('012', 'Batched chunk embedding pipeline')
+ON CONFLICT (version) DO NOTHING;
+
+-- ========================================================================================
+-- END OF MIGRATION 012_embedding_pipeline.sql
+-- ========================================================================================
@@ -0,0 +1,72 @@
+-- ========================================================================================
+-- Migration: 013_hybrid_search.sql
+-- Description: AI Chief of Staff - Full-text search columns for hybrid retrieval
+-- Author: System Architect
+-- Date: 2025-11-14
+-- Sprint: 7 - Meeting Intelligence Performance
+--
+-- Hybrid search runs a full-text query next to the pgvector query on the
+-- same table and fuses the rankings. This migration gives every table with
+-- an embedding a generated search_tsv column and a GIN index, so keyword
+-- matches on names, numbers and acronyms are index lookups.
+--
+-- Dependencies:
+-- - 001_initial_schema.sql
+-- - 012_embedding_pipeline.sql
+-- ========================================================================================
+
+-- ========================================================================================
+-- PART 1: SEARCH VECTORS
+-- ========================================================================================
+
+ALTER TABLE meetings.transcript_chunks
+  ADD COLUMN IF NOT EXISTS search_tsv tsvector GENERATED ALWAYS AS (
+    setweight(to_tsvector('english', coalesce(speaker, '')), 'B') ||
+    setweight(to_tsvector('english', text), 'A')
+  ) STORED;
+
+ALTER TABLE media.media_chunks
+  ADD COLUMN IF NOT EXISTS search_tsv tsvector GENERATED ALWAYS AS (
+    setweight(to_tsvector('english', coalesce(speaker, '')), 'B') ||
+    setweight(to_tsvector('english', text), 'A')
+  ) STORED;
+
+ALTER TABLE comms.communications
+  ADD COLUMN IF NOT EXISTS search_tsv tsvector GENERATED ALWAYS AS (
+    setweight(to_tsvector('english', coalesce(subject, '')), 'A') ||
+    setweight(to_tsvector('english', coalesce(sender, '')), 'B') ||
+    setweight(to_tsvector('english', coalesce(content, '')), 'C')
+  ) STORED;
+
+ALTER TABLE core.contacts
+  ADD COLUMN IF NOT EXISTS search_tsv tsvector GENERATED ALWAYS AS (
+    setweight(to_tsvector('english', name), 'A') ||
+    setweight(to_tsvector('english', coalesce(company, '')), 'A') ||
+    setweight(to_tsvector('english', coalesce(title, '') || ' ' || coalesce(type, '')), 'B')
+  ) STORED;
+
+-- ========================================================================================
+-- PART 2: INDEXES
+-- ========================================================================================
+
+CREATE INDEX IF NOT EXISTS idx_chunks_search_tsv ON meetings.transcript_chunks USING GIN(search_tsv);
+CREATE INDEX IF NOT EXISTS idx_media_chunks_search_tsv ON media.media_chunks USING GIN(search_tsv);
+CREATE INDEX IF NOT EXISTS idx_comms_search_tsv ON comms.communications USING GIN(search_tsv);
+CREATE INDEX IF NOT EXISTS idx_contacts_search_tsv ON core.contacts USING GIN(search_tsv);
+
+COMMENT ON COLUMN meetings.transcript_chunks.search_tsv IS 'Full-text search vector for hybrid retrieval';
+COMMENT ON COLUMN media.media_chunks.search_tsv IS 'Full-text search vector for hybrid retrieval';
+COMMENT ON COLUMN comms.communications.search_tsv IS 'Full-text search vector for hybrid retrieval';
+COMMENT ON COLUMN core.contacts.search_tsv IS 'Full-text search vector for hybrid retrieval';
+
+-- ========================================================================================
+-- PART 3: MIGRATION METADATA
+-- ========================================================================================
+
+INSERT INTO public.schema_migrations (version, description)
+VALUES ('013', 'Full-text search columns for hybrid retrieval')
+ON CONFLICT (version) DO NOTHING;
+
+-- ========================================================================================
+-- END OF MIGRATION 013_hybrid_search.sql
+-- ========================================================================================